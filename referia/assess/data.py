@@ -15,12 +15,14 @@ from lynguine.config.context import Context
 from lynguine import access
 from lynguine.assess import data
 from ..assess import compute # move to lynguine.assess??
-from lynguine.util.misc import to_camel_case, remove_nan, is_valid_var
+from lynguine.util.misc import to_camel_case, remove_nan, is_valid_var, extract_full_filename
 
 from ..config.interface import Interface
 from ..assess.compute import Compute
 
 from ..util.misc import renderable
+from ..util.liquid import compiled_template
+from ..util import store, xlsx
 
 from keyword import iskeyword
 
@@ -32,6 +34,13 @@ log = Logger(
     filename=cntxt["logging"]["filename"],
 )
 
+# Flow types written as one local file, which save_flow() can replace
+# atomically.
+SINGLE_FILE_TYPES = frozenset({"excel", "csv", "json", "bibtex", "yaml", "markdown", "parquet"})
+
+# Let flows be stored in SQLite or Parquet (see referia.util.store).
+store.install()
+
 
 def empty(val):
     """
@@ -88,6 +97,43 @@ def automapping(columns):
         mapping[name] = column
     return mapping
 
+def series_entries(df, index_column_name, mapping, codes, ngroups):
+    """
+    Collect the rows of a series data frame into per-index entry lists.
+
+    Each row becomes a dictionary with missing values removed, the index
+    column dropped and columns renamed to their variable names. Rows are
+    read in a single pass, with values boxed as ``iterrows`` boxes them
+    (``float`` NaN, ``pd.Timestamp``) so missing values are removed.
+
+    :param df: The series data frame, with the index repeated as a column.
+    :type df: pd.DataFrame
+    :param index_column_name: The name of the index column.
+    :type index_column_name: str
+    :param mapping: The mapping from variable names to column names.
+    :type mapping: dict
+    :param codes: The group number of each row (e.g. from ``pd.factorize``).
+    :type codes: array-like
+    :param ngroups: The number of groups.
+    :type ngroups: int
+    :return: The entries of each group, in row order.
+    :rtype: list
+    """
+    grouped = [[] for _ in range(ngroups)]
+    for code, row in zip(codes, df.to_dict("records")):
+        entry = remove_nan(row)
+        map_entry = entry.copy()
+        del map_entry[index_column_name]
+
+        # Use the mapping to translate entry names.
+        for key, key2 in mapping.items():
+            if key2 in entry:
+                map_entry[key] = entry[key2]
+                del map_entry[key2]
+        grouped[code].append(map_entry)
+    return grouped
+
+
 class CustomDataFrame(data.CustomDataFrame):
     """
     Enhanced data frame for review and assessment workflows.
@@ -174,6 +220,8 @@ class CustomDataFrame(data.CustomDataFrame):
         # Add precompute and postcompute lists to the data object
         self._precompute = []
         self._postcompute = []
+        # Dtypes the written columns were cast to on load; see referia.assess.schema.
+        self._column_schema = None
 
         # CIP-0005: Moved _augment_column_names call to from_flow() override
         # This ensures explicit interface mappings are applied BEFORE augmentation,
@@ -262,9 +310,156 @@ class CustomDataFrame(data.CustomDataFrame):
         # This happens AFTER interface mappings are applied, so no conflicts
         for typ in cdf._d:
             cdf._augment_column_names(cdf._d[typ])
-        
+
         return cdf
-                        
+
+    def reload_flows(self, keys):
+        """
+        Re-read the named flows from their sources into this data frame.
+
+        Each flow is read and finalized as in :meth:`from_flow`, replacing
+        its entry in ``_d``; every other flow, the name/column mappings, the
+        compute state and the current index are kept.  When an input flow
+        gains records, record-indexed output and cache flows that were not
+        re-read gain empty rows for them so the new records can be edited.
+
+        :param keys: Interface keys of the flows to re-read (e.g. "input", "output").
+        :type keys: iterable of str
+        :return: The keys re-read.
+        :rtype: list
+        :raises ValueError: If a key is not a flow loaded in this data frame.
+        """
+        interface = self.interface
+        keys = list(keys)
+        for key in keys:
+            if key not in self._d or key not in interface:
+                errmsg = f"Cannot reload \"{key}\": it is not a loaded flow."
+                log.error(errmsg)
+                raise ValueError(errmsg)
+
+        for key in keys:
+            item = interface[key]
+            if key not in self.types["input"] and not access.io.data_exists(item):
+                # As in from_flow(), a missing output starts empty.
+                log.info(f"Data for type '{key}' not found, creating new..")
+                if "columns" in item:
+                    columns = item["columns"]
+                elif key in self.types["cache"]:
+                    columns = interface.get_cache_columns()
+                else:
+                    columns = interface.get_output_columns()
+                newdf = pd.DataFrame(index=self.index, columns=columns)
+            else:
+                newdf = self._finalize_df(*access.io.read_data(item))
+            if key in self.types["parameters"] and "select" in item:
+                newdf = newdf.loc[item["select"]].to_frame().T
+            self._d[key] = newdf
+            self._colspecs[key] = list(newdf.columns)
+
+            mapping = item["mapping"] if "mapping" in item else []
+            if isinstance(mapping, dict):
+                mapping = [mapping]
+            for mapp in mapping:
+                for name, column in mapp.items():
+                    if column in newdf:
+                        self.update_name_column_map(name, column)
+            self._augment_column_names(newdf)
+
+        if any(key in self.types["input"] for key in keys):
+            fixed = set(self.types["series"]) | set(self.types["parameters"]) | set(keys)
+            for key in self._d:
+                if key in fixed or key not in self.types["output"] + self.types["cache"]:
+                    continue
+                df = self._d[key]
+                missing = self.index.difference(df.index, sort=False)
+                if len(missing):
+                    self._d[key] = df.reindex(df.index.append(missing))
+        return keys
+
+    def save_flow(self, key, cells=None):
+        """
+        Write one output flow to its configured destination.
+
+        Flows stored in a single local file are written to a temporary file
+        beside it that then replaces it (``os.replace``), so an interrupted
+        write never leaves a truncated spreadsheet behind. Other flows
+        (directories of files, Google sheets) are written directly.
+
+        When *cells* lists the cells changed since the file was last written
+        and the flow is an Excel workbook, only those cells are updated in a
+        copy of the existing workbook (see ``referia.util.xlsx``); for a
+        SQLite flow only their rows are upserted (see ``referia.util.store``).
+        The whole flow is rewritten instead if its columns no longer match
+        the data.
+
+        :param key: Interface key of the flow (e.g. "output", "writeseries").
+        :type key: str
+        :param cells: Changed ``(index, column)`` pairs, or None if unknown.
+        :type cells: iterable of tuple, optional
+        :return: None
+        """
+        details = self.interface[key]
+        df = self._d[key]
+        if (cells and details.get("type") == "sqlite"
+                and store.upsert_sqlite(df, details, {index for index, _ in cells})):
+            return
+        if details.get("type") not in SINGLE_FILE_TYPES or not details.get("filename"):
+            access.io.write_data(df, details)
+            return
+
+        target = extract_full_filename(details)
+        folder, name = os.path.split(target)
+        stem, ext = os.path.splitext(name)
+        tmpname = f".{stem}.{os.getpid()}.tmp{ext}"
+        tmp_details = dict(details)
+        tmp_details["directory"] = folder or "."
+        tmp_details["filename"] = tmpname
+        tmppath = os.path.join(folder, tmpname)
+        try:
+            if not (cells and details["type"] == "excel"
+                    and self._patch_excel(df, details, cells, target, tmppath)):
+                access.io.write_data(df, tmp_details)
+            os.replace(tmppath, target)
+        except BaseException:
+            if os.path.exists(tmppath):
+                os.remove(tmppath)
+            raise
+
+    def _patch_excel(self, df, details, cells, source, target):
+        """
+        Write *source* with only *cells* updated from *df* to *target*.
+
+        :return: False if the workbook must be rewritten instead (it is
+            missing, or its columns or rows do not match the data).
+        :rtype: bool
+        """
+        if not os.path.exists(source):
+            return False
+        index_name = details.get("index")
+        if not isinstance(index_name, str):
+            index_name = df.index.name
+        if index_name is None or not df.index.is_unique:
+            return False
+        updates = []
+        for index, column in cells:
+            if column not in df.columns or index not in df.index:
+                return False
+            updates.append((index, column, df.at[index, column]))
+        try:
+            patched = xlsx.patch_cells(
+                source, target, updates,
+                columns=list(df.columns),
+                index_name=index_name,
+                sheet=details.get("sheet", "Sheet1"),
+                header=details.get("header", 0),
+            )
+        except Exception as err:
+            log.warning(f"Could not update \"{source}\" in place, rewriting it: {err}")
+            return False
+        if patched:
+            log.debug(f"Updated {len(updates)} cells of \"{source}\" in place.")
+        return patched
+
     @property
     def _data(self):
         """
@@ -468,17 +663,16 @@ class CustomDataFrame(data.CustomDataFrame):
 
         :return: None
         """
-        existlist=[]
-        count=0
         indseries = pd.Series(self.index)
-        for i, ind in indseries.items():
-            if ind not in existlist:
-                existlist.append(ind)
-                count=0
-                continue
-            else:
-                count+=1
-                indseries.at[i] = str(ind) + "_" + str(count)
+        duplicated = indseries.duplicated()
+        if duplicated.any():
+            # A duplicate is numbered by how many duplicates have been seen
+            # since the last first occurrence of any index, i.e. a running
+            # count that restarts at each new index.
+            run = (~duplicated).cumsum()
+            count = duplicated.astype(int).groupby(run).cumsum()
+            indseries = indseries.astype("object")
+            indseries[duplicated] = indseries[duplicated].astype(str) + "_" + count[duplicated].astype(str)
         self.index = indseries
 
        
@@ -1010,13 +1204,17 @@ class CustomDataFrame(data.CustomDataFrame):
         raise ValueError(errmsg)
 
     def set_dtype(self, column, dtype):
-        """Set a Data._writedata column to the given data type."""
-        if self._writedata is not None and column in self._writedata.columns:
-            log.debug(f"\"{column}\" being set to \"{dtype}\".")
-            self._writedata[column] = self._writedata[column].astype(dtype)
-        if self._writeseries is not None and column in self._writeseries.columns:
+        """Set a column of the output and series data to the given data type.
+
+        Columns that already have the type are left alone, so repeated calls
+        do not copy the column.
+        """
+        for typ in ["output", "writedata", "series", "writeseries"]:
+            df = self._d.get(typ)
+            if df is None or column not in df.columns or df[column].dtype == dtype:
+                continue
             log.debug(f"\"{column}\" being set to \"{dtype}\".")
-            self._writeseries[column] = self._writeseries[column].astype(dtype)
+            df[column] = df[column].astype(dtype)
 
     def _append_row(self, df, index):
         row = pd.DataFrame(columns=df.columns, index=pd.Index([index], name=df.index.name))
@@ -1069,6 +1267,36 @@ class CustomDataFrame(data.CustomDataFrame):
         else:
             log.warning(f"\"{column}\" requested to be added to series data but already exists.")
 
+    def liquid_to_value(self, display, kwargs=None, local={}):
+        """
+        Render a liquid template, reusing its compiled form.
+
+        Behaves as lynguine's ``liquid_to_value`` but parses each template
+        once per Liquid environment (see :mod:`referia.util.liquid`) instead
+        of on every call.
+
+        :param display: The liquid template to render.
+        :type display: str
+        :param kwargs: The mapping to use for the liquid template, defaults to the current row's mapping.
+        :type kwargs: dict, optional
+        :param local: Local overrides applied on top of the kwargs, defaults to {}
+        :type local: dict, optional
+        :return: The rendered template.
+        :rtype: str
+        """
+        if self.compute is None:
+            errmsg = f"Compute needs to be initialised before liquid_to_value is called."
+            log.error(errmsg)
+            raise ValueError(errmsg)
+
+        if kwargs is None or kwargs=={}:
+            kwargs = self.mapping()
+        kwargs.update(local)
+        try:
+            return compiled_template(self.compute._liquid_env, display).render(**remove_nan(kwargs))
+        except Exception as err:
+            raise Exception(f"In {display}\n\n {err}") from err
+
     def _column_from_renderable(self, df, **kwargs):
         """Create a column from a renderable field."""
         return self._series_from_renderable(df, is_index=False, **kwargs)
@@ -1097,8 +1325,99 @@ class CustomDataFrame(data.CustomDataFrame):
             series[index] = value
         return series        
 
+    def _row_renderer(self, view, local=None):
+        """
+        Compile a view into a function of a row's mapping.
+
+        Only views that read nothing but the row itself can be compiled:
+        ``liquid`` and ``display`` templates, and ``list``/``join`` views of
+        them.  Views with ``field``, ``compute``, ``tally`` or ``conditions``
+        entries depend on the cursor and return None.
+
+        :param view: The view to compile.
+        :type view: dict
+        :param local: Local overrides collected from enclosing views.
+        :type local: dict, optional
+        :returns: A function mapping a row's keyword arguments to the view's value, or None.
+        :rtype: callable or None
+        """
+        if not isinstance(view, dict) or "conditions" in view:
+            return None
+        local = dict(local or {})
+        if "local" in view:
+            local.update(view["local"])
+        if "list" in view:
+            renderers = [self._row_renderer(v, local) for v in view["list"]]
+            if any(render is None for render in renderers):
+                return None
+            return lambda kwargs: [render(kwargs) for render in renderers]
+        if "field" in view:
+            return None
+        if "join" in view:
+            render = self._row_renderer(view["join"], local)
+            if render is None:
+                return None
+            sep = view["join"].get("separator", "\n\n")
+            return lambda kwargs: sep.join(render(kwargs))
+        if "compute" in view:
+            return None
+        if "liquid" in view:
+            if self.compute is None:
+                return None
+            display = view["liquid"]
+            template = compiled_template(self.compute._liquid_env, display)
+            def render_liquid(kwargs):
+                try:
+                    return template.render(**remove_nan({**kwargs, **local}))
+                except Exception as err:
+                    raise Exception(f"In {display}\n\n {err}") from err
+            return render_liquid
+        if "tally" in view:
+            return None
+        if "display" in view:
+            display = view["display"]
+            def render_display(kwargs):
+                try:
+                    return display.format(**{**kwargs, **local})
+                except KeyError as err:
+                    raise KeyError(f"The mapping doesn't contain the key {err} requested in \"{display}\". Set the mapping in \"_referia.yml\".") from err
+            return render_display
+        return None
+
+    def _batch_series_from_renderable(self, df, render):
+        """
+        Render a compiled view for every row of a data frame.
+
+        The mapping is resolved once and the rows are read in one pass, so
+        the cursor is not moved and no compute hooks run.  Values are boxed
+        as ``df.loc[index]`` boxes them, so missing values are removed as
+        :meth:`mapping` removes them.
+
+        :param df: The data frame to render from.
+        :type df: pd.DataFrame
+        :param render: The compiled view, from :meth:`_row_renderer`.
+        :type render: callable
+        :returns: The rendered values.
+        :rtype: pd.Series
+        """
+        mapping = {name: column for name, column in self._default_mapping().items() if column in df.columns}
+        names = list(mapping)
+        rows = df[[mapping[name] for name in names]].to_dict("records")
+        values = [
+            render(remove_nan({name: row[mapping[name]] for name in names}))
+            for row in rows
+        ] if names else [render({}) for _ in range(len(df.index))]
+        return pd.Series(values, index=df.index, dtype="object")
+
     def _series_from_renderable(self, df, is_index=False, index_col=None, **kwargs):
         """Extract a series from a renderable dictionary."""
+        # Views that only read the row are rendered in one pass without
+        # moving the cursor (and so without running compute hooks per row).
+        if not df.index.has_duplicates and not df.columns.has_duplicates:
+            render = self._row_renderer(kwargs)
+            if render is not None:
+                return self._batch_series_from_renderable(df, render)
+
         series = pd.Series(index=df.index, dtype="object")
         for index in series.index:
             
@@ -1292,7 +1611,10 @@ class CustomDataFrame(data.CustomDataFrame):
             self.interface["mapping"] = mapping
             
             df[index_column_name] = df.index
-            indexcol = list(set(df[index_column_name]))
+            # Group the rows by index, keeping the order in which each index
+            # first appears.
+            codes, indexcol = pd.factorize(df.index, use_na_sentinel=False)
+            indexcol = list(indexcol)
             index = pd.Index(range(len(indexcol)))
             # selector_column_name = interface["selector"]
             # selectorcol = list(set(df[selector_column_name]))
@@ -1301,29 +1623,11 @@ class CustomDataFrame(data.CustomDataFrame):
             newdf[index_column_name] = indexcol
             newinterface = interface.copy()
             del newinterface["series"]
-            for ind in range(len(indexcol)):
-                entries = []
-                index_name = indexcol[ind]
-                num_sub_entries = (df.index==index_name).sum()
-                if num_sub_entries > 1:
-                    sub_entries = []
-                    for key, entry in df.loc[index_name].iterrows():
-                        sub_entries.append(remove_nan(entry.to_dict()))
-                        #entry = remove_nan(df.loc[index_name].to_dict(orient="list"))
-                else:
-                    sub_entries = [remove_nan(df.loc[index_name].to_dict())]
-                    # Use the mapping to translate entry names.
-                for entry in sub_entries:
-                    map_entry = entry.copy()
-                    del map_entry[index_column_name]
-
-                    for key, key2 in mapping.items():
-                        if key2 in entry:
-                            map_entry[key] = entry[key2]
-                            del map_entry[key2]
-                    entries.append(map_entry)
-                newdf.at[ind, "entries"] = entries
-                newdf.at[ind, index_column_name] = indexcol[ind]
+            newdf["entries"] = pd.Series(
+                series_entries(df, index_column_name, mapping, codes, len(indexcol)),
+                index=index,
+                dtype="object",
+            )
                                  
             if "fields" in interface:
                 """Fields have already been resolved."""
@@ -1378,7 +1682,12 @@ class CustomDataFrame(data.CustomDataFrame):
         :type column: str
         :param value: The value whose type the column should be updated with.
         :type value: Any
+
+        Columns covered by the column schema keep the dtype they were cast
+        to on load; a value that dtype refuses is left to the writer.
         """
+        if self._column_schema is not None and self._column_schema.dtype(column) is not None:
+            return
         coltype = df.dtypes[column]
         if is_numeric_dtype(coltype) and is_string_dtype(type(value)):
             log.warning(f"Changing column \"{column}\" type to 'object' due to string input.")
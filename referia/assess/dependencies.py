@@ -0,0 +1,389 @@
+"""Static field-dependency graph for the web review interface.
+
+When one field of a record changes, only some widgets can show something
+different: the widget for that field, its ``_modified``/``_created``
+timestamps, combinators and computes that read it, widgets whose
+``visible_if`` condition tests it, and widgets whose Liquid text refers to
+it, followed transitively.  ``DependencyGraph`` works that set out once
+from the interface so ``WebReviewer.affected_widgets`` does not have to
+return the whole form.
+
+The graph errs towards refreshing too much: an entry whose inputs cannot
+be read from the configuration (a combinator built on a ``compute`` view,
+or on a template that ``include``s another) is treated as depending on
+every field.
+
+Public API
+----------
+template_variables(text) -> set[str]
+    Variable names referenced by a Liquid (``{{ a }}``, ``{% if b %}``) or
+    format-string (``{c}``) template.
+
+view_references(view) -> set[str] | None
+    Fields a viewer/combinator spec reads, or ``None`` when unknown.
+
+DependencyGraph.from_interface(interface, widget_specs, name_map=None)
+    Build the graph for a loaded interface.
+
+graph.affected(column, suffixes=()) -> set[str]
+    Every field whose displayed value may change when *column* changes.
+
+CombinatorPlan.from_interface(interface, name_map=None)
+    Inputs of each ``combinator`` entry, read once from its templates.
+
+plan.stale(columns) -> list[int]
+    Positions of the combinators to re-evaluate after *columns* changed.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from typing import Any, Iterable, Mapping
+
+# ``{{ expr }}`` output blocks and ``{% tag expr %}`` statement blocks.
+_LIQUID_OUTPUT_RE = re.compile(r"\{\{-?(.*?)-?\}\}", re.DOTALL)
+_LIQUID_TAG_RE = re.compile(r"\{%-?(.*?)-?%\}", re.DOTALL)
+# ``{name}`` / ``{name:fmt}`` fields of a str.format template, skipping the
+# doubled braces of Liquid blocks and escaped ``{{``.
+_FORMAT_FIELD_RE = re.compile(r"(?<!\{)\{([A-Za-z_]\w*)(?:[.\[!:][^{}]*)?\}(?!\})")
+_STRING_RE = re.compile(r"\"[^\"]*\"|'[^']*'")
+_IDENT_RE = re.compile(r"(?<![\w.])([A-Za-z_]\w*)")
+# Tags that pull in another template, whose variables cannot be seen here.
+_INCLUDE_RE = re.compile(r"\{%-?\s*(?:include|render)\b")
+
+# Words inside Liquid blocks that are syntax, not variables.
+_LIQUID_KEYWORDS = frozenset({
+    "if", "elsif", "else", "endif", "unless", "endunless", "case", "when",
+    "endcase", "for", "endfor", "in", "break", "continue", "assign",
+    "capture", "endcapture", "cycle", "tablerow", "endtablerow", "increment",
+    "decrement", "raw", "endraw", "comment", "endcomment", "include",
+    "render", "with", "and", "or", "not", "contains", "true", "false", "nil",
+    "null", "empty", "blank", "limit", "offset", "reversed", "forloop",
+})
+
+# Keys of a viewer/combinator spec (see lynguine ``view_to_value``) that
+# hold templates, and keys that hold nested views.
+_TEMPLATE_KEYS = ("liquid", "display", "tally")
+_NESTED_KEYS = ("list", "join")
+
+
+def _liquid_expression_names(expr: str) -> set[str]:
+    """Variable names in one Liquid expression, ignoring filters and literals."""
+    expr = _STRING_RE.sub(" ", expr)
+    names: set[str] = set()
+    # The first segment is the value; later segments are ``filter: args``.
+    for i, segment in enumerate(expr.split("|")):
+        if i > 0:
+            _, _, segment = segment.partition(":")
+        for name in _IDENT_RE.findall(segment):
+            if name not in _LIQUID_KEYWORDS:
+                names.add(name)
+    return names
+
+
+def template_variables(text: Any) -> set[str]:
+    """Return the variable names referenced by a template string.
+
+    Understands Liquid output blocks (``{{ name | filter: other }}``),
+    Liquid tags (``{% if name == "x" %}``, ``{% for a in names %}``) and
+    ``str.format`` fields (``{name}``) as used by ``display`` specs.  Loop
+    variables introduced by ``for``/``assign`` are not reported.
+
+    :param text: Template text; non-strings give an empty set.
+    :return: Referenced names.
+    """
+    if not isinstance(text, str):
+        return set()
+    names: set[str] = set()
+    bound: set[str] = set()
+    for expr in _LIQUID_OUTPUT_RE.findall(text):
+        names |= _liquid_expression_names(expr)
+    for tag in _LIQUID_TAG_RE.findall(text):
+        words = tag.split(None, 1)
+        if not words:
+            continue
+        if words[0] in ("for", "assign", "capture") and len(words) > 1:
+            target, _, rest = words[1].partition("in" if words[0] == "for" else "=")
+            bound |= set(_IDENT_RE.findall(target))
+            names |= _liquid_expression_names(rest)
+        else:
+            names |= _liquid_expression_names(tag)
+    stripped = _LIQUID_TAG_RE.sub(" ", _LIQUID_OUTPUT_RE.sub(" ", text))
+    names |= set(_FORMAT_FIELD_RE.findall(stripped))
+    return names - bound
+
+
+def view_references(view: Any) -> set[str] | None:
+    """Return the fields a viewer or combinator spec reads.
+
+    Follows the view keys understood by ``CustomDataFrame.view_to_value``:
+    ``field`` names a field, ``liquid``/``display``/``tally`` hold templates,
+    ``list``/``join`` hold nested views and each ``conditions`` entry
+    (``{present: {field: x}}``, ``{equal: {field: x, value: v}}``) tests a
+    field.  Names defined under ``local`` are constants, not fields.
+
+    :param view: A viewer/combinator spec dict, a list of them, or a plain
+        template string.
+    :return: The referenced names, or ``None`` when the spec computes its
+        value in a way that cannot be read from the configuration (a
+        ``compute`` view, or a template that ``include``s or ``render``s
+        another).
+    """
+    if isinstance(view, str):
+        if _INCLUDE_RE.search(view):
+            return None
+        return template_variables(view)
+    if isinstance(view, list):
+        found: set[str] = set()
+        for item in view:
+            refs = view_references(item)
+            if refs is None:
+                return None
+            found |= refs
+        return found
+    if not isinstance(view, Mapping):
+        return set()
+    if "compute" in view:
+        return None
+
+    found = set()
+    if isinstance(view.get("field"), str):
+        found.add(view["field"])
+    for key in _TEMPLATE_KEYS:
+        if key in view:
+            refs = view_references(view[key])
+            if refs is None:
+                return None
+            found |= refs
+    for key in _NESTED_KEYS:
+        if key in view:
+            refs = view_references(view[key])
+            if refs is None:
+                return None
+            found |= refs
+    found |= _condition_fields(view.get("conditions"))
+    local = view.get("local")
+    if isinstance(local, Mapping):
+        found -= set(local)
+    return found
+
+
+def _condition_fields(conditions: Any) -> set[str]:
+    """Fields tested by the ``conditions`` entries of a view."""
+    if not isinstance(conditions, list):
+        return set()
+    fields: set[str] = set()
+    for condition in conditions:
+        if not isinstance(condition, Mapping):
+            continue
+        for test in condition.values():
+            if isinstance(test, Mapping) and isinstance(test.get("field"), str):
+                fields.add(test["field"])
+    return fields
+
+
+def _as_names(value: Any) -> list[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, (list, tuple)):
+        return [v for v in value if isinstance(v, str)]
+    return []
+
+
+def _compute_entries(interface: Any) -> list[dict]:
+    """``compute``/``precompute``/``postcompute`` entries of *interface*."""
+    entries: list[dict] = []
+    for key in ("compute", "precompute", "postcompute"):
+        if key not in interface:
+            continue
+        section = interface[key]
+        if isinstance(section, Mapping):
+            section = [section]
+        if isinstance(section, list):
+            entries.extend(e for e in section if isinstance(e, Mapping))
+    return entries
+
+
+class DependencyGraph:
+    """Which fields must be refreshed when a field changes.
+
+    :param edges: Map from a field to the fields computed or displayed from it.
+    :param wildcard: Fields that depend on every other field.
+    """
+
+    def __init__(self, edges: Mapping[str, Iterable[str]] | None = None,
+                 wildcard: Iterable[str] = ()) -> None:
+        self._edges: dict[str, set[str]] = defaultdict(set)
+        for source, targets in (edges or {}).items():
+            self._edges[source] |= set(targets)
+        self._wildcard: set[str] = set(wildcard)
+
+    def add(self, source: str, target: str) -> None:
+        """Record that *target* must be refreshed when *source* changes."""
+        if source != target:
+            self._edges[source].add(target)
+
+    def add_all(self, sources: set[str] | None, target: str) -> None:
+        """Record *target* as depending on *sources* (``None``: on everything)."""
+        if sources is None:
+            self._wildcard.add(target)
+            return
+        for source in sources:
+            self.add(source, target)
+
+    def dependents(self, column: str) -> set[str]:
+        """Fields that depend directly on *column*."""
+        return set(self._edges.get(column, ())) | (self._wildcard - {column})
+
+    def affected(self, column: str, suffixes: Iterable[str] = ()) -> set[str]:
+        """Return *column* and every field transitively affected by it.
+
+        :param column: The field that changed.
+        :param suffixes: Timestamp suffixes (e.g. ``"modified"``) whose
+            ``<column>_<suffix>`` fields are written alongside *column*.
+        :return: The affected fields, including *column* itself.
+        """
+        start = [column] + [f"{column}_{suffix}" for suffix in suffixes if suffix]
+        seen: set[str] = set()
+        stack = list(start)
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            stack.extend(self.dependents(node) - seen)
+        return seen
+
+    @classmethod
+    def from_interface(cls, interface: Any, widget_specs: Iterable[dict],
+                       name_map: Mapping[str, str] | None = None) -> "DependencyGraph":
+        """Build the graph for *interface* and its flattened widget specs.
+
+        :param interface: The loaded ``Interface`` (anything supporting
+            ``in`` and ``[]``).
+        :param widget_specs: Flat widget spec list, as from
+            ``WebReviewer.get_widget_specs``.
+        :param name_map: Variable name to column map of the data
+            (``CustomDataFrame._name_column_map``) used to turn template
+            variables into columns.
+        :return: The dependency graph.
+        """
+        name_map = dict(name_map or {})
+
+        def columns(names: set[str] | None) -> set[str] | None:
+            if names is None:
+                return None
+            return {name_map.get(n, n) for n in names}
+
+        graph = cls()
+
+        # A combinator is re-evaluated when one of its inputs changes (see
+        # CombinatorPlan), and then its widget needs refreshing.
+        if "combinator" in interface:
+            for view in interface["combinator"] or []:
+                if isinstance(view, Mapping) and "field" in view:
+                    rest = {k: v for k, v in view.items() if k != "field"}
+                    graph.add_all(columns(view_references(rest)), view["field"])
+
+        for entry in _compute_entries(interface):
+            targets = _as_names(entry.get("field"))
+            if not targets:
+                continue
+            sources: set[str] | None = set()
+            row_args = entry.get("row_args") or {}
+            if isinstance(row_args, Mapping):
+                sources |= {v for v in row_args.values() if isinstance(v, str)}
+            view_args = entry.get("view_args") or {}
+            if isinstance(view_args, Mapping):
+                for view in view_args.values():
+                    refs = view_references(view)
+                    if refs is None:
+                        sources = None
+                        break
+                    sources |= refs
+            for target in targets:
+                graph.add_all(columns(sources), target)
+
+        # Widgets are refreshed by field, so a widget's other inputs become
+        # edges into its field.
+        for spec in widget_specs:
+            field = spec.get("field")
+            if not field:
+                continue
+            condition = spec.get("visible_if")
+            if isinstance(condition, str):
+                graph.add(name_map.get(condition, condition), field)
+            elif isinstance(condition, Mapping) and condition.get("field"):
+                graph.add(name_map.get(condition["field"], condition["field"]), field)
+            args = spec.get("args") or {}
+            for template in (spec.get("liquid"), args.get("liquid") if isinstance(args, Mapping) else None):
+                if isinstance(template, str):
+                    graph.add_all(columns(view_references(template)), field)
+        return graph
+
+
+class CombinatorPlan:
+    """Which ``combinator`` entries must be re-evaluated when fields change.
+
+    Each combinator's inputs are the fields its view reads (see
+    :func:`view_references`).  A combinator whose inputs cannot be read
+    from the configuration is re-evaluated after every change.
+
+    :param combinators: ``(position, field, inputs)`` for each entry, where
+        *position* indexes ``interface["combinator"]`` and *inputs* is a set
+        of columns or ``None`` when unknown.
+    :param name_map: Variable name to column map applied to changed fields.
+    """
+
+    def __init__(self, combinators: Iterable[tuple[int, str, set[str] | None]],
+                 name_map: Mapping[str, str] | None = None) -> None:
+        self._combinators = list(combinators)
+        self._name_map = dict(name_map or {})
+
+    def __len__(self) -> int:
+        return len(self._combinators)
+
+    @classmethod
+    def from_interface(cls, interface: Any,
+                       name_map: Mapping[str, str] | None = None) -> "CombinatorPlan":
+        """Read the inputs of every ``combinator`` entry of *interface*.
+
+        :param interface: The loaded ``Interface``.
+        :param name_map: As for :meth:`DependencyGraph.from_interface`.
+        :return: The plan.
+        """
+        name_map = dict(name_map or {})
+        combinators = []
+        views = interface["combinator"] if "combinator" in interface else None
+        for position, view in enumerate(views or []):
+            if not isinstance(view, Mapping) or "field" not in view:
+                continue
+            refs = view_references({k: v for k, v in view.items() if k != "field"})
+            inputs = None if refs is None else {name_map.get(n, n) for n in refs} | refs
+            combinators.append((position, view["field"], inputs))
+        return cls(combinators, name_map)
+
+    def stale(self, columns: Iterable[str]) -> list[int]:
+        """Return the combinators to re-evaluate after *columns* changed.
+
+        A combinator reading another one's field is included when that one
+        is, whatever their order.
+
+        :param columns: Fields written, timestamps included.
+        :return: Positions in ``interface["combinator"]``, in config order.
+        """
+        changed: set[str] = set()
+        for column in columns:
+            changed |= {column, self._name_map.get(column, column)}
+        due: set[int] = set()
+        grew = True
+        while grew:
+            grew = False
+            for position, field, inputs in self._combinators:
+                if position in due or (inputs is not None and not inputs & changed):
+                    continue
+                due.add(position)
+                changed |= {field, self._name_map.get(field, field)}
+                grew = True
+        return sorted(due)
@@ -0,0 +1,195 @@
+"""Fingerprints of the files a loaded review depends on.
+
+A ``WebReviewer`` is built from more than its ``_referia.yml``: the configs
+it inherits from, external template files (``templates: {name: {file:
+...}}``) and the spreadsheets and directories its data flows read all feed
+into what it shows.  A ``Fingerprint`` records the size and modification
+time of each of those paths when the review is loaded so a server can tell,
+with a handful of ``stat`` calls, whether any of them has changed since.
+
+Paths are grouped: ``"config"`` holds the config chain and template files,
+and each data flow (``input``, ``output``, ``series``, ...) has a group of
+its own, so callers can see which part of a review went stale.  Directories
+read through a ``source``/``glob`` are recorded along with the files that
+matched, since adding or removing a file changes the directory's mtime.
+
+Public API
+----------
+config_files(user_file, directory) -> list[Path]
+    The config, every config it inherits from and their template files.
+
+flow_files(item, directory) -> list[Path]
+    Files and directories read by one data flow description.
+
+Fingerprint.of(groups) -> Fingerprint
+    Stat every path in ``{group: paths}``.
+
+fingerprint.changed() -> set[str]
+    Groups with a path whose size or mtime differs from when it was taken.
+
+fingerprint.refresh(names)
+    Re-stat the paths of the named groups (after writing them ourselves).
+"""
+
+from __future__ import annotations
+
+import glob
+import logging
+import os
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_FILE = "_referia.yml"
+
+# Keys of a flow description that never name files (``store_fields`` maps
+# *column* names such as ``sourceFilename``).
+_SKIP_KEYS = frozenset({"store_fields", "mapping", "columns", "index"})
+
+
+def _resolve(path: str, directory: Path) -> Path:
+    expanded = Path(os.path.expandvars(os.path.expanduser(str(path))))
+    if not expanded.is_absolute():
+        expanded = directory / expanded
+    return Path(os.path.normpath(expanded))
+
+
+def config_files(user_file: str = DEFAULT_CONFIG_FILE, directory: str | Path = ".") -> list[Path]:
+    """Return the config file, its inherit chain and external template files.
+
+    ``inherit: directory:`` is resolved relative to the inheriting config's
+    directory.  A config that cannot be read is still listed (so creating or
+    fixing it is noticed) but its own dependencies are not followed.
+
+    :param user_file: Name of the config file.
+    :param directory: Directory holding it.
+    :return: Paths in load order, without duplicates.
+    """
+    import yaml
+
+    found: list[Path] = []
+    pending = [_resolve(user_file, Path(directory))]
+    while pending:
+        path = pending.pop(0)
+        if path in found:
+            continue
+        found.append(path)
+        try:
+            with open(path, encoding="utf-8") as fh:
+                data = yaml.safe_load(fh)
+        except Exception:
+            log.debug("Cannot read config %s", path, exc_info=True)
+            continue
+        if not isinstance(data, dict):
+            continue
+        templates = data.get("templates")
+        if isinstance(templates, dict):
+            for template in templates.values():
+                if isinstance(template, dict) and template.get("file"):
+                    template_path = _resolve(template["file"], path.parent)
+                    if template_path not in found:
+                        found.append(template_path)
+        inherit = data.get("inherit")
+        if isinstance(inherit, dict) and inherit.get("directory"):
+            parent_dir = _resolve(inherit["directory"], path.parent)
+            pending.append(parent_dir / inherit.get("filename", DEFAULT_CONFIG_FILE))
+    return found
+
+
+def flow_files(item: Any, directory: str | Path = ".") -> list[Path]:
+    """Return the files and directories read by one data flow description.
+
+    Follows ``filename`` (with an optional sibling ``directory``) and
+    ``source`` entries (``directory`` plus ``glob``) through nested
+    descriptions such as ``hstack``/``vstack`` specifications.  Relative
+    paths resolve against *directory*, the review directory data is loaded
+    from.
+
+    :param item: A flow description from the interface.
+    :param directory: Review directory.
+    :return: Paths without duplicates.
+    """
+    base = Path(directory)
+    found: list[Path] = []
+
+    def add(path: Path) -> None:
+        if path not in found:
+            found.append(path)
+
+    def walk(node: Any) -> None:
+        if isinstance(node, list):
+            for entry in node:
+                walk(entry)
+            return
+        if not isinstance(node, Mapping):
+            return
+        filename = node.get("filename")
+        if isinstance(filename, str) and filename:
+            folder = node.get("directory")
+            if isinstance(folder, str) and folder:
+                add(_resolve(os.path.join(os.path.expandvars(folder), filename), base))
+            else:
+                add(_resolve(filename, base))
+        sources = node.get("source")
+        if sources is not None:
+            for source in sources if isinstance(sources, list) else [sources]:
+                if not isinstance(source, Mapping):
+                    continue
+                folder = _resolve(source.get("directory") or ".", base)
+                add(folder)
+                pattern = source.get("glob") or node.get("glob") or "*"
+                for match in sorted(glob.glob(os.path.join(str(folder), pattern))):
+                    add(Path(match))
+        for key, value in node.items():
+            if key not in _SKIP_KEYS and key != "source" and isinstance(value, (list, Mapping)):
+                walk(value)
+
+    walk(item)
+    return found
+
+
+def _signature(path: Path) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class Fingerprint:
+    """Size and modification time of groups of paths at one moment.
+
+    :param signatures: ``{group: {path: (size, mtime_ns) or None}}``;
+        ``None`` records a path that did not exist.
+    """
+
+    def __init__(self, signatures: dict[str, dict[Path, tuple[int, int] | None]]) -> None:
+        self.signatures = signatures
+
+    @classmethod
+    def of(cls, groups: Mapping[str, Iterable[Path]]) -> "Fingerprint":
+        """Stat every path in *groups* now."""
+        return cls({
+            name: {path: _signature(path) for path in paths}
+            for name, paths in groups.items()
+        })
+
+    def paths(self) -> list[Path]:
+        """Every path recorded, in group order."""
+        return [path for group in self.signatures.values() for path in group]
+
+    def changed(self) -> set[str]:
+        """Return the groups with a path that changed, appeared or vanished."""
+        return {
+            name
+            for name, group in self.signatures.items()
+            if any(_signature(path) != signature for path, signature in group.items())
+        }
+
+    def refresh(self, names: Iterable[str]) -> None:
+        """Re-stat the paths of the groups in *names*, e.g. after saving them."""
+        for name in names:
+            group = self.signatures.get(name)
+            if group is not None:
+                self.signatures[name] = {path: _signature(path) for path in group}
@@ -0,0 +1,180 @@
+"""Append-only journal of field edits made through the web interface.
+
+An edit changes a ``WebReviewer`` in memory; it reaches the output files
+only when the reviewer is flushed.  ``EditJournal`` makes each edit durable
+at once by appending one JSON line to a file beside the config
+(``.<config stem>.journal.jsonl``) and syncing it to disk, which costs the
+same however large the output spreadsheets are.
+
+When a reviewer is loaded, edits left in its journal (the server stopped
+before flushing them) are replayed over the freshly read flows.  Once a
+flush has written every edited flow the journal is truncated, so it only
+ever holds edits the output files do not have yet; with autosave that
+compaction happens shortly after editing pauses.
+
+Each line records ``index``, ``subindex``, ``column``, ``value`` and
+``time``.  Timestamps, numpy scalars and missing values are encoded so they
+come back as the same pandas values.  A line cut short by a crash is
+skipped on replay, and cut off the file when the journal is opened so the
+next edit starts a line of its own.
+
+Only cell edits are journalled.  Creating a series row (a new subindex) is
+not, so edits to a row that existed only in memory are not recovered after
+a crash; they are kept once a flush has written the row out.
+
+Public API
+----------
+journal_path(user_file, directory) -> Path
+    Where the journal for a config lives.
+
+EditJournal(path, fsync=True)
+    Journal stored at *path*.
+
+journal.append(index, subindex, column, value)
+    Record one edit.
+
+journal.entries() -> list[dict]
+    Recorded edits, oldest first, with values decoded.
+
+journal.clear()
+    Drop every entry (after the output files have them).
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import logging
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+
+def journal_path(user_file: str, directory: str | Path) -> Path:
+    """Return the journal file for config *user_file* in *directory*."""
+    return Path(directory) / f".{Path(user_file).stem}.journal.jsonl"
+
+
+def _encode(value: Any) -> Any:
+    """Return *value* in a form ``json`` can write and :func:`_decode` restore."""
+    if isinstance(value, (pd.Timestamp, datetime.datetime, np.datetime64)):
+        if pd.isna(value):
+            return None
+        return {"$datetime": pd.Timestamp(value).isoformat()}
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _encode(item) for key, item in value.items()}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict):
+        if set(value) == {"$datetime"}:
+            return pd.Timestamp(value["$datetime"])
+        return {key: _decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    return value
+
+
+class EditJournal:
+    """JSON-lines journal of edits for one config.
+
+    :param path: Journal file; created on the first append.
+    :param fsync: Sync each append to disk (not just to the OS).
+    """
+
+    def __init__(self, path: str | Path, fsync: bool = True) -> None:
+        self.path = Path(path)
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        # Whether the file is known to end with a whole line.
+        self._whole = False
+        with self._lock:
+            self._trim()
+
+    def _trim(self) -> None:
+        """Cut a torn last line off the file (caller holds the lock)."""
+        try:
+            with open(self.path, "rb+") as fh:
+                data = fh.read()
+                end = data.rfind(b"\n") + 1
+                if end < len(data):
+                    log.warning("Dropping a torn last line of %s", self.path)
+                    fh.truncate(end)
+        except FileNotFoundError:
+            pass
+        self._whole = True
+
+    def append(self, index: Any, subindex: Any, column: str, value: Any) -> None:
+        """Record that *column* of record *index* (*subindex*) was set to *value*."""
+        line = json.dumps({
+            "index": _encode(index),
+            "subindex": _encode(subindex),
+            "column": column,
+            "value": _encode(value),
+            "time": datetime.datetime.now().isoformat(timespec="seconds"),
+        })
+        with self._lock:
+            if not self._whole:
+                self._trim()
+            # Until the line is safely written it may be left torn.
+            self._whole = False
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(line + "\n")
+                fh.flush()
+                if self.fsync:
+                    os.fsync(fh.fileno())
+            self._whole = True
+
+    def entries(self) -> list[dict]:
+        """Return the recorded edits, oldest first, skipping damaged lines."""
+        with self._lock:
+            try:
+                with open(self.path, encoding="utf-8") as fh:
+                    lines = fh.readlines()
+            except FileNotFoundError:
+                return []
+        entries = []
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                raw = json.loads(line)
+            except ValueError:
+                log.warning("Skipping damaged line %d of %s", number, self.path)
+                continue
+            entries.append({key: _decode(value) for key, value in raw.items()})
+        return entries
+
+    def __len__(self) -> int:
+        return len(self.entries())
+
+    def clear(self) -> None:
+        """Drop every entry.
+
+        The file is truncated rather than removed so the directory (which a
+        data flow may read through a glob) does not change each time.
+        """
+        with self._lock:
+            try:
+                if os.path.getsize(self.path):
+                    open(self.path, "w").close()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,141 @@
+"""Column dtypes for the fields a web review writes, resolved once per load.
+
+Writing one cell of a loaded flow is cheap while the value fits the
+column's dtype.  When it does not (a timestamp into the all-missing
+``float64`` column a fresh output file reads as, a comment into a numeric
+column) pandas refuses the write, and the column must be recast first,
+which copies every row.  Doing that on each edit makes edits slower the
+larger the sheet.
+
+``ColumnSchema`` works out, from the review widgets, what each written
+column holds: ``_modified``/``_created`` timestamps hold datetimes, and
+checkbox and text-like widgets hold Python objects (``object``, not the
+nullable ``boolean``, whose missing value cannot be compared with an
+edit).  The reviewer casts the mutable flows to it once when they are
+loaded, so an edit is a single cell assignment.  Numeric widgets are left
+to the dtype the column was read with, which already fits them.
+
+Public API
+----------
+widget_dtype(spec) -> str | None
+    The dtype a review widget's column should have, or ``None`` to keep
+    the one it was read with.
+
+ColumnSchema.from_interface(interface, review_specs)
+    Dtypes of every review field and its timestamp columns.
+
+schema.dtype(column) -> str | None
+    The dtype for *column*, or ``None`` when the schema does not cover it.
+
+schema.apply(data) -> list[str]
+    Cast the columns of *data*'s mutable flows that do not fit, and keep
+    the schema on *data* so its own type updates leave those columns be.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Iterable, Mapping
+
+from pandas.api.types import is_datetime64_any_dtype, is_object_dtype
+
+log = logging.getLogger(__name__)
+
+TIMESTAMP_DTYPE = "datetime64[ns]"
+
+# Widgets whose value is a bool, a string or a list of strings; anything
+# else keeps the dtype it was read with.
+_OBJECT_WIDGETS = frozenset({
+    "Checkbox", "Flag", "ToggleButton", "Text", "Textarea", "Combobox",
+    "Dropdown", "Select", "SelectMultiple", "RadioButtons", "ToggleButtons",
+    "DatePicker",
+})
+
+# Flows edits write to (see ``CustomDataFrame.types``).
+_MUTABLE_FLOWS = ("output", "writedata", "series", "writeseries")
+
+
+def widget_dtype(spec: Mapping[str, Any]) -> str | None:
+    """Return the dtype the column of review widget *spec* should have."""
+    return "object" if spec.get("type") in _OBJECT_WIDGETS else None
+
+
+def _fits(dtype: Any, target: str) -> bool:
+    """Whether a column of *dtype* takes values meant for *target* as is."""
+    if is_object_dtype(dtype):
+        return True
+    if target == TIMESTAMP_DTYPE:
+        return is_datetime64_any_dtype(dtype)
+    return False
+
+
+class ColumnSchema:
+    """Dtypes of the columns a review writes.
+
+    :param dtypes: Column to dtype name (as ``DataFrame.astype`` takes it).
+    """
+
+    def __init__(self, dtypes: Mapping[str, str] | None = None) -> None:
+        self._dtypes = dict(dtypes or {})
+
+    def __len__(self) -> int:
+        return len(self._dtypes)
+
+    @classmethod
+    def from_interface(cls, interface: Any,
+                       review_specs: Iterable[Mapping[str, Any]]) -> "ColumnSchema":
+        """Work out the dtypes of every field *review_specs* write.
+
+        :param interface: The loaded ``Interface`` (for the timestamp
+            suffixes).
+        :param review_specs: Flat review widget specs.
+        :return: The schema.
+        """
+        suffixes = [
+            interface[key] for key in ("modified_suffix", "created_suffix")
+            if key in interface and interface[key]
+        ]
+        dtypes: dict[str, str] = {}
+        for spec in review_specs:
+            field = spec.get("field")
+            if not field or spec.get("type") == "PopulateButton":
+                continue
+            dtype = widget_dtype(spec)
+            if dtype is not None:
+                dtypes.setdefault(field, dtype)
+            for suffix in suffixes:
+                dtypes.setdefault(f"{field}_{suffix}", TIMESTAMP_DTYPE)
+        return cls(dtypes)
+
+    def dtype(self, column: str) -> str | None:
+        """Return the dtype for *column*, or ``None`` when not covered."""
+        return self._dtypes.get(column)
+
+    def apply(self, data: Any) -> list[str]:
+        """Cast the columns of *data*'s mutable flows that do not fit.
+
+        A column whose values cannot be converted (text in a timestamp
+        column) is left as it is; a write that does not fit it is handled
+        when it happens.  The schema is kept as ``data._column_schema``, so
+        ``CustomDataFrame._update_type`` does not recast the columns it
+        covers on a write.
+
+        :param data: A loaded ``CustomDataFrame``.
+        :return: The columns cast.
+        """
+        data._column_schema = self
+        cast: list[str] = []
+        flows = getattr(data, "_d", {})
+        for key in _MUTABLE_FLOWS:
+            df = flows.get(key)
+            columns = getattr(df, "columns", ())
+            for column, dtype in self._dtypes.items():
+                if column not in columns or _fits(df[column].dtype, dtype):
+                    continue
+                try:
+                    df[column] = df[column].astype(dtype)
+                except (TypeError, ValueError) as exc:
+                    log.debug("Keeping %r of %s as %s: %s", column, key, df[column].dtype, exc)
+                    continue
+                cast.append(column)
+        return cast
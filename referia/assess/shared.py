@@ -0,0 +1,292 @@
+"""Edit log and row versions shared by the worker processes of one server.
+
+A ``WebReviewer`` keeps the review data in process memory.  When
+``referia serve`` runs several worker processes each holds its own copy, so
+an edit made through one worker must reach the others before they answer a
+request or write the output files.  ``SharedState`` coordinates them through
+a SQLite database beside the config (``.<config stem>.shared.db``):
+
+``edits``
+    Every cell written through any worker, in commit order (``seq``).  A
+    worker applies the entries after the last one it has seen before each
+    request (``WebReviewer.sync``), so its frame never lags another worker's
+    commit.  Entries are deleted once a flush has written them to the output
+    files; ``meta.flushed`` records the last ``seq`` written.  A worker that
+    finds the files ahead of what it has applied re-reads its output flows.
+
+``rows``
+    A version number per record, bumped by each commit to it.  The browser
+    sends the version its panel was rendered at with each field update;
+    :meth:`SharedState.check` rejects the update with :class:`EditConflict`
+    when another commit since then changed the same field.  Edits to
+    different fields of a record do not conflict.
+
+``fields``
+    The record version at which each field was last committed, which the
+    check reads.  It is kept when a flush drops the log entries, so a
+    field's history is not lost with them.
+
+Commits, the conflict check and flushes run in ``BEGIN IMMEDIATE``
+transactions, so they are serialised across processes; reads see a
+consistent snapshot (the database is in WAL mode).  The log is synced to
+disk at each commit, so it also takes the place of the edit journal (see
+``referia.assess.journal``) for crash recovery.
+
+Public API
+----------
+shared_path(user_file, directory) -> Path
+    Where the database for a config lives.
+
+SharedState(path, timeout=30.0)
+    Open (creating if needed) the database at *path*.
+
+with state.transaction():
+    Hold the database write lock for the enclosed calls.
+
+state.version(index) -> int
+    Current version of record *index* (``0`` if never edited).
+
+state.check(index, field, expected)
+    Raise :class:`EditConflict` if *field* of *index* changed after version
+    *expected*.
+
+state.record(index, subindex, field, cells) -> int
+    Log the cells one edit of *field* wrote; returns the last ``seq``.
+
+state.record_batch(index, subindex, cells) -> int
+    Log ``(field, column, value)`` cells of several edited fields as one
+    commit.
+
+state.changes_since(seq) -> (list[dict], int)
+    Entries after *seq*, oldest first, and ``meta.flushed``.
+
+state.mark_flushed(seq)
+    Record that the output files hold every edit through *seq*.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from referia.assess.journal import _decode, _encode
+
+
+def shared_path(user_file: str, directory: str | Path) -> Path:
+    """Return the shared-state database for config *user_file* in *directory*."""
+    return Path(directory) / f".{Path(user_file).stem}.shared.db"
+
+
+class EditConflict(Exception):
+    """Raised when a field was changed by another worker since the browser read it.
+
+    :param index: Record edited.
+    :param field: Field edited.
+    :param expected: Version the browser's panel was rendered at.
+    :param current: Current version of the record.
+    """
+
+    def __init__(self, index: Any, field: str, expected: int, current: int) -> None:
+        super().__init__(
+            f"{field!r} of record {index!r} changed since version {expected} (now {current})"
+        )
+        self.index = index
+        self.field = field
+        self.expected = expected
+        self.current = current
+
+
+def _key(value: Any) -> str:
+    return json.dumps(_encode(value))
+
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS rows (row TEXT PRIMARY KEY, version INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS edits ("
+    " seq INTEGER PRIMARY KEY AUTOINCREMENT, row TEXT NOT NULL, version INTEGER NOT NULL,"
+    " subindex TEXT, field TEXT, col TEXT NOT NULL, value TEXT)",
+    "CREATE INDEX IF NOT EXISTS edits_row ON edits (row, version)",
+    "CREATE TABLE IF NOT EXISTS fields ("
+    " row TEXT NOT NULL, field TEXT NOT NULL, version INTEGER NOT NULL,"
+    " PRIMARY KEY (row, field))",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO meta VALUES ('flushed', 0)",
+)
+
+
+class SharedState:
+    """SQLite-backed edit log and row versions for one config.
+
+    One instance per reviewer; calls from different threads are serialised.
+
+    :param path: Database file; created with its tables on first use.
+    :param timeout: Seconds to wait for another process's write lock.
+    """
+
+    def __init__(self, path: str | Path, timeout: float = 30.0) -> None:
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._depth = 0
+        # Transactions are issued explicitly (isolation_level=None).
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        with self.transaction():
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+
+    @contextmanager
+    def transaction(self) -> Iterator["SharedState"]:
+        """Hold the database write lock for the enclosed calls.
+
+        Nested uses join the outermost transaction, which commits on a normal
+        exit and rolls back if the block raises.
+        """
+        with self._lock:
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield self
+                finally:
+                    self._depth -= 1
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._depth = 1
+            try:
+                yield self
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._conn.execute("COMMIT")
+            finally:
+                self._depth = 0
+
+    @contextmanager
+    def _snapshot(self) -> Iterator[sqlite3.Connection]:
+        # A read transaction, so several queries see the same state.
+        with self._lock:
+            if self._depth:
+                yield self._conn
+                return
+            self._conn.execute("BEGIN")
+            try:
+                yield self._conn
+            finally:
+                self._conn.execute("COMMIT")
+
+    def version(self, index: Any) -> int:
+        """Return the version of record *index* (``0`` if never edited)."""
+        with self._snapshot() as conn:
+            row = conn.execute("SELECT version FROM rows WHERE row=?", (_key(index),)).fetchone()
+        return row[0] if row else 0
+
+    def flushed(self) -> int:
+        """Return the last ``seq`` the output files are known to hold."""
+        with self._snapshot() as conn:
+            return conn.execute("SELECT value FROM meta WHERE key='flushed'").fetchone()[0]
+
+    def check(self, index: Any, field: str, expected: int) -> None:
+        """Raise :class:`EditConflict` if *field* of *index* changed after *expected*.
+
+        Reads the version at which *field* was last committed, so commits to
+        other fields of the record never conflict, whether or not their log
+        entries have been flushed.
+        """
+        key = _key(index)
+        with self._snapshot() as conn:
+            changed = conn.execute(
+                "SELECT version FROM fields WHERE row=? AND field=?", (key, field)
+            ).fetchone()
+            if changed is None or changed[0] <= expected:
+                return
+            current = conn.execute("SELECT version FROM rows WHERE row=?", (key,)).fetchone()[0]
+        raise EditConflict(index, field, expected, current)
+
+    def record(self, index: Any, subindex: Any, field: str,
+               cells: Iterable[tuple[str, Any]]) -> int:
+        """Log the *cells* an edit of *field* wrote and bump the record's version.
+
+        :return: ``seq`` of the last entry written.
+        """
+        return self.record_batch(index, subindex, ((field, column, value) for column, value in cells))
+
+    def record_batch(self, index: Any, subindex: Any,
+                     cells: Iterable[tuple[str | None, str, Any]]) -> int:
+        """Log the cells an edit of several fields wrote, as one commit.
+
+        :param cells: ``(field, column, value)`` triples, *field* being the
+            edited field the cell belongs to (``None`` for cells derived from
+            all of them, which :meth:`check` never counts as a conflict).
+        :return: ``seq`` of the last entry written.
+        """
+        key = _key(index)
+        with self.transaction():
+            conn = self._conn
+            conn.execute(
+                "INSERT INTO rows VALUES (?, 1) ON CONFLICT (row) DO UPDATE SET version=version+1",
+                (key,),
+            )
+            version = conn.execute("SELECT version FROM rows WHERE row=?", (key,)).fetchone()[0]
+            seq = 0
+            fields = set()
+            for field, column, value in cells:
+                seq = conn.execute(
+                    "INSERT INTO edits (row, version, subindex, field, col, value)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, version, _key(subindex), field, column, json.dumps(_encode(value))),
+                ).lastrowid
+                if field is not None:
+                    fields.add(field)
+            conn.executemany(
+                "INSERT INTO fields VALUES (?, ?, ?)"
+                " ON CONFLICT (row, field) DO UPDATE SET version=excluded.version",
+                [(key, field, version) for field in sorted(fields)],
+            )
+        return seq
+
+    def changes_since(self, seq: int) -> tuple[list[dict], int]:
+        """Return the entries after *seq*, oldest first, and the flushed ``seq``.
+
+        Each entry has ``seq``, ``index``, ``subindex``, ``column`` and
+        ``value``, decoded as the journal does.
+        """
+        with self._snapshot() as conn:
+            rows = conn.execute(
+                "SELECT seq, row, subindex, col, value FROM edits WHERE seq>? ORDER BY seq",
+                (seq,),
+            ).fetchall()
+            flushed = conn.execute("SELECT value FROM meta WHERE key='flushed'").fetchone()[0]
+        entries = [
+            {
+                "seq": number,
+                "index": _decode(json.loads(row)),
+                "subindex": _decode(json.loads(subindex)) if subindex is not None else None,
+                "column": column,
+                "value": _decode(json.loads(value)) if value is not None else None,
+            }
+            for number, row, subindex, column, value in rows
+        ]
+        return entries, flushed
+
+    def mark_flushed(self, seq: int) -> None:
+        """Record that the output files hold every edit through *seq*.
+
+        Those entries are dropped from the log; row and field versions are
+        kept.
+        """
+        with self.transaction():
+            self._conn.execute("DELETE FROM edits WHERE seq<=?", (seq,))
+            self._conn.execute(
+                "UPDATE meta SET value=MAX(value, ?) WHERE key='flushed'", (seq,)
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
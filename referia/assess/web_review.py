@@ -6,51 +6,133 @@ the data/logic layer consumed by the FastAPI routes in ``referia.web.app``.
 
 Public API
 ----------
-WebReviewer(user_file, directory)
-    Construct from a ``_referia.yml`` configuration file.
+WebReviewer(user_file, directory, journal=True, shared=False)
+    Construct from a ``_referia.yml`` configuration file, replaying edits
+    left in its journal (see ``referia.assess.journal``).  With *shared*,
+    edits are committed to the state shared by every worker process
+    serving the config instead (see ``referia.assess.shared``).
 
 web_reviewer.index_list() -> list
     All valid record indices.
 
+web_reviewer.index_catalog() -> IndexCatalog
+    Those indices with O(1) position lookup, neighbours and search, built
+    once per load.
+
 web_reviewer.get_index() -> object
     The currently active record index.
 
 web_reviewer.set_index(index)
     Switch to a different record.
 
+with web_reviewer.preview(index) as focused:
+    Read *index* as ``set_index`` would show it, without running compute
+    hooks; ``focused`` is ``False`` when that is not possible.
+
+with web_reviewer.session(session_id, parent_id=None):
+    Run calls against one browser session's cursor (index, subindex,
+    selector) instead of the shared one.
+
+web_reviewer.panel_version() -> tuple | None
+    Key that changes whenever the rendered panel for the current record
+    would (used by ``referia.web.panel_cache``).
+
 web_reviewer.get_value(column) -> object
     Current data value for *column* in the active record.
 
-web_reviewer.set_value(column, value)
+web_reviewer.set_value(column, value, expected_version=None)
     Update *column* for the active record and trigger on-change logic
-    (timestamps, combinators).
+    (timestamps, combinators); the cells written are appended to the
+    journal.  When shared, raises ``EditConflict`` if another worker
+    changed *column* since *expected_version*.
+
+web_reviewer.set_values(values, expected_version=None) -> list[str]
+    Update several columns at once with a single on-change pass; returns
+    the columns refused as conflicting when shared.
+
+web_reviewer.row_version() -> int | None
+    Shared version of the active record (``None`` when not shared).
+
+web_reviewer.sync() -> int
+    Apply edits other worker processes committed; run on entering a
+    session.  Returns the number of cells written.
 
 web_reviewer.save_flows()
     Persist data to output files.
 
-web_reviewer.load_flows(reload=False)
-    Reload data from source files.
+web_reviewer.flush() -> list[str]
+    Write only the output flows holding unsaved edits, each replaced
+    atomically; returns the flows written.
+
+web_reviewer.dirty -> bool
+    Whether there are edits not yet saved.
+
+web_reviewer.close()
+    Refuse further edits (raising ``ReviewerClosed``): the reviewer was
+    saved and dropped, and a request still holding it must not write.
+
+web_reviewer.dirty_cells() -> dict
+    The unsaved ``(index, column)`` cells of each output flow.
+
+web_reviewer.memory_usage() -> int
+    Estimated bytes held by the loaded data.
+
+web_reviewer.load_flows(reload=False, changed_only=False)
+    Reload data from source files (only the changed flows with
+    *changed_only*).
+
+web_reviewer.stale_dependencies() -> set[str]
+    Which of the files the review was loaded from (``"config"`` for the
+    config chain and templates, else the data flow name) have changed on
+    disk since; see ``referia.assess.fingerprint``.
 
 web_reviewer.get_widget_specs() -> list[dict]
     Flat, ordered list of widget spec dicts derived from ``interface["review"]``
     and ``interface["viewer"]``.
 
+web_reviewer.find_spec(field) / web_reviewer.find_populate_spec(target)
+    Widget spec (or PopulateButton spec) for a field, from an index built
+    once per interface load.
+
 web_reviewer.affected_widgets(column) -> set[str]
-    Column names whose displayed values may change after *column* is updated.
-    The current implementation returns all field-bearing widget columns so the
-    web layer simply re-renders the whole form; a dependency-tracking
-    optimisation is deferred to a follow-on CIP.
+    Column names whose displayed values may change after *column* is updated,
+    from the interface's static dependency graph.
+
+web_reviewer.dependency_graph() -> DependencyGraph
+    That graph, built on first use and rebuilt after a reload.
+
+web_reviewer.combinator_plan() -> CombinatorPlan
+    The fields each combinator reads, so an edit re-evaluates only the
+    combinators that depend on it; built like the graph.
+
+web_reviewer.combinator_stats() -> dict
+    Combinator evaluations run and skipped by edits so far.
+
+web_reviewer.column_schema() -> ColumnSchema
+    The dtypes of the columns edits write, which the mutable flows are
+    cast to once per load so an edit is a single cell assignment.
 """
 
 from __future__ import annotations
 
+import itertools
 import logging
-from typing import Any
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator
 
 import pandas as pd
 
 from lynguine import log as _lynguine_log
 
+from referia.assess.dependencies import CombinatorPlan, DependencyGraph
+from referia.assess.fingerprint import Fingerprint, config_files, flow_files
+from referia.assess.journal import EditJournal, journal_path
+from referia.assess.schema import ColumnSchema
+from referia.assess.shared import EditConflict, SharedState, shared_path
+from referia.exceptions import ReviewerClosed
+from referia.util.files import working_directory
+
 log = logging.getLogger(__name__)
 
 # Widget types that contain nested entries rather than being rendered directly.
@@ -65,6 +147,144 @@ _NON_FIELD_TYPES = frozenset(
 )
 
 
+# Browser sessions remembered per reviewer; the least recently used cursor is
+# dropped beyond this.  A dropped session simply starts again from the shared
+# cursor on its next request.
+MAX_SESSIONS = 256
+
+# Row snapshots kept by get_row_data(); enough for the records the open
+# sessions are looking at.
+ROW_CACHE_SIZE = 64
+
+# Source of WebReviewer data generations (see WebReviewer._generation).
+_GENERATIONS = itertools.count(1)
+
+
+class ReviewCursor:
+    """Position of one browser session in the shared data.
+
+    A cursor is the three attributes of ``CustomDataFrame`` that say which
+    record is in focus.  Swapping cursors in and out is a few attribute
+    writes; the loaded data itself is shared by every session.
+
+    :param index: Active record index.
+    :param subindex: Active row of the write series, if any.
+    :param selector: Column that selects the sub-series, if any.
+    :param generation: :attr:`WebReviewer._generation` the cursor was last
+        used with, so a cursor that outlived a reload can be re-validated.
+    """
+
+    __slots__ = ("index", "subindex", "selector", "generation")
+
+    def __init__(self, index: Any = None, subindex: Any = None,
+                 selector: Any = None, generation: int = 0) -> None:
+        self.index = index
+        self.subindex = subindex
+        self.selector = selector
+        self.generation = generation
+
+    def copy(self) -> "ReviewCursor":
+        """Return an independent copy of this cursor."""
+        return ReviewCursor(self.index, self.subindex, self.selector, self.generation)
+
+
+class SpecRegistry:
+    """Flattened widget specs of one interface, indexed for lookup.
+
+    Built once per interface load by :meth:`WebReviewer.spec_registry` so
+    request handlers do not re-walk the ``viewer``/``review`` config or scan
+    the flat list for each field they touch.  The lists are shared; callers
+    must not modify them.
+
+    :param viewer: Flat viewer widget specs.
+    :param review: Flat review widget specs.
+    """
+
+    __slots__ = ("viewer", "review", "widgets", "by_field", "populate_by_target")
+
+    def __init__(self, viewer: list[dict], review: list[dict]) -> None:
+        from referia.web.render import _populate_button_target
+
+        self.viewer = viewer
+        self.review = review
+        self.widgets = viewer + review
+        # First spec wins for both maps, matching the linear scans they replace.
+        self.by_field: dict[str, dict] = {}
+        self.populate_by_target: dict[str, dict] = {}
+        for spec in self.widgets:
+            if spec.get("type") == "PopulateButton":
+                # PopulateButtons share ``field`` with their target widget.
+                self.populate_by_target.setdefault(_populate_button_target(spec), spec)
+            elif spec.get("field"):
+                self.by_field.setdefault(spec["field"], spec)
+
+
+class IndexCatalog:
+    """Record indices of one data load with position lookup and search.
+
+    Built once per load by :meth:`WebReviewer.index_catalog` so navigation
+    does not copy the index or scan it to find the current record.
+
+    :param indices: Record indices in data order.
+    """
+
+    __slots__ = ("indices", "positions", "_keys")
+
+    def __init__(self, indices: Iterable[Any]) -> None:
+        self.indices = list(indices)
+        # First occurrence wins, matching ``list.index``.
+        self.positions: dict[Any, int] = {}
+        for position, index in enumerate(self.indices):
+            self.positions.setdefault(index, position)
+        self._keys = [str(index).casefold() for index in self.indices]
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def position(self, index: Any) -> int | None:
+        """Return the 0-based position of *index*, or ``None`` if absent."""
+        try:
+            return self.positions.get(index)
+        except TypeError:
+            return None
+
+    def neighbour(self, index: Any, step: int) -> Any:
+        """Return the index *step* records from *index*, clamped to the ends.
+
+        An unknown *index* counts as the first record.
+        """
+        if not self.indices:
+            return None
+        position = self.position(index) or 0
+        position = min(max(position + step, 0), len(self.indices) - 1)
+        return self.indices[position]
+
+    def search(self, query: str = "", offset: int = 0, limit: int = 50) -> tuple[list, int]:
+        """Return one page of indices matching *query* and the match count.
+
+        Matching is case-insensitive; indices starting with *query* come
+        before those merely containing it, each group in data order.  An
+        empty query matches every index.
+
+        :param query: Text to look for.
+        :param offset: Number of matches to skip.
+        :param limit: Maximum number of matches returned.
+        :return: ``(page, total)``.
+        """
+        needle = (query or "").strip().casefold()
+        if not needle:
+            return self.indices[offset:offset + limit], len(self.indices)
+        prefix: list[int] = []
+        inner: list[int] = []
+        for position, key in enumerate(self._keys):
+            if key.startswith(needle):
+                prefix.append(position)
+            elif needle in key:
+                inner.append(position)
+        matches = prefix + inner
+        return [self.indices[p] for p in matches[offset:offset + limit]], len(matches)
+
+
 class WebReviewer:
     """Stateful, widget-free review session for the web backend.
 
@@ -77,6 +297,14 @@ class WebReviewer:
         ``referia.web.path_safety.safe_path_under_root`` first; this class
         does not re-check path traversal.
     :type directory: str
+    :param journal: Record each edit in ``.<config stem>.journal.jsonl``
+        beside the config and replay what a previous run left there,
+        defaults to ``True``.
+    :type journal: bool
+    :param shared: Commit edits to ``.<config stem>.shared.db`` beside the
+        config, which every worker process serving it reads before each
+        request; replaces the journal.  Defaults to ``False``.
+    :type shared: bool
 
     Example::
 
@@ -87,28 +315,73 @@ class WebReviewer:
         reviewer.save_flows()
     """
 
-    def __init__(self, user_file: str = "_referia.yml", directory: str = ".") -> None:
-        import os
+    # Built lazily by spec_registry() / dependency_graph(); reset when the
+    # data is reloaded.
+    _spec_registry: SpecRegistry | None = None
+    _dependency_graph: DependencyGraph | None = None
+    _combinator_plan: CombinatorPlan | None = None
+    _column_schema: ColumnSchema | None = None
+    # Combinator evaluations run and avoided by edits (combinator_stats()).
+    _combinators_evaluated: int = 0
+    _combinators_skipped: int = 0
+    _index_catalog: IndexCatalog | None = None
+    # Row snapshots for get_row_data(), dropped on every write to the row.
+    _row_cache: "OrderedDict[tuple, dict] | None" = None
+    # Per-record write counters for panel_version().
+    _row_versions: dict | None = None
+    _data_generation: int = 0
+    # Set by writes, cleared by save_flows()/flush()/load_flows().
+    _dirty: bool = False
+    # flow -> {(index, column)} written since the last save; the ``None``
+    # flow holds writes that could not be placed (populate computes).
+    _dirty_cells: dict | None = None
+    _user_file: str = "_referia.yml"
+    # Sizes and mtimes of the files the review was loaded from.
+    _fingerprint: Fingerprint | None = None
+    # Edits not yet in the output files, on disk; cleared with _dirty.
+    _journal: EditJournal | None = None
+    # Set by close(), once the reviewer has been saved and dropped.
+    _closed: bool = False
+    # Edit log and row versions shared with other worker processes, the last
+    # log entry applied here and the last flush seen.
+    _shared: SharedState | None = None
+    _shared_seq: int = 0
+    _shared_flushed: int = 0
+
+    def __init__(self, user_file: str = "_referia.yml", directory: str = ".",
+                 journal: bool = True, shared: bool = False) -> None:
         from pathlib import Path
         from referia.config.interface import Interface
         from referia.assess.data import CustomDataFrame
 
         self._directory = str(Path(directory).resolve())
+        self._user_file = user_file
         self._interface = Interface.from_file(user_file, self._directory)
+        if shared:
+            # Opened first: the database's files appear in the directory.
+            self._shared = SharedState(shared_path(user_file, self._directory))
+            self._shared_seq = self._shared_flushed = self._shared.flushed()
+        # Taken before reading so a file written during the load shows up
+        # as stale rather than being missed.
+        self._take_fingerprint()
 
         # Data loading resolves file paths relative to CWD, so temporarily
         # switch to the review directory for the duration of the load.
-        _orig = os.getcwd()
-        try:
-            os.chdir(self._directory)
+        with working_directory(self._directory):
             self._data = CustomDataFrame.from_flow(self._interface)
-        finally:
-            os.chdir(_orig)
+        self._data_generation = next(_GENERATIONS)
+        self._apply_schema()
 
         indices = list(self._data.index)
         if indices:
             self._data.set_index(indices[0])
 
+        if shared:
+            self.sync()
+        elif journal:
+            self._journal = EditJournal(journal_path(user_file, self._directory))
+            self._replay_journal()
+
     # ------------------------------------------------------------------
     # Index management
     # ------------------------------------------------------------------
@@ -117,13 +390,181 @@ class WebReviewer:
         """Return all valid record indices as a plain list."""
         return list(self._data.index)
 
+    def index_catalog(self) -> IndexCatalog:
+        """Return the record indices indexed for navigation and search.
+
+        Built on first use and rebuilt after :meth:`load_flows`.
+        """
+        if self._index_catalog is None:
+            self._index_catalog = IndexCatalog(self._data.index)
+        return self._index_catalog
+
     def get_index(self) -> Any:
         """Return the currently active record index."""
         return self._data.get_index()
 
     def set_index(self, index: Any) -> None:
         """Switch the active record to *index*."""
-        self._data.set_index(index)
+        previous = self._data.get_index()
+        try:
+            self._data.set_index(index)
+        finally:
+            if index != previous:
+                # Post-compute hooks write the record being left, pre-compute
+                # hooks the one being entered; without hooks nothing changed.
+                written = []
+                if getattr(self._data, "_postcompute", None):
+                    written.append(previous)
+                if getattr(self._data, "_precompute", None):
+                    written.append(index)
+                if written:
+                    self._invalidate_rows(*written)
+
+    @contextmanager
+    def preview(self, index: Any) -> Iterator[bool]:
+        """Focus *index* for reading only, as :meth:`set_index` would show it.
+
+        Used to render a record before anyone moves to it.  No compute hook
+        runs and nothing is written, so the block is told ``False`` (and the
+        cursor stays put) when entering *index* would change what is shown:
+        the config has pre-compute hooks, or the record has no series row
+        yet.  The cursor is restored on exit.
+
+        :param index: Record to focus.
+        :return: Whether *index* is in focus inside the block.
+        """
+        data = self._data
+        if (
+            getattr(data, "_precompute", None)
+            or self.index_catalog().position(index) is None
+        ):
+            yield False
+            return
+        cursor = self._read_cursor()
+        data._index = index
+        try:
+            series = getattr(data, "types", {}).get("series", ())
+            if any(typ in series for typ in getattr(data, "_d", {})):
+                if not len(data.get_subseries()):
+                    yield False
+                    return
+                data.check_or_set_subseries()
+            yield True
+        finally:
+            self._write_cursor(cursor)
+
+    # ------------------------------------------------------------------
+    # Browser sessions
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def session(self, session_id: str | None, parent_id: str | None = None) -> Iterator["WebReviewer"]:
+        """Run the enclosed calls against the cursor of *session_id*.
+
+        Every browser shares the one loaded ``CustomDataFrame``; what differs
+        between them is which record is in focus.  On entry the session's
+        cursor is written into the data frame and on exit it is read back, so
+        :meth:`set_index` inside the block moves only this session and the
+        pre/post-compute hooks run only for the records this session visits.
+
+        A session seen for the first time starts as a copy of *parent_id*'s
+        cursor when that session exists (a new browser tab inherits the
+        record its window was on), otherwise as a copy of the shared cursor.
+        ``session_id=None`` leaves the shared cursor in place.
+
+        Not thread-safe: callers must serialise use of a reviewer (the web
+        layer does this with a per-reviewer lock).
+
+        Edits committed by other worker processes are applied first
+        (:meth:`sync`).
+
+        :param session_id: Opaque session key, e.g. from a cookie.
+        :param parent_id: Session to copy the initial cursor from.
+        """
+        if session_id is None:
+            self.sync()
+            yield self
+            return
+
+        data = self._data
+        shared = self._read_cursor()
+        cursor = self._session_cursor(session_id, parent_id, shared)
+        self._write_cursor(cursor)
+        try:
+            self.sync()
+            if cursor.generation != self._generation:
+                self._revalidate_cursor()
+            yield self
+        finally:
+            # A reload inside the block replaces self._data; the new frame
+            # already has this session's record set and nothing to restore.
+            new_cursor = self._read_cursor()
+            cursor.index, cursor.subindex, cursor.selector = (
+                new_cursor.index, new_cursor.subindex, new_cursor.selector
+            )
+            cursor.generation = self._generation
+            if self._data is data:
+                self._write_cursor(shared)
+
+    def _sessions(self) -> "OrderedDict[str, ReviewCursor]":
+        sessions = self.__dict__.get("_session_cursors")
+        if sessions is None:
+            sessions = self.__dict__["_session_cursors"] = OrderedDict()
+        return sessions
+
+    @property
+    def _generation(self) -> int:
+        """Identifies the loaded data; changes each time it is (re)loaded.
+
+        Drawn from a process-wide counter so that two reviewers (say, before
+        and after a config edit in root mode) never share a generation.
+        """
+        return self._data_generation
+
+    def _session_cursor(self, session_id: str, parent_id: str | None,
+                        shared: ReviewCursor) -> ReviewCursor:
+        sessions = self._sessions()
+        cursor = sessions.get(session_id)
+        if cursor is None:
+            parent = sessions.get(parent_id) if parent_id is not None else None
+            cursor = (parent or shared).copy()
+            sessions[session_id] = cursor
+            while len(sessions) > MAX_SESSIONS:
+                sessions.popitem(last=False)
+        else:
+            sessions.move_to_end(session_id)
+        return cursor
+
+    def _read_cursor(self) -> ReviewCursor:
+        # Raw attributes, not get_index(): the getters can fall back to (and
+        # set) a default, and set_index() runs compute hooks.  Moving a
+        # cursor in or out must do neither.
+        data = self._data
+        return ReviewCursor(
+            getattr(data, "_index", None),
+            getattr(data, "_subindex", None),
+            getattr(data, "_selector", None),
+            self._generation,
+        )
+
+    def _write_cursor(self, cursor: ReviewCursor) -> None:
+        data = self._data
+        data._index = cursor.index
+        data._subindex = cursor.subindex
+        data._selector = cursor.selector
+
+    def _revalidate_cursor(self) -> None:
+        """Bring a cursor from before the last reload in line with the new data."""
+        index = self._data._index
+        if index is not None and index in self._data.index:
+            self._data.check_or_set_subseries()
+            self._invalidate_rows(index)
+            return
+        # The record is gone: fall back to the first one, as load_flows does.
+        self._write_cursor(ReviewCursor())
+        indices = list(self._data.index)
+        if indices:
+            self.set_index(indices[0])
 
     # ------------------------------------------------------------------
     # Value access
@@ -171,39 +612,322 @@ class WebReviewer:
         renderer) can look up any column—including those used in
         ``visible_if`` conditions that have no corresponding widget.
 
-        Values are read with :meth:`get_value` rather than ``to_pandas()``.
-        ``to_pandas()`` joins every flow into one frame and raises when
-        allocation and scores share column names, which would blank Liquid
-        substitutions (``{{q1Question}}`` and similar constants).
-        ``get_value`` is the same path Jupyter Liquid uses, including
-        parameter columns from ``global_consts``.
+        The row is materialised in one pass over the data's flows (see
+        :meth:`_row_snapshot`) and cached until the next write to the row,
+        so repeated renders of an unchanged record cost one dict copy.
+        ``to_pandas()`` is deliberately not used: it joins every flow into
+        one frame and raises when allocation and scores share column names,
+        which would blank Liquid substitutions (``{{q1Question}}`` and
+        similar constants).
+
+        :return: A fresh dict the caller may modify.
+        """
+        key = (
+            self._generation,
+            self._data.get_index(),
+            getattr(self._data, "_subindex", None),
+            getattr(self._data, "_selector", None),
+        )
+        cache = self._row_cache
+        if cache is None:
+            cache = self._row_cache = OrderedDict()
+        row = cache.get(key)
+        if row is None:
+            row = self._row_snapshot()
+            if row is None:
+                return {}
+            cache[key] = row
+            while len(cache) > ROW_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return dict(row)
+
+    def _row_snapshot(self) -> dict | None:
+        """Resolve every column of the current record in a single pass.
+
+        Walks the data's flows in storage order and takes each column from
+        the first flow holding both the record and the column, the same
+        precedence as ``CustomDataFrame.at``.  Each flow's row is fetched
+        once with ``.loc`` rather than once per column.  Parameter flows
+        (``global_consts``) contribute by name.  Series columns, and any
+        column a flow layout does not allow to be read in bulk, fall back to
+        :meth:`get_value`.  NaN-like values become ``None`` in one
+        vectorised ``isna`` pass, matching :meth:`get_value`.
+
+        :return: The row, or ``None`` if the column list cannot be read.
         """
         try:
             columns = list(self._data.columns)
         except Exception:
-            return {}
+            return None
+
+        values: dict = {}
+        try:
+            values = self._bulk_row_values(columns)
+        except Exception as exc:
+            log.debug("Bulk row read failed, reading per column: %s", exc)
+            values = {}
 
-        result: dict = {}
         for col in columns:
-            try:
-                result[col] = self.get_value(col)
-            except Exception:
-                result[col] = None
-        return result
+            if col not in values:
+                try:
+                    values[col] = self._data_value(col)
+                except Exception:
+                    values[col] = None
+
+        if not values:
+            return {}
+        ordered = pd.Series([values[c] for c in columns], dtype=object)
+        ordered[ordered.isna()] = None
+        return dict(zip(columns, ordered.tolist()))
+
+    def _bulk_row_values(self, columns: list) -> dict:
+        data = self._data
+        index = data.get_index()
+        flows = getattr(data, "_d", None)
+        types = getattr(data, "types", None)
+        if index is None or not isinstance(flows, dict) or not isinstance(types, dict):
+            return {}
+
+        series_types = set(types.get("series", ()))
+        parameter_types = set(types.get("parameters", ()))
+        pending = set(columns)
+        values: dict = {}
+        index_name = getattr(data.index, "name", None)
+        if index_name in pending:
+            values[index_name] = index
+            pending.discard(index_name)
+
+        for typ, frame in flows.items():
+            if not pending:
+                break
+            if typ in series_types:
+                # Needs the selector/subindex filter; leave to get_value.
+                pending -= set(getattr(frame, "columns", ()))
+                continue
+            if isinstance(frame, pd.DataFrame):
+                if index not in frame.index:
+                    continue
+                hits = [c for c in frame.columns if c in pending]
+                if not hits:
+                    continue
+                row = frame.loc[index, hits]
+                if isinstance(row, pd.DataFrame):
+                    # Duplicate index labels: let get_value decide.
+                    pending -= set(hits)
+                    continue
+                values.update(zip(hits, row.tolist()))
+                pending -= set(hits)
+            elif isinstance(frame, pd.Series) and typ in parameter_types:
+                hits = [c for c in frame.index if c in pending]
+                values.update(zip(hits, frame[hits].tolist()))
+                pending -= set(hits)
+        return values
+
+    def _data_value(self, column: str) -> Any:
+        self._data.set_column(column)
+        return self._data.get_value()
+
+    def _invalidate_rows(self, *indices: Any) -> None:
+        """Record a write to *indices* (all rows when none given).
 
-    def set_value(self, column: str, value: Any) -> None:
+        Drops their cached row snapshots and bumps their
+        :meth:`panel_version`.
+        """
+        if not indices:
+            if self._row_cache:
+                self._row_cache.clear()
+            self._row_versions = None
+            return
+        versions = self._row_versions
+        if versions is None:
+            versions = self._row_versions = {}
+        for index in indices:
+            if index is not None:
+                versions[index] = versions.get(index, 0) + 1
+        cache = self._row_cache
+        if cache:
+            for key in [k for k in cache if k[1] in indices]:
+                del cache[key]
+
+    def panel_version(self) -> tuple | None:
+        """Return a key that changes whenever the current panel would.
+
+        Combines the data generation, the record and sub-record in focus and
+        the record's write counter.  ``None`` when no record is in focus.
+        """
+        index = self._data.get_index()
+        if index is None:
+            return None
+        versions = self._row_versions or {}
+        return (
+            self._generation,
+            index,
+            getattr(self._data, "_subindex", None),
+            getattr(self._data, "_selector", None),
+            versions.get(index, 0),
+        )
+
+    def set_value(self, column: str, value: Any, expected_version: int | None = None) -> None:
         """Update *column* for the active record and run on-change logic.
 
         If the new value is identical to the stored value the call is a no-op.
 
+        When the reviewer is shared, the edit is committed under the shared
+        write lock after applying other workers' edits, and the cells
+        written are logged for them.
+
         :param column: Name of the data column.
         :param value: New value to store.
+        :param expected_version: :meth:`row_version` the caller's view of
+            the record was taken at; ignored unless shared.
+        :raises EditConflict: *column* was changed by another commit since
+            *expected_version*.
+        :raises ReviewerClosed: The reviewer was closed.
         """
-        self._data.set_column(column)
-        old_value = self._data.get_value()
-        if value != old_value:
-            self._data.set_value(value)
-            self._value_updated(column)
+        self._check_open()
+        if self._shared is None:
+            written = self._write_value(column, value)
+            if written and self._journal is not None:
+                index = self._data.get_index()
+                subindex = getattr(self._data, "_subindex", None)
+                for name, cell in written:
+                    self._journal.append(index, subindex, name, cell)
+            return
+
+        with self._shared.transaction():
+            self.sync()
+            index = self._data.get_index()
+            if expected_version is not None:
+                self._shared.check(index, column, expected_version)
+            written = self._write_value(column, value)
+            if written:
+                subindex = getattr(self._data, "_subindex", None)
+                self._shared_seq = self._shared.record(index, subindex, column, written)
+
+    def set_values(self, values: dict[str, Any], expected_version: int | None = None) -> list[str]:
+        """Update several columns of the active record with one on-change pass.
+
+        Like calling :meth:`set_value` for each item, but the timestamps of
+        each changed column are written once and the combinators evaluated
+        once for the whole batch.  Unchanged values are skipped.
+
+        When the reviewer is shared the batch is one commit.  Columns another
+        commit changed since *expected_version* are left alone and returned
+        instead of raising :class:`EditConflict`.
+
+        :param values: New value for each column.
+        :param expected_version: As for :meth:`set_value`.
+        :return: Columns refused as conflicting (always empty unless shared).
+        :raises ReviewerClosed: The reviewer was closed.
+        """
+        self._check_open()
+        if self._shared is None:
+            written = self._write_values(values)
+            if written and self._journal is not None:
+                index = self._data.get_index()
+                subindex = getattr(self._data, "_subindex", None)
+                for _, name, cell in written:
+                    self._journal.append(index, subindex, name, cell)
+            return []
+
+        conflicts: list[str] = []
+        with self._shared.transaction():
+            self.sync()
+            index = self._data.get_index()
+            if expected_version is not None:
+                for column in values:
+                    try:
+                        self._shared.check(index, column, expected_version)
+                    except EditConflict:
+                        conflicts.append(column)
+            written = self._write_values(
+                {column: value for column, value in values.items() if column not in conflicts}
+            )
+            if written:
+                subindex = getattr(self._data, "_subindex", None)
+                self._shared_seq = self._shared.record_batch(index, subindex, written)
+        return conflicts
+
+    def _write_value(self, column: str, value: Any) -> list[tuple[str, Any]]:
+        """Store *value* and run on-change logic; return the cells written."""
+        return [(name, cell) for _, name, cell in self._write_values({column: value})]
+
+    def _write_values(self, values: dict[str, Any]) -> list[tuple[str | None, str, Any]]:
+        """Store *values* and run on-change logic once.
+
+        :return: ``(field, column, value)`` for each cell written, *field*
+            being the edited column the cell belongs to (``None`` for
+            combinators, which belong to no one edit).
+        """
+        index = self._data.get_index()
+        changed: list[str] = []
+        try:
+            for column, value in values.items():
+                self._data.set_column(column)
+                if value == self._data.get_value():
+                    continue
+                changed.append(column)
+                self._set_cell(column, value)
+            if not changed:
+                return []
+            self._dirty = True
+            written = [(column, column, values[column]) for column in changed]
+            written.extend(self._value_updated(changed))
+            self._mark_dirty(index, [name for _, name, _ in written])
+        finally:
+            if changed:
+                self._invalidate_rows(index)
+        return written
+
+    def row_version(self) -> int | None:
+        """Return the shared version of the active record.
+
+        The version goes up with every commit to the record by any worker.
+        ``None`` when the reviewer is not shared or no record is in focus.
+        """
+        index = self._data.get_index()
+        if self._shared is None or index is None:
+            return None
+        return self._shared.version(index)
+
+    def sync(self) -> int:
+        """Apply the edits other worker processes committed since the last sync.
+
+        Entries are written straight into the data, as journal replay does,
+        and drop the cached rows they touch.  When another worker has
+        flushed edits this one never applied (they are no longer in the
+        log), the output flows are re-read first.  Does nothing unless the
+        reviewer is shared.
+
+        :return: Number of cells written.
+        """
+        if self._shared is None:
+            return 0
+        entries, flushed = self._shared.changes_since(self._shared_seq)
+        if flushed > self._shared_seq:
+            from referia.assess.data import CustomDataFrame
+
+            outputs = [key for key in CustomDataFrame.types["output"] if key in self._data._d]
+            if not self._reload_changed_flows(self._data.get_index(), flows=outputs):
+                # Syncs again from what the files hold.
+                self.load_flows(reload=True)
+                return 0
+            self._shared_seq = flushed
+        elif flushed != self._shared_flushed:
+            # Another worker wrote the outputs, holding nothing we lack.
+            if flushed == self._shared_seq and not entries:
+                self._clean()
+            self._refresh_output_fingerprint()
+        self._shared_flushed = flushed
+        if not entries:
+            return 0
+        applied, skipped = self._apply_entries(entries)
+        self._shared_seq = entries[-1]["seq"]
+        log.debug("Applied %d shared edit(s) for %s (%d skipped)",
+                  applied, self._directory, skipped)
+        return applied
 
     # ------------------------------------------------------------------
     # Persistence
@@ -214,47 +938,357 @@ class WebReviewer:
 
         File paths in the interface may be relative; chdir to the review
         directory so they resolve to the same location used by ``from_flow``.
+        When shared, other workers' edits are applied first, as in
+        :meth:`flush`.
         """
-        import os
+        if self._shared is not None:
+            with self._shared.transaction():
+                self.sync()
+                self._save_all_flows()
+                self._shared.mark_flushed(self._shared_seq)
+                self._shared_flushed = self._shared_seq
+            return
+        self._save_all_flows()
+
+    def _save_all_flows(self) -> None:
+        with working_directory(self._directory):
+            self._data.save_flows()
+            self._clean()
+        if self._fingerprint is not None:
+            # Our own writes are not outside changes.
+            from referia.assess.data import CustomDataFrame
+            self._fingerprint.refresh(CustomDataFrame.types["output"])
+
+    def flush(self) -> list[str]:
+        """Write the output flows that hold unsaved edits.
+
+        Unlike :meth:`save_flows` only flows with dirty cells are written,
+        each through ``CustomDataFrame.save_flow`` (temporary file, then
+        rename), which updates just those cells of an Excel workbook.  If a
+        write fails the flows not yet written stay dirty.
+
+        When shared, this runs under the shared write lock after applying
+        every other worker's edits, so the files receive all committed
+        edits; the log entries written are then dropped.
+
+        :return: Names of the flows written.
+        """
+        if self._shared is None:
+            return self._write_dirty_flows()
+        with self._shared.transaction():
+            self.sync()
+            written = self._write_dirty_flows()
+            self._shared.mark_flushed(self._shared_seq)
+            self._shared_flushed = self._shared_seq
+        return written
+
+    def _write_dirty_flows(self) -> list[str]:
+        """Write each output flow holding dirty cells; the body of :meth:`flush`."""
+        from referia.assess.data import CustomDataFrame
 
-        _orig = os.getcwd()
+        if not self._dirty:
+            return []
+        outputs = [key for key in CustomDataFrame.types["output"] if key in self._data._d]
+        cells = self._dirty_cells if self._dirty_cells is not None else {None: set()}
+        if None in cells:
+            # Writes we could not place: every output flow may have changed.
+            unplaced = cells.pop(None)
+            for key in outputs:
+                cells.setdefault(key, set()).update(unplaced)
+        self._dirty_cells = cells
+
+        written: list[str] = []
         try:
-            os.chdir(self._directory)
-            self._data.save_flows()
+            with working_directory(self._directory):
+                for key in outputs:
+                    if key in cells:
+                        self._data.save_flow(key, cells=cells[key])
+                        del cells[key]
+                        written.append(key)
         finally:
-            os.chdir(_orig)
+            if self._fingerprint is not None:
+                self._fingerprint.refresh(written)
+        # Cells outside the output flows (e.g. a cache) are not persisted.
+        self._clean()
+        return written
+
+    def dirty_cells(self) -> dict:
+        """Return ``{flow: {(index, column), ...}}`` for unsaved edits.
+
+        The ``None`` key holds writes whose flow is unknown.
+        """
+        return {flow: set(cells) for flow, cells in (self._dirty_cells or {}).items()}
+
+    def _clean(self) -> None:
+        """Forget unsaved edits: they were written, or discarded by a reload."""
+        self._dirty = False
+        self._dirty_cells = None
+        if self._journal is not None:
+            self._journal.clear()
+
+    def _replay_journal(self) -> None:
+        """Re-apply edits a previous run journalled but never wrote out.
+
+        Entries are written straight into the data (no timestamps, combinators
+        or compute hooks: the journal already holds the cells those wrote) and
+        leave the reviewer dirty so the next flush compacts them into the
+        output files.  Entries for records that no longer exist are skipped.
+        """
+        entries = self._journal.entries()
+        if not entries:
+            return
+        applied, skipped = self._apply_entries(entries)
+        log.info("Replayed %d journalled edit(s) for %s (%d skipped)",
+                 applied, self._directory, skipped)
+
+    def _apply_entries(self, entries: list[dict]) -> tuple[int, int]:
+        """Write journal or shared-log *entries* straight into the data.
 
-    def load_flows(self, reload: bool = False) -> None:
+        :return: ``(applied, skipped)`` counts.
+        """
+        cursor = self._read_cursor()
+        applied = skipped = 0
+        touched = set()
+        try:
+            for entry in entries:
+                index = entry.get("index")
+                if index not in self._data.index:
+                    skipped += 1
+                    continue
+                self._write_cursor(ReviewCursor(index, entry.get("subindex"), cursor.selector))
+                try:
+                    self._set_cell(entry["column"], entry.get("value"))
+                except Exception:
+                    log.warning("Could not apply logged edit of %r for %r",
+                                entry.get("column"), index, exc_info=True)
+                    skipped += 1
+                    continue
+                self._mark_dirty(index, [entry["column"]])
+                touched.add(index)
+                applied += 1
+        finally:
+            self._write_cursor(cursor)
+        if applied:
+            self._dirty = True
+            self._invalidate_rows(*touched)
+        return applied, skipped
+
+    def _mark_dirty(self, index: Any, columns: Iterable[str]) -> None:
+        """Record that *columns* of record *index* were written."""
+        if self._dirty_cells is None:
+            self._dirty_cells = {}
+        colspecs = getattr(self._data, "_colspecs", None)
+        if not isinstance(colspecs, dict):
+            colspecs = {}
+        name_map = getattr(self._data, "_name_column_map", None)
+        if not isinstance(name_map, dict):
+            name_map = {}
+        for column in columns:
+            actual = name_map.get(column, column) if column is not None else None
+            flow = next((key for key, cols in colspecs.items() if actual in cols), None)
+            self._dirty_cells.setdefault(flow, set()).add((index, actual))
+
+    def dependency_files(self) -> dict[str, list]:
+        """Return the files the review is loaded from, grouped.
+
+        ``"config"`` holds the config, the configs it inherits from and
+        external template files; every data flow in the interface has a
+        group named after it with the files and glob directories it reads.
+        """
+        from referia.assess.data import CustomDataFrame
+
+        groups = {"config": config_files(self._user_file, self._directory)}
+        flow_keys = {key for keys in CustomDataFrame.types.values() for key in keys}
+        for key, item in self._interface.items():
+            if key in flow_keys:
+                groups[key] = flow_files(item, self._directory)
+        return groups
+
+    def stale_dependencies(self) -> set[str]:
+        """Return the dependency groups changed on disk since loading.
+
+        Costs one ``stat`` per file in :meth:`dependency_files`.  Empty when
+        nothing changed or the files could not be determined.
+        """
+        if self._fingerprint is None:
+            return set()
+        changed = self._fingerprint.changed()
+        if changed and self._shared is not None and self._shared.flushed() != self._shared_flushed:
+            # Another worker wrote the outputs; sync() brings them in.
+            from referia.assess.data import CustomDataFrame
+            changed -= set(CustomDataFrame.types["output"])
+        return changed
+
+    def _refresh_output_fingerprint(self) -> None:
+        if self._fingerprint is not None:
+            from referia.assess.data import CustomDataFrame
+            self._fingerprint.refresh(CustomDataFrame.types["output"])
+
+    def _take_fingerprint(self) -> None:
+        try:
+            self._fingerprint = Fingerprint.of(self.dependency_files())
+        except Exception:
+            log.warning("Could not determine the files %s depends on", self._directory, exc_info=True)
+            self._fingerprint = None
+
+    @property
+    def dirty(self) -> bool:
+        """True when edits have been made since the last save or load."""
+        return self._dirty
+
+    @property
+    def closed(self) -> bool:
+        """True once :meth:`close` has been called."""
+        return self._closed
+
+    def close(self) -> None:
+        """Refuse further edits.
+
+        Called, under the reviewer's worker lock, once it has been saved and
+        dropped from a cache.  A request that picked it up earlier may still
+        call it; its edits would otherwise land in an object nobody saves
+        and in a journal its successor truncates.
+        """
+        self._closed = True
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise ReviewerClosed("The reviewer was closed; the review was reloaded")
+
+    def memory_usage(self) -> int:
+        """Estimate the bytes held by the loaded data flows.
+
+        Sums ``memory_usage(deep=True)`` over every flow of the data frame;
+        compute state and caches are not counted.
+
+        :return: Estimated size in bytes (``0`` if it cannot be measured).
+        """
+        total = 0
+        for flow in getattr(self._data, "_d", {}).values():
+            try:
+                usage = flow.memory_usage(deep=True)
+                total += int(usage.sum() if hasattr(usage, "sum") else usage)
+            except Exception:
+                continue
+        return total
+
+    def load_flows(self, reload: bool = False, changed_only: bool = False) -> None:
         """Reload data from the configured source files.
 
         Re-creates ``self._data`` from the interface configuration, preserving
         the current index when *reload* is True.
 
+        With *changed_only*, only the flows whose files changed on disk since
+        they were read (see :meth:`stale_dependencies`) are re-read, in place,
+        with ``CustomDataFrame.reload_flows``; output flows are re-read too
+        while there are unsaved edits, which a reload discards.  It falls back
+        to a full reload when the configuration itself changed or the changed
+        flows cannot be re-read on their own.
+
         :param reload: If True, attempt to restore the active index after
             reloading.  Defaults to False.
         :type reload: bool
+        :param changed_only: If True, re-read only changed flows.
+        :type changed_only: bool
         """
-        import os
         from referia.assess.data import CustomDataFrame
 
         current_index = self._data.get_index() if reload else None
-        _orig = os.getcwd()
-        try:
-            os.chdir(self._directory)
+        # What the output files are known to hold before they are read.
+        flushed = self._shared.flushed() if self._shared is not None else 0
+        if changed_only and self._reload_changed_flows(current_index):
+            self._resync(flushed)
+            return
+        self._take_fingerprint()
+        with working_directory(self._directory):
             self._data = CustomDataFrame.from_flow(self._interface)
-        finally:
-            os.chdir(_orig)
+        self._data_generation = next(_GENERATIONS)
+        self._clean()
+        self._spec_registry = None
+        self._dependency_graph = None
+        self._combinator_plan = None
+        self._column_schema = None
+        self._index_catalog = None
+        self._invalidate_rows()
+        self._apply_schema()
 
         indices = list(self._data.index)
         if current_index is not None and current_index in indices:
             self._data.set_index(current_index)
         elif indices:
             self._data.set_index(indices[0])
+        self._resync(flushed)
+
+    def _resync(self, flushed: int) -> None:
+        """Re-apply the shared edits after *flushed* to freshly read data.
+
+        Edits still in memory are applied again, which leaves the same
+        values.
+        """
+        if self._shared is None:
+            return
+        self._shared_seq = self._shared_flushed = flushed
+        self.sync()
+
+    def _reload_changed_flows(self, current_index: Any, flows: Iterable[str] | None = None) -> bool:
+        """Re-read changed flows (or *flows*) in place; False if a full reload is needed."""
+        from referia.assess.data import CustomDataFrame
+
+        if self._fingerprint is None or not hasattr(self._data, "reload_flows"):
+            return False
+        if flows is None:
+            flows = self.stale_dependencies()
+            if "config" in flows:
+                return False
+            if self._dirty:
+                flows |= set(CustomDataFrame.types["output"]) & set(self._data._d)
+        flows = set(flows)
+        if not flows:
+            return True
+
+        # Keep interface order so inputs are read before what depends on them.
+        flows = [key for key in self._fingerprint.signatures if key in flows]
+        self._fingerprint.refresh(flows)
+        try:
+            with working_directory(self._directory):
+                self._data.reload_flows(flows)
+        except Exception:
+            log.warning("Re-reading %s failed; reloading everything",
+                        ", ".join(flows), exc_info=True)
+            return False
+        log.info("Re-read %s for %s", ", ".join(flows), self._directory)
+
+        self._data_generation = next(_GENERATIONS)
+        # Unsaved edits live only in output flows, which were re-read.
+        self._clean()
+        self._index_catalog = None
+        self._invalidate_rows()
+        self._apply_schema()
+
+        indices = self._data.index
+        if current_index is not None and current_index in indices:
+            self._data.set_index(current_index)
+        elif len(indices):
+            self._data.set_index(indices[0])
+        return True
 
     # ------------------------------------------------------------------
     # Widget spec extraction
     # ------------------------------------------------------------------
 
+    def spec_registry(self) -> SpecRegistry:
+        """Return the indexed widget specs, building them on first use.
+
+        Rebuilt after :meth:`load_flows`.
+        """
+        if self._spec_registry is None:
+            viewer: list[dict] = []
+            review: list[dict] = []
+            self._flatten_entries(self._viewer_raw(), viewer)
+            self._flatten_entries(self._review_raw(), review)
+            self._spec_registry = SpecRegistry(viewer, review)
+        return self._spec_registry
+
     def get_widget_specs(self) -> list[dict]:
         """Return a flat ordered list of widget spec dicts.
 
@@ -265,28 +1299,29 @@ class WebReviewer:
 
         :return: Ordered list of widget spec dicts (viewer first, then review).
         """
-        specs: list[dict] = []
-        self._flatten_entries(self._viewer_raw(), specs)
-        self._flatten_entries(self._review_raw(), specs)
-        return specs
+        return self.spec_registry().widgets
 
     def get_viewer_specs(self) -> list[dict]:
         """Return widget specs from the ``viewer`` section only.
 
         :return: Flat ordered list of viewer widget spec dicts.
         """
-        specs: list[dict] = []
-        self._flatten_entries(self._viewer_raw(), specs)
-        return specs
+        return self.spec_registry().viewer
 
     def get_review_specs(self) -> list[dict]:
         """Return widget specs from the ``review`` section only.
 
         :return: Flat ordered list of review widget spec dicts.
         """
-        specs: list[dict] = []
-        self._flatten_entries(self._review_raw(), specs)
-        return specs
+        return self.spec_registry().review
+
+    def find_spec(self, field: str) -> dict | None:
+        """Return the first non-PopulateButton widget spec for *field*."""
+        return self.spec_registry().by_field.get(field)
+
+    def find_populate_spec(self, target: str) -> dict | None:
+        """Return the PopulateButton spec whose target field is *target*."""
+        return self.spec_registry().populate_by_target.get(target)
 
     def render_viewer_html(self, viewer_spec: dict) -> str:
         """Evaluate *viewer_spec* against the current record and return HTML.
@@ -338,19 +1373,73 @@ class WebReviewer:
     def affected_widgets(self, column: str) -> set[str]:
         """Return column names that may need refreshing after *column* changes.
 
-        The current implementation conservatively returns **all** field-bearing
-        widget columns so the web layer re-renders the complete form.  A
-        finer-grained dependency graph is deferred to a follow-on CIP.
+        Follows the static dependency graph of the interface (see
+        ``referia.assess.dependencies``): *column* itself, its
+        ``_modified``/``_created`` timestamps, combinators and computes that
+        read it, and widgets whose ``visible_if`` or Liquid text refers to
+        any of those.
 
         :param column: The column that was just updated.
-        :return: Set of column names to refresh.
+        :return: Set of widget columns to refresh.
         """
+        suffixes = []
+        for key in ("modified_suffix", "created_suffix"):
+            try:
+                suffixes.append(self._interface[key])
+            except (KeyError, TypeError):
+                pass
+        affected = self.dependency_graph().affected(column, suffixes)
         return {
             spec["field"]
             for spec in self.get_widget_specs()
-            if "field" in spec
+            if spec.get("field") in affected
         }
 
+    def combinator_plan(self) -> CombinatorPlan:
+        """Return the inputs of each combinator, read on first use.
+
+        Rebuilt after :meth:`load_flows`, as :meth:`dependency_graph` is.
+        """
+        if self._combinator_plan is None:
+            name_map = getattr(self._data, "_name_column_map", None)
+            self._combinator_plan = CombinatorPlan.from_interface(
+                self._interface, name_map if isinstance(name_map, dict) else None
+            )
+        return self._combinator_plan
+
+    def combinator_stats(self) -> dict:
+        """Return how many combinator evaluations edits ran and how many they skipped."""
+        return {
+            "evaluated": self._combinators_evaluated,
+            "skipped": self._combinators_skipped,
+        }
+
+    def column_schema(self) -> ColumnSchema:
+        """Return the dtypes of the columns edits write, worked out on first use.
+
+        Rebuilt after :meth:`load_flows`, as :meth:`dependency_graph` is.
+        """
+        if self._column_schema is None:
+            self._column_schema = ColumnSchema.from_interface(
+                self._interface, self.get_review_specs()
+            )
+        return self._column_schema
+
+    def dependency_graph(self) -> DependencyGraph:
+        """Return the field dependency graph, building it on first use.
+
+        The graph is rebuilt after :meth:`load_flows` because reloading can
+        change the variable-name to column mapping.
+        """
+        if self._dependency_graph is None:
+            name_map = getattr(self._data, "_name_column_map", None)
+            self._dependency_graph = DependencyGraph.from_interface(
+                self._interface,
+                self.get_widget_specs(),
+                name_map if isinstance(name_map, dict) else None,
+            )
+        return self._dependency_graph
+
     # ------------------------------------------------------------------
     # Internal on-change logic (mirrors Reviewer.value_updated without widgets)
     # ------------------------------------------------------------------
@@ -369,34 +1458,115 @@ class WebReviewer:
 
         :param compute_interface: Dict of the form ``{"compute": <spec>}`` as
             constructed from the PopulateButton's ``args.compute`` entry.
+        :raises ReviewerClosed: The reviewer was closed.
         """
-        import os
-
-        _orig = os.getcwd()
+        self._check_open()
         try:
-            os.chdir(self._directory)
-            self._data._compute.run(self._data, compute_interface)
+            with working_directory(self._directory):
+                self._data._compute.run(self._data, compute_interface)
         finally:
-            os.chdir(_orig)
-
-    def _value_updated(self, column: str) -> None:
-        """Run on-change side-effects for *column* without touching widgets.
+            # A compute that fails part-way may still have written values,
+            # to columns we cannot tell.
+            self._dirty = True
+            self._mark_dirty(self._data.get_index(), [None])
+            self._invalidate_rows(self._data.get_index())
+        self._journal_compute_fields(compute_interface.get("compute"))
+
+    def _journal_compute_fields(self, compute: Any) -> None:
+        """Journal (or, when shared, commit) the declared ``field`` targets of a populate compute.
+
+        Other columns a compute function writes cannot be known here; they
+        reach the output files with the next flush.  The compute itself runs
+        outside the shared write lock; its cells are committed after it, on
+        top of whatever other workers committed meanwhile.
+        """
+        if self._journal is None and self._shared is None:
+            return
+        fields: list[str] = []
+        for spec in compute if isinstance(compute, list) else [compute]:
+            if not isinstance(spec, dict):
+                continue
+            field = spec.get("field")
+            fields.extend(field if isinstance(field, list) else [field] if field else [])
+        index = self._data.get_index()
+        subindex = getattr(self._data, "_subindex", None)
+        cells = []
+        for field in fields:
+            try:
+                cells.append((field, self._data_value(field)))
+            except Exception:
+                log.debug("Could not read computed field %r to journal it", field, exc_info=True)
+        if self._shared is None:
+            for field, value in cells:
+                self._journal.append(index, subindex, field, value)
+            return
+        if not cells:
+            return
+        with self._shared.transaction():
+            self.sync()
+            # sync() may have written older values over the computed ones.
+            self._apply_entries([
+                {"index": index, "subindex": subindex, "column": field, "value": value}
+                for field, value in cells
+            ])
+            self._shared_seq = self._shared.record(index, subindex, cells[0][0], cells)
+
+    def _value_updated(self, columns: list[str]) -> list[tuple[str | None, str, Any]]:
+        """Run on-change side-effects for *columns* without touching widgets.
 
         Replicates the non-widget parts of ``Reviewer.value_updated()``:
 
-        1. Updates the ``<column>_modified`` timestamp.
-        2. Sets the ``<column>_created`` timestamp when absent.
-        3. Re-evaluates any combinator fields defined in the interface.
+        1. Updates each column's ``<column>_modified`` timestamp.
+        2. Sets each column's ``<column>_created`` timestamp when absent.
+        3. Re-evaluates the combinator fields that read any of *columns* or
+           their timestamps, once for all of *columns*.
+
+        :return: ``(field, column, value)`` for each cell written, as
+            :meth:`_write_values` returns them.
         """
         today_val = pd.to_datetime("today")
+        written: list[tuple[str | None, str, Any]] = []
+        for column in columns:
+            written.extend((column, name, value) for name, value in self._stamp(column, today_val))
+        changed = list(columns) + [name for _, name, _ in written]
+        written.extend((None, name, value) for name, value in self._update_combinators(changed))
+        return written
+
+    def _apply_schema(self) -> None:
+        """Cast the freshly loaded mutable flows to :meth:`column_schema`."""
+        try:
+            cast = self.column_schema().apply(self._data)
+        except Exception as exc:
+            log.warning("Could not resolve column types for %s: %s", self._directory, exc)
+            return
+        if cast:
+            log.debug("Cast %d column(s) on load: %s", len(cast), ", ".join(cast))
+
+    def _set_cell(self, column: str, value: Any) -> None:
+        """Write *value* to *column* of the active record.
+
+        The columns edits write were cast when the flows loaded (see
+        :meth:`column_schema`), so this is one cell assignment.  A value the
+        column's dtype refuses has the column widened to ``object`` once and
+        is written again.
+        """
+        self._data.set_column(column)
+        try:
+            self._data.set_value(value)
+        except TypeError:
+            self._data.set_dtype(column, "object")
+            self._data.set_value(value)
+
+    def _stamp(self, column: str, today_val: Any) -> list[tuple[str, Any]]:
+        """Write the modified (and, when absent, created) timestamp of *column*."""
+        written: list[tuple[str, Any]] = []
 
         # Modified timestamp
         modified_suffix: str = self._interface["modified_suffix"]
         modified_field = f"{column}_{modified_suffix}"
         try:
-            self._data.set_dtype(modified_field, "datetime64[ns]")
-            self._data.set_column(modified_field)
-            self._data.set_value(today_val)
+            self._set_cell(modified_field, today_val)
+            written.append((modified_field, today_val))
         except Exception as exc:
             log.debug("Could not set modified field %r: %s", modified_field, exc)
 
@@ -404,25 +1574,38 @@ class WebReviewer:
         created_suffix: str = self._interface["created_suffix"]
         created_field = f"{column}_{created_suffix}"
         try:
-            self._data.set_dtype(created_field, "datetime64[ns]")
             created_col_val = self._data.get_value_column(created_field)
             current_created = self._data.at[self._data.get_index(), created_col_val] if created_col_val in self._data.columns else None
             if current_created is None or pd.isna(current_created):
-                self._data.set_column(created_field)
-                self._data.set_value(today_val)
+                self._set_cell(created_field, today_val)
+                written.append((created_field, today_val))
         except Exception as exc:
             log.debug("Could not set created field %r: %s", created_field, exc)
+        return written
 
-        # Combinators
-        if "combinator" in self._interface:
-            for view in self._interface["combinator"]:
-                if "field" not in view:
-                    continue
-                col = view["field"]
-                combinator_view = {k: v for k, v in view.items() if k != "field"}
-                try:
-                    combinator_val = self._data.viewer_to_value(combinator_view)
-                    self._data.set_column(col)
-                    self._data.set_value(combinator_val)
-                except Exception as exc:
-                    log.debug("Could not update combinator %r: %s", col, exc)
+    def _update_combinators(self, changed: list[str]) -> list[tuple[str, Any]]:
+        """Re-evaluate the combinator fields that read any of *changed*.
+
+        Which combinators read which fields is worked out once per load
+        (see :meth:`combinator_plan`); the others keep their value and are
+        counted as skipped in :meth:`combinator_stats`.
+        """
+        written: list[tuple[str, Any]] = []
+        if "combinator" not in self._interface:
+            return written
+        views = self._interface["combinator"]
+        plan = self.combinator_plan()
+        due = plan.stale(changed)
+        self._combinators_skipped += len(plan) - len(due)
+        for position in due:
+            view = views[position]
+            col = view["field"]
+            combinator_view = {k: v for k, v in view.items() if k != "field"}
+            self._combinators_evaluated += 1
+            try:
+                combinator_val = self._data.viewer_to_value(combinator_view)
+                self._set_cell(col, combinator_val)
+                written.append((col, combinator_val))
+            except Exception as exc:
+                log.debug("Could not update combinator %r: %s", col, exc)
+        return written
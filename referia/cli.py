@@ -4,10 +4,19 @@ Usage::
 
     # Single-config mode (original):
     poetry run referia serve [--config _referia.yml] [--directory .] \\
-                             [--host 127.0.0.1] [--port 8000]
+                             [--host 127.0.0.1] [--port 8000] [--workers 4] \\
+                             [--panel-cache 128] [--prefetch 0.5] [--autosave 2] \
+                             [--processes 1]
 
     # Root-server mode (multi-config):
-    poetry run referia serve --root ~/OneDrive/referia/ [--host 127.0.0.1] [--port 8000]
+    poetry run referia serve --root ~/OneDrive/referia/ [--host 127.0.0.1] [--port 8000] \\
+                             [--workers 4] [--panel-cache 128] [--max-reviewers 32] \\
+                             [--max-reviewer-memory 2048] [--reviewer-ttl 3600] \\
+                             [--autosave 2] [--processes 1] [--shards 1]
+
+    # Write SQLite/Parquet flows out as Excel workbooks:
+    poetry run referia export [--config _referia.yml] [--directory .] \\
+                              [--flow output] [--output scores.xlsx]
 """
 
 import argparse
@@ -66,6 +75,83 @@ def _build_parser() -> argparse.ArgumentParser:
         default=8000,
         help="TCP port to listen on (default: 8000)",
     )
+    serve.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Worker threads for blocking review work such as data loads, "
+             "saves and LLM populate calls (default: 4).",
+    )
+    serve.add_argument(
+        "--panel-cache",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Rendered review panels kept for reuse when revisiting a record "
+             "(default: 128, 0 disables).",
+    )
+    serve.add_argument(
+        "--prefetch",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Time spent after each move to a record rendering the next and "
+             "previous records ahead of use (default: 0.5, 0 disables).",
+    )
+    serve.add_argument(
+        "--autosave",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Write edits to the output files once editing pauses for this "
+             "long (default: 2, 0 to write only on Save and at shutdown).",
+    )
+    serve.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Server processes (uvicorn workers) to run (default: 1).  With "
+             "more than one, edits are coordinated through a shared database "
+             "beside each config and conflicting edits are refused.",
+    )
+    serve.add_argument(
+        "--shards",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Root-server mode: run N worker processes, each serving a fixed "
+             "share of the configs, behind a supervisor on --host/--port "
+             "(default: 1, everything in one process).",
+    )
+    # Set by the supervisor on the worker processes it starts.
+    serve.add_argument("--shard", default=None, help=argparse.SUPPRESS)
+    serve.add_argument(
+        "--max-reviewers",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Root-server mode: loaded configs kept in memory; the least "
+             "recently used are saved if needed and unloaded (default: 32, "
+             "0 for no limit).",
+    )
+    serve.add_argument(
+        "--max-reviewer-memory",
+        type=int,
+        default=None,
+        metavar="MB",
+        help="Root-server mode: estimated megabytes of loaded review data kept "
+             "in memory (default: 2048, 0 for no limit).",
+    )
+    serve.add_argument(
+        "--reviewer-ttl",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Root-server mode: unload configs unused for this long "
+             "(default: 3600, 0 for no limit).",
+    )
 
     check = subparsers.add_parser(
         "check",
@@ -95,6 +181,41 @@ def _build_parser() -> argparse.ArgumentParser:
         help="In text mode, suppress the summary and show only failing files.",
     )
 
+    export = subparsers.add_parser(
+        "export",
+        help="Write SQLite/Parquet flows out as Excel workbooks",
+        description=(
+            "Regenerate an .xlsx workbook from each flow of a config that is "
+            "stored as type sqlite or parquet, for people who need a "
+            "spreadsheet.  The stored data is not changed."
+        ),
+    )
+    export.add_argument(
+        "--config",
+        default="_referia.yml",
+        metavar="FILE",
+        help="Config filename (default: _referia.yml).",
+    )
+    export.add_argument(
+        "--directory",
+        default=".",
+        metavar="DIR",
+        help="Review directory (default: current directory).",
+    )
+    export.add_argument(
+        "--flow",
+        default=None,
+        metavar="KEY",
+        help="Export only this flow (e.g. output, series).",
+    )
+    export.add_argument(
+        "--output",
+        default=None,
+        metavar="FILE",
+        help="Workbook to write (default: the stored file's name with .xlsx).  "
+             "Needs --flow when the config stores more than one flow.",
+    )
+
     return parser
 
 
@@ -106,6 +227,8 @@ def main(argv=None):
         _serve(args)
     elif args.command == "check":
         _check(args)
+    elif args.command == "export":
+        _export(args)
     else:
         parser.print_help()
         sys.exit(1)
@@ -133,21 +256,131 @@ def _serve(args):
         sys.exit(1)
 
     from referia.web.app import create_app
+    from referia.web.autosave import DEFAULT_AUTOSAVE_DELAY
+    from referia.web.panel_cache import DEFAULT_PANEL_CACHE_SIZE
+    from referia.web.prefetch import DEFAULT_PREFETCH_BUDGET
+    from referia.web.reviewer_cache import (
+        DEFAULT_MAX_MEMORY_MB,
+        DEFAULT_MAX_REVIEWERS,
+        DEFAULT_REVIEWER_TTL,
+    )
+    from referia.web.workers import DEFAULT_WORKERS
+
+    workers = getattr(args, "workers", None)
+    if workers is None:
+        workers = DEFAULT_WORKERS
+    if workers < 1:
+        print("error: --workers must be at least 1.", file=sys.stderr)
+        sys.exit(1)
+    processes = getattr(args, "processes", None)
+    if processes is None:
+        processes = 1
+    if processes < 1:
+        print("error: --processes must be at least 1.", file=sys.stderr)
+        sys.exit(1)
+    shards = getattr(args, "shards", None)
+    if shards is None:
+        shards = 1
+    if shards < 1:
+        print("error: --shards must be at least 1.", file=sys.stderr)
+        sys.exit(1)
+    if shards > 1 and (args.root is None or processes > 1):
+        print("error: --shards needs --root and cannot be combined with --processes.",
+              file=sys.stderr)
+        sys.exit(1)
+    panel_cache = getattr(args, "panel_cache", None)
+    if panel_cache is None:
+        panel_cache = DEFAULT_PANEL_CACHE_SIZE
+    if panel_cache < 0:
+        print("error: --panel-cache must not be negative.", file=sys.stderr)
+        sys.exit(1)
+
+    limits = {}
+    for option, name, default in (
+        ("prefetch", "--prefetch", DEFAULT_PREFETCH_BUDGET),
+        ("autosave", "--autosave", DEFAULT_AUTOSAVE_DELAY),
+        ("max_reviewers", "--max-reviewers", DEFAULT_MAX_REVIEWERS),
+        ("max_reviewer_memory", "--max-reviewer-memory", DEFAULT_MAX_MEMORY_MB),
+        ("reviewer_ttl", "--reviewer-ttl", DEFAULT_REVIEWER_TTL),
+    ):
+        value = getattr(args, option, None)
+        if value is None:
+            value = default
+        if value < 0:
+            print(f"error: {name} must not be negative.", file=sys.stderr)
+            sys.exit(1)
+        limits[option] = value
+
+    if shards > 1:
+        from pathlib import Path
+        from referia.web.supervisor import Supervisor, create_supervisor_app
+
+        worker_args = [
+            "--workers", str(workers),
+            "--panel-cache", str(panel_cache),
+            "--prefetch", str(limits["prefetch"]),
+            "--autosave", str(limits["autosave"]),
+            "--max-reviewers", str(limits["max_reviewers"]),
+            "--max-reviewer-memory", str(limits["max_reviewer_memory"]),
+            "--reviewer-ttl", str(limits["reviewer_ttl"]),
+        ]
+        supervisor = Supervisor(str(Path(args.root).resolve()), shards, worker_args)
+        print(f"Starting referia root-server at http://{args.host}:{args.port}")
+        print(f"  Root:   {args.root}")
+        print(f"  Shards: {shards} worker processes; each config is served by one of them.")
+        print("Press Ctrl+C to stop.")
+        uvicorn.run(create_supervisor_app(supervisor), host=args.host, port=args.port)
+        return
 
     if args.root is not None:
-        app = create_app(root=args.root)
+        options = dict(
+            root=args.root,
+            workers=workers,
+            panel_cache_size=panel_cache,
+            prefetch_budget=limits["prefetch"],
+            max_reviewers=limits["max_reviewers"],
+            max_reviewer_memory_mb=limits["max_reviewer_memory"],
+            reviewer_ttl=limits["reviewer_ttl"],
+            autosave_delay=limits["autosave"],
+            shared=processes > 1,
+            shard=getattr(args, "shard", None),
+        )
         print(f"Starting referia root-server at http://{args.host}:{args.port}")
         print(f"  Root:   {args.root}")
         print("  Any _referia.yml under the root is served at its relative path.")
     else:
         directory = args.directory if args.directory is not None else "."
-        app = create_app(user_file=args.config, directory=directory)
+        options = dict(
+            user_file=args.config,
+            directory=directory,
+            workers=workers,
+            panel_cache_size=panel_cache,
+            prefetch_budget=limits["prefetch"],
+            autosave_delay=limits["autosave"],
+            shared=processes > 1,
+        )
         print(f"Starting referia review interface at http://{args.host}:{args.port}")
         print(f"  Config:    {args.config}")
         print(f"  Directory: {directory}")
 
     print("Press Ctrl+C to stop.")
-    uvicorn.run(app, host=args.host, port=args.port)
+    if processes == 1:
+        uvicorn.run(create_app(**options), host=args.host, port=args.port)
+        return
+
+    # Each worker process builds its own app from the options.
+    import json
+    import os
+    from pathlib import Path
+    from referia.web.app import APP_OPTIONS_ENV
+
+    for key in ("root", "directory"):
+        if options.get(key) is not None:
+            options[key] = str(Path(options[key]).resolve())
+    os.environ[APP_OPTIONS_ENV] = json.dumps(options)
+    print(f"  Processes: {processes} (edits shared through .<config>.shared.db)")
+    uvicorn.run("referia.web.app:create_app_from_env", factory=True,
+                host=args.host, port=args.port, workers=processes)
 
 
 def _check(args):
@@ -168,3 +401,44 @@ def _check(args):
             print(format_text(results, args.root))
 
     sys.exit(1 if errors else 0)
+
+
+def _export(args):
+    """Implement ``referia export`` subcommand."""
+    import os
+    from pathlib import Path
+    from lynguine.util.misc import extract_full_filename
+    from referia.config.interface import Interface
+    from referia.util.store import STORE_TYPES, export_flow
+    from referia.util.files import working_directory
+
+    directory = str(Path(args.directory).resolve())
+    interface = Interface.from_file(args.config, directory)
+    flows = {
+        key: item for key, item in interface.items()
+        if isinstance(item, dict) and item.get("type") in STORE_TYPES
+    }
+    if args.flow is not None:
+        if args.flow not in flows:
+            print(f"error: flow {args.flow!r} is not stored as "
+                  f"{' or '.join(sorted(STORE_TYPES))}.", file=sys.stderr)
+            sys.exit(1)
+        flows = {args.flow: flows[args.flow]}
+    if not flows:
+        print("error: the config has no sqlite or parquet flows to export.", file=sys.stderr)
+        sys.exit(1)
+    if args.output is not None and len(flows) > 1:
+        print("error: --output needs --flow when several flows are stored.", file=sys.stderr)
+        sys.exit(1)
+
+    output = os.path.abspath(args.output) if args.output is not None else None
+    # Flow paths are relative to the review directory.
+    with working_directory(directory):
+        for key, details in flows.items():
+            target = output or str(Path(extract_full_filename(details)).with_suffix(".xlsx"))
+            rows = export_flow(details, target)
+            print(f"Wrote {rows} rows of {key!r} to {os.path.abspath(target)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,11 @@
 class ComputeError(Exception):
     """Raised to share a compute error with the logging system"""
     pass
+
+
+class ReviewerClosed(RuntimeError):
+    """Raised on an edit to a web reviewer that was saved and dropped.
+
+    Its outputs and journal now belong to whichever reviewer replaced it, so
+    the edit must be repeated there.
+    """
@@ -12,6 +12,7 @@ import datetime
 from .config import *
 from .log import Logger
 from .util import to_camel_case, remove_nan, renderable, tallyable, markdown2html
+from .util.liquid import compiled_template
 
 log = Logger(
     name=__name__,
@@ -313,7 +314,7 @@ class Render():
         if kwargs is None:
             kwargs = self.mapping()
         try:
-            return self._liquid_env.from_string(display).render(**remove_nan(kwargs))
+            return compiled_template(self._liquid_env, display).render(**remove_nan(kwargs))
         except Exception as err:
             raise Exception(f"In {display}\n\n {err}") from err
 
@@ -497,3 +497,365 @@ def test_from_flow_with_valid_settings(valid_local_settings):
 #    cdf = 
 
        # The number of scored elements is the number of filed in maching "scored:field" in the interface
+
+
+# Batch rendering of derived fields
+def create_people_dataframe(n=3):
+    data = {
+        "givenName": [f"Given{i}" for i in range(n)],
+        "familyName": [f"Family{i}" for i in range(n)],
+    }
+    return referia.assess.data.CustomDataFrame(data, colspecs="input")
+
+def _no_cursor_moves(cdf, monkeypatch):
+    def fail(value):
+        raise AssertionError("set_index called during batch rendering")
+    monkeypatch.setattr(cdf, "set_index", fail)
+
+def test_series_from_renderable_liquid_batch(monkeypatch):
+    cdf = create_people_dataframe()
+    raw = cdf.to_pandas()
+    _no_cursor_moves(cdf, monkeypatch)
+    series = cdf._column_from_renderable(raw, name="fullName", liquid="{{givenName}} {{familyName}}")
+    assert list(series) == ["Given0 Family0", "Given1 Family1", "Given2 Family2"]
+    assert all(series.index == raw.index)
+
+def test_series_from_renderable_join_and_local_batch(monkeypatch):
+    cdf = create_people_dataframe(2)
+    raw = cdf.to_pandas()
+    _no_cursor_moves(cdf, monkeypatch)
+    view = {
+        "name": "label",
+        "join": {"list": [{"display": "{familyName}"}, {"liquid": "{{suffix}}"}], "separator": "_"},
+        "local": {"suffix": "x"},
+    }
+    series = cdf._index_from_renderable(raw, **view)
+    assert list(series) == ["Family0_x", "Family1_x"]
+
+def test_row_renderer_declines_cursor_views():
+    cdf = create_people_dataframe(1)
+    assert cdf._row_renderer({"field": "givenName"}) is None
+    assert cdf._row_renderer({"compute": {"function": "today"}}) is None
+    assert cdf._row_renderer({"liquid": "{{givenName}}", "conditions": [{"present": {"field": "givenName"}}]}) is None
+    assert cdf._row_renderer({"list": [{"liquid": "{{givenName}}"}, {"tally": {"liquid": "x"}}]}) is None
+
+def _render_both_ways(cdf, raw, fields, monkeypatch):
+    """Render *fields* batched and through the per-row cursor path."""
+    batched = [cdf._column_from_renderable(raw, **field) for field in fields]
+    with monkeypatch.context() as m:
+        m.setattr(cdf, "_row_renderer", lambda view, local=None: None)
+        per_row = [cdf._column_from_renderable(raw, **field) for field in fields]
+    return batched, per_row
+
+def test_series_from_renderable_missing_values_match_per_row(monkeypatch):
+    cdf = referia.assess.data.CustomDataFrame(
+        {
+            "givenName": ["Ada", np.nan, "Grace"],
+            "familyName": ["Lovelace", "Hopper", None],
+            "score": [1.5, np.nan, 3.0],
+        },
+        colspecs="input",
+    )
+    raw = cdf.to_pandas()
+    fields = [
+        {"name": "fullName", "liquid": "{{givenName}} {{familyName}}"},
+        {"name": "scored", "liquid": "{% if score %}{{score}}{% else %}none{% endif %}"},
+    ]
+    batched, per_row = _render_both_ways(cdf, raw, fields, monkeypatch)
+    for a, b in zip(batched, per_row):
+        assert list(a) == list(b)
+    assert list(batched[1]) == ["1.5", "none", "3.0"]
+
+@pytest.mark.slow
+def test_benchmark_series_from_renderable(monkeypatch):
+    """Derive two fields for a 5,000-row allocation, batched and per row."""
+    cdf = create_people_dataframe(5000)
+    raw = cdf.to_pandas()
+    raw.loc[raw.index[::7], "givenName"] = np.nan
+    fields = [
+        {"name": "fullName", "liquid": "{{givenName}} {{familyName}}"},
+        {"name": "fileName", "display": "{familyName}.pdf"},
+    ]
+    batched, per_row = _render_both_ways(cdf, raw, fields, monkeypatch)
+    for a, b in zip(batched, per_row):
+        assert list(a) == list(b)
+
+# Series regrouping
+def test_series_entries_groups_in_order():
+    df = pd.DataFrame(
+        {"score": [1.0, 2.0, 3.0], "comment": ["a", None, "c"]},
+        index=pd.Index(["y", "x", "y"], name="id"),
+    )
+    df["id"] = df.index
+    codes, uniques = pd.factorize(df.index)
+    entries = referia.assess.data.series_entries(df, "id", {"note": "comment"}, codes, len(uniques))
+    assert list(uniques) == ["y", "x"]
+    assert entries == [
+        [{"score": 1.0, "note": "a"}, {"score": 3.0, "note": "c"}],
+        [{"score": 2.0}],
+    ]
+
+def _series_entries_per_key(df, index_column_name, mapping, uniques):
+    """Regroup *df* as before, looking up each key and iterating its rows."""
+    from lynguine.util.misc import remove_nan
+    per_key = []
+    for index_name in uniques:
+        entries = []
+        for _, row in df.loc[[index_name]].iterrows():
+            entry = remove_nan(row.to_dict())
+            map_entry = entry.copy()
+            del map_entry[index_column_name]
+            for key, key2 in mapping.items():
+                if key2 in entry:
+                    map_entry[key] = entry[key2]
+                    del map_entry[key2]
+            entries.append(map_entry)
+        per_key.append(entries)
+    return per_key
+
+def test_series_entries_missing_values_match_row_iteration():
+    df = pd.DataFrame(
+        {
+            "score": [1.5, np.nan, 3.0],
+            "when": pd.to_datetime(["2024-01-01", "2024-02-01", None]),
+            "comment": ["a", None, "c"],
+        },
+        index=pd.Index(["y", "x", "y"], name="id"),
+    )
+    df["id"] = df.index
+    codes, uniques = pd.factorize(df.index)
+    entries = referia.assess.data.series_entries(df, "id", {"note": "comment"}, codes, len(uniques))
+    assert entries == _series_entries_per_key(df, "id", {"note": "comment"}, uniques)
+    missing = entries[1][0]
+    assert "score" not in missing and "note" not in missing
+    assert type(missing["when"]) is pd.Timestamp
+    assert type(entries[0][0]["score"]) is float
+
+@pytest.mark.slow
+@pytest.mark.parametrize("nrows", [1000, 4000, 16000])
+def test_benchmark_series_entries(nrows):
+    """Regroup a series sheet with four sub-entries per index, as per-key lookups do."""
+    keys = [f"id{i // 4}" for i in range(nrows)]
+    df = pd.DataFrame(
+        {"score": np.arange(nrows, dtype=float), "comment": ["text"] * nrows},
+        index=pd.Index(keys, name="id"),
+    )
+    df["id"] = df.index
+    mapping = {"note": "comment"}
+
+    codes, uniques = pd.factorize(df.index)
+    grouped = referia.assess.data.series_entries(df, "id", mapping, codes, len(uniques))
+
+    assert grouped == _series_entries_per_key(df, "id", mapping, uniques)
+
+# Index deduplication
+def _legacy_remove_index_duplicates(index):
+    existlist = []
+    count = 0
+    indseries = pd.Series(index, dtype="object")
+    for i, ind in indseries.items():
+        if ind not in existlist:
+            existlist.append(ind)
+            count = 0
+            continue
+        else:
+            count += 1
+            indseries.at[i] = str(ind) + "_" + str(count)
+    return list(indseries)
+
+def _dedupe(index):
+    holder = type("Holder", (), {})()
+    holder.index = pd.Index(index)
+    referia.assess.data.CustomDataFrame._remove_index_duplicates(holder)
+    return list(holder.index)
+
+@pytest.mark.parametrize("index", [
+    ["a", "b", "c"],
+    ["a", "a", "a", "b", "b"],
+    ["a", "b", "a", "b"],
+    ["a", "a", "b", "a"],
+    [1, 1, 2],
+])
+def test_remove_index_duplicates_suffixes(index):
+    assert _dedupe(index) == _legacy_remove_index_duplicates(index)
+
+def test_remove_index_duplicates_random():
+    rng = np.random.default_rng(0)
+    index = [f"k{k}" for k in rng.integers(0, 30, size=200)]
+    assert _dedupe(index) == _legacy_remove_index_duplicates(index)
+
+@pytest.mark.slow
+def test_remove_index_duplicates_50k_rows():
+    keys = [f"id{i}" for i in range(25000)]
+    deduped = _dedupe(keys * 2)
+    assert deduped == keys + [f"{key}_{n}" for n, key in enumerate(keys, 1)]
+
+@pytest.fixture
+def input_output_settings():
+    return referia.config.interface.Interface(
+        {
+            "input": {
+                "type": "local",
+                "index": "index",
+                "data": [
+                    {"index": "a", "title": "Alpha"},
+                    {"index": "b", "title": "Beta"},
+                ],
+            },
+            "output": {
+                "type": "local",
+                "index": "index",
+                "data": [{"index": "a", "score": 1}],
+            },
+        },
+        user_file="test.yml",
+        directory=".",
+    )
+
+def test_reload_flows_rereads_only_named_flows(input_output_settings):
+    cdf = referia.assess.data.CustomDataFrame.from_flow(input_output_settings)
+    output = cdf._d["output"]
+    input_output_settings["input"]["data"][1]["title"] = "Bravo"
+    assert cdf.reload_flows(["input"]) == ["input"]
+    assert cdf._d["input"].loc["b", "title"] == "Bravo"
+    assert cdf._d["output"] is output
+
+def test_reload_flows_extends_outputs_for_new_records(input_output_settings):
+    cdf = referia.assess.data.CustomDataFrame.from_flow(input_output_settings)
+    input_output_settings["input"]["data"].append({"index": "c", "title": "Gamma"})
+    cdf.reload_flows(["input"])
+    assert list(cdf.index) == ["a", "b", "c"]
+    assert "c" in cdf._d["output"].index
+    assert cdf._d["output"].loc["a", "score"] == 1
+
+def test_reload_flows_rejects_unknown_flow(input_output_settings):
+    cdf = referia.assess.data.CustomDataFrame.from_flow(input_output_settings)
+    with pytest.raises(ValueError):
+        cdf.reload_flows(["series"])
+
+@pytest.fixture
+def csv_output_frame(tmp_path):
+    pd.DataFrame({"index": ["a", "b"], "score": [1, 2]}).to_csv(tmp_path / "scores.csv", index=False)
+    settings = referia.config.interface.Interface(
+        {
+            "output": {
+                "type": "csv",
+                "index": "index",
+                "filename": "scores.csv",
+                "directory": str(tmp_path),
+            },
+        },
+        user_file="test.yml",
+        directory=str(tmp_path),
+    )
+    return referia.assess.data.CustomDataFrame.from_flow(settings), tmp_path
+
+def test_save_flow_replaces_file(csv_output_frame):
+    cdf, folder = csv_output_frame
+    cdf._d["output"].loc["a", "score"] = 5
+    cdf.save_flow("output")
+    assert sorted(p.name for p in folder.iterdir()) == ["scores.csv"]
+    assert 5 in pd.read_csv(folder / "scores.csv")["score"].tolist()
+
+def test_save_flow_failure_keeps_original(csv_output_frame, monkeypatch):
+    cdf, folder = csv_output_frame
+    before = (folder / "scores.csv").read_text()
+
+    def failing_write(df, details):
+        (folder / details["filename"]).write_text("partial")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(referia.assess.data.access.io, "write_data", failing_write)
+    with pytest.raises(OSError):
+        cdf.save_flow("output")
+    assert (folder / "scores.csv").read_text() == before
+    assert sorted(p.name for p in folder.iterdir()) == ["scores.csv"]
+
+@pytest.fixture
+def excel_output_frame(tmp_path):
+    df = pd.DataFrame({"index": ["a", "b"], "score": [1, 2], "note": ["x", "y"]})
+    with pd.ExcelWriter(tmp_path / "scores.xlsx", engine="xlsxwriter") as writer:
+        df.to_excel(writer, sheet_name="Sheet1", index=False)
+    settings = referia.config.interface.Interface(
+        {
+            "output": {
+                "type": "excel",
+                "index": "index",
+                "filename": "scores.xlsx",
+                "directory": str(tmp_path),
+                "sheet": "Sheet1",
+            },
+        },
+        user_file="test.yml",
+        directory=str(tmp_path),
+    )
+    return referia.assess.data.CustomDataFrame.from_flow(settings), tmp_path
+
+def test_save_flow_updates_excel_cells_in_place(excel_output_frame, monkeypatch):
+    cdf, folder = excel_output_frame
+    cdf._d["output"].loc["b", "score"] = 5
+
+    def no_rewrite(df, details):
+        raise AssertionError("workbook rewritten")
+
+    monkeypatch.setattr(referia.assess.data.access.io, "write_data", no_rewrite)
+    cdf.save_flow("output", cells={("b", "score")})
+    saved = pd.read_excel(folder / "scores.xlsx", sheet_name="Sheet1").set_index("index")
+    assert saved.loc["b", "score"] == 5
+    assert saved.loc["a", "note"] == "x"
+    assert sorted(p.name for p in folder.iterdir()) == ["scores.xlsx"]
+
+def test_save_flow_rewrites_excel_when_columns_change(excel_output_frame, monkeypatch):
+    cdf, folder = excel_output_frame
+    cdf._d["output"]["extra"] = "new"
+    rewritten = []
+    write_data = referia.assess.data.access.io.write_data
+
+    def record(df, details):
+        rewritten.append(details["filename"])
+        write_data(df, details)
+
+    monkeypatch.setattr(referia.assess.data.access.io, "write_data", record)
+    cdf.save_flow("output", cells={("a", "extra")})
+    assert len(rewritten) == 1
+
+@pytest.fixture
+def sqlite_output_settings(tmp_path):
+    return referia.config.interface.Interface(
+        {
+            "input": {
+                "type": "local",
+                "index": "index",
+                "data": [{"index": "a", "title": "Alpha"}, {"index": "b", "title": "Beta"}],
+            },
+            "output": {
+                "type": "sqlite",
+                "index": "index",
+                "filename": "scores.db",
+                "directory": str(tmp_path),
+                "columns": ["score"],
+            },
+        },
+        user_file="test.yml",
+        directory=str(tmp_path),
+    )
+
+def test_sqlite_output_round_trips_through_flows(sqlite_output_settings):
+    cdf = referia.assess.data.CustomDataFrame.from_flow(sqlite_output_settings)
+    cdf._d["output"].loc["a", "score"] = 3
+    cdf.save_flows()
+    cdf = referia.assess.data.CustomDataFrame.from_flow(sqlite_output_settings)
+    assert cdf._d["output"].loc["a", "score"] == 3
+
+def test_save_flow_upserts_sqlite_rows(sqlite_output_settings, monkeypatch):
+    cdf = referia.assess.data.CustomDataFrame.from_flow(sqlite_output_settings)
+    cdf.save_flow("output")
+    cdf._d["output"].loc["b", "score"] = 4
+
+    def no_rewrite(df, details):
+        raise AssertionError("table rewritten")
+
+    monkeypatch.setattr(referia.assess.data.store, "write_sqlite", no_rewrite)
+    cdf.save_flow("output", cells={("b", "score")})
+    stored = referia.util.store.read_sqlite(sqlite_output_settings["output"]).set_index("index")
+    assert stored.loc["b", "score"] == 4
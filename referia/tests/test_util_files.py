@@ -1,5 +1,9 @@
+import os
+import threading
+import time
+
 import pytest
-from referia.util.files import file_from_re, files_from_re, to_valid_file 
+from referia.util.files import file_from_re, files_from_re, to_valid_file, working_directory
 
 def test_files_from_re(mocker):
     test_directory = "/test/directory"
@@ -30,3 +34,34 @@ def test_to_valid_file():
 
     for input_text, expected_output in test_cases.items():
         assert to_valid_file(input_text) == expected_output
+
+def test_working_directory_restores_on_error(tmp_path):
+    orig = os.getcwd()
+    with pytest.raises(RuntimeError):
+        with working_directory(str(tmp_path)):
+            assert os.getcwd() == str(tmp_path)
+            raise RuntimeError
+    assert os.getcwd() == orig
+
+def test_working_directory_blocks_do_not_interleave(tmp_path):
+    orig = os.getcwd()
+    directories = [tmp_path / name for name in ("a", "b", "c", "d")]
+    seen = {}
+
+    def work(directory):
+        for _ in range(20):
+            with working_directory(str(directory)):
+                time.sleep(0.001)
+                seen.setdefault(directory, set()).add(os.getcwd())
+
+    threads = []
+    for directory in directories:
+        directory.mkdir()
+        threads.append(threading.Thread(target=work, args=(directory,)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert seen == {directory: {str(directory)} for directory in directories}
+    assert os.getcwd() == orig
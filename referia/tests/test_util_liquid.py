@@ -0,0 +1,93 @@
+import gc
+import weakref
+
+import liquid as lq
+import pandas as pd
+import pytest
+from liquid.parser import get_parser
+
+from referia.util import liquid as liquid_cache
+from referia.util.liquid import cache_info, clear_cache, compiled_template, render_template
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_cache()
+    yield
+    clear_cache()
+
+
+def test_compiled_template_reused():
+    env = lq.Environment()
+    first = compiled_template(env, "Hello {{ name }}")
+    second = compiled_template(env, "Hello {{ name }}")
+    assert first is second
+    assert first.render(name="Ada") == "Hello Ada"
+    assert cache_info() == {"size": 1, "hits": 1, "misses": 1}
+
+
+def test_environments_kept_apart():
+    plain = lq.Environment()
+    shouting = lq.Environment()
+    shouting.add_filter("shout", lambda value: str(value).upper() + "!")
+    source = "{{ name | shout }}"
+    assert render_template(shouting, source, name="ada") == "ADA!"
+    assert compiled_template(plain, source) is not compiled_template(shouting, source)
+
+
+def test_cache_bounded(monkeypatch):
+    monkeypatch.setattr(liquid_cache, "MAX_TEMPLATES", 3)
+    env = lq.Environment()
+    for i in range(5):
+        compiled_template(env, f"{{{{ a }}}}{i}")
+    assert cache_info()["size"] == 3
+    # The oldest templates were evicted, the newest kept.
+    compiled_template(env, "{{ a }}4")
+    assert cache_info()["hits"] == 1
+
+
+def test_dropped_environments_are_collected():
+    # Each config load makes a new environment; its templates must not keep
+    # it alive.
+    refs = []
+    for i in range(5):
+        env = lq.Environment()
+        assert render_template(env, "{{ n }}", n=i) == str(i)
+        refs.append(weakref.ref(env))
+    del env
+    # liquid itself keeps the parsers of its 128 most recent environments.
+    get_parser.cache_clear()
+    gc.collect()
+    assert all(ref() is None for ref in refs)
+    assert cache_info()["size"] == 0
+
+
+def test_syntax_error_not_cached():
+    env = lq.Environment()
+    with pytest.raises(Exception):
+        compiled_template(env, "{% if %}")
+    assert cache_info()["size"] == 0
+
+
+@pytest.mark.slow
+def test_benchmark_tally_render():
+    """A 1,000-entry tally renders through liquid_to_value with one parse."""
+    import referia.assess.data
+
+    n = 1000
+    data = pd.DataFrame(
+        {"reviewer": [f"Reviewer {i}" for i in range(n)], "score": [i % 10 for i in range(n)]},
+        index=pd.Index(["paper"] * n, name="id"),
+    )
+    cdf = referia.assess.data.CustomDataFrame(
+        data, colspecs={"writeseries": ["reviewer", "score"]}, selector="reviewer"
+    )
+    cdf.set_index("paper")
+    source = "{% if score > 5 %}**{{ reviewer }}**{% else %}{{ reviewer }}{% endif %}"
+
+    text = cdf.tally_to_value({"liquid": source})
+
+    assert "**Reviewer 6**" in text
+    assert "Reviewer 999" in text
+    # Every entry rendered from the one compiled template.
+    assert cache_info() == {"size": 1, "hits": n - 1, "misses": 1}
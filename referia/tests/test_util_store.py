@@ -0,0 +1,114 @@
+import argparse
+
+import pandas as pd
+import pytest
+
+from lynguine import access
+
+from referia.util import store
+
+
+@pytest.fixture
+def scores(tmp_path):
+    df = pd.DataFrame(
+        {
+            "score": [1, 2, None],
+            "note": ["x", None, "z"],
+            "score_modified": pd.to_datetime(["2024-01-01", None, "2024-01-03"]),
+        },
+        index=pd.Index(["a", "b", "c"], name="index"),
+    )
+    details = {"type": "sqlite", "filename": "scores.db", "directory": str(tmp_path), "index": "index"}
+    return df, details
+
+
+def test_sqlite_round_trip(scores):
+    df, details = scores
+    store.write_sqlite(df, details)
+    read = store.read_sqlite(details)
+    assert list(read.columns) == ["index", "score", "note", "score_modified"]
+    assert read["index"].tolist() == ["a", "b", "c"]
+    assert read.loc[0, "score_modified"] == pd.Timestamp("2024-01-01")
+    assert pd.isna(read.loc[1, "score_modified"])
+    assert read.loc[2, "note"] == "z"
+
+
+def test_sqlite_upsert_writes_only_given_rows(scores):
+    df, details = scores
+    store.write_sqlite(df, details)
+    df.loc["b", "score"] = 9
+    df.loc["c", "score"] = 7  # not listed, so not written
+    assert store.upsert_sqlite(df, details, ["b"])
+    read = store.read_sqlite(details).set_index("index")
+    assert read.loc["b", "score"] == 9
+    assert pd.isna(read.loc["c", "score"])
+    assert list(read.index) == ["a", "b", "c"]
+
+
+def test_sqlite_upsert_refused_on_new_column(scores):
+    df, details = scores
+    store.write_sqlite(df, details)
+    df["extra"] = 1
+    assert not store.upsert_sqlite(df, details, ["a"])
+
+
+def test_sqlite_upsert_adds_new_row(scores):
+    df, details = scores
+    store.write_sqlite(df, details)
+    df.loc["d"] = [4, "w", pd.NaT]
+    assert store.upsert_sqlite(df, details, ["d"])
+    assert store.read_sqlite(details)["index"].tolist() == ["a", "b", "c", "d"]
+
+
+def test_sqlite_series_has_no_key_and_is_not_upserted(tmp_path):
+    df = pd.DataFrame({"comment": ["x", "y"]}, index=pd.Index(["a", "a"], name="index"))
+    details = {"type": "sqlite", "filename": "series.db", "directory": str(tmp_path), "table": "comments"}
+    store.write_sqlite(df, details)
+    assert store.read_sqlite(details)["comment"].tolist() == ["x", "y"]
+    assert not store.upsert_sqlite(df, details, ["a"])
+
+
+def test_sqlite_exists_checks_table(scores, tmp_path):
+    df, details = scores
+    assert not store.store_exists(details)
+    store.write_sqlite(df, details)
+    assert store.store_exists(details)
+    assert not store.store_exists(dict(details, table="other"))
+
+
+def test_install_routes_store_types_through_lynguine(scores):
+    df, details = scores
+    store.install()
+    store.install()  # idempotent
+    assert not access.io.data_exists(details)
+    access.io.write_data(df, details)
+    assert access.io.data_exists(details)
+    read, _ = access.io.read_data(details)
+    assert read.index.name == "index"
+    assert read["score"].tolist()[:2] == [1, 2]
+
+
+def test_parquet_round_trip(scores):
+    pytest.importorskip("pyarrow")
+    df, details = scores
+    details = dict(details, type="parquet", filename="scores.parquet")
+    store.write_store(df, details)
+    read = store.read_store(details)
+    assert read["index"].tolist() == ["a", "b", "c"]
+    assert read.loc[0, "score_modified"] == pd.Timestamp("2024-01-01")
+
+
+def test_export_cli_writes_workbook(scores, tmp_path, capsys):
+    from referia.cli import _export
+
+    df, details = scores
+    store.write_sqlite(df, details)
+    (tmp_path / "_referia.yml").write_text(
+        "input:\n  type: local\n  index: index\n  data: [{index: a}]\n"
+        "output:\n  type: sqlite\n  filename: scores.db\n  index: index\n"
+    )
+    args = argparse.Namespace(config="_referia.yml", directory=str(tmp_path), flow=None, output=None)
+    _export(args)
+    assert "3 rows of 'output'" in capsys.readouterr().out
+    exported = pd.read_excel(tmp_path / "scores.xlsx", sheet_name="Sheet1")
+    assert exported["index"].tolist() == ["a", "b", "c"]
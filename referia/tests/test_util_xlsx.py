@@ -0,0 +1,119 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from referia.util.xlsx import patch_cells
+
+
+def write_workbook(path, df, header=0):
+    writer = pd.ExcelWriter(path, engine="xlsxwriter", datetime_format="YYYY-MM-DD HH:MM:SS.000")
+    df.to_excel(writer, sheet_name="Sheet1", startrow=header, index=False)
+    writer.close()
+
+
+def read_workbook(path, header=0):
+    return pd.read_excel(path, sheet_name="Sheet1", header=header).set_index("index")
+
+
+@pytest.fixture
+def scores(tmp_path):
+    df = pd.DataFrame({
+        "index": ["a", "b", "c"],
+        "score": [1.0, 2.0, np.nan],
+        "note": ["x", "y", "z"],
+        "score_modified": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03"]),
+    })
+    path = tmp_path / "scores.xlsx"
+    write_workbook(path, df)
+    return path, ["score", "note", "score_modified"]
+
+
+def test_patch_changes_only_given_cells(scores, tmp_path):
+    path, columns = scores
+    target = tmp_path / "out.xlsx"
+    stamp = pd.Timestamp("2025-06-01 10:30:00")
+    updates = [("b", "score", 7.5), ("a", "note", "<new & improved>"), ("c", "score_modified", stamp)]
+    assert patch_cells(str(path), str(target), updates, columns, "index")
+
+    before = read_workbook(path)
+    after = read_workbook(target)
+    assert after.loc["b", "score"] == 7.5
+    assert after.loc["a", "note"] == "<new & improved>"
+    assert after.loc["c", "score_modified"] == stamp
+    expected = before.copy()
+    expected.loc["b", "score"] = 7.5
+    expected.loc["a", "note"] = "<new & improved>"
+    expected.loc["c", "score_modified"] = stamp
+    pd.testing.assert_frame_equal(after, expected)
+
+
+def test_patch_fills_and_clears_cells(scores, tmp_path):
+    path, columns = scores
+    target = tmp_path / "out.xlsx"
+    assert patch_cells(str(path), str(target), [("c", "score", 3), ("a", "score", None)], columns, "index")
+    after = read_workbook(target)
+    assert after.loc["c", "score"] == 3
+    assert pd.isna(after.loc["a", "score"])
+
+
+def test_patch_respects_header_row(tmp_path):
+    path = tmp_path / "offset.xlsx"
+    write_workbook(path, pd.DataFrame({"index": [10, 20], "score": [1, 2]}), header=2)
+    target = tmp_path / "out.xlsx"
+    assert patch_cells(str(path), str(target), [(20, "score", 5)], ["score"], "index", header=2)
+    assert read_workbook(target, header=2).loc[20, "score"] == 5
+
+
+@pytest.mark.parametrize("updates, columns", [
+    ([("a", "score", 1.0)], ["score", "note", "score_modified", "added"]),  # schema changed
+    ([("d", "score", 1.0)], ["score", "note", "score_modified"]),  # new row
+    ([("a", "score", float("inf"))], ["score", "note", "score_modified"]),
+])
+def test_patch_refused(scores, tmp_path, updates, columns):
+    path, _ = scores
+    target = tmp_path / "out.xlsx"
+    assert not patch_cells(str(path), str(target), updates, columns, "index")
+    assert not target.exists()
+
+
+def test_patch_refuses_date_without_date_style(tmp_path):
+    path = tmp_path / "plain.xlsx"
+    write_workbook(path, pd.DataFrame({"index": ["a"], "score": [1]}))
+    target = tmp_path / "out.xlsx"
+    assert not patch_cells(str(path), str(target), [("a", "score", pd.Timestamp("2025-01-01"))],
+                           ["score"], "index")
+
+
+def test_patch_refuses_repeated_index(tmp_path):
+    path = tmp_path / "series.xlsx"
+    write_workbook(path, pd.DataFrame({"index": ["a", "a"], "score": [1, 2]}))
+    target = tmp_path / "out.xlsx"
+    assert not patch_cells(str(path), str(target), [("a", "score", 3)], ["score"], "index")
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("rows", [500, 2000, 8000])
+def test_benchmark_patch_against_rewrite(tmp_path, rows):
+    """Compare writing one edit by patching with rewriting the workbook."""
+    columns = {f"q{i}": np.random.rand(rows) for i in range(8)}
+    for i in range(8):
+        columns[f"q{i}_modified"] = pd.Timestamp("2024-01-01")
+    df = pd.DataFrame({"index": [f"r{i}" for i in range(rows)], **columns})
+    path = tmp_path / "scores.xlsx"
+    write_workbook(path, df)
+    index = df["index"].iloc[rows // 2]
+
+    start = time.perf_counter()
+    write_workbook(tmp_path / "rewrite.xlsx", df)
+    rewrite = time.perf_counter() - start
+
+    start = time.perf_counter()
+    assert patch_cells(str(path), str(tmp_path / "patched.xlsx"),
+                       [(index, "q0", 0.5), (index, "q0_modified", pd.Timestamp("2025-01-01"))],
+                       list(df.columns[1:]), "index")
+    patch = time.perf_counter() - start
+
+    print(f"\n{rows} rows x {len(df.columns)} columns: rewrite {rewrite:.3f}s, patch {patch:.3f}s")
+    assert patch < rewrite
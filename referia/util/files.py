@@ -1,6 +1,12 @@
+import contextlib
 import os
 import re
 import string
+import threading
+
+# The current directory belongs to the whole process: every temporary
+# change of it is made under this lock so threads cannot interleave them.
+_CWD_LOCK = threading.RLock()
 
 def file_from_re(pattern: str, directory: str = ".") -> str:
     """
@@ -45,4 +51,24 @@ def to_valid_file(text):
     return text
 
 
-    
+@contextlib.contextmanager
+def working_directory(directory: str):
+    """
+    Run a block with the current directory set to *directory*.
+
+    Relative paths in configs resolve against the current directory, which
+    is shared by every thread.  The change and its restore are made under a
+    process-wide lock, so a thread never sees another's directory and the
+    restores cannot land out of order; a block that changes directory holds
+    up every other such block until it returns.
+
+    :param directory: The directory to change to.
+    :type directory: str
+    """
+    with _CWD_LOCK:
+        orig = os.getcwd()
+        try:
+            os.chdir(directory)
+            yield
+        finally:
+            os.chdir(orig)
@@ -0,0 +1,100 @@
+"""Compiled Liquid template cache.
+
+Every viewer, combinator, tally entry and renderable field is a Liquid
+template that used to be parsed with ``env.from_string(source)`` on every
+render, including once per row while deriving renderable columns at load
+time.  Parsing dominates the cost of small templates, so compiled templates
+are kept here and reused.
+
+A compiled template is bound to the environment (filters, loader) it was
+parsed with, and holds a reference back to it, so the templates are kept on
+the environment itself rather than in a table keyed by it: they are shared
+by everything that renders through that environment (a data frame's
+``Compute``) and are freed with it.  An environment made afresh, as each
+load of a config makes one, starts with no templates.
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+
+# Compiled templates kept per environment.  A configuration rarely has more
+# than a few hundred distinct templates.
+MAX_TEMPLATES = 512
+
+# Attribute of an environment holding its compiled templates.
+_TEMPLATES = "_referia_templates"
+
+# Environments holding templates, for ``cache_info`` and ``clear_cache``.
+_envs = weakref.WeakSet()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def compiled_template(env, source):
+    """
+    Return *source* parsed by *env*, reusing an earlier parse when possible.
+
+    :param env: The Liquid environment to parse with.
+    :type env: liquid.Environment
+    :param source: The template source.
+    :type source: str
+    :return: The compiled template.
+    :rtype: liquid.BoundTemplate
+    """
+    with _lock:
+        templates = getattr(env, _TEMPLATES, None)
+        if templates is None:
+            templates = OrderedDict()
+            setattr(env, _TEMPLATES, templates)
+            _envs.add(env)
+        template = templates.get(source)
+        if template is not None:
+            templates.move_to_end(source)
+            _stats["hits"] += 1
+            return template
+        _stats["misses"] += 1
+
+    # Parse outside the lock; a concurrent parse of the same source just
+    # stores an equivalent template.
+    template = env.from_string(source)
+    with _lock:
+        templates[source] = template
+        while len(templates) > MAX_TEMPLATES:
+            templates.popitem(last=False)
+    return template
+
+
+def render_template(env, source, **kwargs):
+    """
+    Render *source* with *env* through the compiled template cache.
+
+    :param env: The Liquid environment.
+    :type env: liquid.Environment
+    :param source: The template source.
+    :type source: str
+    :return: The rendered text.
+    :rtype: str
+    """
+    return compiled_template(env, source).render(**kwargs)
+
+
+def cache_info():
+    """
+    Return the number of cached templates and hit/miss counts.
+
+    :return: Dictionary with ``size``, ``hits`` and ``misses``.
+    :rtype: dict
+    """
+    with _lock:
+        size = sum(len(getattr(env, _TEMPLATES)) for env in _envs)
+        return {"size": size, "hits": _stats["hits"], "misses": _stats["misses"]}
+
+
+def clear_cache():
+    """Drop all compiled templates and reset the statistics."""
+    with _lock:
+        for env in list(_envs):
+            getattr(env, _TEMPLATES).clear()
+        _stats["hits"] = 0
+        _stats["misses"] = 0
@@ -0,0 +1,350 @@
+"""Embedded storage backends for output and series flows.
+
+Scores and series flows are normally spreadsheets, read in full at load
+and rewritten in full at every save.  Two further flow types can be chosen
+in ``_referia.yml`` instead::
+
+    output:
+      type: sqlite          # row-level upserts
+      filename: scores.db
+      table: scores         # defaults to the file's stem
+      index: index
+
+    series:
+      type: parquet         # fast bulk reads; needs pyarrow
+      filename: comments.parquet
+      index: index
+      selector: comment_id
+
+Both store the index as an ordinary column next to the data, as the
+spreadsheet readers expect, and keep column dtypes so timestamps come back
+as timestamps.  SQLite tables get a primary key on the index column when
+the index is unique; :func:`upsert_sqlite` then writes just the rows given,
+inside one transaction.  A Parquet file is rewritten whole (through the
+temporary file and rename of ``CustomDataFrame.save_flow``) but is much
+cheaper to read and write than a workbook.
+
+lynguine's ``access.io`` dispatches on ``type`` with no way to register a
+new one, so :func:`install` puts these backends in front of its
+``read_data``, ``write_data`` and ``data_exists``.  Everything that loads or
+saves flows through it (``CustomDataFrame.from_flow``, ``_load_scores``,
+``_load_series``, ``save_flows``) then handles the new types.
+
+:func:`export_flow` writes a stored flow out as an Excel workbook for
+people who need a spreadsheet (``referia export``).
+
+Public API
+----------
+STORE_TYPES
+    Flow types handled here.
+
+install()
+    Chain the backends in front of ``lynguine.access.io`` (idempotent).
+
+read_store(details) / write_store(df, details) / store_exists(details)
+    Read, write and check a flow of one of these types.
+
+upsert_sqlite(df, details, indices) -> bool
+    Write only the rows *indices* of a SQLite flow.
+
+export_flow(details, filename, sheet="Sheet1")
+    Write a stored flow to an Excel workbook.
+"""
+
+from __future__ import annotations
+
+import datetime
+import functools
+import math
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+
+from lynguine import access
+from lynguine.util.misc import extract_full_filename
+
+STORE_TYPES = frozenset({"sqlite", "parquet"})
+
+# Table recording each stored column's pandas dtype.
+_DTYPES_TABLE = "_referia_dtypes"
+
+
+def _quote(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _table(details: Mapping) -> str:
+    return details.get("table") or Path(details["filename"]).stem
+
+
+def _index_name(df: pd.DataFrame, details: Mapping) -> str:
+    index = details.get("index")
+    if isinstance(index, dict):
+        index = index.get("name")
+    return index if isinstance(index, str) else (df.index.name or "index")
+
+
+def _missing(value: Any) -> bool:
+    if value is None or value is pd.NA or value is pd.NaT:
+        return True
+    return isinstance(value, float) and math.isnan(value)
+
+
+def _frame(df: pd.DataFrame, details: Mapping) -> pd.DataFrame:
+    """Return *df* with its index as the first column, ready to store."""
+    name = _index_name(df, details)
+    if name in df.columns:
+        frame = pd.DataFrame(df).reset_index(drop=True)
+        return frame[[name] + [column for column in frame.columns if column != name]]
+    frame = pd.DataFrame(df).copy()
+    frame.index.name = name
+    return frame.reset_index()
+
+
+def _sql_value(value: Any) -> Any:
+    if isinstance(value, np.datetime64):
+        value = pd.Timestamp(value)
+    elif isinstance(value, np.generic):
+        value = value.item()
+    if _missing(value):
+        return None
+    if isinstance(value, (pd.Timestamp, datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float, str, bytes)):
+        return value
+    return str(value)
+
+
+def _restore_dtypes(df: pd.DataFrame, dtypes: Mapping[str, str]) -> pd.DataFrame:
+    for column, dtype in dtypes.items():
+        if column not in df.columns:
+            continue
+        if dtype.startswith("datetime64"):
+            df[column] = pd.to_datetime(df[column], errors="coerce")
+        elif dtype == "bool" and df[column].notna().all():
+            df[column] = df[column].astype(bool)
+    return df
+
+
+# -- SQLite -------------------------------------------------------------------
+
+def _connect(details: Mapping) -> sqlite3.Connection:
+    return sqlite3.connect(extract_full_filename(details))
+
+
+def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)
+    ).fetchone()
+    return row is not None
+
+
+def _record_dtypes(conn: sqlite3.Connection, table: str, frame: pd.DataFrame) -> None:
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {_DTYPES_TABLE} "
+        '("table" TEXT, "column" TEXT, "dtype" TEXT, PRIMARY KEY ("table", "column"))'
+    )
+    conn.execute(f'DELETE FROM {_DTYPES_TABLE} WHERE "table"=?', (table,))
+    conn.executemany(
+        f"INSERT INTO {_DTYPES_TABLE} VALUES (?, ?, ?)",
+        [(table, str(column), str(dtype)) for column, dtype in frame.dtypes.items()],
+    )
+
+
+def read_sqlite(details: Mapping) -> pd.DataFrame:
+    """Read a SQLite flow, rows in the order they were first written."""
+    table = _table(details)
+    with closing(_connect(details)) as conn:
+        df = pd.read_sql_query(f"SELECT * FROM {_quote(table)} ORDER BY rowid", conn)
+        dtypes = {}
+        if _table_exists(conn, _DTYPES_TABLE):
+            dtypes = dict(conn.execute(
+                f'SELECT "column", "dtype" FROM {_DTYPES_TABLE} WHERE "table"=?', (table,)
+            ).fetchall())
+    return _restore_dtypes(df, dtypes)
+
+
+def write_sqlite(df: pd.DataFrame, details: Mapping) -> None:
+    """Replace a SQLite flow's table with *df*, in one transaction."""
+    frame = _frame(df, details)
+    table = _table(details)
+    index = frame.columns[0]
+    columns = ", ".join(_quote(column) for column in frame.columns)
+    # Untyped columns keep each value's own type (no affinity).
+    key = f", PRIMARY KEY ({_quote(index)})" if frame[index].is_unique else ""
+    rows = [tuple(_sql_value(value) for value in row)
+            for row in frame.itertuples(index=False, name=None)]
+    with closing(_connect(details)) as conn:
+        with conn:
+            conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+            conn.execute(f"CREATE TABLE {_quote(table)} ({columns}{key})")
+            conn.executemany(
+                f"INSERT INTO {_quote(table)} VALUES ({', '.join('?' * len(frame.columns))})",
+                rows,
+            )
+            _record_dtypes(conn, table, frame)
+
+
+def upsert_sqlite(df: pd.DataFrame, details: Mapping, indices: Iterable[Any]) -> bool:
+    """Write the rows *indices* of *df* to its SQLite table, leaving the rest.
+
+    :return: False (nothing written) when the table is missing, has other
+        columns than *df*, or is not keyed on a unique index; the caller
+        then writes the whole flow.
+    """
+    indices = list(dict.fromkeys(indices))
+    if not df.index.is_unique or any(index not in df.index for index in indices):
+        return False
+    frame = _frame(df.loc[indices], details)
+    index = frame.columns[0]
+    table = _table(details)
+    path = extract_full_filename(details)
+    if not os.path.exists(path):
+        return False
+    with closing(sqlite3.connect(path)) as conn:
+        if not _table_exists(conn, table):
+            return False
+        info = conn.execute(f"PRAGMA table_info({_quote(table)})").fetchall()
+        if [row[1] for row in info] != list(frame.columns):
+            return False
+        if [row[1] for row in info if row[5]] != [index]:
+            return False
+        columns = ", ".join(_quote(column) for column in frame.columns)
+        updates = ", ".join(f"{_quote(c)}=excluded.{_quote(c)}" for c in frame.columns[1:])
+        action = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+        rows = [tuple(_sql_value(value) for value in row)
+                for row in frame.itertuples(index=False, name=None)]
+        with conn:
+            conn.executemany(
+                f"INSERT INTO {_quote(table)} ({columns}) "
+                f"VALUES ({', '.join('?' * len(frame.columns))}) "
+                f"ON CONFLICT ({_quote(index)}) {action}",
+                rows,
+            )
+            # A column's dtype can change (all-empty object to timestamps).
+            _record_dtypes(conn, table, _frame(df.iloc[:0], details))
+    return True
+
+
+def sqlite_exists(details: Mapping) -> bool:
+    path = extract_full_filename(details)
+    if not os.path.exists(path):
+        return False
+    with closing(sqlite3.connect(path)) as conn:
+        return _table_exists(conn, _table(details))
+
+
+# -- Parquet ------------------------------------------------------------------
+
+def _require_parquet() -> None:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as err:
+        raise ImportError(
+            "Parquet flows need pyarrow.  Install it with:  poetry install --with storage"
+        ) from err
+
+
+def read_parquet(details: Mapping) -> pd.DataFrame:
+    """Read a Parquet flow."""
+    _require_parquet()
+    return pd.read_parquet(extract_full_filename(details))
+
+
+def write_parquet(df: pd.DataFrame, details: Mapping) -> None:
+    """Write a Parquet flow (the whole file)."""
+    _require_parquet()
+    frame = _frame(df, details)
+    for column in frame.columns:
+        if frame[column].dtype != object:
+            continue
+        values = frame[column].map(lambda value: None if _missing(value) else value)
+        # Arrow needs one type per column; store mixed columns as text.
+        kinds = {type(value) for value in values if value is not None}
+        if len(kinds) > 1:
+            values = values.map(lambda value: None if value is None else str(value))
+        frame[column] = values
+    frame.to_parquet(extract_full_filename(details), index=False)
+
+
+# -- Dispatch -----------------------------------------------------------------
+
+def read_store(details: Mapping) -> pd.DataFrame:
+    """Read a flow of one of :data:`STORE_TYPES` (index as a column)."""
+    if details["type"] == "sqlite":
+        return read_sqlite(details)
+    return read_parquet(details)
+
+
+def write_store(df: pd.DataFrame, details: Mapping) -> None:
+    """Write a flow of one of :data:`STORE_TYPES` in full."""
+    if details["type"] == "sqlite":
+        write_sqlite(df, details)
+    else:
+        write_parquet(df, details)
+
+
+def store_exists(details: Mapping) -> bool:
+    """Whether the flow's data has been stored yet."""
+    if details["type"] == "sqlite":
+        return sqlite_exists(details)
+    return os.path.exists(extract_full_filename(details))
+
+
+def _is_store(details: Any) -> bool:
+    return isinstance(details, Mapping) and details.get("type") in STORE_TYPES
+
+
+def install() -> None:
+    """Handle :data:`STORE_TYPES` in ``lynguine.access.io``.
+
+    Wraps its ``read_data``, ``write_data`` and ``data_exists``; other
+    types still go to lynguine.  Calling it again does nothing.
+    """
+    io = access.io
+    if getattr(io.read_data, "_referia_store", False):
+        return
+
+    read_data, write_data, data_exists = io.read_data, io.write_data, io.data_exists
+
+    @functools.wraps(read_data)
+    def chained_read(details, *args, **kwargs):
+        if _is_store(details):
+            return io.finalize_data(read_store(details), details)
+        return read_data(details, *args, **kwargs)
+
+    @functools.wraps(write_data)
+    def chained_write(df, details, *args, **kwargs):
+        if _is_store(details):
+            return write_store(df, details)
+        return write_data(df, details, *args, **kwargs)
+
+    @functools.wraps(data_exists)
+    def chained_exists(details, *args, **kwargs):
+        if _is_store(details):
+            return store_exists(details)
+        return data_exists(details, *args, **kwargs)
+
+    for wrapper in (chained_read, chained_write, chained_exists):
+        wrapper._referia_store = True
+    io.read_data, io.write_data, io.data_exists = chained_read, chained_write, chained_exists
+
+
+def export_flow(details: Mapping, filename: str, sheet: str = "Sheet1") -> int:
+    """Write the flow stored as *details* to the Excel workbook *filename*.
+
+    :return: Number of rows written.
+    """
+    df = read_store(details)
+    writer = pd.ExcelWriter(filename, engine="xlsxwriter",
+                            datetime_format="YYYY-MM-DD HH:MM:SS.000")
+    df.to_excel(writer, sheet_name=sheet, index=False)
+    writer.close()
+    return len(df)
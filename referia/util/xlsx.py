@@ -0,0 +1,308 @@
+"""Cell-level updates of an existing ``.xlsx`` workbook.
+
+Saving an output flow through ``lynguine`` rewrites the whole workbook with
+xlsxwriter, which takes seconds for a scores sheet with thousands of rows
+even when one cell changed.  :func:`patch_cells` instead copies the
+workbook and rewrites only the changed ``<c>`` elements of the one sheet's
+XML; every other byte of the sheet and every other part of the package is
+kept as it was.  Loading the workbook into an object model (openpyxl)
+would cost more than the full rewrite it replaces.
+
+Rows are found through the index column of the sheet, columns through its
+header row.  Patching is refused (``False``, nothing written) whenever the
+workbook does not match the data closely enough to be edited cell by cell:
+the header differs from the data's columns, an index is missing or
+repeated, or a value needs formatting the sheet does not already have (a
+date in a column without a date style).  Callers then rewrite the file.
+
+Public API
+----------
+patch_cells(source, target, updates, columns, index_name, sheet="Sheet1", header=0) -> bool
+    Write a copy of *source* to *target* with *updates* applied.
+"""
+
+from __future__ import annotations
+
+import datetime
+import math
+import posixpath
+import re
+import zipfile
+from typing import Any, Iterable
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape, unescape
+
+import numpy as np
+import pandas as pd
+
+_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+_EXCEL_EPOCH = datetime.datetime(1899, 12, 30)
+# Longest string a cell holds.
+_MAX_STRING = 32767
+# Built-in number formats that display dates or times.
+_DATE_FORMAT_IDS = frozenset(range(14, 23)) | {45, 46, 47}
+# Characters XML 1.0 cannot carry.
+_INVALID_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_CELL_ATTR = re.compile(r'\s(\w+)="([^"]*)"')
+_CELL_VALUE = re.compile(r"<v>(.*?)</v>", re.S)
+_INLINE_TEXT = re.compile(r"<t\b[^>]*>(.*?)</t>", re.S)
+
+
+def _column_number(letters: str) -> int:
+    number = 0
+    for char in letters:
+        number = number * 26 + ord(char) - 64
+    return number
+
+
+def _split_ref(ref: str) -> tuple[str, int]:
+    match = re.fullmatch(r"([A-Z]+)(\d+)", ref)
+    return match.group(1), int(match.group(2))
+
+
+def _key(value: Any) -> str:
+    """Normalise an index value so sheet and data frame values compare equal."""
+    if isinstance(value, (np.generic,)):
+        value = value.item()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _sheet_part(archive: zipfile.ZipFile, sheet: str) -> str | None:
+    """Return the package path of the worksheet called *sheet*."""
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    rel_id = None
+    for node in workbook.iter(f"{_MAIN}sheet"):
+        if node.get("name") == sheet:
+            rel_id = node.get(f"{_REL}id")
+            break
+    if rel_id is None:
+        return None
+    rels = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    for node in rels.iter(f"{_PKG_REL}Relationship"):
+        if node.get("Id") == rel_id:
+            target = node.get("Target")
+            if target.startswith("/"):
+                return target.lstrip("/")
+            return posixpath.normpath(posixpath.join("xl", target))
+    return None
+
+
+def _shared_strings(archive: zipfile.ZipFile) -> list[str]:
+    try:
+        data = archive.read("xl/sharedStrings.xml")
+    except KeyError:
+        return []
+    root = ElementTree.fromstring(data)
+    return [
+        "".join(text.text or "" for text in item.iter(f"{_MAIN}t"))
+        for item in root.iter(f"{_MAIN}si")
+    ]
+
+
+def _date_styles(archive: zipfile.ZipFile) -> set[str]:
+    """Return the cell style indices (``s``) whose number format shows a date."""
+    try:
+        root = ElementTree.fromstring(archive.read("xl/styles.xml"))
+    except KeyError:
+        return set()
+    custom = {}
+    for fmt in root.iter(f"{_MAIN}numFmt"):
+        code = re.sub(r'"[^"]*"|\[[^\]]*\]', "", fmt.get("formatCode", "")).lower()
+        custom[int(fmt.get("numFmtId"))] = any(char in code for char in "ymdhs")
+    styles = set()
+    xfs = root.find(f"{_MAIN}cellXfs")
+    for position, xf in enumerate(xfs if xfs is not None else []):
+        fmt_id = int(xf.get("numFmtId", 0))
+        if fmt_id in _DATE_FORMAT_IDS or custom.get(fmt_id):
+            styles.add(str(position))
+    return styles
+
+
+def _cell_text(attrs: dict, body: str | None, strings: list[str]) -> str | None:
+    """Return the displayed text of a cell, for header and index matching."""
+    if not body:
+        return None
+    kind = attrs.get("t")
+    if kind == "inlineStr":
+        return unescape("".join(_INLINE_TEXT.findall(body)))
+    match = _CELL_VALUE.search(body)
+    if match is None:
+        return None
+    raw = unescape(match.group(1))
+    if kind == "s":
+        return strings[int(raw)]
+    if kind in ("str", "e", "b"):
+        return raw
+    try:
+        return _key(float(raw))
+    except ValueError:
+        return raw
+
+
+def _row_cells(sheet_xml: str, row: int) -> list[tuple[str, dict, str | None]]:
+    """Return ``(ref, attrs, body)`` for the cells of row *row*."""
+    match = re.search(rf'<row\b[^>]*\br="{row}"[^>]*?(?:/>|>(.*?)</row>)', sheet_xml, re.S)
+    if match is None or not match.group(1):
+        return []
+    cells = []
+    for cell in re.finditer(r"<c\b([^>]*?)(?:/>|>(.*?)</c>)", match.group(1), re.S):
+        attrs = dict(_CELL_ATTR.findall(cell.group(1)))
+        cells.append((attrs.get("r", ""), attrs, cell.group(2)))
+    return cells
+
+
+def _cell_xml(ref: str, value: Any, style: str | None, date_style: str | None) -> str | None:
+    """Return the ``<c>`` element for *value*, or ``None`` if it cannot be written here."""
+    style_attr = f' s="{style}"' if style else ""
+    if isinstance(value, np.datetime64):
+        value = pd.Timestamp(value)
+    elif isinstance(value, np.generic):
+        value = value.item()
+    if value is None or value is pd.NA or value is pd.NaT:
+        return f'<c r="{ref}"{style_attr}/>'
+    if isinstance(value, bool):
+        return f'<c r="{ref}"{style_attr} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        if isinstance(value, float) and math.isnan(value):
+            return f'<c r="{ref}"{style_attr}/>'
+        if isinstance(value, float) and math.isinf(value):
+            return None
+        return f'<c r="{ref}"{style_attr}><v>{value!r}</v></c>'
+    if isinstance(value, (pd.Timestamp, datetime.datetime)):
+        if value.tzinfo is not None or date_style is None:
+            return None
+        delta = pd.Timestamp(value).to_pydatetime() - _EXCEL_EPOCH
+        serial = delta.days + (delta.seconds + delta.microseconds / 1e6) / 86400
+        return f'<c r="{ref}" s="{date_style}"><v>{serial!r}</v></c>'
+    if isinstance(value, str):
+        if len(value) > _MAX_STRING or _INVALID_XML.search(value):
+            return None
+        text = escape(value)
+        return (f'<c r="{ref}"{style_attr} t="inlineStr">'
+                f'<is><t xml:space="preserve">{text}</t></is></c>')
+    return None
+
+
+def patch_cells(
+    source: str,
+    target: str,
+    updates: Iterable[tuple[Any, str, Any]],
+    columns: Iterable[str],
+    index_name: str,
+    sheet: str = "Sheet1",
+    header: int = 0,
+) -> bool:
+    """Copy workbook *source* to *target* with the given cells changed.
+
+    :param source: Existing ``.xlsx`` file.
+    :param target: Where to write the patched copy (may not be *source*).
+    :param updates: ``(index, column, value)`` for each cell to set.
+    :param columns: The data's columns (besides the index); the sheet's
+        header must hold exactly these plus *index_name*.
+    :param index_name: Header of the column holding the row index.
+    :param sheet: Worksheet name.
+    :param header: Zero-based row of the header, as lynguine's ``header``.
+    :return: ``True`` if *target* was written, ``False`` if the workbook
+        cannot be patched and must be rewritten.
+    """
+    updates = list(updates)
+    with zipfile.ZipFile(source) as archive:
+        part = _sheet_part(archive, sheet)
+        if part is None:
+            return False
+        strings = _shared_strings(archive)
+        sheet_xml = archive.read(part).decode("utf-8")
+
+        header_row = header + 1
+        names = {}
+        for ref, attrs, body in _row_cells(sheet_xml, header_row):
+            text = _cell_text(attrs, body, strings)
+            if text:
+                names[text] = _split_ref(ref)[0]
+        if set(names) != set(columns) | {index_name}:
+            return False
+
+        # Row of each index value, from the index column alone.
+        index_letters = names[index_name]
+        rows: dict[str, int | None] = {}
+        pattern = rf'<c\b(?=[^>]*\br="{index_letters}(\d+)")([^>]*?)(?:/>|>(.*?)</c>)'
+        for match in re.finditer(pattern, sheet_xml, re.S):
+            row = int(match.group(1))
+            if row <= header_row:
+                continue
+            text = _cell_text(dict(_CELL_ATTR.findall(match.group(2))), match.group(3), strings)
+            key = _key(text)
+            rows[key] = None if key in rows else row  # None: repeated index
+
+        edits: dict[int, dict[str, Any]] = {}
+        for index, column, value in updates:
+            row = rows.get(_key(index))
+            if row is None or column not in names or column == index_name:
+                return False
+            edits.setdefault(row, {})[names[column]] = value
+        date_styles = _date_styles(archive) if any(
+            isinstance(value, (pd.Timestamp, datetime.datetime))
+            for row_edits in edits.values() for value in row_edits.values()
+        ) else set()
+
+        sheet_xml = _apply(sheet_xml, edits, date_styles)
+        if sheet_xml is None:
+            return False
+
+        with zipfile.ZipFile(target, "w") as out:
+            for item in archive.infolist():
+                data = sheet_xml.encode("utf-8") if item.filename == part else archive.read(item)
+                out.writestr(item, data)
+    return True
+
+
+def _column_date_style(sheet_xml: str, letters: str, date_styles: set[str]) -> str | None:
+    for match in re.finditer(rf'<c\b[^>]*\br="{letters}\d+"[^>]*\bs="(\d+)"', sheet_xml):
+        if match.group(1) in date_styles:
+            return match.group(1)
+    return None
+
+
+def _apply(sheet_xml: str, edits: dict[int, dict[str, Any]], date_styles: set[str]) -> str | None:
+    """Return *sheet_xml* with *edits* (``{row: {letters: value}}``) applied."""
+    column_styles: dict[str, str | None] = {}
+    # Edit later rows first so earlier offsets stay valid.
+    for row in sorted(edits, reverse=True):
+        match = re.search(rf'<row\b[^>]*\br="{row}"[^>]*?(/>|>(.*?)</row>)', sheet_xml, re.S)
+        if match is None:
+            return None
+        open_tag = sheet_xml[match.start():match.start(1)]
+        body = match.group(2) or ""
+        for letters, value in edits[row].items():
+            ref = f"{letters}{row}"
+            existing = re.search(rf'<c\b(?=[^>]*\br="{ref}")([^>]*?)(?:/>|>(.*?)</c>)', body, re.S)
+            style = None
+            if existing is not None:
+                style = dict(_CELL_ATTR.findall(existing.group(1))).get("s")
+            date_style = style if style in date_styles else None
+            if date_style is None and isinstance(value, (pd.Timestamp, datetime.datetime)):
+                if letters not in column_styles:
+                    column_styles[letters] = _column_date_style(sheet_xml, letters, date_styles)
+                date_style = column_styles[letters]
+            cell = _cell_xml(ref, value, style, date_style)
+            if cell is None:
+                return None
+            if existing is not None:
+                body = body[:existing.start()] + cell + body[existing.end():]
+                continue
+            # Insert keeping the cells of the row in column order.
+            number = _column_number(letters)
+            position = len(body)
+            for other in re.finditer(r'<c\b[^>]*\br="([A-Z]+)\d+"', body):
+                if _column_number(other.group(1)) > number:
+                    position = other.start()
+                    break
+            body = body[:position] + cell + body[position:]
+        sheet_xml = f"{sheet_xml[:match.start()]}{open_tag}>{body}</row>{sheet_xml[match.end():]}"
+    return sheet_xml
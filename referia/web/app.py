@@ -2,26 +2,54 @@
 
 from __future__ import annotations
 
+import json
 import logging
+import os
 import time
 from pathlib import Path
-from typing import Any
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
+from referia.web.autosave import DEFAULT_AUTOSAVE_DELAY, Autosaver
+from referia.web.config_index import DEFAULT_REFRESH_INTERVAL, ConfigIndex
+from referia.web.panel_cache import DEFAULT_PANEL_CACHE_SIZE, PanelCache
+from referia.web.prefetch import DEFAULT_PREFETCH_BUDGET, Prefetcher
+from referia.web.reviewer_cache import (
+    DEFAULT_MAX_MEMORY_MB,
+    DEFAULT_MAX_REVIEWERS,
+    DEFAULT_REVIEWER_TTL,
+    ReviewerCache,
+)
+from referia.web.sessions import install_session_middleware
+from referia.web.workers import DEFAULT_WORKERS, ReviewerExecutor
+
 log = logging.getLogger(__name__)
 
 _WEB_DIR = Path(__file__).parent
 _TEMPLATES_DIR = _WEB_DIR / "templates"
 _STATIC_DIR = _WEB_DIR / "static"
 
+# Environment variable holding create_app() options for worker processes
+# started by uvicorn (see create_app_from_env).
+APP_OPTIONS_ENV = "REFERIA_APP_OPTIONS"
+
 
 def create_app(
     user_file: str = "_referia.yml",
     directory: str = ".",
     root: str | None = None,
+    workers: int = DEFAULT_WORKERS,
+    panel_cache_size: int = DEFAULT_PANEL_CACHE_SIZE,
+    prefetch_budget: float = DEFAULT_PREFETCH_BUDGET,
+    config_refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+    max_reviewers: int = DEFAULT_MAX_REVIEWERS,
+    max_reviewer_memory_mb: int = DEFAULT_MAX_MEMORY_MB,
+    reviewer_ttl: float = DEFAULT_REVIEWER_TTL,
+    autosave_delay: float = DEFAULT_AUTOSAVE_DELAY,
+    shared: bool = False,
+    shard: str | None = None,
 ) -> FastAPI:
     """Create and configure a FastAPI application for the given review directory.
 
@@ -47,6 +75,32 @@ def create_app(
         directory: Review directory for single-config mode (default: ``"."``).
         root: Root directory for multi-config mode.  When supplied, ``user_file``
             and ``directory`` are ignored.
+        workers: Size of the thread pool that runs blocking reviewer work
+            (data access, saves, populate computes) off the event loop.
+        panel_cache_size: Number of rendered review panels kept for reuse
+            (``0`` disables the cache).
+        prefetch_budget: Seconds spent after each navigation rendering the
+            next and previous records' panels into that cache (``0``
+            disables).
+        config_refresh_interval: Root-server mode only: seconds between
+            background rescans of the config metadata index that serves the
+            directory listings.
+        max_reviewers: Root-server mode only: loaded configs kept in memory
+            (``0`` for no limit).
+        max_reviewer_memory_mb: Root-server mode only: estimated megabytes of
+            loaded data kept in memory (``0`` for no limit).
+        reviewer_ttl: Root-server mode only: seconds an unused config stays
+            loaded (``0`` for no limit).
+        autosave_delay: Seconds without an edit after which edits are written
+            to the output files in the background (``0`` disables; edits are
+            then written by Save and at shutdown).
+        shared: Coordinate edits with other server processes serving the
+            same configs through ``referia.assess.shared`` (row versions,
+            conflict responses); needed whenever more than one process
+            runs.
+        shard: Root-server mode only: this process's worker name under a
+            ``referia.web.supervisor`` supervisor, which enables
+            ``POST /_shard/release``.
 
     Returns:
         Configured FastAPI application instance.
@@ -60,10 +114,42 @@ def create_app(
     templates = Jinja2Templates(directory=str(_TEMPLATES_DIR))
     app.state.templates = templates
     app.state.start_time = int(time.time())  # cache-buster for static assets
+    app.state.shared = shared
+
+    # Each browser (and tab) gets its own record cursor; see referia.web.sessions.
+    install_session_middleware(app)
+
+    # Blocking reviewer work runs on this pool; see referia.web.workers.
+    app.state.executor = ReviewerExecutor(max_workers=workers)
+    # Rendered panels, reused until the record changes; see referia.web.panel_cache.
+    app.state.panel_cache = PanelCache(maxsize=panel_cache_size)
+    # Neighbouring panels are rendered ahead of use; see referia.web.prefetch.
+    app.state.prefetcher = Prefetcher(
+        app.state.panel_cache, lock_for=app.state.executor.lock_for, budget=prefetch_budget
+    )
+
+    # Edits are written back in the background; see referia.web.autosave.
+    app.state.autosave = Autosaver(delay=autosave_delay, lock_for=app.state.executor.lock_for)
 
-    # reviewer_cache stores (mtime, WebReviewer) pairs keyed by resolved config path.
-    # Used in root-server mode; populated lazily on first request for each path.
-    app.state.reviewer_cache: dict[str, tuple[float, Any]] = {}
+    @app.on_event("startup")
+    async def _startup_autosave() -> None:
+        app.state.autosave.start()
+
+    @app.on_event("shutdown")
+    async def _shutdown_executor() -> None:
+        # Let running edits finish, then write whatever is still pending.
+        app.state.executor.shutdown(wait=True)
+        app.state.autosave.stop()
+
+    # reviewer_cache maps resolved config paths to (mtime, WebReviewer) pairs.
+    # Used in root-server mode; populated lazily on first request for each path
+    # and bounded (see referia.web.reviewer_cache).
+    app.state.reviewer_cache = ReviewerCache(
+        maxsize=max_reviewers,
+        max_memory=max_reviewer_memory_mb * 1024 * 1024,
+        ttl=reviewer_ttl,
+        lock_for=app.state.executor.lock_for,
+    )
 
     if root is not None:
         # ── Root-server mode ──────────────────────────────────────────────────
@@ -75,6 +161,9 @@ def create_app(
         # load_errors accumulates {path, type, time} dicts for the /errors page.
         # Exception text stays in the server log (CIP-000E).
         app.state.load_errors: list[dict] = []
+        # Listing metadata for every config under the root, kept in memory and
+        # rescanned in the background; see referia.web.config_index.
+        app.state.config_index = ConfigIndex(resolved_root, config_refresh_interval)
 
         # Write WARNING+ messages from all referia/lynguine loggers to a
         # single file at the root so errors are easy to find.
@@ -89,6 +178,7 @@ def create_app(
 
         @app.on_event("startup")
         async def _startup_root() -> None:
+            app.state.config_index.start()
             log.info(
                 "Referia root-server mode active.  "
                 "Configs loaded on demand from: %r  "
@@ -97,6 +187,12 @@ def create_app(
                 _log_path,
             )
 
+        @app.on_event("shutdown")
+        async def _shutdown_root() -> None:
+            app.state.config_index.stop()
+            # Save edits held by cached reviewers before the process exits.
+            app.state.reviewer_cache.clear()
+
     else:
         # ── Single-config mode (original behaviour) ───────────────────────────
         resolved_dir = str(Path(directory).resolve())
@@ -110,7 +206,7 @@ def create_app(
             """Instantiate WebReviewer once at startup so all routes share state."""
             try:
                 from referia.assess.web_review import WebReviewer
-                app.state.reviewer = WebReviewer(user_file, resolved_dir)
+                app.state.reviewer = WebReviewer(user_file, resolved_dir, shared=shared)
                 log.info(
                     "WebReviewer initialised: %d records loaded from %r/%r",
                     len(app.state.reviewer.index_list()),
@@ -126,6 +222,16 @@ def create_app(
                 )
                 app.state.reviewer = None
 
+        @app.on_event("shutdown")
+        async def _shutdown() -> None:
+            """Write edits the autosave has not yet written."""
+            reviewer = app.state.reviewer
+            if reviewer is not None and reviewer.dirty:
+                try:
+                    reviewer.flush()
+                except Exception:
+                    log.exception("Could not save edits at shutdown")
+
     # Register HTMX routes.
     # /health is registered first, then the single-config router, then the
     # root_router (if in root-server mode).  Order matters because Starlette
@@ -139,6 +245,19 @@ def create_app(
                 "mode": "root-server",
                 "root": app.state.root,
                 "configs_cached": len(app.state.reviewer_cache),
+                "config_index": app.state.config_index.stats(),
+                "reviewer_cache": app.state.reviewer_cache.stats(),
+                "workers": app.state.executor.max_workers,
+                "panel_cache": app.state.panel_cache.stats(),
+                "prefetch": app.state.prefetcher.stats(),
+                "autosave": app.state.autosave.stats(),
+                # Of the configs currently loaded.
+                "combinators": _combinator_totals(
+                    entry[1] for entry in map(app.state.reviewer_cache.get, app.state.reviewer_cache)
+                    if entry is not None
+                ),
+                "shared": app.state.shared,
+                "shard": shard,
             }
         reviewer_ok = app.state.reviewer is not None
         return {
@@ -147,8 +266,38 @@ def create_app(
             "reviewer": "loaded" if reviewer_ok else "failed",
             "config": app.state.user_file,
             "directory": app.state.directory,
+            "workers": app.state.executor.max_workers,
+            "panel_cache": app.state.panel_cache.stats(),
+            "prefetch": app.state.prefetcher.stats(),
+            "autosave": app.state.autosave.stats(),
+            "combinators": _combinator_totals([app.state.reviewer] if reviewer_ok else []),
+            "shared": app.state.shared,
         }
 
+    if root is not None and shard is not None:
+        @app.post("/_shard/release")
+        async def release(request: Request):
+            """Save and drop the reviewers for configs another worker now owns.
+
+            The supervisor posts the ring membership after a worker joins.
+            """
+            from referia.web.supervisor import HashRing, shard_key
+
+            body = await request.json()
+            ring = HashRing(body["nodes"], replicas=body["replicas"])
+            owner = body.get("owner", shard)
+
+            def moved(key: str) -> bool:
+                config = os.path.relpath(key, app.state.root).replace(os.sep, "/")
+                return ring.node_for(shard_key(config)) != owner
+
+            released = await app.state.executor.run(
+                None, app.state.reviewer_cache.evict_where, moved
+            )
+            if released:
+                log.info("Released %d config(s) to other workers", released)
+            return {"released": released}
+
     from referia.web.routes import router
     app.include_router(router)
 
@@ -157,3 +306,22 @@ def create_app(
         app.include_router(root_router)
 
     return app
+
+
+def _combinator_totals(reviewers) -> dict:
+    """Sum ``WebReviewer.combinator_stats()`` over *reviewers*."""
+    totals = {"evaluated": 0, "skipped": 0}
+    for reviewer in reviewers:
+        for key, count in reviewer.combinator_stats().items():
+            totals[key] = totals.get(key, 0) + count
+    return totals
+
+
+def create_app_from_env() -> FastAPI:
+    """Create the app from the JSON options in :data:`APP_OPTIONS_ENV`.
+
+    uvicorn starts each of several worker processes from an import string,
+    so ``referia serve --processes N`` passes its ``create_app`` keyword
+    arguments through the environment.
+    """
+    return create_app(**json.loads(os.environ.get(APP_OPTIONS_ENV, "{}")))
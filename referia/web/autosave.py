@@ -0,0 +1,172 @@
+"""Write-behind autosave for edited reviewers.
+
+Every form edit changes a ``WebReviewer`` in memory only; the spreadsheet
+was written when someone pressed Save, and edits were lost if the server
+stopped first.  ``Autosaver`` writes them back in the background instead.
+
+Routes call :meth:`Autosaver.schedule` after each edit.  A daemon thread
+calls ``reviewer.flush()`` (which writes only the output flows with dirty
+cells, each replaced atomically) once the reviewer has gone ``delay``
+seconds without a further edit, so a burst of edits is written once.
+Continuous editing is written at least every ``max_delay`` seconds.  The
+flush runs under the reviewer's worker lock, so it never overlaps a request
+using that reviewer.  A failed flush is logged and retried after ``delay``.
+
+:meth:`Autosaver.stop` flushes everything still pending, and the Save
+button only needs to call ``flush`` immediately.
+
+Public API
+----------
+Autosaver(delay=DEFAULT_AUTOSAVE_DELAY, lock_for=None)
+    ``delay=0`` disables background writes; edits are then written by
+    Save, cache eviction and shutdown only.
+
+autosaver.schedule(reviewer)
+    Note an edit to *reviewer*.
+
+autosaver.flush_all()
+    Write every pending reviewer now.
+
+autosaver.start() / autosaver.stop()
+    Run / stop the background thread (``stop`` flushes first).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+log = logging.getLogger(__name__)
+
+# Seconds without an edit before a reviewer is written.
+DEFAULT_AUTOSAVE_DELAY = 2.0
+# Longest an edit waits while editing continues, as a multiple of the delay.
+MAX_DELAY_FACTOR = 10
+
+
+class Autosaver:
+    """Debounced background flushing of edited reviewers.
+
+    :param delay: Seconds of quiet before writing, ``0`` to disable.
+    :param lock_for: Returns the lock to hold while flushing a reviewer.
+    :param clock: Monotonic time source (for tests).
+    :raises ValueError: If *delay* is negative.
+    """
+
+    def __init__(
+        self,
+        delay: float = DEFAULT_AUTOSAVE_DELAY,
+        lock_for: Callable[[Any], Any] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if delay < 0:
+            raise ValueError(f"delay must not be negative, got {delay!r}")
+        self.delay = delay
+        self.max_delay = delay * MAX_DELAY_FACTOR
+        self.flushes = 0
+        self.failures = 0
+        self._lock_for = lock_for
+        self._clock = clock
+        # id(reviewer) -> [reviewer, first edit time, due time]
+        self._pending: dict[int, list] = {}
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+
+    def schedule(self, reviewer: Any) -> None:
+        """Note an edit to *reviewer*; it is written after ``delay`` quiet seconds."""
+        if not self.delay:
+            return
+        now = self._clock()
+        with self._cond:
+            entry = self._pending.get(id(reviewer))
+            if entry is None:
+                self._pending[id(reviewer)] = [reviewer, now, now + self.delay]
+            else:
+                entry[2] = min(now + self.delay, entry[1] + self.max_delay)
+            self._cond.notify()
+
+    def pending(self) -> int:
+        """Number of reviewers waiting to be written."""
+        with self._cond:
+            return len(self._pending)
+
+    def flush_due(self) -> int:
+        """Write the reviewers whose quiet period has passed; return how many."""
+        now = self._clock()
+        with self._cond:
+            due = [entry[0] for entry in self._pending.values() if entry[2] <= now]
+        return sum(self._flush(reviewer) for reviewer in due)
+
+    def flush_all(self) -> int:
+        """Write every pending reviewer now; return how many were written."""
+        with self._cond:
+            due = [entry[0] for entry in self._pending.values()]
+        return sum(self._flush(reviewer) for reviewer in due)
+
+    def start(self) -> None:
+        """Start the background thread (no-op if running or disabled)."""
+        if not self.delay or (self._thread is not None and self._thread.is_alive()):
+            return
+        with self._cond:
+            self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="referia-autosave", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread and write everything still pending."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+        self.flush_all()
+
+    def stats(self) -> dict:
+        """Return the delay, pending count and flush counters."""
+        return {
+            "delay": self.delay,
+            "pending": self.pending(),
+            "flushes": self.flushes,
+            "failures": self.failures,
+        }
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._stopping:
+                    return
+                if self._pending:
+                    wait = min(entry[2] for entry in self._pending.values()) - self._clock()
+                else:
+                    wait = None
+                if wait is None or wait > 0:
+                    self._cond.wait(wait)
+                    continue
+            self.flush_due()
+
+    def _flush(self, reviewer: Any) -> bool:
+        """Flush *reviewer* under its lock; reschedule it on failure."""
+        lock = self._lock_for(reviewer) if self._lock_for is not None else contextlib.nullcontext()
+        with self._cond:
+            entry = self._pending.pop(id(reviewer), None)
+        if entry is None:
+            return False
+        try:
+            with lock:
+                reviewer.flush()
+        except Exception:
+            self.failures += 1
+            log.exception("Autosave failed; retrying in %.1fs", self.delay)
+            with self._cond:
+                # Keep the first-edit time so max_delay still applies; a newer
+                # schedule() of the same reviewer wins.
+                now = self._clock()
+                self._pending.setdefault(id(reviewer), [reviewer, entry[1], now + self.delay])
+            return False
+        self.flushes += 1
+        return True
@@ -0,0 +1,220 @@
+"""In-memory index of ``_referia.yml`` metadata for root-server mode.
+
+The root landing page, the directory listings served when a path has no
+config of its own, and ``/errors`` all need the title, date, ``current``
+flag, ``inherit`` target and parse status of every config under the root.
+Walking the tree with ``rglob`` and YAML-parsing every file on each of those
+requests takes seconds on a network- or cloud-synced drive with hundreds of
+reviews.
+
+``ConfigIndex`` keeps that metadata in memory keyed by path, together with
+each file's modification time and size.  A refresh walks the tree with
+``os.scandir`` (stat calls only) and re-parses just the files that were
+added or changed since the last pass; removed files are dropped.  A daemon
+thread repeats the refresh every ``refresh_interval`` seconds, so requests
+are served from memory and edits show up within one interval.
+
+Public API
+----------
+read_config_meta(yml_path) -> dict
+    Display metadata of one ``_referia.yml`` (``{"_error": True}`` if it
+    cannot be parsed).
+
+ConfigIndex(root, refresh_interval=DEFAULT_REFRESH_INTERVAL)
+    Metadata index for the tree under *root*.
+
+index.entries(base=None) -> list[tuple[Path, dict]]
+    ``(yml_path, meta)`` pairs under *base*, sorted by path.  Scans the tree
+    first if it has never been scanned.
+
+index.refresh() -> int
+    Rescan now; returns the number of files (re)parsed.
+
+index.start() / index.stop()
+    Run / stop the background refresh thread.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+CONFIG_FILENAME = "_referia.yml"
+
+# Seconds between background rescans of the root tree.
+DEFAULT_REFRESH_INTERVAL = 30.0
+
+
+def read_config_meta(yml_path: Path) -> dict:
+    """Return display metadata from a ``_referia.yml`` without loading WebReviewer.
+
+    Extracts ``title``, ``description``, ``date``, ``current``, and
+    ``inherit_abs`` via ``yaml.safe_load``.  Any parse error logs the exception
+    and returns ``{"_error": True}`` so a bad yml never breaks the listing page
+    and exception text never reaches the browser (CIP-000E).
+
+    ``date`` is normalised to an ISO-format string (``"YYYY-MM-DD"``).
+    ``current`` is coerced to a plain Python ``bool``.
+    ``inherit_abs`` is the resolved absolute ``Path`` of the inherited config
+    directory, or ``None`` if no ``inherit`` section is present.
+    """
+    try:
+        import yaml  # type: ignore[import]
+        with open(yml_path, encoding="utf-8") as fh:
+            data = yaml.safe_load(fh)
+        if not isinstance(data, dict):
+            return {}
+        raw_date = data.get("date")
+        date_str: str | None = None
+        if raw_date is not None:
+            try:
+                import datetime
+                if isinstance(raw_date, (datetime.date, datetime.datetime)):
+                    date_str = raw_date.strftime("%Y-%m-%d")
+                else:
+                    # Validate it looks like a date string.
+                    datetime.date.fromisoformat(str(raw_date))
+                    date_str = str(raw_date)
+            except (ValueError, TypeError):
+                pass
+
+        inherit_abs: Path | None = None
+        raw_inherit = data.get("inherit")
+        if isinstance(raw_inherit, dict):
+            rel_dir = raw_inherit.get("directory")
+            if rel_dir:
+                try:
+                    inherit_abs = (yml_path.parent / str(rel_dir)).resolve()
+                except Exception:
+                    pass
+
+        return {
+            "title": data.get("title") or data.get("name"),
+            "description": data.get("description"),
+            "date": date_str,
+            "current": bool(data.get("current", False)),
+            "inherit_abs": inherit_abs,
+        }
+    except Exception as exc:
+        log.warning("Failed to parse config %s: %s", yml_path, exc)
+        return {"_error": True}
+
+
+def _scan(root: Path) -> dict[Path, tuple[int, int]]:
+    """Map every config file under *root* to its ``(mtime_ns, size)``."""
+    found: dict[Path, tuple[int, int]] = {}
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name == CONFIG_FILENAME and entry.is_file():
+                            st = entry.stat()
+                            found[Path(entry.path)] = (st.st_mtime_ns, st.st_size)
+                    except OSError:
+                        continue
+        except OSError as exc:
+            log.debug("Cannot scan %s: %s", directory, exc)
+    return found
+
+
+class ConfigIndex:
+    """Config metadata for a root tree, refreshed incrementally.
+
+    :param root: Root directory of the tree.
+    :param refresh_interval: Seconds between background rescans.
+    """
+
+    def __init__(self, root: str | Path, refresh_interval: float = DEFAULT_REFRESH_INTERVAL) -> None:
+        self.root = Path(root).resolve()
+        self.refresh_interval = refresh_interval
+        self.scans = 0
+        self.parsed = 0
+        # path -> (signature, meta); replaced wholesale by refresh().
+        self._entries: dict[Path, tuple[tuple[int, int], dict]] = {}
+        self._scanned = False
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def refresh(self) -> int:
+        """Rescan the tree, re-parsing only added or changed configs.
+
+        :return: Number of configs parsed in this pass.
+        """
+        with self._refresh_lock:
+            current = self._entries
+            updated: dict[Path, tuple[tuple[int, int], dict]] = {}
+            parsed = 0
+            for path, signature in _scan(self.root).items():
+                known = current.get(path)
+                if known is not None and known[0] == signature:
+                    updated[path] = known
+                else:
+                    updated[path] = (signature, read_config_meta(path))
+                    parsed += 1
+            self._entries = updated
+            self._scanned = True
+            self.scans += 1
+            self.parsed += parsed
+            return parsed
+
+    def entries(self, base: str | Path | None = None) -> list[tuple[Path, dict]]:
+        """Return ``(yml_path, meta)`` pairs for configs under *base*.
+
+        :param base: Directory to restrict to (defaults to the root).
+        :return: Pairs sorted by path; the metadata dicts are shared and must
+            not be modified.
+        """
+        if not self._scanned:
+            self.refresh()
+        entries = self._entries
+        base_path = Path(base) if base is not None else self.root
+        return [
+            (path, entries[path][1])
+            for path in sorted(entries)
+            if path.parent == base_path or base_path in path.parent.parents
+        ]
+
+    def start(self) -> None:
+        """Start the background refresh thread (no-op if running)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="referia-config-index", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresh thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                log.exception("Config index refresh failed under %s", self.root)
+            if self._stop.wait(self.refresh_interval):
+                return
+
+    def stats(self) -> dict:
+        """Return the number of configs indexed and refresh counters."""
+        return {
+            "configs": len(self._entries),
+            "scans": self.scans,
+            "parsed": self.parsed,
+            "refresh_interval": self.refresh_interval,
+        }
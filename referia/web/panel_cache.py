@@ -0,0 +1,126 @@
+"""LRU cache of rendered review-panel fragments.
+
+Rendering a panel evaluates every viewer block (Liquid, then
+``markdown2html``), the whole review form and the index ``<select>``.  The
+result only changes when the record does, so flipping back to a record
+just viewed can reuse it.
+
+Entries are keyed by config path plus ``WebReviewer.panel_version()``: the
+reviewer's data generation, the record and sub-record in focus, and the
+record's write counter.  ``set_value``, ``run_populate``, compute hooks run
+by ``set_index`` and ``load_flows`` all move that version, so a stale entry
+is never looked up again and simply ages out.
+
+Public API
+----------
+PanelCache(maxsize=DEFAULT_PANEL_CACHE_SIZE)
+    Thread-safe LRU; ``maxsize=0`` disables caching.
+
+cache.get_or_build(config, reviewer, build) -> dict
+    Cached panel context for *reviewer*'s current record, or ``build()``.
+
+cache.warm(config, reviewer, build) -> bool
+    Store ``build()`` for *reviewer*'s current record unless already cached
+    (used by ``referia.web.prefetch``).
+
+cache.stats() -> dict
+    Size, capacity, hits, misses and panels warmed, as reported on
+    ``/health``.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+# Panels kept per server.  A panel is tens of KB of HTML for large forms.
+DEFAULT_PANEL_CACHE_SIZE = 128
+
+
+class PanelCache:
+    """LRU of panel template contexts shared by all reviewers of an app.
+
+    :param maxsize: Maximum number of panels kept, ``0`` to disable.
+    :type maxsize: int
+    :raises ValueError: If *maxsize* is negative.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_PANEL_CACHE_SIZE) -> None:
+        if maxsize < 0:
+            raise ValueError(f"maxsize must not be negative, got {maxsize!r}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.warmed = 0
+        self._entries: OrderedDict[tuple, dict] = OrderedDict()
+        # Routes run on the worker pool; different reviewers share this cache.
+        self._lock = threading.Lock()
+
+    def get_or_build(self, config: str, reviewer: Any, build: Callable[[], dict]) -> dict:
+        """Return the panel context for *reviewer*'s current record.
+
+        :param config: Config path the reviewer was loaded for (``""`` in
+            single-config mode).
+        :param reviewer: The ``WebReviewer``; its ``panel_version()`` keys
+            the entry.  A version of ``None`` bypasses the cache.
+        :param build: Renders the context on a miss.
+        :return: A fresh dict the caller may extend.
+        """
+        version = reviewer.panel_version() if self.maxsize else None
+        if version is None:
+            return build()
+        key = (config,) + tuple(version)
+        with self._lock:
+            ctx = self._entries.get(key)
+            if ctx is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(ctx)
+            self.misses += 1
+
+        ctx = build()
+        with self._lock:
+            self._entries[key] = ctx
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return dict(ctx)
+
+    def warm(self, config: str, reviewer: Any, build: Callable[[], dict]) -> bool:
+        """Build and keep the panel for *reviewer*'s current record ahead of use.
+
+        Does nothing if the panel is already cached; neither case counts as
+        a hit or a miss.
+
+        :return: Whether a panel was built.
+        """
+        version = reviewer.panel_version() if self.maxsize else None
+        if version is None:
+            return False
+        key = (config,) + tuple(version)
+        with self._lock:
+            if key in self._entries:
+                return False
+        ctx = build()
+        with self._lock:
+            self._entries[key] = ctx
+            self.warmed += 1
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return True
+
+    def clear(self) -> None:
+        """Drop every entry (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return size, capacity, hit/miss counts and panels warmed."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "warmed": self.warmed,
+            }
@@ -0,0 +1,149 @@
+"""Background rendering of the records next to the one just shown.
+
+Moving to another record costs a ``set_index`` (compute hooks, series
+checks) and, unless the panel cache already holds it, a full panel render
+while the assessor waits.  Assessors mostly step through records in order,
+so after each navigation ``Prefetcher`` renders the neighbouring records'
+panels into ``referia.web.panel_cache`` and the next/prev buttons usually
+find them there.
+
+A prefetch runs on the worker pool after the response has been sent:
+
+* It never waits for the reviewer's lock.  If a request holds it, the
+  prefetch is dropped; that request schedules its own.
+* Records are read through ``WebReviewer.preview``, which runs no compute
+  hooks and writes nothing.  Configs with pre-compute hooks (whose results
+  the panel shows) and records without a series row are skipped, so
+  prefetching never triggers an LLM call or a populate compute.
+* Rendering stops once ``budget`` seconds have been spent on one
+  navigation, nearest records first.
+
+Public API
+----------
+Prefetcher(panels, lock_for, budget=DEFAULT_PREFETCH_BUDGET, distance=DEFAULT_PREFETCH_DISTANCE)
+    ``budget=0`` disables prefetching.
+
+prefetcher.prefetch(reviewer, config, session, parent, build) -> int
+    Render the panels around *session*'s current record; returns how many
+    were built.
+
+prefetcher.stats() -> dict
+    Budget and counters, as reported on ``/health``.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Callable
+
+from referia.web.panel_cache import PanelCache
+
+log = logging.getLogger(__name__)
+
+# Seconds of rendering spent ahead of each navigation.
+DEFAULT_PREFETCH_BUDGET = 0.5
+# Records prefetched on each side of the current one.
+DEFAULT_PREFETCH_DISTANCE = 1
+
+
+class Prefetcher:
+    """Renders neighbouring panels into a :class:`PanelCache` ahead of use.
+
+    :param panels: Cache the panels are stored in.
+    :param lock_for: Returns the lock serialising work on a reviewer.
+    :param budget: Seconds of rendering per navigation, ``0`` to disable.
+    :param distance: Records prefetched on each side of the current one.
+    :param clock: Monotonic time source (for tests).
+    :raises ValueError: If *budget* or *distance* is negative.
+    """
+
+    def __init__(
+        self,
+        panels: PanelCache,
+        lock_for: Callable[[Any], Any],
+        budget: float = DEFAULT_PREFETCH_BUDGET,
+        distance: int = DEFAULT_PREFETCH_DISTANCE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if budget < 0:
+            raise ValueError(f"budget must not be negative, got {budget!r}")
+        if distance < 0:
+            raise ValueError(f"distance must not be negative, got {distance!r}")
+        self.panels = panels
+        self.budget = budget
+        self.distance = distance
+        self.built = 0
+        self.skipped = 0
+        self.busy = 0
+        self.failures = 0
+        self._lock_for = lock_for
+        self._clock = clock
+
+    @property
+    def enabled(self) -> bool:
+        """Whether prefetching does anything."""
+        return bool(self.budget and self.distance and self.panels.maxsize)
+
+    def prefetch(self, reviewer: Any, config: str, session: str | None,
+                 parent: str | None, build: Callable[[], dict]) -> int:
+        """Render the panels of the records around *session*'s current one.
+
+        :param reviewer: The ``WebReviewer``.
+        :param config: Config path keying the panel cache (``""`` in
+            single-config mode).
+        :param session: Browser session whose cursor is used, as for
+            ``reviewer.session``.
+        :param parent: Session that cursor is initialised from.
+        :param build: Renders the panel context of the record in focus.
+        :return: Number of panels built.
+        """
+        if not self.enabled:
+            return 0
+        lock = self._lock_for(reviewer)
+        if not lock.acquire(blocking=False):
+            self.busy += 1
+            return 0
+        built = 0
+        try:
+            with reviewer.session(session, parent):
+                started = self._clock()
+                for index in self._targets(reviewer):
+                    if self._clock() - started >= self.budget:
+                        break
+                    with reviewer.preview(index) as focused:
+                        if not focused:
+                            self.skipped += 1
+                            continue
+                        if self.panels.warm(config, reviewer, build):
+                            built += 1
+        except Exception:
+            # A failed prefetch only costs the speed-up.
+            self.failures += 1
+            log.warning("Prefetch failed for %r", config or reviewer, exc_info=True)
+        finally:
+            lock.release()
+        self.built += built
+        return built
+
+    def _targets(self, reviewer: Any) -> list:
+        """Indices around the current record, nearest first, next before previous."""
+        catalog = reviewer.index_catalog()
+        current = reviewer.get_index()
+        targets: list = []
+        for step in range(1, self.distance + 1):
+            for index in (catalog.neighbour(current, step), catalog.neighbour(current, -step)):
+                if index is not None and index != current and index not in targets:
+                    targets.append(index)
+        return targets
+
+    def stats(self) -> dict:
+        """Return the budget and prefetch counters."""
+        return {
+            "budget": self.budget,
+            "distance": self.distance,
+            "built": self.built,
+            "skipped": self.skipped,
+            "busy": self.busy,
+            "failures": self.failures,
+        }
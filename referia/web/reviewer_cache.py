@@ -0,0 +1,280 @@
+"""Bounded cache of loaded ``WebReviewer`` objects for root-server mode.
+
+A root server loads a reviewer (interface plus every data flow) the first
+time a config is requested.  Kept forever, a server that has been asked for
+a few hundred configs holds a few hundred data frames.  ``ReviewerCache``
+bounds that with three limits, applied whenever a reviewer is stored or
+looked up:
+
+* ``maxsize`` — number of reviewers kept;
+* ``max_memory`` — total estimated size in bytes, from
+  ``WebReviewer.memory_usage()`` measured when the reviewer is stored;
+* ``ttl`` — seconds a reviewer may go unused.
+
+The least recently used reviewers go first.  A reviewer with unsaved edits
+(``reviewer.dirty``) is saved before it is dropped, while holding its worker
+lock so no request is using it; if the save fails it stays cached and the
+failure is logged and counted.  Once saved it is closed
+(``reviewer.close()``) under the same lock, so a request that picked it up
+before it was dropped cannot write to it afterwards.  The same applies to a
+reviewer replaced because its ``_referia.yml`` changed on disk.
+
+The cache is a ``MutableMapping`` of ``key -> (mtime, reviewer)`` so code
+that treats ``app.state.reviewer_cache`` as a dict keeps working;
+``lookup``/``store`` add recency, statistics and eviction.
+
+Public API
+----------
+ReviewerCache(maxsize=..., max_memory=..., ttl=..., lock_for=None)
+    ``0`` disables a limit.  *lock_for* maps a reviewer to the lock that
+    serialises work on it (``ReviewerExecutor.lock_for``).
+
+cache.lookup(key, mtime) -> reviewer | None
+    Cached reviewer for *key* if it was loaded from this *mtime*.
+
+cache.store(key, mtime, reviewer)
+    Insert and evict down to the limits.
+
+cache.evict_where(predicate) -> int
+    Save if needed and drop the reviewers whose key matches.
+
+cache.stats() -> dict
+    Size, memory, limits, hits, misses and evictions, as on ``/health``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Iterator
+
+log = logging.getLogger(__name__)
+
+# Defaults for ``referia serve --root``.
+DEFAULT_MAX_REVIEWERS = 32
+DEFAULT_MAX_MEMORY_MB = 2048
+DEFAULT_REVIEWER_TTL = 3600.0
+
+
+class _Entry:
+    __slots__ = ("mtime", "reviewer", "size", "last_used")
+
+    def __init__(self, mtime: float, reviewer: Any, size: int, last_used: float) -> None:
+        self.mtime = mtime
+        self.reviewer = reviewer
+        self.size = size
+        self.last_used = last_used
+
+
+def _estimate_size(reviewer: Any) -> int:
+    measure = getattr(reviewer, "memory_usage", None)
+    if measure is None:
+        return 0
+    try:
+        return int(measure())
+    except Exception:
+        log.debug("Could not measure reviewer memory", exc_info=True)
+        return 0
+
+
+class ReviewerCache(MutableMapping):
+    """LRU of reviewers bounded by count, estimated memory and idle time.
+
+    :param maxsize: Maximum number of reviewers, ``0`` for no limit.
+    :param max_memory: Maximum total estimated bytes, ``0`` for no limit.
+    :param ttl: Seconds a reviewer may stay unused, ``0`` for no limit.
+    :param lock_for: Returns the lock to hold while saving a reviewer.
+    :param clock: Monotonic time source (for tests).
+    :raises ValueError: If a limit is negative.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAX_REVIEWERS,
+        max_memory: int = DEFAULT_MAX_MEMORY_MB * 1024 * 1024,
+        ttl: float = DEFAULT_REVIEWER_TTL,
+        lock_for: Callable[[Any], Any] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        for name, value in (("maxsize", maxsize), ("max_memory", max_memory), ("ttl", ttl)):
+            if value < 0:
+                raise ValueError(f"{name} must not be negative, got {value!r}")
+        self.maxsize = maxsize
+        self.max_memory = max_memory
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.flush_failures = 0
+        self._lock_for = lock_for
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._guard = threading.Lock()
+
+    # -- Mapping protocol: key -> (mtime, reviewer) ------------------------
+
+    def __getitem__(self, key: str) -> tuple[float, Any]:
+        entry = self._entries[key]
+        return entry.mtime, entry.reviewer
+
+    def __setitem__(self, key: str, value: tuple[float, Any]) -> None:
+        mtime, reviewer = value
+        self.store(key, mtime, reviewer)
+
+    def __delitem__(self, key: str) -> None:
+        with self._guard:
+            del self._entries[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -- Cache operations ---------------------------------------------------
+
+    def peek(self, key: str, mtime: float) -> Any:
+        """Like :meth:`lookup` but without touching recency or statistics."""
+        entry = self._entries.get(key)
+        if entry is not None and entry.mtime == mtime:
+            return entry.reviewer
+        return None
+
+    def lookup(self, key: str, mtime: float) -> Any:
+        """Return the reviewer cached for *key* if loaded from *mtime*.
+
+        :param key: Config file path.
+        :param mtime: Current modification time of the config file.
+        :return: The reviewer, or ``None`` on a miss (absent or stale).
+        """
+        self._expire()
+        with self._guard:
+            entry = self._entries.get(key)
+            if entry is None or entry.mtime != mtime:
+                self.misses += 1
+                return None
+            entry.last_used = self._clock()
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.reviewer
+
+    def store(self, key: str, mtime: float, reviewer: Any) -> None:
+        """Cache *reviewer* for *key* and evict down to the limits.
+
+        A different reviewer previously cached for *key* is saved first if
+        it has unsaved edits.
+        """
+        entry = _Entry(mtime, reviewer, _estimate_size(reviewer), self._clock())
+        with self._guard:
+            previous = self._entries.get(key)
+            if previous is not None and previous.reviewer is not reviewer:
+                # Keep the old reviewer reachable until it is flushed.
+                replaced = previous
+            else:
+                replaced = None
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+        if replaced is not None and not self._retire(replaced.reviewer):
+            log.warning("Unsaved edits in replaced reviewer for %s could not be saved", key)
+        self._expire()
+        self._shrink(protect=key)
+
+    def memory(self) -> int:
+        """Return the total estimated bytes of the cached reviewers."""
+        with self._guard:
+            return sum(entry.size for entry in self._entries.values())
+
+    def clear(self) -> None:
+        """Drop every reviewer, saving those with unsaved edits."""
+        for key in list(self._entries):
+            self._evict(key)
+
+    def evict_where(self, predicate: Callable[[str], bool]) -> int:
+        """Drop the reviewers whose key satisfies *predicate*, saving edits first.
+
+        :return: Number of reviewers dropped (those whose save failed stay).
+        """
+        return sum(self._evict(key) for key in list(self._entries) if predicate(key))
+
+    def stats(self) -> dict:
+        """Return size, memory, limits and hit/miss/eviction counts."""
+        with self._guard:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "memory_bytes": sum(entry.size for entry in self._entries.values()),
+                "max_memory_bytes": self.max_memory,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "flush_failures": self.flush_failures,
+            }
+
+    # -- Eviction -----------------------------------------------------------
+
+    def _expire(self) -> None:
+        if not self.ttl:
+            return
+        cutoff = self._clock() - self.ttl
+        with self._guard:
+            idle = [key for key, entry in self._entries.items() if entry.last_used < cutoff]
+        for key in idle:
+            self._evict(key)
+
+    def _over_limit(self) -> bool:
+        if self.maxsize and len(self._entries) > self.maxsize:
+            return True
+        if self.max_memory and sum(e.size for e in self._entries.values()) > self.max_memory:
+            return True
+        return False
+
+    def _shrink(self, protect: str | None = None) -> None:
+        tried: set[str] = set()
+        while True:
+            with self._guard:
+                if not self._over_limit():
+                    return
+                victim = next(
+                    (key for key in self._entries if key != protect and key not in tried),
+                    None,
+                )
+            if victim is None:
+                return
+            tried.add(victim)
+            self._evict(victim)
+
+    def _evict(self, key: str) -> bool:
+        """Save *key*'s reviewer if dirty and drop it; keep it if saving fails."""
+        with self._guard:
+            entry = self._entries.get(key)
+        if entry is None:
+            return False
+        if not self._retire(entry.reviewer):
+            return False
+        with self._guard:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+                self.evictions += 1
+                return True
+        return False
+
+    def _retire(self, reviewer: Any) -> bool:
+        """Save *reviewer* if it has unsaved edits and close it; False if the save fails."""
+        lock = self._lock_for(reviewer) if self._lock_for is not None else contextlib.nullcontext()
+        with lock:
+            if getattr(reviewer, "dirty", False):
+                try:
+                    reviewer.flush()
+                except Exception:
+                    self.flush_failures += 1
+                    log.exception("Could not save reviewer before evicting it")
+                    return False
+            close = getattr(reviewer, "close", None)
+            if close is not None:
+                close()
+            return True
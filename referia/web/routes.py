@@ -10,18 +10,29 @@ All routes share a ``WebReviewer`` instance stored in ``app.state.reviewer``.
 ``GET /record``
     Review-panel fragment for ``?index=<value>`` (HTMX partial swap).
 
-``GET /indices``
-    Index-selector ``<select>`` fragment.
+``GET /record/next`` / ``GET /record/prev``
+    Review-panel fragment for the neighbouring record.
+
+``GET /indices?q=&offset=&limit=``
+    One page of record indices matching ``q`` (prefix matches, then
+    substring matches) for the index search box.
 
 ``POST /field/{column}``
     Accept a form value, call ``WebReviewer.set_value()``, return a status
     fragment plus OOB widget refreshes for all affected columns.
 
+``POST /fields``
+    Accept several form values at once (``base.html`` batches edits made
+    in quick succession), call ``WebReviewer.set_values()`` so timestamps
+    and combinators are updated in one pass, and return one status
+    fragment plus OOB refreshes for every affected column.
+
 ``POST /save``
-    Persist data; return a status fragment.
+    Write unsaved edits now; return a status fragment.
 
 ``POST /reload``
-    Reload data from source files; return a refreshed review panel.
+    Re-read the source files that changed on disk (and discard unsaved
+    edits); return a refreshed review panel.
 
 ``POST /populate/{field}``
     Trigger an on-demand compute function for *field*; return a status
@@ -40,11 +51,14 @@ under the root directory.  Reviewers are lazily loaded and cached by
 ``GET /{config_path:path}/record``
     Panel fragment.
 
+``GET /{config_path:path}/record/next`` / ``.../record/prev``
+    Neighbouring record.
+
 ``GET /{config_path:path}/indices``
-    Index selector.
+    Index search.
 
-``POST /{config_path:path}/field/{column}``
-    Field update.
+``POST /{config_path:path}/field/{column}`` / ``POST /{config_path:path}/fields``
+    Field update / batched field update.
 
 ``POST /{config_path:path}/save`` / ``POST /{config_path:path}/reload``
     Persist / reload.
@@ -52,6 +66,54 @@ under the root directory.  Reviewers are lazily loaded and cached by
 ``POST /{config_path:path}/populate/{field}``
     On-demand compute.
 
+Worker pool
+-----------
+Every route is ``async def`` but reviewer work (pandas lookups, spreadsheet
+writes, populate computes) is blocking.  Routes hand that work to
+``app.state.executor`` (see ``referia.web.workers``) via :func:`_in_worker`,
+which serialises calls per reviewer.  The event loop only parses requests and
+assembles templates.
+
+Panel cache
+-----------
+Panel contexts (viewer blocks, form HTML, index selector) are kept in
+``app.state.panel_cache`` (see ``referia.web.panel_cache``), keyed by config
+path and ``WebReviewer.panel_version()``.
+
+Prefetch
+--------
+Navigation responses (full page, ``/record``, ``/record/next``,
+``/record/prev``) carry a background task that renders the panels of the
+neighbouring records into the panel cache once the response is sent (see
+``referia.web.prefetch``), so stepping through records usually hits it.
+
+Autosave
+--------
+Routes that change data (field updates, populate) queue the reviewer on
+``app.state.autosave`` (see ``referia.web.autosave``), which writes the
+edited output flows once editing pauses.  ``POST /save`` writes them at once.
+
+Config index
+------------
+Root-mode listings (``GET /``, directory pages, ``/errors``) read config
+metadata from ``app.state.config_index`` (see ``referia.web.config_index``),
+which a background thread keeps in step with the tree.
+
+Sessions
+--------
+Each browser, and each tab within it, keeps its own current record in the
+shared reviewer.  :func:`_in_worker` runs reviewer work inside
+``WebReviewer.session`` for the key from ``referia.web.sessions``.
+
+Shared state
+------------
+With ``create_app(shared=True)`` (several server processes) reviewers
+commit edits through ``referia.assess.shared``.  The panel carries the
+record's version in a hidden ``#row-version`` input, which ``base.html``
+sends with each field update as ``X-Referia-Row-Version``.  An update to a
+field another worker changed since then is refused with a 409 response
+that shows the current value instead.
+
 Client-side URL rewriting
 --------------------------
 ``base.html`` injects a ``CONFIG_PATH`` JS constant (empty string in
@@ -62,13 +124,24 @@ single-config mode, the config prefix in root mode).  An
 
 from __future__ import annotations
 
+import functools
 import html
 import logging
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+from urllib.parse import urlencode
 
 from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
+from starlette.background import BackgroundTask
+
+from referia.assess.shared import EditConflict
+from referia.exceptions import ReviewerClosed
+from referia.web.config_index import ConfigIndex, read_config_meta
+from referia.web.panel_cache import PanelCache
+from referia.web.sessions import session_key
 
 from referia.web.path_safety import PathOutsideRootError, safe_path_under_root
 from referia.web.render import render_widget, render_form, render_viewer
@@ -77,6 +150,13 @@ log = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Matches returned per ``GET /indices`` page, by default and at most.
+DEFAULT_INDEX_PAGE = 50
+MAX_INDEX_PAGE = 500
+
+# Request header carrying the record version the browser's panel shows.
+ROW_VERSION_HEADER = "X-Referia-Row-Version"
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -126,18 +206,61 @@ def _templates(request: Request):
     return request.app.state.templates
 
 
+async def _in_worker(request: Request, reviewer, fn, *args: Any, **kwargs: Any) -> Any:
+    """Run blocking *fn* on the app's worker pool, serialised on *reviewer*.
+
+    *fn* runs inside the request's browser session (``reviewer.session``), so
+    index changes and reads apply to that browser's cursor only.  Pass
+    ``reviewer=None`` for work that does not touch a reviewer.
+    """
+    if reviewer is not None:
+        key, parent = session_key(request)
+        fn = functools.partial(_in_session, reviewer, key, parent, fn)
+    return await request.app.state.executor.run(reviewer, fn, *args, **kwargs)
+
+
+def _schedule_autosave(request: Request, reviewer) -> None:
+    """Queue *reviewer* for a background write after an edit."""
+    autosave = getattr(request.app.state, "autosave", None)
+    if autosave is not None:
+        autosave.schedule(reviewer)
+
+
+def _panels(request: Request) -> PanelCache | None:
+    """Return the app's rendered-panel cache (``None`` if it has none)."""
+    return getattr(request.app.state, "panel_cache", None)
+
+
+def _prefetch_task(request: Request, reviewer, config: str = "") -> BackgroundTask | None:
+    """Background task rendering the panels next to the one being returned."""
+    prefetcher = getattr(request.app.state, "prefetcher", None)
+    if prefetcher is None or not prefetcher.enabled:
+        return None
+    key, parent = session_key(request)
+    build = functools.partial(_panel_response_context, reviewer)
+    return BackgroundTask(
+        request.app.state.executor.run, None,
+        prefetcher.prefetch, reviewer, config, key, parent, build,
+    )
+
+
+def _in_session(reviewer, key: str | None, parent: str | None, fn, *args: Any, **kwargs: Any) -> Any:
+    with reviewer.session(key, parent):
+        return fn(*args, **kwargs)
+
+
 def _current_data(reviewer) -> dict:
     """Return the current record's data as a plain dict for widget rendering.
 
     Starts from the full row so that columns referenced in ``visible_if``
     conditions (which may not have a corresponding widget) are available.
-    Widget-field values are then refreshed via :meth:`get_value` to pick up
-    any in-flight changes that haven't been persisted yet.
+    The row snapshot is refreshed on every write, so only widget fields the
+    row does not cover are read individually with :meth:`get_value`.
     """
     data: dict = reviewer.get_row_data()
     for spec in reviewer.get_widget_specs():
         col = spec.get("field")
-        if col:
+        if col and col not in data:
             try:
                 data[col] = reviewer.get_value(col)
             except Exception:
@@ -145,53 +268,15 @@ def _current_data(reviewer) -> dict:
     return data
 
 
-def _find_spec(reviewer, column: str) -> dict | None:
-    """Return the first widget spec whose ``field`` matches *column*.
-
-    Skips PopulateButton specs because they share ``field`` with their target
-    widget; use :func:`_find_populate_spec` to locate buttons specifically.
-    """
-    for spec in reviewer.get_widget_specs():
-        if spec.get("field") == column and spec.get("type") != "PopulateButton":
-            return spec
-    return None
-
-
-def _populate_button_target(spec: dict) -> str:
-    """Return the effective target field for a PopulateButton spec.
-
-    Handles both formats:
-    * Simple: top-level ``field`` key.
-    * Complex: ``args.target`` or ``args.compute.field``.
-
-    ``args.target`` / ``args.compute.field`` take priority because the
-    top-level ``field`` may be a button identifier, not the populate target.
-    """
-    args = spec.get("args", {})
-    return (
-        args.get("target")
-        or args.get("compute", {}).get("field")
-        or spec.get("field")
-        or ""
-    )
-
-
-def _find_populate_spec(reviewer, field: str) -> dict | None:
-    """Return the PopulateButton spec whose effective target field matches *field*."""
-    for spec in reviewer.get_widget_specs():
-        if spec.get("type") == "PopulateButton" and _populate_button_target(spec) == field:
-            return spec
-    return None
-
-
 def _panel_response_context(reviewer) -> dict:
     """Build the shared template context dict for ``review_panel.html``.
 
     Used by single-config and root-mode routes so the panel-rendering logic
     lives in exactly one place.
     """
-    indices = reviewer.index_list()
+    catalog = reviewer.index_catalog()
     current_index = reviewer.get_index()
+    position = catalog.position(current_index)
     data = _current_data(reviewer)
 
     viewer_blocks = [
@@ -199,15 +284,16 @@ def _panel_response_context(reviewer) -> dict:
         for spec in reviewer.get_viewer_specs()
     ]
     form_html = render_form(reviewer.get_review_specs(), data)
-    index_selector = _render_index_selector(indices, current_index)
+    index_selector = _render_index_selector(current_index)
 
     return {
         "index_selector": index_selector,
         "viewer_blocks": viewer_blocks,
         "form_html": form_html,
         "current_index": current_index,
-        "total": len(indices),
-        "position": (indices.index(current_index) + 1) if current_index in indices else "?",
+        "total": len(catalog),
+        "position": position + 1 if position is not None else "?",
+        "row_version": reviewer.row_version(),
     }
 
 
@@ -218,25 +304,52 @@ def _render_panel(reviewer, request: Request) -> str:
     return response.body.decode()
 
 
-def _render_index_selector(indices: list, current_index: Any) -> str:
-    """Render the index ``<select>`` widget as an HTML string."""
-    options = "\n".join(
-        f'  <option value="{_esc(idx)}"'
-        f'{" selected" if idx == current_index else ""}>'
-        f"{_esc(idx)}</option>"
-        for idx in indices
-    )
+def _render_index_selector(current_index: Any) -> str:
+    """Render the index search box as an HTML string.
+
+    Matching records are fetched page by page from ``GET /indices`` as the
+    user types, so the panel never carries the full index list.
+    """
     return (
-        '<select id="index-select" name="index" class="index-select"\n'
-        '        hx-get="/record"\n'
-        '        hx-trigger="change"\n'
-        '        hx-target="#review-panel"\n'
-        '        hx-swap="innerHTML">\n'
-        f"{options}\n"
-        "</select>"
+        '<div class="index-search">\n'
+        '  <input type="search" id="index-select" name="q" class="index-select"\n'
+        f'         placeholder="{_esc(current_index)}" autocomplete="off"\n'
+        '         aria-label="Search records"\n'
+        '         hx-get="/indices"\n'
+        '         hx-trigger="input changed delay:250ms, focus"\n'
+        '         hx-target="#index-results"\n'
+        '         hx-swap="innerHTML">\n'
+        '  <div id="index-results" class="index-results"></div>\n'
+        "</div>"
     )
 
 
+def _render_index_results(page: list, total: int, query: str, offset: int, limit: int) -> str:
+    """Render one page of ``GET /indices`` matches.
+
+    Each match loads its record into the panel; a trailing button fetches
+    the next page in place.
+    """
+    items = [
+        f'<button type="button" class="index-result"'
+        f' hx-get="/record?{urlencode({"index": str(idx)})}"'
+        ' hx-target="#review-panel" hx-swap="innerHTML">'
+        f"{_esc(idx)}</button>"
+        for idx in page
+    ]
+    if not page and offset == 0:
+        items.append('<span class="index-empty">No matching records.</span>')
+    following = offset + len(page)
+    if following < total:
+        params = urlencode({"q": query, "offset": following, "limit": limit})
+        items.append(
+            f'<button type="button" class="index-more"'
+            f' hx-get="/indices?{params}" hx-target="this" hx-swap="outerHTML">'
+            f"More ({total - following} left)</button>"
+        )
+    return "\n".join(items)
+
+
 def _esc(value: Any) -> str:
     return html.escape(str(value) if value is not None else "")
 
@@ -257,6 +370,22 @@ def _log_route_error(action: str, exc: Exception, **context: Any) -> None:
     log.exception("%s failed %s", action, extra)
 
 
+def _row_version(request: Request) -> int | None:
+    """Return the record version the browser sent, if any."""
+    try:
+        return int(request.headers[ROW_VERSION_HEADER])
+    except (KeyError, ValueError):
+        return None
+
+
+def _row_version_oob(reviewer) -> str:
+    """OOB swap updating the page's ``#row-version`` (empty when not shared)."""
+    version = reviewer.row_version()
+    if version is None:
+        return ""
+    return f'<input type="hidden" id="row-version" value="{int(version)}" hx-swap-oob="true">'
+
+
 def _make_oob(widget_html: str) -> str:
     """Add ``hx-swap-oob="true"`` to the outermost widget container div."""
     return widget_html.replace(
@@ -266,6 +395,164 @@ def _make_oob(widget_html: str) -> str:
     )
 
 
+# ---------------------------------------------------------------------------
+# Blocking route bodies
+#
+# Each helper below does the reviewer work for one route and is run on the
+# worker pool through _in_worker().  They are shared by the single-config and
+# root-mode routes.
+# ---------------------------------------------------------------------------
+
+
+def _cached_panel_context(reviewer, panels: PanelCache | None = None, config: str = "") -> dict:
+    """:func:`_panel_response_context` through the app's panel cache, if any."""
+    if panels is None:
+        return _panel_response_context(reviewer)
+    return panels.get_or_build(config, reviewer, lambda: _panel_response_context(reviewer))
+
+
+def _select_record_context(reviewer, index: str | None,
+                           panels: PanelCache | None = None, config: str = "") -> dict:
+    """Switch to *index* (when given) and return the panel template context."""
+    if index is not None:
+        reviewer.set_index(index)
+    return _cached_panel_context(reviewer, panels, config)
+
+
+def _index_search_html(reviewer, query: str, offset: int, limit: int) -> str:
+    page, total = reviewer.index_catalog().search(query, offset, limit)
+    return _render_index_results(page, total, query, offset, limit)
+
+
+def _step_record_context(reviewer, step: int,
+                         panels: PanelCache | None = None, config: str = "") -> dict:
+    """Move *step* records from the current one and return the panel context."""
+    target = reviewer.index_catalog().neighbour(reviewer.get_index(), step)
+    return _select_record_context(reviewer, target, panels, config)
+
+
+def _page_bounds(offset: int, limit: int) -> tuple[int, int]:
+    """Clamp ``/indices`` paging parameters to sane values."""
+    return max(offset, 0), min(max(limit, 1), MAX_INDEX_PAGE)
+
+
+def _closed_response(columns: str) -> HTMLResponse:
+    """409 for an edit that reached a reviewer dropped while it was in flight."""
+    log.info("Update of %r refused: the review was reloaded", columns)
+    return HTMLResponse('<span class="status-warning">&#9888; The review was reloaded; '
+                        'reload the page and repeat the change</span>', status_code=409)
+
+
+def _apply_field_update(reviewer, column: str, raw_value: Any,
+                        expected_version: int | None = None) -> HTMLResponse:
+    """Store a posted form value and return status + OOB widget refreshes.
+
+    Affected widget divs are returned as HTMX OOB swaps so the page reflects
+    computed side-effects (timestamps, combinators).  With shared state, a
+    conflicting edit (see ``EditConflict``) gets a 409 response carrying the
+    field's current value instead.
+    """
+    spec = reviewer.find_spec(column)
+    value: Any = _coerce_form_value(raw_value, spec)
+
+    try:
+        if expected_version is None:
+            reviewer.set_value(column, value)
+        else:
+            reviewer.set_value(column, value, expected_version=expected_version)
+        status_html = '<span class="status-ok">&#10003; Updated</span>'
+    except EditConflict:
+        log.info("Update of %r refused: changed by another worker", column)
+        parts = ['<span class="status-warning">&#9888; Changed by another reviewer; '
+                 'their value is shown</span>']
+        if spec:
+            parts.append(_make_oob(render_widget(spec, reviewer.get_value(column), _current_data(reviewer))))
+        parts.append(_row_version_oob(reviewer))
+        return HTMLResponse("\n".join(parts), status_code=409)
+    except ReviewerClosed:
+        return _closed_response(column)
+    except Exception as exc:
+        _log_route_error("Update", exc, column=column)
+        return HTMLResponse(_user_error_html("Update"))
+
+    # Build OOB refreshes for all affected widgets
+    data = _current_data(reviewer)
+    parts = [status_html]
+    for col in reviewer.affected_widgets(column):
+        affected_spec = reviewer.find_spec(col)
+        if affected_spec:
+            val = reviewer.get_value(col)
+            widget_html = render_widget(affected_spec, val, data)
+            parts.append(_make_oob(widget_html))
+    parts.append(_row_version_oob(reviewer))
+
+    return HTMLResponse("\n".join(parts))
+
+
+def _apply_fields_update(reviewer, raw_values: dict, expected_version: int | None = None) -> HTMLResponse:
+    """Store several posted form values and return one merged response.
+
+    The on-change logic runs once for the batch (see
+    ``WebReviewer.set_values``) and each affected widget is refreshed once.
+    With shared state, fields another worker changed are left alone and
+    shown with their current value; the response is then a 409.
+    """
+    values = {
+        column: _coerce_form_value(raw, reviewer.find_spec(column))
+        for column, raw in raw_values.items()
+    }
+    try:
+        if expected_version is None:
+            conflicts = reviewer.set_values(values)
+        else:
+            conflicts = reviewer.set_values(values, expected_version=expected_version)
+    except ReviewerClosed:
+        return _closed_response(", ".join(values))
+    except Exception as exc:
+        _log_route_error("Update", exc, columns=list(values))
+        return HTMLResponse(_user_error_html("Update"))
+
+    refresh: set[str] = set(conflicts)
+    for column in values:
+        if column not in conflicts:
+            refresh |= reviewer.affected_widgets(column)
+    if conflicts:
+        log.info("Update of %r refused: changed by another worker", conflicts)
+        parts = [f'<span class="status-warning">&#9888; {_esc(", ".join(conflicts))} changed by '
+                 'another reviewer; their value is shown</span>']
+    else:
+        count = len(values)
+        parts = [f'<span class="status-ok">&#10003; Updated {count} field{"s" if count != 1 else ""}</span>']
+
+    data = _current_data(reviewer)
+    for col in sorted(refresh):
+        spec = reviewer.find_spec(col)
+        if spec:
+            parts.append(_make_oob(render_widget(spec, reviewer.get_value(col), data)))
+    parts.append(_row_version_oob(reviewer))
+    return HTMLResponse("\n".join(parts), status_code=409 if conflicts else 200)
+
+
+async def _posted_fields(request: Request) -> dict:
+    """Return the first posted value of each form field, as ``/field`` reads one."""
+    form = await request.form()
+    return {column: form.get(column) for column in form.keys()}
+
+
+def _reload_context(reviewer, panels: PanelCache | None = None, config: str = "") -> dict:
+    """Re-read changed source files and return the panel template context."""
+    reviewer.load_flows(reload=True, changed_only=True)
+    return _cached_panel_context(reviewer, panels, config)
+
+
+def _populate_and_respond(reviewer, field: str, missing_html: str) -> HTMLResponse:
+    """Find the PopulateButton targeting *field* and run its compute."""
+    btn_spec = reviewer.find_populate_spec(field)
+    if btn_spec is None:
+        return HTMLResponse(missing_html)
+    return _run_populate_and_respond(reviewer, field, btn_spec)
+
+
 # ---------------------------------------------------------------------------
 # Routes
 # ---------------------------------------------------------------------------
@@ -287,12 +574,14 @@ async def index(
     """
     if getattr(request.app.state, "root", None) is not None:
         current_only = current is not None
-        configs = _list_sub_configs(request.app.state.root, "")
+        configs = await _in_worker(
+            request, None, _list_sub_configs, request.app.state.root, "", _config_index(request)
+        )
         configs = _filter_configs(configs, after=after, before=before, current_only=current_only)
         return _render_directory_listing("", configs, after=after, before=before, current_only=current_only)
 
     reviewer = _reviewer(request)
-    ctx = _panel_response_context(reviewer)
+    ctx = await _in_worker(request, reviewer, _cached_panel_context, reviewer, _panels(request))
     return _templates(request).TemplateResponse(
         request,
         "base.html",
@@ -304,6 +593,7 @@ async def index(
             "config_path_prefix": "",
             **ctx,
         },
+        background=_prefetch_task(request, reviewer),
     )
 
 
@@ -315,17 +605,38 @@ async def get_record(request: Request, index: str | None = None):
     ``#review-panel`` div's inner HTML.
     """
     reviewer = _reviewer(request)
-    if index is not None:
-        reviewer.set_index(index)
-    ctx = _panel_response_context(reviewer)
-    return _templates(request).TemplateResponse(request, "review_panel.html", ctx)
+    ctx = await _in_worker(request, reviewer, _select_record_context, reviewer, index, _panels(request))
+    return _templates(request).TemplateResponse(
+        request, "review_panel.html", ctx, background=_prefetch_task(request, reviewer)
+    )
+
+
+@router.get("/record/next", response_class=HTMLResponse)
+async def get_next_record(request: Request):
+    """Return the review panel for the record after the current one."""
+    reviewer = _reviewer(request)
+    ctx = await _in_worker(request, reviewer, _step_record_context, reviewer, 1, _panels(request))
+    return _templates(request).TemplateResponse(
+        request, "review_panel.html", ctx, background=_prefetch_task(request, reviewer)
+    )
+
+
+@router.get("/record/prev", response_class=HTMLResponse)
+async def get_prev_record(request: Request):
+    """Return the review panel for the record before the current one."""
+    reviewer = _reviewer(request)
+    ctx = await _in_worker(request, reviewer, _step_record_context, reviewer, -1, _panels(request))
+    return _templates(request).TemplateResponse(
+        request, "review_panel.html", ctx, background=_prefetch_task(request, reviewer)
+    )
 
 
 @router.get("/indices", response_class=HTMLResponse)
-async def get_indices(request: Request):
-    """Return the index-selector ``<select>`` fragment."""
+async def get_indices(request: Request, q: str = "", offset: int = 0, limit: int = DEFAULT_INDEX_PAGE):
+    """Return one page of record indices matching *q* (prefix matches first)."""
     reviewer = _reviewer(request)
-    return HTMLResponse(_render_index_selector(reviewer.index_list(), reviewer.get_index()))
+    offset, limit = _page_bounds(offset, limit)
+    return HTMLResponse(await _in_worker(request, reviewer, _index_search_html, reviewer, q, offset, limit))
 
 
 @router.post("/field/{column}", response_class=HTMLResponse)
@@ -340,45 +651,46 @@ async def update_field(request: Request, column: str):
     form = await request.form()
     raw_value = form.get(column)
     log.debug("update_field: column=%r raw_value=%r form_keys=%s", column, raw_value, list(form.keys()))
+    response = await _in_worker(
+        request, reviewer, _apply_field_update, reviewer, column, raw_value, _row_version(request)
+    )
+    _schedule_autosave(request, reviewer)
+    return response
 
-    spec = _find_spec(reviewer, column)
-    value: Any = _coerce_form_value(raw_value, spec)
 
-    try:
-        reviewer.set_value(column, value)
-        status_html = '<span class="status-ok">&#10003; Updated</span>'
-    except Exception as exc:
-        _log_route_error("Update", exc, column=column)
-        return HTMLResponse(_user_error_html("Update"))
-
-    # Build OOB refreshes for all affected widgets
-    data = _current_data(reviewer)
-    parts = [status_html]
-    for col in reviewer.affected_widgets(column):
-        affected_spec = _find_spec(reviewer, col)
-        if affected_spec:
-            val = reviewer.get_value(col)
-            widget_html = render_widget(affected_spec, val, data)
-            parts.append(_make_oob(widget_html))
+@router.post("/fields", response_class=HTMLResponse)
+async def update_fields(request: Request):
+    """Accept several form values, update the data once, return merged OOB refreshes.
 
-    return HTMLResponse("\n".join(parts))
+    Posted by the batching hook in ``base.html`` when fields are edited in
+    quick succession (e.g. a prepared review pasted into several boxes).
+    """
+    reviewer = _reviewer(request)
+    raw_values = await _posted_fields(request)
+    response = await _in_worker(
+        request, reviewer, _apply_fields_update, reviewer, raw_values, _row_version(request)
+    )
+    _schedule_autosave(request, reviewer)
+    return response
 
 
 @router.post("/save", response_class=HTMLResponse)
 async def save(request: Request):
-    """Persist the current in-memory reviewer state to output files.
+    """Write the in-memory edits to the output files now.
 
     Each field already posted its own value to ``/field/{column}`` when the
     user edited it (via change, blur, or mouseup HTMX triggers), so the
     reviewer's in-memory state is already up-to-date by the time Save is
-    clicked.  This route only needs to flush that state to disk.
+    clicked, and ``app.state.autosave`` would write it shortly anyway.  This
+    route only forces that flush (``WebReviewer.flush``: the output flows
+    with edits, each replaced atomically).
 
     Calling ``set_value`` here would re-run compute functions with potentially
     stale or unintended values, so we deliberately avoid it.
     """
     reviewer = _reviewer(request)
     try:
-        reviewer.save_flows()
+        await _in_worker(request, reviewer, reviewer.flush)
         return HTMLResponse('<span class="status-ok">&#10003; Saved</span>')
     except Exception as exc:
         _log_route_error("Save", exc)
@@ -392,12 +704,11 @@ async def reload_data(request: Request):
     templates = _templates(request)
 
     try:
-        reviewer.load_flows(reload=True)
+        ctx = await _in_worker(request, reviewer, _reload_context, reviewer, _panels(request))
     except Exception as exc:
         _log_route_error("Reload", exc)
         return HTMLResponse(_user_error_html("Reload"))
 
-    ctx = _panel_response_context(reviewer)
     return templates.TemplateResponse(request, "review_panel.html", ctx)
 
 
@@ -431,12 +742,12 @@ async def populate_field(request: Request, field: str):
          args: {text: "{description}"}
     """
     reviewer = _reviewer(request)
-    btn_spec = _find_populate_spec(reviewer, field)
-    if btn_spec is None:
-        return HTMLResponse(
-            f'<span class="status-warning">&#9888; No PopulateButton found for field {_esc(field)}</span>'
-        )
-    return _run_populate_and_respond(reviewer, field, btn_spec)
+    response = await _in_worker(
+        request, reviewer, _populate_and_respond, reviewer, field,
+        f'<span class="status-warning">&#9888; No PopulateButton found for field {_esc(field)}</span>',
+    )
+    _schedule_autosave(request, reviewer)
+    return response
 
 
 # ===========================================================================
@@ -481,12 +792,51 @@ def _resolve_config_path(root: str, url_path: str) -> tuple[Path, str]:
     return candidate, user_file
 
 
+# Config key -> [lock, number of threads using it]; an entry lives only
+# while some thread is loading (or waiting to load) that config.
+_LOAD_LOCKS: dict[str, list] = {}
+_LOAD_LOCKS_GUARD = threading.Lock()
+
+
+@contextmanager
+def _load_lock(key: str) -> Iterator[None]:
+    """Hold the lock that serialises loading the config at *key*."""
+    with _LOAD_LOCKS_GUARD:
+        entry = _LOAD_LOCKS.setdefault(key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _LOAD_LOCKS_GUARD:
+            entry[1] -= 1
+            if not entry[1]:
+                del _LOAD_LOCKS[key]
+
+
+def _is_stale(reviewer, config_file: Path) -> bool:
+    """True when files *reviewer* was loaded from have changed on disk."""
+    changed = reviewer.stale_dependencies()
+    if changed:
+        log.info("Reloading %s: %s changed on disk", config_file, ", ".join(sorted(changed)))
+    return bool(changed)
+
+
 def _get_cached_reviewer(app_state, config_file: Path, user_file: str):
     """Return the ``WebReviewer`` for *config_file*, loading or refreshing from cache.
 
     Cache entries are keyed by absolute config file path and invalidated when
-    the file's ``mtime`` changes, so editing a ``_referia.yml`` on disk takes
-    effect on the next request without restarting the server.
+    the file's ``mtime`` changes, or when any other file the review was loaded
+    from (inherited configs, template files, data flow sources) has changed
+    (``WebReviewer.stale_dependencies``, a ``stat`` per file).  Edits on disk
+    therefore take effect on the next request without restarting the server
+    or touching the ``_referia.yml``.  The cache
+    (``referia.web.reviewer_cache.ReviewerCache``) also evicts reviewers that
+    are idle or over its size and memory limits.  A stale reviewer with
+    unsaved edits is saved and dropped before its replacement is loaded, so
+    the replacement starts from the saved state.  A dropped reviewer is
+    closed, so a request that picked it up earlier gets a 409 for an edit
+    instead of writing where no one will save it.
     """
     from fastapi import HTTPException
 
@@ -497,11 +847,24 @@ def _get_cached_reviewer(app_state, config_file: Path, user_file: str):
         log.exception("Config not accessible: %s", config_file)
         raise HTTPException(status_code=404, detail="Config not accessible") from exc
 
-    cached = app_state.reviewer_cache.get(key)
-    if cached is None or cached[0] != mtime:
+    cache = app_state.reviewer_cache
+    reviewer = cache.lookup(key, mtime)
+    if reviewer is not None and not _is_stale(reviewer, config_file):
+        return reviewer
+
+    # Requests run on the worker pool, so two first requests for the same
+    # config can arrive together; load it once.
+    with _load_lock(key):
+        reviewer = cache.peek(key, mtime)
+        if reviewer is not None and not _is_stale(reviewer, config_file):
+            return reviewer
+        # Save the outgoing reviewer's edits first: its successor reads the
+        # outputs and replays the journal that the save rewrites.
+        cache.evict_where(lambda cached: cached == key)
         from referia.assess.web_review import WebReviewer
         try:
-            reviewer = WebReviewer(user_file, str(config_file.parent))
+            reviewer = WebReviewer(user_file, str(config_file.parent),
+                                   shared=getattr(app_state, "shared", False))
         except Exception as exc:
             log.exception("Failed to load config %s", config_file)
             # Record in the in-memory error registry (if it exists on app_state).
@@ -515,9 +878,9 @@ def _get_cached_reviewer(app_state, config_file: Path, user_file: str):
                     "time": _time.strftime("%Y-%m-%d %H:%M:%S"),
                 })
             raise HTTPException(status_code=503, detail="Could not load config")
-        app_state.reviewer_cache[key] = (mtime, reviewer)
+        cache.store(key, mtime, reviewer)
 
-    return app_state.reviewer_cache[key][1]
+    return reviewer
 
 
 def _root_reviewer(request: Request, config_path: str):
@@ -528,64 +891,22 @@ def _root_reviewer(request: Request, config_path: str):
     return _get_cached_reviewer(request.app.state, config_file, user_file)
 
 
-def _read_config_meta(yml_path: Path) -> dict:
-    """Return display metadata from a ``_referia.yml`` without loading WebReviewer.
+async def _root_reviewer_async(request: Request, config_path: str):
+    """:func:`_root_reviewer` on the worker pool (a cache miss loads data)."""
+    return await _in_worker(request, None, _root_reviewer, request, config_path)
 
-    Extracts ``title``, ``description``, ``date``, ``current``, and
-    ``inherit_abs`` via ``yaml.safe_load``.  Any parse error logs the exception
-    and returns ``{"_error": True}`` so a bad yml never breaks the listing page
-    and exception text never reaches the browser (CIP-000E).
 
-    ``date`` is normalised to an ISO-format string (``"YYYY-MM-DD"``).
-    ``current`` is coerced to a plain Python ``bool``.
-    ``inherit_abs`` is the resolved absolute ``Path`` of the inherited config
-    directory, or ``None`` if no ``inherit`` section is present.
-    """
-    try:
-        import yaml  # type: ignore[import]
-        with open(yml_path, encoding="utf-8") as fh:
-            data = yaml.safe_load(fh)
-        if not isinstance(data, dict):
-            return {}
-        raw_date = data.get("date")
-        date_str: str | None = None
-        if raw_date is not None:
-            try:
-                import datetime
-                if isinstance(raw_date, (datetime.date, datetime.datetime)):
-                    date_str = raw_date.strftime("%Y-%m-%d")
-                else:
-                    # Validate it looks like a date string.
-                    datetime.date.fromisoformat(str(raw_date))
-                    date_str = str(raw_date)
-            except (ValueError, TypeError):
-                pass
-
-        inherit_abs: Path | None = None
-        raw_inherit = data.get("inherit")
-        if isinstance(raw_inherit, dict):
-            rel_dir = raw_inherit.get("directory")
-            if rel_dir:
-                try:
-                    inherit_abs = (yml_path.parent / str(rel_dir)).resolve()
-                except Exception:
-                    pass
-
-        return {
-            "title": data.get("title") or data.get("name"),
-            "description": data.get("description"),
-            "date": date_str,
-            "current": bool(data.get("current", False)),
-            "inherit_abs": inherit_abs,
-        }
-    except Exception as exc:
-        log.warning("Failed to parse config %s: %s", yml_path, exc)
-        return {"_error": True}
+def _config_index(request: Request) -> ConfigIndex | None:
+    """Return the app's config metadata index (``None`` if it has none)."""
+    return getattr(request.app.state, "config_index", None)
 
 
-def _list_sub_configs(root: str, url_path: str) -> list[dict]:
+def _list_sub_configs(root: str, url_path: str, config_index: ConfigIndex | None = None) -> list[dict]:
     """Return all ``_referia.yml`` configs under *url_path* grouped for display.
 
+    Metadata comes from *config_index* when given, otherwise the tree is
+    walked and every config parsed.
+
     Each entry contains:
 
     * ``url``         — root-relative URL with trailing slash (links to the review)
@@ -606,8 +927,13 @@ def _list_sub_configs(root: str, url_path: str) -> list[dict]:
     if not search_base.is_dir():
         return []
 
+    if config_index is not None:
+        found = config_index.entries(search_base)
+    else:
+        found = [(yml, read_config_meta(yml)) for yml in sorted(search_base.rglob("_referia.yml"))]
+
     configs = []
-    for yml in sorted(search_base.rglob("_referia.yml")):
+    for yml, meta in found:
         try:
             rel_from_root = yml.parent.relative_to(root_path)
             rel_from_base = yml.parent.relative_to(search_base)
@@ -630,7 +956,6 @@ def _list_sub_configs(root: str, url_path: str) -> list[dict]:
         except ValueError:
             group_url = "/"
 
-        meta = _read_config_meta(yml)
         configs.append({
             "url": "/" + str(rel_from_root) + "/",
             "label": label,
@@ -1001,7 +1326,7 @@ def _run_populate_and_respond(reviewer, field: str, btn_spec: dict) -> HTMLRespo
         _log_route_error("Populate", exc, field=field)
         return HTMLResponse(_user_error_html("Populate"))
 
-    target_spec = _find_spec(reviewer, target)
+    target_spec = reviewer.find_spec(target)
     if target_spec is None:
         return HTMLResponse('<span class="status-ok">&#10003; Populated</span>')
 
@@ -1024,52 +1349,76 @@ root_router = APIRouter()
 
 @root_router.get("/{config_path:path}/record", response_class=HTMLResponse)
 async def root_get_record(request: Request, config_path: str, index: str | None = None):
-    reviewer = _root_reviewer(request, config_path)
-    if index is not None:
-        reviewer.set_index(index)
-    ctx = _panel_response_context(reviewer)
-    return _templates(request).TemplateResponse(request, "review_panel.html", ctx)
+    reviewer = await _root_reviewer_async(request, config_path)
+    ctx = await _in_worker(
+        request, reviewer, _select_record_context, reviewer, index, _panels(request), config_path
+    )
+    return _templates(request).TemplateResponse(
+        request, "review_panel.html", ctx,
+        background=_prefetch_task(request, reviewer, config_path),
+    )
+
+
+@root_router.get("/{config_path:path}/record/next", response_class=HTMLResponse)
+async def root_get_next_record(request: Request, config_path: str):
+    reviewer = await _root_reviewer_async(request, config_path)
+    ctx = await _in_worker(
+        request, reviewer, _step_record_context, reviewer, 1, _panels(request), config_path
+    )
+    return _templates(request).TemplateResponse(
+        request, "review_panel.html", ctx,
+        background=_prefetch_task(request, reviewer, config_path),
+    )
+
+
+@root_router.get("/{config_path:path}/record/prev", response_class=HTMLResponse)
+async def root_get_prev_record(request: Request, config_path: str):
+    reviewer = await _root_reviewer_async(request, config_path)
+    ctx = await _in_worker(
+        request, reviewer, _step_record_context, reviewer, -1, _panels(request), config_path
+    )
+    return _templates(request).TemplateResponse(
+        request, "review_panel.html", ctx,
+        background=_prefetch_task(request, reviewer, config_path),
+    )
 
 
 @root_router.get("/{config_path:path}/indices", response_class=HTMLResponse)
-async def root_get_indices(request: Request, config_path: str):
-    reviewer = _root_reviewer(request, config_path)
-    return HTMLResponse(_render_index_selector(reviewer.index_list(), reviewer.get_index()))
+async def root_get_indices(request: Request, config_path: str, q: str = "",
+                           offset: int = 0, limit: int = DEFAULT_INDEX_PAGE):
+    reviewer = await _root_reviewer_async(request, config_path)
+    offset, limit = _page_bounds(offset, limit)
+    return HTMLResponse(await _in_worker(request, reviewer, _index_search_html, reviewer, q, offset, limit))
 
 
 @root_router.post("/{config_path:path}/field/{column}", response_class=HTMLResponse)
 async def root_update_field(request: Request, config_path: str, column: str):
-    reviewer = _root_reviewer(request, config_path)
+    reviewer = await _root_reviewer_async(request, config_path)
     form = await request.form()
     raw_value = form.get(column)
+    response = await _in_worker(
+        request, reviewer, _apply_field_update, reviewer, column, raw_value, _row_version(request)
+    )
+    _schedule_autosave(request, reviewer)
+    return response
 
-    spec = _find_spec(reviewer, column)
-    value: Any = _coerce_form_value(raw_value, spec)
-
-    try:
-        reviewer.set_value(column, value)
-        status_html = '<span class="status-ok">&#10003; Updated</span>'
-    except Exception as exc:
-        _log_route_error("Update", exc, column=column)
-        return HTMLResponse(_user_error_html("Update"))
-
-    data = _current_data(reviewer)
-    parts = [status_html]
-    for col in reviewer.affected_widgets(column):
-        affected_spec = _find_spec(reviewer, col)
-        if affected_spec:
-            val = reviewer.get_value(col)
-            widget_html = render_widget(affected_spec, val, data)
-            parts.append(_make_oob(widget_html))
 
-    return HTMLResponse("\n".join(parts))
+@root_router.post("/{config_path:path}/fields", response_class=HTMLResponse)
+async def root_update_fields(request: Request, config_path: str):
+    reviewer = await _root_reviewer_async(request, config_path)
+    raw_values = await _posted_fields(request)
+    response = await _in_worker(
+        request, reviewer, _apply_fields_update, reviewer, raw_values, _row_version(request)
+    )
+    _schedule_autosave(request, reviewer)
+    return response
 
 
 @root_router.post("/{config_path:path}/save", response_class=HTMLResponse)
 async def root_save(request: Request, config_path: str):
-    reviewer = _root_reviewer(request, config_path)
+    reviewer = await _root_reviewer_async(request, config_path)
     try:
-        reviewer.save_flows()
+        await _in_worker(request, reviewer, reviewer.flush)
         return HTMLResponse('<span class="status-ok">&#10003; Saved</span>')
     except Exception as exc:
         _log_route_error("Save", exc)
@@ -1078,26 +1427,27 @@ async def root_save(request: Request, config_path: str):
 
 @root_router.post("/{config_path:path}/reload", response_class=HTMLResponse)
 async def root_reload(request: Request, config_path: str):
-    reviewer = _root_reviewer(request, config_path)
+    reviewer = await _root_reviewer_async(request, config_path)
     templates = _templates(request)
     try:
-        reviewer.load_flows(reload=True)
+        ctx = await _in_worker(
+            request, reviewer, _reload_context, reviewer, _panels(request), config_path
+        )
     except Exception as exc:
         _log_route_error("Reload", exc)
         return HTMLResponse(_user_error_html("Reload"))
-    ctx = _panel_response_context(reviewer)
     return templates.TemplateResponse(request, "review_panel.html", ctx)
 
 
 @root_router.post("/{config_path:path}/populate/{field}", response_class=HTMLResponse)
 async def root_populate(request: Request, config_path: str, field: str):
-    reviewer = _root_reviewer(request, config_path)
-    btn_spec = _find_populate_spec(reviewer, field)
-    if btn_spec is None:
-        return HTMLResponse(
-            f'<span class="status-warning">&#9888; No PopulateButton for {_esc(field)}</span>'
-        )
-    return _run_populate_and_respond(reviewer, field, btn_spec)
+    reviewer = await _root_reviewer_async(request, config_path)
+    response = await _in_worker(
+        request, reviewer, _populate_and_respond, reviewer, field,
+        f'<span class="status-warning">&#9888; No PopulateButton for {_esc(field)}</span>',
+    )
+    _schedule_autosave(request, reviewer)
+    return response
 
 
 # ── Catch-all full page — MUST be registered last ────────────────────────────
@@ -1106,7 +1456,7 @@ async def root_populate(request: Request, config_path: str, field: str):
 async def list_errors(request: Request):
     """Show all configs that failed to parse (YAML) or load (WebReviewer)."""
     root = request.app.state.root
-    all_configs = _list_sub_configs(root, "")
+    all_configs = await _in_worker(request, None, _list_sub_configs, root, "", _config_index(request))
 
     # ── YAML parse errors found while scanning the tree ──────────────────────
     parse_errors = [c for c in all_configs if c.get("error")]
@@ -1210,11 +1560,14 @@ async def root_index(
     from fastapi import HTTPException as _HTTPException
 
     try:
-        reviewer = _root_reviewer(request, config_path)
+        reviewer = await _root_reviewer_async(request, config_path)
     except _HTTPException as exc:
         if exc.status_code == 404:
             # No _referia.yml here — show a filtered listing of sub-configs.
-            all_configs = _list_sub_configs(request.app.state.root, config_path)
+            all_configs = await _in_worker(
+                request, None, _list_sub_configs, request.app.state.root, config_path,
+                _config_index(request),
+            )
             if all_configs:
                 current_only = current is not None
                 visible = _filter_configs(
@@ -1226,7 +1579,12 @@ async def root_index(
                 )
         raise
 
-    ctx = _panel_response_context(reviewer)
+    # Keyed as the /record routes key it, which see the path without the
+    # trailing slash.
+    config = config_path.rstrip("/")
+    ctx = await _in_worker(
+        request, reviewer, _cached_panel_context, reviewer, _panels(request), config
+    )
     prefix = _config_path_prefix(config_path)
 
     # Derive a display title: use the last path component as a readable label
@@ -1243,4 +1601,5 @@ async def root_index(
             "config_path_prefix": prefix,
             **ctx,
         },
+        background=_prefetch_task(request, reviewer, config),
     )
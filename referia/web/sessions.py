@@ -0,0 +1,76 @@
+"""Browser session identity for the web review interface.
+
+Several assessors (or several tabs of one assessor) can have the same
+review open.  Each gets its own cursor in the shared ``WebReviewer`` (see
+``WebReviewer.session``); this module decides which cursor a request uses.
+
+* A ``referia_session`` cookie identifies the browser.  The middleware
+  installed by :func:`install_session_middleware` issues one on the first
+  response that lacks it.
+* HTMX requests also send an ``X-Referia-Tab`` header holding an id kept in
+  the tab's ``sessionStorage`` (see ``base.html``), so two tabs of one
+  browser can sit on different records.  A tab's cursor starts from the
+  browser's cursor.
+
+Public API
+----------
+install_session_middleware(app)
+    Register the cookie-issuing middleware on a FastAPI app.
+
+session_key(request) -> (key, parent_key)
+    Cursor key for *request* and the key its cursor is initialised from.
+"""
+
+from __future__ import annotations
+
+import re
+import secrets
+
+from fastapi import FastAPI, Request
+
+SESSION_COOKIE = "referia_session"
+TAB_HEADER = "X-Referia-Tab"
+
+# Ids are generated here or by the browser; anything else is ignored rather
+# than used as a key, so a client cannot grow the session table with
+# arbitrary strings.
+_ID_RE = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
+
+
+def _valid_id(value: str | None) -> str | None:
+    if value and _ID_RE.match(value):
+        return value
+    return None
+
+
+def install_session_middleware(app: FastAPI) -> None:
+    """Give every browser a ``referia_session`` cookie."""
+
+    @app.middleware("http")
+    async def _session_cookie(request: Request, call_next):
+        session_id = _valid_id(request.cookies.get(SESSION_COOKIE))
+        issued = session_id is None
+        if issued:
+            session_id = secrets.token_urlsafe(16)
+        request.state.session_id = session_id
+        response = await call_next(request)
+        if issued:
+            response.set_cookie(
+                SESSION_COOKIE, session_id, httponly=True, samesite="lax", path="/"
+            )
+        return response
+
+
+def session_key(request: Request) -> tuple[str | None, str | None]:
+    """Return ``(key, parent_key)`` for the cursor *request* should use.
+
+    Without the middleware (e.g. a bare router under test) there is no
+    session and the shared cursor is used: ``(None, None)``.
+    """
+    session_id = getattr(request.state, "session_id", None)
+    if session_id is None:
+        return None, None
+    tab_id = _valid_id(request.headers.get(TAB_HEADER))
+    if tab_id is None:
+        return session_id, None
+    return f"{session_id}/{tab_id}", session_id
@@ -0,0 +1,507 @@
+"""Root-server mode spread over several worker processes.
+
+A root server keeps every loaded config in one Python process, so a config
+with CPU-heavy computes slows every other review on the machine.
+``referia serve --root DIR --shards N`` runs a supervisor instead: it starts
+*N* worker processes, each an ordinary root server bound to a private port
+on ``127.0.0.1``, and forwards every request to one of them.
+
+Requests are routed on the config they address (see :func:`route_key`)
+through a consistent-hash ring (:class:`HashRing`), so each config's
+``WebReviewer`` lives in exactly one worker and a change to the set of
+workers moves only the configs on the arcs that changed hands:
+
+* When a worker dies it leaves the ring at once and its configs pass to the
+  neighbouring workers; their unsaved edits are in the config's journal
+  (see ``referia.assess.journal``) and are replayed there.  A replacement
+  is started, and once it answers it rejoins the ring.
+* Before a worker joins, the others are told the new membership
+  (``POST /_shard/release``) and save and drop the reviewers for configs
+  they will no longer own.  Only then is the worker put on the ring;
+  requests for the configs that move wait until it is, so no config is
+  served by two workers at once.
+
+``GET /health`` on the supervisor reports each worker's process, requests in
+flight and forwarded, the configs routed to it and the worker's own
+``/health``.
+
+Public API
+----------
+HashRing(nodes=(), replicas=DEFAULT_REPLICAS)
+    Consistent-hash ring; ``ring.node_for(key)``, ``ring.add(node)``,
+    ``ring.remove(node)``.
+
+shard_key(config_path) -> str
+    Canonical routing key of a config path (``a/b`` and
+    ``a/b/_referia.yml`` are the same config).
+
+route_key(url_path) -> str
+    Routing key of a root-mode request path.
+
+Supervisor(root, processes, worker_args=(), ...)
+    The worker processes and the ring; ``start()``, ``stop()``, ``check()``,
+    ``await proxy(request)``, ``await health()``.
+
+create_supervisor_app(supervisor) -> FastAPI
+    The front application served by ``referia serve --shards``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import hashlib
+import logging
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Callable, Iterable
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse, Response
+
+log = logging.getLogger(__name__)
+
+# Points per worker on the ring; more spreads configs more evenly.
+DEFAULT_REPLICAS = 64
+
+# Seconds between checks that the workers are alive.
+DEFAULT_CHECK_INTERVAL = 1.0
+
+# Seconds a new worker has to start answering.
+DEFAULT_START_TIMEOUT = 60.0
+
+_USER_FILE = "_referia.yml"
+
+# Root-mode action routes (see referia.web.routes.root_router); anything
+# else is a page for the whole path.
+_ACTION = re.compile(
+    r"^(?P<config>.*)/(?:record|record/next|record/prev|indices|field/[^/]+|fields|save|reload"
+    r"|populate/[^/]+)$"
+)
+
+# Headers that describe one connection rather than the message.
+_HOP_HEADERS = frozenset({
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade", "host", "content-length",
+    "content-encoding",
+})
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode("utf-8"), usedforsecurity=False).digest()[:8], "big")
+
+
+class HashRing:
+    """Consistent-hash ring mapping keys to nodes.
+
+    Each node is placed at *replicas* points; a key belongs to the first
+    node clockwise from its hash.  Adding or removing a node only moves the
+    keys between that node's points and their predecessors.
+
+    :param nodes: Initial node names.
+    :param replicas: Points per node.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = DEFAULT_REPLICAS) -> None:
+        self.replicas = replicas
+        self._points: list[int] = []
+        self._owners: list[str] = []
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> list[str]:
+        """Node names on the ring, sorted."""
+        return sorted(set(self._owners))
+
+    def __contains__(self, node: str) -> bool:
+        return node in self._owners
+
+    def __len__(self) -> int:
+        return len(set(self._owners))
+
+    def add(self, node: str) -> None:
+        """Place *node* on the ring (no-op if already there)."""
+        if node in self:
+            return
+        for replica in range(self.replicas):
+            point = _hash(f"{node}#{replica}")
+            position = bisect.bisect(self._points, point)
+            self._points.insert(position, point)
+            self._owners.insert(position, node)
+
+    def remove(self, node: str) -> None:
+        """Take *node* off the ring."""
+        kept = [(p, o) for p, o in zip(self._points, self._owners) if o != node]
+        self._points = [p for p, _ in kept]
+        self._owners = [o for _, o in kept]
+
+    def node_for(self, key: str) -> str | None:
+        """Return the node owning *key* (``None`` on an empty ring)."""
+        if not self._points:
+            return None
+        position = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[position]
+
+
+def shard_key(config_path: str) -> str:
+    """Return the routing key of *config_path* (relative to the root).
+
+    A directory and its ``_referia.yml`` name the same config, so both give
+    the directory.
+    """
+    key = config_path.strip("/")
+    if key == _USER_FILE:
+        return ""
+    if key.endswith("/" + _USER_FILE):
+        return key[: -len(_USER_FILE) - 1]
+    return key
+
+
+def route_key(url_path: str) -> str:
+    """Return the routing key of the root-mode request path *url_path*."""
+    path = url_path.strip("/")
+    match = _ACTION.match(path)
+    return shard_key(match.group("config") if match else path)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class _Worker:
+    """One worker process and its counters."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.port = 0
+        self.process: Any = None
+        self.started = 0.0
+        self.restarts = 0
+        self.active = 0
+        self.requests = 0
+        self.keys: set[str] = set()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+
+class Supervisor:
+    """Worker processes of a sharded root server and the ring routing to them.
+
+    :param root: Root directory served.
+    :param processes: Number of worker processes.
+    :param worker_args: Further ``referia serve`` arguments for each worker
+        (thread pool, caches, autosave).
+    :param replicas: Ring points per worker.
+    :param check_interval: Seconds between liveness checks.
+    :param start_timeout: Seconds a worker has to start answering.
+    :param spawn: Starts a worker from its command line; returns an object
+        with ``poll``, ``terminate``, ``kill`` and ``wait`` (for tests).
+    :param transport: httpx transport for calls to workers (for tests).
+    """
+
+    def __init__(
+        self,
+        root: str,
+        processes: int,
+        worker_args: Iterable[str] = (),
+        replicas: int = DEFAULT_REPLICAS,
+        check_interval: float = DEFAULT_CHECK_INTERVAL,
+        start_timeout: float = DEFAULT_START_TIMEOUT,
+        spawn: Callable[[list[str]], Any] = subprocess.Popen,
+        transport: Any = None,
+    ) -> None:
+        if processes < 1:
+            raise ValueError(f"processes must be at least 1, got {processes!r}")
+        self.root = root
+        self.worker_args = list(worker_args)
+        self.check_interval = check_interval
+        self.start_timeout = start_timeout
+        self.workers = [_Worker(f"w{i}") for i in range(processes)]
+        self._ring = HashRing(replicas=replicas)
+        # The ring a joining worker will make, while the others release the
+        # configs that move to it; set when no join is under way.
+        self._proposed: HashRing | None = None
+        self._settled = threading.Event()
+        self._settled.set()
+        self._guard = threading.Lock()
+        self._spawn = spawn
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # -- Processes ------------------------------------------------------------
+
+    def command(self, worker: _Worker) -> list[str]:
+        """Return the command line that runs *worker*."""
+        return [
+            sys.executable, "-m", "referia.cli", "serve",
+            "--root", self.root, "--host", "127.0.0.1", "--port", str(worker.port),
+            "--shard", worker.name, *self.worker_args,
+        ]
+
+    def start(self) -> None:
+        """Start every worker, wait for them to answer and begin monitoring."""
+        self._stop.clear()
+        for worker in self.workers:
+            self._launch(worker)
+        for worker in self.workers:
+            if self._wait_ready(worker):
+                with self._guard:
+                    self._ring.add(worker.name)
+        if not len(self._ring):
+            raise RuntimeError("No referia worker process started; see the log")
+        self._thread = threading.Thread(target=self._monitor, name="referia-supervisor",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop monitoring and shut the workers down (they save their edits)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for worker in self.workers:
+            if worker.alive():
+                worker.process.terminate()
+        for worker in self.workers:
+            if worker.process is None:
+                continue
+            try:
+                worker.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                log.warning("Worker %s did not stop; killing it", worker.name)
+                worker.process.kill()
+
+    def _launch(self, worker: _Worker) -> None:
+        worker.port = _free_port()
+        worker.process = self._spawn(self.command(worker))
+        worker.started = time.time()
+        log.info("Started worker %s on port %d", worker.name, worker.port)
+
+    def _wait_ready(self, worker: _Worker) -> bool:
+        deadline = time.monotonic() + self.start_timeout
+        with httpx.Client(transport=self._transport, timeout=2.0) as client:
+            while time.monotonic() < deadline and not self._stop.is_set():
+                if not worker.alive():
+                    break
+                try:
+                    if client.get(worker.url + "/health").status_code == 200:
+                        return True
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.2)
+        log.error("Worker %s did not start answering", worker.name)
+        return False
+
+    def _monitor(self) -> None:
+        while not self._stop.wait(self.check_interval):
+            try:
+                self.check()
+            except Exception:
+                log.exception("Worker check failed")
+
+    def check(self) -> list[str]:
+        """Replace dead workers, rebalancing the ring; return their names.
+
+        A dead worker's configs pass to its neighbours at once.  Its
+        replacement rejoins once it answers and the other workers have
+        dropped the configs that move back to it.
+        """
+        replaced = []
+        for worker in self.workers:
+            if self._stop.is_set() or worker.alive():
+                continue
+            code = worker.process.poll() if worker.process is not None else None
+            log.warning("Worker %s exited (code %s); its configs move to the others",
+                        worker.name, code)
+            self._leave(worker)
+            worker.restarts += 1
+            worker.keys.clear()
+            self._launch(worker)
+            if self._wait_ready(worker):
+                self._join(worker)
+            replaced.append(worker.name)
+        return replaced
+
+    def _leave(self, worker: _Worker) -> None:
+        with self._guard:
+            self._ring.remove(worker.name)
+
+    def _join(self, worker: _Worker) -> None:
+        """Put *worker* on the ring once the others have released its configs.
+
+        Each other worker is sent the membership with *worker* in it and
+        saves and drops the configs that move.  Requests for those configs
+        wait (see :meth:`proxy`) until *worker* is on the ring, so the old
+        owner cannot write over edits the new one has taken.
+        """
+        with self._guard:
+            proposed = HashRing(self._ring.nodes + [worker.name], replicas=self._ring.replicas)
+            self._proposed = proposed
+            self._settled.clear()
+        body = {"owner": None, "nodes": proposed.nodes, "replicas": proposed.replicas}
+        try:
+            with httpx.Client(transport=self._transport, timeout=None) as client:
+                for other in self.workers:
+                    if other is worker or not other.alive():
+                        continue
+                    try:
+                        client.post(other.url + "/_shard/release",
+                                    json=dict(body, owner=other.name))
+                    except httpx.HTTPError:
+                        log.warning("Could not rebalance worker %s", other.name, exc_info=True)
+        finally:
+            with self._guard:
+                self._ring.add(worker.name)
+                self._proposed = None
+                self._settled.set()
+
+    # -- Routing --------------------------------------------------------------
+
+    def moving(self, key: str) -> bool:
+        """Whether routing key *key* is moving to a worker that is joining."""
+        with self._guard:
+            if self._proposed is None:
+                return False
+            return self._proposed.node_for(key) != self._ring.node_for(key)
+
+    def worker_for(self, key: str) -> _Worker | None:
+        """Return the live worker owning routing key *key*."""
+        with self._guard:
+            name = self._ring.node_for(key)
+        return next((w for w in self.workers if w.name == name), None)
+
+    async def proxy(self, request: Request) -> Response:
+        """Forward *request* to the worker owning its config."""
+        key = route_key(request.url.path)
+        body = await request.body()
+        path = request.scope.get("raw_path") or request.url.path.encode()
+        url = path.decode("latin-1")
+        if request.url.query:
+            url += "?" + request.url.query
+        headers = [(k, v) for k, v in request.headers.items() if k.lower() not in _HOP_HEADERS]
+        client = self._async_client()
+        while self.moving(key):
+            await asyncio.to_thread(self._settled.wait, self.check_interval)
+        for _ in range(2):
+            worker = self.worker_for(key)
+            if worker is None:
+                break
+            worker.active += 1
+            worker.requests += 1
+            worker.keys.add(key)
+            try:
+                upstream = await client.request(request.method, worker.url + url,
+                                                headers=headers, content=body)
+            except httpx.ConnectError:
+                # Died since the last check: route around it and try once more.
+                if not worker.alive():
+                    self._leave(worker)
+                    continue
+                log.warning("Worker %s refused a connection", worker.name)
+                break
+            finally:
+                worker.active -= 1
+            response = Response(content=upstream.content, status_code=upstream.status_code)
+            response.raw_headers = [
+                (k.encode("latin-1"), v.encode("latin-1"))
+                for k, v in upstream.headers.multi_items() if k.lower() not in _HOP_HEADERS
+            ] + [(b"content-length", str(len(upstream.content)).encode())]
+            return response
+        return PlainTextResponse("No review worker available; see the server log.", status_code=503)
+
+    def _async_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            # Populate computes can take minutes.
+            self._client = httpx.AsyncClient(
+                transport=self._transport, timeout=httpx.Timeout(None, connect=5.0)
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # -- Reporting ------------------------------------------------------------
+
+    async def health(self) -> dict:
+        """Return the supervisor's and each worker's state and load."""
+        with self._guard:
+            in_ring = set(self._ring.nodes)
+
+        async def worker_health(worker: _Worker) -> dict | None:
+            if not worker.alive():
+                return None
+            try:
+                response = await self._async_client().get(worker.url + "/health", timeout=2.0)
+                return response.json()
+            except (httpx.HTTPError, ValueError):
+                return None
+
+        reports = await asyncio.gather(*(worker_health(w) for w in self.workers))
+        workers = []
+        for worker, report in zip(self.workers, reports):
+            workers.append({
+                "name": worker.name,
+                "pid": getattr(worker.process, "pid", None),
+                "port": worker.port,
+                "alive": worker.alive(),
+                "in_ring": worker.name in in_ring,
+                "restarts": worker.restarts,
+                "uptime": round(time.time() - worker.started, 1) if worker.started else 0.0,
+                "active": worker.active,
+                "requests": worker.requests,
+                "configs_routed": len(worker.keys),
+                "health": report,
+            })
+        alive = sum(w["in_ring"] for w in workers)
+        return {
+            "status": "ok" if alive == len(workers) else "degraded" if alive else "down",
+            "mode": "supervisor",
+            "root": self.root,
+            "workers": workers,
+        }
+
+
+def create_supervisor_app(supervisor: Supervisor) -> FastAPI:
+    """Create the front application that forwards to *supervisor*'s workers."""
+    app = FastAPI(
+        title="Referia Review Interface",
+        description="Sharded root server: requests are forwarded to worker processes.",
+    )
+    app.state.supervisor = supervisor
+
+    @app.on_event("startup")
+    async def _start_workers() -> None:
+        await asyncio.to_thread(supervisor.start)
+
+    @app.on_event("shutdown")
+    async def _stop_workers() -> None:
+        await supervisor.aclose()
+        await asyncio.to_thread(supervisor.stop)
+
+    @app.get("/health")
+    async def health():
+        return await supervisor.health()
+
+    @app.api_route("/{path:path}",
+                   methods=["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"])
+    async def forward(request: Request, path: str):
+        return await supervisor.proxy(request)
+
+    return app
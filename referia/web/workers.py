@@ -0,0 +1,130 @@
+"""Bounded worker pool for blocking reviewer work.
+
+The FastAPI routes are ``async def`` but most of what they do is blocking:
+pandas lookups in ``WebReviewer``, Excel writes in ``save_flows`` and
+multi-second LLM calls in ``run_populate``.  Run directly on the event loop,
+one slow populate stalls every other browser connected to the server.
+
+``ReviewerExecutor`` moves that work onto a bounded thread pool so the event
+loop only reads requests and assembles templates.  Calls that share a
+reviewer are serialised with a per-reviewer lock because ``WebReviewer``
+keeps a single ``CustomDataFrame`` cursor and is not thread-safe.  Calls for
+different reviewers (root-server mode) run in parallel up to the pool size,
+except while they read or write files: relative flow paths resolve against
+the process-wide current directory, so those steps take turns (see
+``referia.util.files.working_directory``).
+
+A process pool is deliberately not offered: reviewer state lives in this
+process's memory and cannot be shipped to another process per request.
+pandas, file I/O and the HTTP calls behind the LLM computes all release the
+GIL, so threads give the concurrency that matters here.
+
+Public API
+----------
+ReviewerExecutor(max_workers=DEFAULT_WORKERS)
+    Create a pool with *max_workers* threads.
+
+await executor.run(reviewer, fn, *args, **kwargs)
+    Run ``fn(*args, **kwargs)`` on the pool while holding *reviewer*'s lock.
+    Pass ``reviewer=None`` for work that touches no reviewer (e.g. listing
+    the configs under the root directory).
+
+executor.shutdown()
+    Wait for running calls to finish and release the threads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+# Default pool size for ``referia serve``.  Small on purpose: each worker may
+# hold a pandas frame's worth of temporaries and the usual deployment is a
+# handful of assessors on one machine.
+DEFAULT_WORKERS = 4
+
+
+class ReviewerExecutor:
+    """Thread pool that serialises work per reviewer.
+
+    :param max_workers: Number of worker threads, defaults to
+        :data:`DEFAULT_WORKERS`.
+    :type max_workers: int
+    :raises ValueError: If *max_workers* is less than one.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_WORKERS) -> None:
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers!r}")
+        self.max_workers = max_workers
+        # Created on first use and dropped by shutdown(), so an app that is
+        # started, stopped and started again (as test clients do) gets a
+        # fresh pool each time.
+        self._pool: ThreadPoolExecutor | None = None
+        self._pool_guard = threading.Lock()
+        # Weak keys so a reviewer dropped from the root-mode cache also drops
+        # its lock.
+        self._locks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._locks_guard = threading.Lock()
+
+    def lock_for(self, reviewer: Any) -> threading.RLock:
+        """Return the lock that serialises work on *reviewer*.
+
+        The lock is re-entrant so a call that is already running under the
+        lock can call back into helpers that take it again.
+        """
+        with self._locks_guard:
+            lock = self._locks.get(reviewer)
+            if lock is None:
+                lock = threading.RLock()
+                self._locks[reviewer] = lock
+            return lock
+
+    async def run(self, reviewer: Any, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``fn(*args, **kwargs)`` on the pool and return its result.
+
+        Exceptions raised by *fn* propagate to the awaiting coroutine
+        unchanged, so ``HTTPException`` raised in a worker still becomes the
+        right HTTP response.
+
+        :param reviewer: Reviewer whose lock must be held while *fn* runs, or
+            ``None`` for work that touches no reviewer.
+        :param fn: Blocking callable to run.
+        :return: Whatever *fn* returns.
+        """
+        call = functools.partial(fn, *args, **kwargs)
+        if reviewer is not None:
+            lock = self.lock_for(reviewer)
+
+            def call_locked() -> Any:
+                with lock:
+                    return call()
+
+            task = call_locked
+        else:
+            task = call
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_pool(), task)
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._pool_guard:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="referia-worker",
+                )
+            return self._pool
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the pool; by default wait for running calls to finish.
+
+        A later :meth:`run` starts a new pool.
+        """
+        with self._pool_guard:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
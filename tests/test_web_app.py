@@ -16,7 +16,9 @@ from unittest.mock import MagicMock, patch
 import pytest
 from fastapi.testclient import TestClient
 
+from referia.assess.web_review import IndexCatalog
 from referia.web.app import create_app
+from referia.web.reviewer_cache import ReviewerCache
 
 
 # ---------------------------------------------------------------------------
@@ -37,6 +39,9 @@ def _yaml_exception_text(text: str) -> str:
 def _mock_reviewer():
     r = MagicMock()
     r.index_list.return_value = ["alice", "bob"]
+    r.index_catalog.return_value = IndexCatalog(["alice", "bob"])
+    r.stale_dependencies.return_value = set()
+    r.row_version.return_value = None
     r.get_index.return_value = "alice"
     r.get_viewer_specs.return_value = []
     r.get_review_specs.return_value = []
@@ -44,6 +49,10 @@ def _mock_reviewer():
     r.render_viewer_html.return_value = ""
     r.get_value.return_value = ""
     r.get_row_data.return_value = {}
+    r.find_spec.return_value = None
+    r.find_populate_spec.return_value = None
+    # No panel caching: tests change the mock between requests.
+    r.panel_version.return_value = None
     return r
 
 
@@ -83,6 +92,15 @@ class TestSingleConfigMode:
         assert body["status"] == "ok"
         assert body["reviewer"] == "loaded"
 
+    def test_health_reports_combinator_evaluations(self):
+        reviewer = _mock_reviewer()
+        reviewer.combinator_stats.return_value = {"evaluated": 2, "skipped": 5}
+        with patch("referia.assess.web_review.WebReviewer", return_value=reviewer):
+            app = create_app(user_file="_referia.yml", directory="/tmp")
+            with TestClient(app) as client:
+                body = client.get("/health").json()
+        assert body["combinators"] == {"evaluated": 2, "skipped": 5}
+
     def test_health_degraded_when_startup_fails(self):
         with patch(
             "referia.assess.web_review.WebReviewer",
@@ -136,6 +154,7 @@ class TestRootServerMode:
         assert body["status"] == "ok"
         assert body["root"] == str(tmp_path.resolve())
         assert body["configs_cached"] == 0
+        assert body["combinators"] == {"evaluated": 0, "skipped": 0}
 
     def test_root_mode_does_not_call_web_reviewer_at_startup(self, tmp_path):
         """WebReviewer must NOT be constructed during startup in root mode."""
@@ -213,7 +232,7 @@ class TestGetCachedReviewer:
         cfg = tmp_path / "_referia.yml"
         cfg.write_text("title: test")
         mock_state = MagicMock()
-        mock_state.reviewer_cache = {}
+        mock_state.reviewer_cache = ReviewerCache()
         mock_rev = _mock_reviewer()
         with patch("referia.assess.web_review.WebReviewer", return_value=mock_rev):
             result = _get_cached_reviewer(mock_state, cfg, "_referia.yml")
@@ -227,7 +246,8 @@ class TestGetCachedReviewer:
         mock_state = MagicMock()
         mock_rev = _mock_reviewer()
         mtime = cfg.stat().st_mtime
-        mock_state.reviewer_cache = {str(cfg): (mtime, mock_rev)}
+        mock_state.reviewer_cache = ReviewerCache()
+        mock_state.reviewer_cache.store(str(cfg), mtime, mock_rev)
         with patch("referia.assess.web_review.WebReviewer") as MockRev:
             result = _get_cached_reviewer(mock_state, cfg, "_referia.yml")
             MockRev.assert_not_called()
@@ -241,11 +261,74 @@ class TestGetCachedReviewer:
         mock_state = MagicMock()
         old_rev = _mock_reviewer()
         # Store a stale mtime (0.0)
-        mock_state.reviewer_cache = {str(cfg): (0.0, old_rev)}
+        mock_state.reviewer_cache = ReviewerCache()
+        mock_state.reviewer_cache.store(str(cfg), 0.0, old_rev)
+        new_rev = _mock_reviewer()
+        with patch("referia.assess.web_review.WebReviewer", return_value=new_rev):
+            result = _get_cached_reviewer(mock_state, cfg, "_referia.yml")
+        assert result is new_rev
+
+    def test_reloads_when_dependency_changes(self, tmp_path):
+        from referia.web.routes import _get_cached_reviewer
+        cfg = tmp_path / "_referia.yml"
+        cfg.write_text("title: test")
+        mock_state = MagicMock()
+        old_rev = _mock_reviewer()
+        old_rev.stale_dependencies.return_value = {"input"}
+        mock_state.reviewer_cache = ReviewerCache()
+        mock_state.reviewer_cache.store(str(cfg), cfg.stat().st_mtime, old_rev)
         new_rev = _mock_reviewer()
         with patch("referia.assess.web_review.WebReviewer", return_value=new_rev):
             result = _get_cached_reviewer(mock_state, cfg, "_referia.yml")
         assert result is new_rev
+        assert mock_state.reviewer_cache[str(cfg)][1] is new_rev
+
+    def test_stale_reviewer_saved_before_replacement_loads(self, tmp_path):
+        from referia.web.routes import _get_cached_reviewer
+        cfg = tmp_path / "_referia.yml"
+        cfg.write_text("title: test")
+        mock_state = MagicMock()
+        events = []
+        old_rev = _mock_reviewer()
+        old_rev.dirty = True
+        old_rev.stale_dependencies.return_value = {"output"}
+        old_rev.flush.side_effect = lambda: events.append("flush")
+        mock_state.reviewer_cache = ReviewerCache()
+        mock_state.reviewer_cache.store(str(cfg), cfg.stat().st_mtime, old_rev)
+        new_rev = _mock_reviewer()
+
+        def load(*args, **kwargs):
+            events.append("load")
+            return new_rev
+
+        with patch("referia.assess.web_review.WebReviewer", side_effect=load):
+            result = _get_cached_reviewer(mock_state, cfg, "_referia.yml")
+        assert result is new_rev
+        assert events == ["flush", "load"]
+        # A request still holding the old reviewer cannot write to it.
+        old_rev.close.assert_called_once()
+        new_rev.close.assert_not_called()
+
+    def test_load_locks_are_pruned(self, tmp_path):
+        from referia.web import routes
+        cfg = tmp_path / "_referia.yml"
+        cfg.write_text("title: test")
+        mock_state = MagicMock()
+        mock_state.reviewer_cache = ReviewerCache()
+        with patch("referia.assess.web_review.WebReviewer", return_value=_mock_reviewer()):
+            routes._get_cached_reviewer(mock_state, cfg, "_referia.yml")
+        assert str(cfg) not in routes._LOAD_LOCKS
+
+    def test_edit_to_closed_reviewer_is_refused(self):
+        from referia.exceptions import ReviewerClosed
+        from referia.web.routes import _apply_field_update, _apply_fields_update
+        reviewer = _mock_reviewer()
+        reviewer.set_value.side_effect = ReviewerClosed("closed")
+        reviewer.set_values.side_effect = ReviewerClosed("closed")
+        response = _apply_field_update(reviewer, "score", "3")
+        assert response.status_code == 409
+        assert b"reload the page" in response.body
+        assert _apply_fields_update(reviewer, {"score": "3"}).status_code == 409
 
 
 # ---------------------------------------------------------------------------
@@ -296,6 +379,24 @@ class TestRootRouterRoutes:
                 resp = client.get("/reviews/intro/record")
         assert resp.status_code == 200
 
+    def test_root_next_record_moves_cursor(self, tmp_path):
+        app, _ = _make_root_app_with_config(tmp_path, "reviews/intro")
+        reviewer = _mock_reviewer()
+        with patch("referia.assess.web_review.WebReviewer", return_value=reviewer):
+            with TestClient(app) as client:
+                resp = client.get("/reviews/intro/record/next")
+        assert resp.status_code == 200
+        reviewer.set_index.assert_called_once_with("bob")
+
+    def test_root_indices_search(self, tmp_path):
+        app, _ = _make_root_app_with_config(tmp_path, "reviews/intro")
+        with patch("referia.assess.web_review.WebReviewer", return_value=_mock_reviewer()):
+            with TestClient(app) as client:
+                resp = client.get("/reviews/intro/indices", params={"q": "bo"})
+        assert resp.status_code == 200
+        assert ">bob<" in resp.text
+        assert ">alice<" not in resp.text
+
     def test_root_save_returns_ok(self, tmp_path):
         app, _ = _make_root_app_with_config(tmp_path, "reviews/intro")
         with patch("referia.assess.web_review.WebReviewer", return_value=_mock_reviewer()):
@@ -683,3 +784,37 @@ class TestCLIArgumentParsing:
         with pytest.raises(SystemExit) as exc_info:
             _serve(args)
         assert exc_info.value.code == 1
+
+    def test_workers_option_parsed(self):
+        from referia.cli import _build_parser
+        args = _build_parser().parse_args(["serve", "--workers", "8"])
+        assert args.workers == 8
+
+    def test_workers_defaults_to_none(self):
+        from referia.cli import _build_parser
+        args = _build_parser().parse_args(["serve"])
+        assert args.workers is None
+
+    def test_panel_cache_option_parsed(self):
+        from referia.cli import _build_parser
+        args = _build_parser().parse_args(["serve", "--panel-cache", "0"])
+        assert args.panel_cache == 0
+
+    def test_reviewer_cache_limits_parsed(self):
+        from referia.cli import _build_parser
+        args = _build_parser().parse_args([
+            "serve", "--root", "/tmp", "--max-reviewers", "5",
+            "--max-reviewer-memory", "512", "--reviewer-ttl", "60",
+        ])
+        assert (args.max_reviewers, args.max_reviewer_memory, args.reviewer_ttl) == (5, 512, 60.0)
+
+    def test_negative_reviewer_limit_rejected(self):
+        from referia.cli import _serve
+        import argparse
+        args = argparse.Namespace(
+            root="/tmp", directory=None, config="_referia.yml",
+            host="127.0.0.1", port=8000, max_reviewers=-1,
+        )
+        with pytest.raises(SystemExit) as exc_info:
+            _serve(args)
+        assert exc_info.value.code == 1
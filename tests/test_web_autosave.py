@@ -0,0 +1,94 @@
+"""Tests for referia.web.autosave — debounced background writes of edits."""
+
+from __future__ import annotations
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from referia.web.autosave import Autosaver
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDebounce:
+    def test_written_after_quiet_period(self):
+        clock = _Clock()
+        saver = Autosaver(delay=2, clock=clock)
+        reviewer = MagicMock()
+        saver.schedule(reviewer)
+        clock.now = 1
+        saver.schedule(reviewer)
+        clock.now = 2.5
+        assert saver.flush_due() == 0
+        clock.now = 3
+        assert saver.flush_due() == 1
+        reviewer.flush.assert_called_once()
+        assert saver.pending() == 0
+
+    def test_continuous_edits_written_by_max_delay(self):
+        clock = _Clock()
+        saver = Autosaver(delay=1, clock=clock)
+        reviewer = MagicMock()
+        flushed_at = None
+        for step in range(40):
+            clock.now = step * 0.5
+            saver.schedule(reviewer)
+            if saver.flush_due() and flushed_at is None:
+                flushed_at = clock.now
+        assert flushed_at == saver.max_delay
+
+    def test_failed_flush_retried(self):
+        clock = _Clock()
+        saver = Autosaver(delay=1, clock=clock)
+        reviewer = MagicMock()
+        reviewer.flush.side_effect = [OSError("locked"), None]
+        saver.schedule(reviewer)
+        clock.now = 1
+        assert saver.flush_due() == 0
+        assert saver.pending() == 1
+        clock.now = 2
+        assert saver.flush_due() == 1
+        assert saver.stats()["failures"] == 1
+
+    def test_disabled(self):
+        saver = Autosaver(delay=0)
+        saver.schedule(MagicMock())
+        assert saver.pending() == 0
+
+    def test_negative_delay_rejected(self):
+        with pytest.raises(ValueError):
+            Autosaver(delay=-1)
+
+
+class TestBackground:
+    def test_thread_flushes_under_reviewer_lock(self):
+        lock = threading.RLock()
+        held = threading.Event()
+        reviewer = MagicMock()
+        reviewer.flush.side_effect = lambda: held.set() if lock._is_owned() else None
+        saver = Autosaver(delay=0.05, lock_for=lambda r: lock)
+        saver.start()
+        try:
+            saver.schedule(reviewer)
+            assert held.wait(5)
+        finally:
+            saver.stop()
+
+    def test_stop_flushes_pending(self):
+        saver = Autosaver(delay=60)
+        reviewer = MagicMock()
+        saver.start()
+        saver.schedule(reviewer)
+        start = time.monotonic()
+        saver.stop()
+        assert time.monotonic() - start < 5
+        reviewer.flush.assert_called_once()
@@ -0,0 +1,111 @@
+"""Tests for referia.web.config_index — the root-mode config metadata index."""
+
+from __future__ import annotations
+
+import os
+import time
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from referia.web.app import create_app
+from referia.web.config_index import ConfigIndex, read_config_meta
+from referia.web.routes import _list_sub_configs
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def _touch_later(path, text):
+    """Rewrite *path* with a modification time guaranteed to differ."""
+    st = path.stat()
+    path.write_text(text)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestReadConfigMeta:
+    def test_fields(self, tmp_path):
+        yml = _write(tmp_path / "a" / "_referia.yml",
+                     "title: A\ndate: 2024-05-01\ncurrent: true\ninherit:\n  directory: ..\n")
+        meta = read_config_meta(yml)
+        assert meta["title"] == "A"
+        assert meta["date"] == "2024-05-01"
+        assert meta["current"] is True
+        assert meta["inherit_abs"] == tmp_path.resolve()
+
+    def test_parse_error(self, tmp_path):
+        yml = _write(tmp_path / "_referia.yml", "title: [unclosed\n")
+        assert read_config_meta(yml) == {"_error": True}
+
+
+class TestConfigIndex:
+    def test_first_entries_call_scans(self, tmp_path):
+        _write(tmp_path / "g" / "one" / "_referia.yml", "title: One")
+        _write(tmp_path / "g" / "two" / "_referia.yml", "title: Two")
+        index = ConfigIndex(tmp_path)
+        titles = [meta["title"] for _, meta in index.entries()]
+        assert titles == ["One", "Two"]
+        assert index.stats()["configs"] == 2
+
+    def test_refresh_parses_only_changes(self, tmp_path):
+        one = _write(tmp_path / "one" / "_referia.yml", "title: One")
+        two = _write(tmp_path / "two" / "_referia.yml", "title: Two")
+        index = ConfigIndex(tmp_path)
+        assert index.refresh() == 2
+        assert index.refresh() == 0
+
+        _touch_later(one, "title: Uno")
+        _write(tmp_path / "three" / "_referia.yml", "title: Three")
+        two.unlink()
+        assert index.refresh() == 2
+        titles = {meta["title"] for _, meta in index.entries()}
+        assert titles == {"Uno", "Three"}
+
+    def test_entries_under_base(self, tmp_path):
+        _write(tmp_path / "a" / "x" / "_referia.yml", "title: AX")
+        _write(tmp_path / "ab" / "_referia.yml", "title: AB")
+        index = ConfigIndex(tmp_path)
+        titles = [meta["title"] for _, meta in index.entries(tmp_path.resolve() / "a")]
+        assert titles == ["AX"]
+
+    def test_background_refresh(self, tmp_path):
+        index = ConfigIndex(tmp_path, refresh_interval=0.05)
+        index.start()
+        try:
+            _write(tmp_path / "late" / "_referia.yml", "title: Late")
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline and index.stats()["configs"] == 0:
+                time.sleep(0.02)
+        finally:
+            index.stop()
+        assert [meta["title"] for _, meta in index.entries()] == ["Late"]
+
+
+class TestListingFromIndex:
+    def test_listing_matches_direct_scan(self, tmp_path):
+        _write(tmp_path / "g" / "base" / "_referia.yml", "title: Base\ndate: 2024-01-02")
+        _write(tmp_path / "g" / "child" / "_referia.yml",
+               "title: Child\ninherit:\n  directory: ../base\n")
+        _write(tmp_path / "bad" / "_referia.yml", "title: [")
+        index = ConfigIndex(tmp_path)
+        assert _list_sub_configs(str(tmp_path), "", index) == _list_sub_configs(str(tmp_path), "")
+
+    def test_listing_does_not_reparse(self, tmp_path):
+        _write(tmp_path / "one" / "_referia.yml", "title: One")
+        index = ConfigIndex(tmp_path)
+        index.refresh()
+        with patch("referia.web.config_index.read_config_meta") as reader:
+            configs = _list_sub_configs(str(tmp_path), "", index)
+        reader.assert_not_called()
+        assert configs[0]["title"] == "One"
+
+    def test_root_app_serves_listing_and_health(self, tmp_path):
+        _write(tmp_path / "reviews" / "intro" / "_referia.yml", "title: Intro")
+        app = create_app(root=str(tmp_path))
+        with TestClient(app) as client:
+            assert "Intro" in client.get("/").text
+            stats = client.get("/health").json()["config_index"]
+        assert stats["configs"] == 1
@@ -0,0 +1,238 @@
+"""Tests for referia.assess.dependencies — the field dependency graph.
+
+Covers template variable extraction, view reference extraction, graph
+construction from an interface, and (marked ``slow``) a benchmark of the
+OOB payload a field update sends with and without the graph.
+"""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from referia.assess.dependencies import (
+    CombinatorPlan,
+    DependencyGraph,
+    template_variables,
+    view_references,
+)
+
+
+class TestTemplateVariables:
+    def test_liquid_output(self):
+        assert template_variables("Dear {{ givenName }} {{familyName}}") == {
+            "givenName", "familyName",
+        }
+
+    def test_filters_and_string_literals_ignored(self):
+        text = '{{familyName | replace: " ", "-"}}_{{ name | default: fallback }}'
+        assert template_variables(text) == {"familyName", "name", "fallback"}
+
+    def test_liquid_tags(self):
+        text = '{% if score > 3 and passed %}ok{% endif %}'
+        assert template_variables(text) == {"score", "passed"}
+
+    def test_for_loop_variable_not_reported(self):
+        text = "{% for item in items %}{{ item }}{% endfor %}"
+        assert template_variables(text) == {"items"}
+
+    def test_format_fields(self):
+        assert template_variables("{name} scored {score:.1f}") == {"name", "score"}
+
+    def test_non_string(self):
+        assert template_variables(None) == set()
+
+
+class TestViewReferences:
+    def test_field_view(self):
+        assert view_references({"field": "score"}) == {"score"}
+
+    def test_nested_join(self):
+        view = {"join": {"list": [{"field": "a"}, {"liquid": "{{b}}"}], "separator": ", "}}
+        assert view_references(view) == {"a", "b"}
+
+    def test_local_names_are_not_fields(self):
+        view = {"display": "{greeting} {name}", "local": {"greeting": "Hi"}}
+        assert view_references(view) == {"name"}
+
+    def test_compute_view_unknown(self):
+        assert view_references({"compute": {"function": "today"}}) is None
+
+    def test_condition_fields(self):
+        view = {
+            "display": "{score}",
+            "conditions": [
+                {"present": {"field": "flag"}},
+                {"equal": {"field": "status", "value": "done"}},
+            ],
+        }
+        assert view_references(view) == {"score", "flag", "status"}
+
+    def test_included_template_unknown(self):
+        assert view_references({"liquid": "{% include 'summary' %}"}) is None
+        assert view_references("{%- render 'row', name: name -%}") is None
+        assert view_references({"liquid": "{{ included }}"}) == {"included"}
+
+
+def _interface(data: dict):
+    iface = MagicMock()
+    iface.__getitem__ = lambda self, k: data[k]
+    iface.__contains__ = lambda self, k: k in data
+    return iface
+
+
+class TestDependencyGraph:
+    def test_affected_includes_column_and_suffixes(self):
+        graph = DependencyGraph()
+        assert graph.affected("a", ["modified", "created"]) == {
+            "a", "a_modified", "a_created",
+        }
+
+    def test_combinator_edges(self):
+        iface = _interface({"combinator": [{"field": "total", "display": "{a} {b}"}]})
+        graph = DependencyGraph.from_interface(iface, [])
+        assert graph.affected("a") == {"a", "total"}
+        assert graph.affected("c") == {"c"}
+
+    def test_unknown_combinator_depends_on_everything(self):
+        iface = _interface({"combinator": [{"field": "today", "compute": {"function": "now"}}]})
+        graph = DependencyGraph.from_interface(iface, [])
+        assert graph.affected("anything") == {"anything", "today"}
+
+    def test_compute_row_and_view_args(self):
+        iface = _interface({"compute": [{
+            "field": "fullName",
+            "function": "render_liquid",
+            "row_args": {"givenName": "givenName"},
+            "view_args": {"text": {"liquid": "{{familyName}}"}},
+        }]})
+        graph = DependencyGraph.from_interface(iface, [])
+        assert "fullName" in graph.affected("givenName")
+        assert "fullName" in graph.affected("familyName")
+
+    def test_visible_if_and_liquid_widgets(self):
+        specs = [
+            {"type": "Textarea", "field": "comment", "visible_if": {"field": "flag", "value": True}},
+            {"type": "Markdown", "field": "intro", "liquid": "Hello {{name}}"},
+        ]
+        graph = DependencyGraph.from_interface(_interface({}), specs)
+        assert graph.affected("flag") == {"flag", "comment"}
+        assert graph.affected("name") == {"name", "intro"}
+
+    def test_name_map_resolves_template_variables(self):
+        specs = [{"type": "Markdown", "field": "intro", "liquid": "{{givenName}}"}]
+        graph = DependencyGraph.from_interface(
+            _interface({}), specs, name_map={"givenName": "Given Name"}
+        )
+        assert graph.affected("Given Name") == {"Given Name", "intro"}
+
+    def test_transitive_closure(self):
+        graph = DependencyGraph({"a": {"b"}, "b": {"c"}, "c": {"a"}})
+        assert graph.affected("a") == {"a", "b", "c"}
+
+
+class TestCombinatorPlan:
+    def test_only_dependent_combinators_are_stale(self):
+        iface = _interface({"combinator": [
+            {"field": "total", "liquid": "{{a}}+{{b}}"},
+            {"field": "label", "display": "{c}"},
+        ]})
+        plan = CombinatorPlan.from_interface(iface)
+        assert len(plan) == 2
+        assert plan.stale(["a"]) == [0]
+        assert plan.stale(["c", "b"]) == [0, 1]
+        assert plan.stale(["note", "note_modified"]) == []
+
+    def test_chained_combinators_whatever_their_order(self):
+        iface = _interface({"combinator": [
+            {"field": "grade", "liquid": "{{total}}"},
+            {"field": "total", "liquid": "{{a}}+{{b}}"},
+        ]})
+        assert CombinatorPlan.from_interface(iface).stale(["a"]) == [0, 1]
+
+    def test_unknown_inputs_always_stale(self):
+        iface = _interface({"combinator": [
+            {"field": "today", "compute": {"function": "now"}},
+            {"field": "total", "liquid": "{{a}}"},
+        ]})
+        assert CombinatorPlan.from_interface(iface).stale(["z"]) == [0]
+
+    def test_condition_field_makes_combinator_stale(self):
+        iface = _interface({"combinator": [
+            {"field": "note", "display": "{score}",
+             "conditions": [{"present": {"field": "flag"}}]},
+            {"field": "verdict", "liquid": "{{score}}",
+             "conditions": [{"equal": {"field": "status", "value": "done"}}]},
+        ]})
+        plan = CombinatorPlan.from_interface(iface)
+        assert plan.stale(["flag"]) == [0]
+        assert plan.stale(["status"]) == [1]
+
+    def test_included_template_always_stale(self):
+        iface = _interface({"combinator": [
+            {"field": "summary", "liquid": "{% include 'summary' %}"},
+            {"field": "total", "liquid": "{{a}}"},
+        ]})
+        assert CombinatorPlan.from_interface(iface).stale(["z"]) == [0]
+
+    def test_name_map_resolves_template_variables(self):
+        iface = _interface({"combinator": [{"field": "name", "liquid": "{{givenName}}"}]})
+        plan = CombinatorPlan.from_interface(iface, name_map={"givenName": "Given Name"})
+        assert plan.stale(["Given Name"]) == [0]
+
+    def test_no_combinators(self):
+        assert len(CombinatorPlan.from_interface(_interface({}))) == 0
+
+
+@pytest.mark.slow
+def test_benchmark_field_update_payload():
+    """Compare OOB payload and latency of whole-form vs graph-driven refresh.
+
+    A 200-criterion CriterionComment form: each criterion has a Markdown
+    header, a comment Textarea and a score slider; one combinator tallies
+    the scores.
+    """
+    from referia.assess.web_review import SpecRegistry
+    from referia.web.routes import _apply_field_update
+
+    n = 200
+    specs = []
+    combinator_refs = []
+    for i in range(n):
+        specs.append({"type": "Markdown", "liquid": f"### Criterion {i} for {{{{name}}}}"})
+        specs.append({"type": "Textarea", "field": f"comment{i}",
+                      "args": {"description": f"Comment on criterion {i}"}})
+        specs.append({"type": "IntSlider", "field": f"score{i}",
+                      "args": {"min": 0, "max": 10}})
+        combinator_refs.append(f"{{{{score{i}}}}}")
+    specs.append({"type": "Text", "field": "total"})
+    interface = _interface({
+        "combinator": [{"field": "total", "liquid": "+".join(combinator_refs)}],
+    })
+    graph = DependencyGraph.from_interface(interface, specs)
+    registry = SpecRegistry([], specs)
+    fields = {s["field"] for s in specs if "field" in s}
+    row = {f: "some existing comment text " * 10 for f in fields}
+
+    def run(affected):
+        reviewer = MagicMock()
+        reviewer.get_widget_specs.return_value = specs
+        reviewer.get_row_data.return_value = dict(row)
+        reviewer.get_value.side_effect = lambda c: row.get(c)
+        reviewer.affected_widgets.side_effect = affected
+        reviewer.find_spec.side_effect = registry.by_field.get
+        start = time.perf_counter()
+        html = _apply_field_update(reviewer, "comment7", "new text")
+        return len(html.encode()), time.perf_counter() - start
+
+    full_bytes, full_time = run(lambda column: fields)
+    graph_bytes, graph_time = run(
+        lambda column: graph.affected(column, ["modified", "created"]) & fields
+    )
+    print(
+        f"\nwhole form: {full_bytes} bytes, {full_time * 1e3:.1f} ms; "
+        f"graph: {graph_bytes} bytes, {graph_time * 1e3:.1f} ms"
+    )
+    assert graph_bytes * 50 < full_bytes
@@ -0,0 +1,196 @@
+"""Tests for batched field updates (``WebReviewer.set_values``, ``POST /fields``)."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from referia.assess.shared import SharedState
+from referia.assess.web_review import IndexCatalog
+from referia.web.app import create_app
+
+
+class _At:
+    def __init__(self, frame):
+        self._frame = frame
+
+    def __getitem__(self, key):
+        return self._frame.cells.get(key)
+
+
+class _Frame:
+    """One record; the combinator ``total`` sums ``a`` and ``b``."""
+
+    def __init__(self):
+        self.index = ["r"]
+        self.columns = ["a", "b", "note"]
+        self._index, self._subindex, self._selector = "r", None, None
+        self._column = None
+        self.cells = {}
+        self.at = _At(self)
+        self.dtype_casts = 0
+        self.combinator_runs = 0
+
+    def get_index(self):
+        return self._index
+
+    def set_column(self, column):
+        self._column = column
+
+    def get_value(self):
+        return self.cells.get((self._index, self._column))
+
+    def set_value(self, value):
+        self.cells[(self._index, self._column)] = value
+
+    def set_dtype(self, column, dtype):
+        self.dtype_casts += 1
+
+    def get_value_column(self, column):
+        return column
+
+    def viewer_to_value(self, view):
+        self.combinator_runs += 1
+        return sum(self.cells.get(("r", c)) or 0 for c in ("a", "b"))
+
+
+def _reviewer(tmp_path=None):
+    from referia.assess.web_review import WebReviewer
+
+    reviewer = WebReviewer.__new__(WebReviewer)
+    reviewer._interface = {
+        "modified_suffix": "modified",
+        "created_suffix": "created",
+        "combinator": [{"field": "total", "liquid": "{{a}}+{{b}}"}],
+    }
+    reviewer._data = _Frame()
+    if tmp_path is not None:
+        reviewer._directory = str(tmp_path)
+        reviewer._fingerprint = MagicMock(signatures={})
+        reviewer._shared = SharedState(tmp_path / "s.db")
+    return reviewer
+
+
+class TestSetValues:
+    def test_one_on_change_pass_for_the_batch(self):
+        reviewer = _reviewer()
+        assert reviewer.set_values({"a": 1, "b": 2, "note": "ok"}) == []
+        frame = reviewer._data
+        assert frame.cells[("r", "total")] == 3
+        assert frame.combinator_runs == 1
+        # Column types are resolved when flows load, not per edit.
+        assert frame.dtype_casts == 0
+        assert {("r", "a_modified"), ("r", "b_created")} <= set(frame.cells)
+        assert reviewer.dirty_cells()[None] >= {("r", "a"), ("r", "b_modified"), ("r", "total")}
+
+    def test_unchanged_values_are_skipped(self):
+        reviewer = _reviewer()
+        reviewer.set_values({"a": 1})
+        frame = reviewer._data
+        frame.combinator_runs = 0
+        reviewer.set_values({"a": 1, "b": 5})
+        assert ("r", "b_modified") in frame.cells
+        assert frame.cells[("r", "total")] == 6
+        reviewer.set_values({"a": 1, "b": 5})
+        assert frame.combinator_runs == 1
+
+    def test_same_cells_as_separate_updates(self):
+        batched, single = _reviewer(), _reviewer()
+        batched.set_values({"a": 1, "b": 2})
+        single.set_value("a", 1)
+        single.set_value("b", 2)
+        assert set(batched._data.cells) == set(single._data.cells)
+        assert batched._data.cells[("r", "total")] == single._data.cells[("r", "total")]
+
+
+class TestSharedSetValues:
+    def test_batch_is_one_commit(self, tmp_path):
+        reviewer = _reviewer(tmp_path)
+        assert reviewer.set_values({"a": 1, "b": 2}, expected_version=0) == []
+        assert reviewer.row_version() == 1
+        entries, _ = reviewer._shared.changes_since(0)
+        assert {e["column"] for e in entries} >= {"a", "b", "a_modified", "total"}
+
+    def test_conflicting_fields_are_left_alone(self, tmp_path):
+        reviewer = _reviewer(tmp_path)
+        other = _reviewer(tmp_path)
+        other.set_value("a", 9)
+        assert reviewer.set_values({"a": 1, "b": 2}, expected_version=0) == ["a"]
+        assert reviewer.get_value("a") == 9
+        assert reviewer.get_value("b") == 2
+        # The timestamps of b do not make a later edit of a conflict.
+        reviewer._shared.check("r", "a", 1)
+
+
+def _mock_web_reviewer():
+    r = MagicMock()
+    r.index_catalog.return_value = IndexCatalog(["alice"])
+    r.stale_dependencies.return_value = set()
+    r.row_version.return_value = None
+    r.get_row_data.return_value = {}
+    r.get_widget_specs.return_value = []
+    specs = {
+        "Score": {"type": "IntText", "field": "Score"},
+        "Comment": {"type": "Textarea", "field": "Comment"},
+        "Total": {"type": "Text", "field": "Total"},
+    }
+    r.find_spec.side_effect = specs.get
+    r.affected_widgets.side_effect = lambda column: {column, "Total"}
+    r.get_value.side_effect = {"Score": 3, "Comment": "<Comment>", "Total": "<Total>"}.get
+    r.set_values.return_value = []
+    return r
+
+
+class TestFieldsRoute:
+    def _post(self, reviewer, **kwargs):
+        with patch("referia.assess.web_review.WebReviewer", return_value=reviewer):
+            app = create_app(user_file="_referia.yml", directory="/tmp", **kwargs)
+            with TestClient(app) as client:
+                return client.post("/fields", data={"Score": "3", "Comment": "Good"})
+
+    def test_values_applied_in_one_call(self):
+        reviewer = _mock_web_reviewer()
+        response = self._post(reviewer)
+        assert response.status_code == 200
+        reviewer.set_values.assert_called_once_with({"Score": 3, "Comment": "Good"})
+        reviewer.set_value.assert_not_called()
+        assert "Updated 2 fields" in response.text
+
+    def test_each_affected_widget_refreshed_once(self):
+        response = self._post(_mock_web_reviewer())
+        assert response.text.count('hx-swap-oob="true"') == 3
+        assert response.text.count("&lt;Total&gt;") == 1
+
+    def test_conflicts_show_current_value(self):
+        reviewer = _mock_web_reviewer()
+        reviewer.set_values.return_value = ["Comment"]
+        reviewer.affected_widgets.side_effect = lambda column: {column}
+        response = self._post(reviewer)
+        assert response.status_code == 409
+        assert "Comment changed by another reviewer" in response.text
+        assert "&lt;Comment&gt;" in response.text
+
+    def test_error_is_reported_without_details(self):
+        reviewer = _mock_web_reviewer()
+        reviewer.set_values.side_effect = RuntimeError("secret path")
+        response = self._post(reviewer)
+        assert "Update failed" in response.text
+        assert "secret path" not in response.text
+
+    def test_root_mode_route(self, tmp_path):
+        reviewer = _mock_web_reviewer()
+        (tmp_path / "review").mkdir()
+        (tmp_path / "review" / "_referia.yml").write_text("input: {}\n")
+        with patch("referia.assess.web_review.WebReviewer", return_value=reviewer):
+            app = create_app(root=str(tmp_path), config_refresh_interval=0)
+            with TestClient(app) as client:
+                response = client.post("/review/fields", data={"Score": "4"})
+        assert response.status_code == 200
+        reviewer.set_values.assert_called_once_with({"Score": 4})
+
+
+def test_batched_updates_routed_with_their_config():
+    from referia.web.supervisor import route_key
+
+    assert route_key("/a/b/fields") == route_key("/a/b/field/x") == "a/b"
@@ -0,0 +1,83 @@
+"""Tests for referia.assess.fingerprint — files a loaded review depends on."""
+
+from __future__ import annotations
+
+import os
+
+from referia.assess.fingerprint import Fingerprint, config_files, flow_files
+
+
+def _write(path, text=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def _touch_later(path, text):
+    """Rewrite *path* with a modification time guaranteed to differ."""
+    st = path.stat()
+    path.write_text(text)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestConfigFiles:
+    def test_inherit_chain_and_templates(self, tmp_path):
+        base = _write(tmp_path / "base" / "_referia.yml", "title: Base")
+        child = _write(
+            tmp_path / "child" / "_referia.yml",
+            "inherit:\n  directory: ../base\n"
+            "templates:\n  scored:\n    file: templates/scored.yml\n  inline:\n    pattern: []\n",
+        )
+        template = _write(tmp_path / "child" / "templates" / "scored.yml", "pattern: []")
+        assert config_files("_referia.yml", tmp_path / "child") == [child, template, base]
+
+    def test_inherit_cycle_terminates(self, tmp_path):
+        a = _write(tmp_path / "a" / "_referia.yml", "inherit:\n  directory: ../b\n")
+        b = _write(tmp_path / "b" / "_referia.yml", "inherit:\n  directory: ../a\n")
+        assert config_files("_referia.yml", tmp_path / "a") == [a, b]
+
+    def test_missing_parent_listed(self, tmp_path):
+        _write(tmp_path / "_referia.yml", "inherit:\n  directory: gone\n")
+        assert config_files("_referia.yml", tmp_path)[-1] == tmp_path / "gone" / "_referia.yml"
+
+
+class TestFlowFiles:
+    def test_filename_with_directory(self, tmp_path):
+        item = {"type": "excel", "filename": "scores.xlsx", "directory": "data",
+                "store_fields": {"filename": "sourceFilename"}}
+        assert flow_files(item, tmp_path) == [tmp_path / "data" / "scores.xlsx"]
+
+    def test_nested_specifications(self, tmp_path):
+        item = {"type": "hstack", "specifications": [
+            {"type": "csv", "filename": "a.csv"},
+            {"type": "csv", "filename": "b.csv"},
+        ]}
+        assert flow_files(item, tmp_path) == [tmp_path / "a.csv", tmp_path / "b.csv"]
+
+    def test_source_directory_and_matches(self, tmp_path):
+        one = _write(tmp_path / "papers" / "one.md")
+        _write(tmp_path / "papers" / "skip.txt")
+        item = {"type": "directory", "source": [{"directory": "papers", "glob": "*.md"}]}
+        assert flow_files(item, tmp_path) == [tmp_path / "papers", one]
+
+
+class TestFingerprint:
+    def test_changed_groups(self, tmp_path):
+        cfg = _write(tmp_path / "_referia.yml", "title: A")
+        data = _write(tmp_path / "scores.csv", "a\n1\n")
+        fp = Fingerprint.of({"config": [cfg], "input": [data]})
+        assert fp.changed() == set()
+
+        _touch_later(data, "a\n2\n")
+        assert fp.changed() == {"input"}
+
+        fp.refresh(["input"])
+        assert fp.changed() == set()
+
+    def test_appearing_and_vanishing_files(self, tmp_path):
+        missing = tmp_path / "output.xlsx"
+        present = _write(tmp_path / "input.csv")
+        fp = Fingerprint.of({"output": [missing], "input": [present]})
+        _write(missing)
+        present.unlink()
+        assert fp.changed() == {"output", "input"}
@@ -0,0 +1,67 @@
+"""Tests for referia.assess.journal (append-only edit journal)."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from referia.assess.journal import EditJournal, journal_path
+
+
+def test_path_sits_beside_config(tmp_path):
+    assert journal_path("_referia.yml", tmp_path) == tmp_path / "._referia.journal.jsonl"
+
+
+def test_entries_round_trip_in_order(tmp_path):
+    journal = EditJournal(tmp_path / "j.jsonl", fsync=False)
+    stamp = pd.Timestamp("2024-05-01 12:30:00")
+    journal.append("a", None, "score", np.int64(3))
+    journal.append(7, 2, "score_modified", stamp)
+    journal.append("a", None, "note", float("nan"))
+    journal.append("a", None, "tags", ["x", "y"])
+
+    entries = journal.entries()
+    assert [(e["index"], e["subindex"], e["column"]) for e in entries] == [
+        ("a", None, "score"), (7, 2, "score_modified"), ("a", None, "note"), ("a", None, "tags"),
+    ]
+    assert entries[0]["value"] == 3
+    assert entries[1]["value"] == stamp
+    assert entries[2]["value"] is None
+    assert entries[3]["value"] == ["x", "y"]
+    assert "time" in entries[0]
+
+
+def test_missing_file_has_no_entries(tmp_path):
+    assert EditJournal(tmp_path / "absent.jsonl").entries() == []
+
+
+def test_damaged_line_is_skipped(tmp_path):
+    path = tmp_path / "j.jsonl"
+    journal = EditJournal(path, fsync=False)
+    journal.append("a", None, "score", 1)
+    with open(path, "a") as fh:
+        fh.write('{"index": "b", "col')  # cut short by a crash
+    assert len(journal) == 1
+
+
+def test_append_after_torn_tail_keeps_the_edit(tmp_path):
+    path = tmp_path / "j.jsonl"
+    EditJournal(path, fsync=False).append("a", None, "score", 1)
+    with open(path, "a") as fh:
+        fh.write('{"index": "b", "col')  # cut short by a crash
+    # The restarted server opens the journal and records its first edit.
+    journal = EditJournal(path, fsync=False)
+    journal.append("c", None, "score", 3)
+    assert [(e["index"], e["value"]) for e in journal.entries()] == [("a", 1), ("c", 3)]
+    assert path.read_text().endswith("\n")
+
+
+def test_clear_truncates(tmp_path):
+    path = tmp_path / "j.jsonl"
+    journal = EditJournal(path, fsync=False)
+    journal.clear()
+    assert not path.exists()
+    journal.append("a", None, "score", 1)
+    journal.clear()
+    assert path.exists() and path.stat().st_size == 0
+    assert journal.entries() == []
@@ -0,0 +1,112 @@
+"""Tests for referia.web.panel_cache — reuse of rendered review panels."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from referia.assess.web_review import IndexCatalog
+from referia.web.app import create_app
+from referia.web.panel_cache import PanelCache
+
+
+def _reviewer(version=("g", "alice", None, None, 0)):
+    r = MagicMock()
+    r.panel_version.return_value = version
+    return r
+
+
+class TestPanelCache:
+    def test_second_lookup_is_a_hit(self):
+        cache = PanelCache(maxsize=4)
+        build = MagicMock(return_value={"form_html": "<form/>"})
+        reviewer = _reviewer()
+        assert cache.get_or_build("", reviewer, build) == {"form_html": "<form/>"}
+        assert cache.get_or_build("", reviewer, build) == {"form_html": "<form/>"}
+        assert build.call_count == 1
+        assert cache.stats() == {"size": 1, "maxsize": 4, "hits": 1, "misses": 1, "warmed": 0}
+
+    def test_new_version_rebuilds(self):
+        cache = PanelCache(maxsize=4)
+        build = MagicMock(return_value={})
+        cache.get_or_build("", _reviewer(("g", "alice", None, None, 0)), build)
+        cache.get_or_build("", _reviewer(("g", "alice", None, None, 1)), build)
+        assert build.call_count == 2
+
+    def test_configs_do_not_share_entries(self):
+        cache = PanelCache(maxsize=4)
+        build = MagicMock(return_value={})
+        cache.get_or_build("a", _reviewer(), build)
+        cache.get_or_build("b", _reviewer(), build)
+        assert build.call_count == 2
+
+    def test_returns_copies(self):
+        cache = PanelCache(maxsize=4)
+        reviewer = _reviewer()
+        cache.get_or_build("", reviewer, lambda: {"x": 1})["x"] = 2
+        assert cache.get_or_build("", reviewer, lambda: {"x": 3}) == {"x": 1}
+
+    def test_lru_eviction(self):
+        cache = PanelCache(maxsize=2)
+        for index in ("a", "b", "c"):
+            cache.get_or_build("", _reviewer(("g", index, None, None, 0)), dict)
+        assert cache.stats()["size"] == 2
+        build = MagicMock(return_value={})
+        cache.get_or_build("", _reviewer(("g", "a", None, None, 0)), build)
+        build.assert_called_once()
+
+    def test_zero_size_disables(self):
+        cache = PanelCache(maxsize=0)
+        build = MagicMock(return_value={})
+        reviewer = _reviewer()
+        cache.get_or_build("", reviewer, build)
+        cache.get_or_build("", reviewer, build)
+        assert build.call_count == 2
+        reviewer.panel_version.assert_not_called()
+
+    def test_none_version_bypasses(self):
+        cache = PanelCache(maxsize=4)
+        build = MagicMock(return_value={})
+        cache.get_or_build("", _reviewer(None), build)
+        assert cache.stats()["size"] == 0
+
+    def test_negative_size_rejected(self):
+        with pytest.raises(ValueError):
+            PanelCache(maxsize=-1)
+
+
+def _mock_web_reviewer():
+    r = MagicMock()
+    r.index_list.return_value = ["alice", "bob"]
+    r.index_catalog.return_value = IndexCatalog(["alice", "bob"])
+    r.stale_dependencies.return_value = set()
+    r.row_version.return_value = None
+    r.get_index.return_value = "alice"
+    r.get_widget_specs.return_value = []
+    r.get_viewer_specs.return_value = []
+    r.get_review_specs.return_value = []
+    r.get_row_data.return_value = {}
+    r.panel_version.return_value = ("g", "alice", None, None, 0)
+    return r
+
+
+class TestPanelCacheRoutes:
+    def test_revisit_served_from_cache(self):
+        reviewer = _mock_web_reviewer()
+        with patch("referia.assess.web_review.WebReviewer", return_value=reviewer):
+            app = create_app(user_file="_referia.yml", directory="/tmp")
+            with TestClient(app) as client:
+                first = client.get("/record")
+                second = client.get("/record")
+                health = client.get("/health").json()
+        assert first.text == second.text
+        assert reviewer.get_review_specs.call_count == 1
+        assert health["panel_cache"]["hits"] == 1
+        assert health["panel_cache"]["misses"] == 1
+
+    def test_cache_size_configurable(self, tmp_path):
+        app = create_app(root=str(tmp_path), panel_cache_size=7)
+        with TestClient(app) as client:
+            assert client.get("/health").json()["panel_cache"]["maxsize"] == 7
@@ -0,0 +1,246 @@
+"""Tests for referia.web.prefetch and WebReviewer.preview."""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from referia.assess.web_review import IndexCatalog
+from referia.web.app import create_app
+from referia.web.panel_cache import PanelCache
+from referia.web.prefetch import Prefetcher
+
+
+class _Frame:
+    def __init__(self, index, precompute=(), series=None):
+        self.index = list(index)
+        self._index, self._subindex, self._selector = self.index[0], None, None
+        self._precompute = list(precompute)
+        self.types = {"series": ["series"]}
+        self._d = {"series": None} if series is not None else {"input": None}
+        self._series = series or {}
+
+    def get_subseries(self):
+        return self._series.get(self._index, [])
+
+    def check_or_set_subseries(self):
+        self._subindex = self._series[self._index][0]
+
+
+def _web_reviewer(frame):
+    from referia.assess.web_review import WebReviewer
+
+    reviewer = WebReviewer.__new__(WebReviewer)
+    reviewer._data = frame
+    return reviewer
+
+
+class TestPreview:
+    def test_focuses_record_and_restores_cursor(self):
+        reviewer = _web_reviewer(_Frame(["a", "b"]))
+        with reviewer.preview("b") as focused:
+            assert focused
+            assert reviewer._data._index == "b"
+        assert reviewer._data._index == "a"
+
+    def test_unknown_record(self):
+        reviewer = _web_reviewer(_Frame(["a", "b"]))
+        with reviewer.preview("z") as focused:
+            assert not focused
+            assert reviewer._data._index == "a"
+
+    def test_refused_when_precompute_hooks_would_run(self):
+        reviewer = _web_reviewer(_Frame(["a", "b"], precompute=[{"function": "llm"}]))
+        with reviewer.preview("b") as focused:
+            assert not focused
+            assert reviewer._data._index == "a"
+
+    def test_series_record_gets_first_subindex(self):
+        reviewer = _web_reviewer(_Frame(["a", "b"], series={"a": [1], "b": [2, 3]}))
+        with reviewer.preview("b") as focused:
+            assert focused
+            assert reviewer._data._subindex == 2
+        assert (reviewer._data._index, reviewer._data._subindex) == ("a", None)
+
+    def test_refused_when_series_row_would_be_created(self):
+        reviewer = _web_reviewer(_Frame(["a", "b"], series={"a": [1]}))
+        with reviewer.preview("b") as focused:
+            assert not focused
+        assert reviewer._data._index == "a"
+
+
+class _Reviewer:
+    """Records in a list; the panel is just the record's name."""
+
+    def __init__(self, indices, current, refuse=()):
+        self.catalog = IndexCatalog(indices)
+        self.current = current
+        self.refuse = set(refuse)
+        self.sessions = []
+
+    @contextmanager
+    def session(self, key, parent=None):
+        self.sessions.append((key, parent))
+        yield self
+
+    def index_catalog(self):
+        return self.catalog
+
+    def get_index(self):
+        return self.current
+
+    @contextmanager
+    def preview(self, index):
+        if index in self.refuse:
+            yield False
+            return
+        previous, self.current = self.current, index
+        try:
+            yield True
+        finally:
+            self.current = previous
+
+    def panel_version(self):
+        return ("g", self.current, None, None, 0)
+
+
+def _prefetcher(**kwargs):
+    panels = PanelCache(maxsize=8)
+    locks: dict = {}
+    lock_for = lambda reviewer: locks.setdefault(id(reviewer), threading.RLock())
+    return Prefetcher(panels, lock_for, **kwargs), panels, lock_for
+
+
+class TestPrefetcher:
+    def test_renders_next_and_previous(self):
+        prefetcher, panels, _ = _prefetcher()
+        reviewer = _Reviewer(["a", "b", "c", "d"], "b")
+        built = []
+        assert prefetcher.prefetch(reviewer, "", "tab", "browser",
+                                   lambda: built.append(reviewer.current) or {}) == 2
+        assert built == ["c", "a"]
+        assert reviewer.sessions == [("tab", "browser")]
+        assert reviewer.current == "b"
+        # Already cached: nothing is built again.
+        assert prefetcher.prefetch(reviewer, "", None, None, dict) == 0
+        assert panels.stats()["warmed"] == 2
+        assert (panels.hits, panels.misses) == (0, 0)
+
+    def test_clamped_at_the_ends(self):
+        prefetcher, _, _ = _prefetcher(distance=2)
+        reviewer = _Reviewer(["a", "b", "c"], "a")
+        built = []
+        prefetcher.prefetch(reviewer, "", None, None, lambda: built.append(reviewer.current) or {})
+        assert built == ["b", "c"]
+
+    def test_skips_records_that_cannot_be_previewed(self):
+        prefetcher, _, _ = _prefetcher()
+        reviewer = _Reviewer(["a", "b", "c"], "b", refuse={"c"})
+        assert prefetcher.prefetch(reviewer, "", None, None, dict) == 1
+        assert prefetcher.stats()["skipped"] == 1
+
+    def test_stops_when_budget_spent(self):
+        ticks = iter([0.0, 0.0, 0.7])
+        prefetcher, _, _ = _prefetcher(budget=0.5, clock=lambda: next(ticks))
+        reviewer = _Reviewer(["a", "b", "c"], "b")
+        assert prefetcher.prefetch(reviewer, "", None, None, dict) == 1
+
+    def test_gives_way_to_running_request(self):
+        prefetcher, _, lock_for = _prefetcher()
+        reviewer = _Reviewer(["a", "b"], "a")
+        held, release = threading.Event(), threading.Event()
+
+        def request():
+            with lock_for(reviewer):
+                held.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=request)
+        thread.start()
+        held.wait(5)
+        try:
+            assert prefetcher.prefetch(reviewer, "", None, None, dict) == 0
+        finally:
+            release.set()
+            thread.join()
+        assert prefetcher.stats()["busy"] == 1
+
+    def test_failure_is_contained(self):
+        prefetcher, _, lock_for = _prefetcher()
+        reviewer = _Reviewer(["a", "b"], "a")
+
+        def build():
+            raise RuntimeError("render failed")
+
+        assert prefetcher.prefetch(reviewer, "", None, None, build) == 0
+        assert prefetcher.stats()["failures"] == 1
+        # The lock was released.
+        assert lock_for(reviewer).acquire(blocking=False)
+
+    def test_disabled(self):
+        prefetcher, _, _ = _prefetcher(budget=0)
+        assert not prefetcher.enabled
+        assert prefetcher.prefetch(_Reviewer(["a", "b"], "a"), "", None, None, dict) == 0
+
+    def test_negative_budget_rejected(self):
+        with pytest.raises(ValueError):
+            _prefetcher(budget=-1)
+
+
+def _mock_web_reviewer(indices):
+    state = {"index": indices[0]}
+    r = MagicMock()
+    r.index_list.return_value = list(indices)
+    r.index_catalog.return_value = IndexCatalog(indices)
+    r.stale_dependencies.return_value = set()
+    r.row_version.return_value = None
+    r.get_index.side_effect = lambda: state["index"]
+    r.set_index.side_effect = lambda index: state.update(index=index)
+    r.panel_version.side_effect = lambda: ("g", state["index"], None, None, 0)
+    r.get_widget_specs.return_value = []
+    r.get_viewer_specs.return_value = []
+    r.get_review_specs.return_value = []
+    r.get_row_data.side_effect = lambda: {"name": state["index"]}
+
+    @contextmanager
+    def preview(index):
+        previous = state["index"]
+        state["index"] = index
+        try:
+            yield True
+        finally:
+            state["index"] = previous
+
+    r.preview.side_effect = preview
+    return r
+
+
+class TestPrefetchRoutes:
+    def test_next_record_served_from_warm_cache(self):
+        reviewer = _mock_web_reviewer(["alice", "bob", "carol"])
+        with patch("referia.assess.web_review.WebReviewer", return_value=reviewer):
+            app = create_app(user_file="_referia.yml", directory="/tmp")
+            with TestClient(app) as client:
+                client.get("/record", params={"index": "bob"})
+                renders = reviewer.get_review_specs.call_count
+                response = client.get("/record/next")
+                health = client.get("/health").json()
+        assert "3 / 3" in response.text
+        assert health["panel_cache"]["hits"] == 1
+        assert health["prefetch"]["built"] == 2
+        # Neither carol nor, afterwards, her neighbour bob was rendered again.
+        assert reviewer.get_review_specs.call_count == renders
+
+    def test_disabled_by_zero_budget(self):
+        reviewer = _mock_web_reviewer(["alice", "bob"])
+        with patch("referia.assess.web_review.WebReviewer", return_value=reviewer):
+            app = create_app(user_file="_referia.yml", directory="/tmp", prefetch_budget=0)
+            with TestClient(app) as client:
+                client.get("/record")
+                health = client.get("/health").json()
+        reviewer.preview.assert_not_called()
+        assert health["prefetch"]["built"] == 0
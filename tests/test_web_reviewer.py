@@ -179,15 +179,14 @@ class TestSetValue:
     def test_set_value_triggers_modified_timestamp(self):
         reviewer, data, storage = _build_reviewer(col_vals={"score": 0})
         reviewer.set_value("score", 1)
-        # set_dtype should be called for the modified field
-        calls = [str(c) for c in data.set_dtype.call_args_list]
-        assert any("score_modified" in c for c in calls)
+        assert isinstance(storage["score_modified"], pd.Timestamp)
+        # Columns are cast when flows load, not on each edit.
+        data.set_dtype.assert_not_called()
 
     def test_set_value_triggers_created_timestamp_when_absent(self):
         reviewer, data, storage = _build_reviewer(col_vals={"score": 0})
         reviewer.set_value("score", 1)
-        calls = [str(c) for c in data.set_dtype.call_args_list]
-        assert any("score_created" in c for c in calls)
+        assert storage["score_created"] == storage["score_modified"]
 
 
 # ---------------------------------------------------------------------------
@@ -204,6 +203,40 @@ class TestPersistence:
         reviewer.save_flows()
         data.save_flows.assert_called_once()
 
+    def test_dirty_after_edit_until_saved(self):
+        import os
+
+        reviewer, data, _ = _build_reviewer(col_vals={"score": 0})
+        reviewer._directory = os.getcwd()
+        assert not reviewer.dirty
+        reviewer.set_value("score", 3)
+        assert reviewer.dirty
+        reviewer.save_flows()
+        assert not reviewer.dirty
+
+    def test_stale_dependencies_after_outside_edit(self, tmp_path):
+        import os
+
+        (tmp_path / "_referia.yml").write_text("title: t")
+        scores = tmp_path / "scores.csv"
+        scores.write_text("a\n1\n")
+        reviewer, data, _ = _build_reviewer()
+        reviewer._directory = str(tmp_path)
+        reviewer._interface = {"input": {"type": "csv", "filename": "scores.csv"}}
+        reviewer._take_fingerprint()
+        assert reviewer.stale_dependencies() == set()
+
+        st = scores.stat()
+        scores.write_text("a\n2\n")
+        os.utime(scores, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert reviewer.stale_dependencies() == {"input"}
+
+    def test_memory_usage_sums_flows(self):
+        reviewer, data, _ = _build_reviewer()
+        frame = pd.DataFrame({"a": range(100)})
+        data._d = {"input": frame, "output": frame}
+        assert reviewer.memory_usage() == 2 * int(frame.memory_usage(deep=True).sum())
+
     def test_load_flows_delegates_to_data(self):
         import os
         from unittest.mock import MagicMock, patch
@@ -408,23 +441,94 @@ class TestGetWidgetSpecs:
         assert result[0]["type"] == "Markdown"
 
 
+class TestSpecRegistry:
+    def test_specs_flattened_once(self):
+        reviewer, _, _ = _build_reviewer(review=[{"type": "Text", "field": "name"}])
+        first = reviewer.get_widget_specs()
+        assert reviewer.get_widget_specs() is first
+
+    def test_find_spec_skips_populate_buttons(self):
+        specs = [
+            {"type": "PopulateButton", "field": "summary"},
+            {"type": "Textarea", "field": "summary"},
+        ]
+        reviewer, _, _ = _build_reviewer(review=specs)
+        assert reviewer.find_spec("summary") is specs[1]
+        assert reviewer.find_spec("missing") is None
+
+    def test_find_populate_spec_by_target(self):
+        button = {"type": "PopulateButton", "field": "btn", "args": {"target": "summary"}}
+        reviewer, _, _ = _build_reviewer(review=[{"type": "Textarea", "field": "summary"}, button])
+        assert reviewer.find_populate_spec("summary") is button
+        assert reviewer.find_populate_spec("btn") is None
+
+    def test_registry_rebuilt_after_load_flows(self):
+        reviewer, _, _ = _build_reviewer(review=[{"type": "Text", "field": "name"}])
+        registry = reviewer.spec_registry()
+        reviewer._directory = "."
+        new_data, _ = _make_data()
+        with patch("referia.assess.data.CustomDataFrame.from_flow", return_value=new_data):
+            reviewer.load_flows()
+        assert reviewer.spec_registry() is not registry
+
+
+class TestIndexCatalog:
+    def test_position_lookup(self):
+        from referia.assess.web_review import IndexCatalog
+
+        catalog = IndexCatalog(["a", "b", "a", "c"])
+        assert len(catalog) == 4
+        assert catalog.position("a") == 0
+        assert catalog.position("c") == 3
+        assert catalog.position("zzz") is None
+        assert catalog.position(["unhashable"]) is None
+
+    def test_neighbour_clamps(self):
+        from referia.assess.web_review import IndexCatalog
+
+        catalog = IndexCatalog(["a", "b", "c"])
+        assert catalog.neighbour("b", 1) == "c"
+        assert catalog.neighbour("c", 1) == "c"
+        assert catalog.neighbour("a", -1) == "a"
+        assert catalog.neighbour("missing", 1) == "b"
+        assert IndexCatalog([]).neighbour("a", 1) is None
+
+    def test_search_prefix_then_substring(self):
+        from referia.assess.web_review import IndexCatalog
+
+        catalog = IndexCatalog(["Maria", "Mario", "Amar", "Bob"])
+        page, total = catalog.search("mar")
+        assert page == ["Maria", "Mario", "Amar"]
+        assert total == 3
+        assert catalog.search("mar", offset=1, limit=1) == (["Mario"], 3)
+        assert catalog.search("", limit=2) == (["Maria", "Mario"], 4)
+
+    def test_catalog_cached_and_rebuilt_after_load_flows(self):
+        reviewer, _, _ = _build_reviewer(index_vals=["x", "y"])
+        catalog = reviewer.index_catalog()
+        assert reviewer.index_catalog() is catalog
+        assert catalog.indices == ["x", "y"]
+        reviewer._directory = "."
+        new_data, _ = _make_data(index_vals=["z"])
+        with patch("referia.assess.data.CustomDataFrame.from_flow", return_value=new_data):
+            reviewer.load_flows()
+        assert reviewer.index_catalog().indices == ["z"]
+
+
 # ---------------------------------------------------------------------------
 # Tests: affected_widgets
 # ---------------------------------------------------------------------------
 
 
 class TestAffectedWidgets:
-    def test_returns_all_field_columns(self):
+    def test_independent_field_not_returned(self):
         specs = [
             {"type": "Text", "field": "name"},
             {"type": "IntSlider", "field": "score"},
             {"type": "SaveButton"},  # no field
         ]
         reviewer, _, _ = _build_reviewer(review=specs)
-        affected = reviewer.affected_widgets("name")
-        assert "name" in affected
-        assert "score" in affected
-        assert len(affected) == 2
+        assert reviewer.affected_widgets("name") == {"name"}
 
     def test_affected_widgets_ignores_button_types(self):
         specs = [
@@ -434,6 +538,36 @@ class TestAffectedWidgets:
         reviewer, _, _ = _build_reviewer(review=specs)
         assert reviewer.affected_widgets("text") == {"text"}
 
+    def test_timestamp_widgets_returned(self):
+        specs = [
+            {"type": "Text", "field": "name"},
+            {"type": "Text", "field": "name_modified"},
+            {"type": "Text", "field": "score_modified"},
+        ]
+        reviewer, _, _ = _build_reviewer(review=specs)
+        assert reviewer.affected_widgets("name") == {"name", "name_modified"}
+
+    def test_combinator_and_visible_if_followed_transitively(self):
+        specs = [
+            {"type": "IntSlider", "field": "a"},
+            {"type": "Text", "field": "total"},
+            {"type": "Text", "field": "note", "visible_if": "total"},
+            {"type": "Text", "field": "other"},
+        ]
+        combinator = [{"field": "total", "liquid": "{{a}} {{b}}"}]
+        reviewer, _, _ = _build_reviewer(review=specs, combinator=combinator)
+        assert reviewer.affected_widgets("a") == {"a", "total", "note"}
+
+    def test_graph_rebuilt_after_load_flows(self):
+        reviewer, _, _ = _build_reviewer(review=[{"type": "Text", "field": "name"}])
+        graph = reviewer.dependency_graph()
+        assert reviewer.dependency_graph() is graph
+        reviewer._directory = "."
+        new_data, _ = _make_data()
+        with patch("referia.assess.data.CustomDataFrame.from_flow", return_value=new_data):
+            reviewer.load_flows()
+        assert reviewer.dependency_graph() is not graph
+
 
 # ---------------------------------------------------------------------------
 # Tests: combinator update on set_value
@@ -444,18 +578,33 @@ class TestCombinatorUpdate:
     def test_combinator_field_updated_after_set_value(self):
         combinator = [{"field": "total", "liquid": "{{a}} {{b}}"}]
         reviewer, data, storage = _build_reviewer(
-            col_vals={"score": 0},
+            col_vals={"a": 0},
             combinator=combinator,
         )
         data.viewer_to_value.return_value = "combined_value"
 
-        reviewer.set_value("score", 3)
+        reviewer.set_value("a", 3)
 
         # viewer_to_value should have been called with combinator spec (sans "field")
         data.viewer_to_value.assert_called_once_with({"liquid": "{{a}} {{b}}"})
         # and the result stored in "total"
         assert storage.get("total") == "combined_value"
 
+    def test_unrelated_edit_skips_combinator(self):
+        combinator = [{"field": "total", "liquid": "{{a}} {{b}}"}]
+        reviewer, data, storage = _build_reviewer(
+            col_vals={"score": 0},
+            combinator=combinator,
+        )
+
+        reviewer.set_value("score", 3)
+        data.viewer_to_value.assert_not_called()
+        assert "total" not in storage
+
+        reviewer.set_value("a", 1)
+        data.viewer_to_value.assert_called_once()
+        assert reviewer.combinator_stats() == {"evaluated": 1, "skipped": 1}
+
 
 class TestGetRowData:
     """Tests for WebReviewer.get_row_data().
@@ -514,3 +663,426 @@ class TestGetRowData:
         data.columns = _BoomColumns()
         result = reviewer.get_row_data()
         assert result == {}
+
+    def test_row_cached_until_write(self):
+        reviewer, data, _ = _build_reviewer(col_vals={"score": 1, "comment": "x"})
+        reviewer.get_row_data()
+        reads = data.get_value.call_count
+        assert reviewer.get_row_data() == {"score": 1, "comment": "x"}
+        assert data.get_value.call_count == reads
+
+        reviewer.set_value("score", 2)
+        assert reviewer.get_row_data()["score"] == 2
+
+    def test_returned_dict_is_a_copy(self):
+        reviewer, _, _ = _build_reviewer(col_vals={"score": 1})
+        reviewer.get_row_data()["score"] = 99
+        assert reviewer.get_row_data()["score"] == 1
+
+    def test_row_cache_dropped_on_index_change(self):
+        reviewer, _, storage = _build_reviewer(col_vals={"score": 1})
+        reviewer.get_row_data()
+        storage["score"] = 7  # e.g. written by a pre-compute hook
+        reviewer.set_index("row1")
+        reviewer.set_index("row0")
+        assert reviewer.get_row_data()["score"] == 7
+
+
+def _touch_later(path, text):
+    """Rewrite *path* with a modification time guaranteed to differ."""
+    import os
+
+    st = path.stat()
+    path.write_text(text)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def _flow_reviewer(tmp_path):
+    """Reviewer over an input and an output csv, fingerprinted as loaded."""
+    (tmp_path / "_referia.yml").write_text("title: t")
+    (tmp_path / "in.csv").write_text("index\na\nb\n")
+    (tmp_path / "out.csv").write_text("index,score\na,1\n")
+    reviewer, data, _ = _build_reviewer(index_vals=["a", "b"])
+    data._d = {"input": None, "output": None}
+    reviewer._directory = str(tmp_path)
+    reviewer._interface = {
+        "input": {"type": "csv", "filename": "in.csv"},
+        "output": {"type": "csv", "filename": "out.csv"},
+    }
+    reviewer._take_fingerprint()
+    return reviewer, data
+
+
+class TestFlush:
+    def _reviewer(self):
+        import os
+
+        reviewer, data, storage = _build_reviewer(col_vals={"score": 0, "note": ""})
+        reviewer._directory = os.getcwd()
+        data._d = {"input": None, "output": None, "writeseries": None}
+        data._colspecs = {"input": ["title"], "output": ["score", "score_modified", "score_created"],
+                          "writeseries": ["note"]}
+        return reviewer, data
+
+    def test_edit_records_cell_in_its_flow(self):
+        reviewer, _ = self._reviewer()
+        reviewer.set_value("score", 4)
+        cells = reviewer.dirty_cells()
+        assert ("row0", "score") in cells["output"]
+        assert ("row0", "score_modified") in cells["output"]
+
+    def test_flush_writes_only_dirty_flows(self):
+        reviewer, data = self._reviewer()
+        reviewer.set_value("score", 4)
+        assert reviewer.flush() == ["output"]
+        data.save_flow.assert_called_once()
+        assert data.save_flow.call_args.args == ("output",)
+        assert ("row0", "score") in data.save_flow.call_args.kwargs["cells"]
+        data.save_flows.assert_not_called()
+        assert not reviewer.dirty
+        assert reviewer.flush() == []
+
+    def test_unplaced_writes_flush_every_output(self):
+        reviewer, data = self._reviewer()
+        reviewer.run_populate({"compute": {}})
+        assert reviewer.flush() == ["output", "writeseries"]
+
+    def test_failed_write_keeps_remaining_flows_dirty(self):
+        reviewer, data = self._reviewer()
+        reviewer.set_value("score", 4)
+        reviewer.set_value("note", "n")
+        data.save_flow.side_effect = [None, OSError("disk full")]
+        with pytest.raises(OSError):
+            reviewer.flush()
+        assert reviewer.dirty
+        assert set(reviewer.dirty_cells()) == {"writeseries"}
+
+
+class TestJournal:
+    def _reviewer(self, tmp_path):
+        from referia.assess.journal import EditJournal
+
+        reviewer, data = TestFlush()._reviewer()
+        reviewer._journal = EditJournal(tmp_path / "j.jsonl", fsync=False)
+        return reviewer, data
+
+    def test_edit_appends_every_cell_written(self, tmp_path):
+        reviewer, _ = self._reviewer(tmp_path)
+        reviewer.set_value("score", 4)
+        entries = reviewer._journal.entries()
+        assert [(e["index"], e["column"]) for e in entries] == [
+            ("row0", "score"), ("row0", "score_modified"), ("row0", "score_created"),
+        ]
+        assert entries[0]["value"] == 4
+        assert isinstance(entries[1]["value"], pd.Timestamp)
+
+    def test_flush_compacts_journal(self, tmp_path):
+        reviewer, _ = self._reviewer(tmp_path)
+        reviewer.set_value("score", 4)
+        reviewer.flush()
+        assert reviewer._journal.entries() == []
+
+    def test_failed_flush_keeps_journal(self, tmp_path):
+        reviewer, data = self._reviewer(tmp_path)
+        reviewer.set_value("score", 4)
+        data.save_flow.side_effect = OSError("disk full")
+        with pytest.raises(OSError):
+            reviewer.flush()
+        assert len(reviewer._journal) == 3
+
+    def test_replay_restores_edits_and_marks_dirty(self, tmp_path):
+        reviewer, data = self._reviewer(tmp_path)
+        reviewer._journal.append("row1", None, "score", 9)
+        reviewer._journal.append("gone", None, "score", 1)
+        reviewer._replay_journal()
+        assert reviewer.dirty
+        assert reviewer.dirty_cells() == {"output": {("row1", "score")}}
+        data.set_value.assert_called_once_with(9)
+        # The cursor is put back where it was.
+        assert reviewer.get_index() == "row0"
+
+    def test_populate_journals_target_field(self, tmp_path):
+        reviewer, _ = self._reviewer(tmp_path)
+        reviewer.run_populate({"compute": {"field": "score", "function": "f"}})
+        assert [e["column"] for e in reviewer._journal.entries()] == ["score"]
+
+
+    def test_closed_reviewer_refuses_edits(self, tmp_path):
+        from referia.exceptions import ReviewerClosed
+
+        reviewer, data = self._reviewer(tmp_path)
+        reviewer.close()
+        for edit in (lambda: reviewer.set_value("score", 4),
+                     lambda: reviewer.set_values({"score": 4}),
+                     lambda: reviewer.run_populate({"compute": {"field": "score"}})):
+            with pytest.raises(ReviewerClosed):
+                edit()
+        assert reviewer._journal.entries() == []
+        assert not reviewer.dirty
+        data.set_value.assert_not_called()
+
+
+class TestChangedOnlyReload:
+    def test_rereads_only_changed_flow(self, tmp_path):
+        reviewer, data = _flow_reviewer(tmp_path)
+        _touch_later(tmp_path / "in.csv", "index\na\nb\nc\n")
+        with patch("referia.assess.data.CustomDataFrame.from_flow") as from_flow:
+            reviewer.load_flows(reload=True, changed_only=True)
+        from_flow.assert_not_called()
+        data.reload_flows.assert_called_once_with(["input"])
+        assert reviewer.stale_dependencies() == set()
+
+    def test_unsaved_edits_reread_outputs(self, tmp_path):
+        reviewer, data = _flow_reviewer(tmp_path)
+        reviewer._dirty = True
+        reviewer.load_flows(reload=True, changed_only=True)
+        data.reload_flows.assert_called_once_with(["output"])
+        assert not reviewer.dirty
+
+    def test_nothing_changed_reads_nothing(self, tmp_path):
+        reviewer, data = _flow_reviewer(tmp_path)
+        before = reviewer.panel_version()
+        reviewer.load_flows(reload=True, changed_only=True)
+        data.reload_flows.assert_not_called()
+        assert reviewer.panel_version() == before
+
+    def test_config_change_reloads_everything(self, tmp_path):
+        reviewer, data = _flow_reviewer(tmp_path)
+        _touch_later(tmp_path / "_referia.yml", "title: changed")
+        new_data, _ = _make_data(index_vals=["a", "b"])
+        with patch("referia.assess.data.CustomDataFrame.from_flow", return_value=new_data) as from_flow:
+            reviewer.load_flows(reload=True, changed_only=True)
+        from_flow.assert_called_once()
+        data.reload_flows.assert_not_called()
+
+    def test_failed_reread_falls_back(self, tmp_path):
+        reviewer, data = _flow_reviewer(tmp_path)
+        data.reload_flows.side_effect = ValueError("no")
+        _touch_later(tmp_path / "out.csv", "index,score\na,2\n")
+        new_data, _ = _make_data(index_vals=["a", "b"])
+        with patch("referia.assess.data.CustomDataFrame.from_flow", return_value=new_data):
+            reviewer.load_flows(reload=True, changed_only=True)
+        assert reviewer._data is new_data
+
+
+class TestPanelVersion:
+    def test_version_stable_without_writes(self):
+        reviewer, _, _ = _build_reviewer(col_vals={"score": 1})
+        assert reviewer.panel_version() == reviewer.panel_version()
+
+    def test_set_value_bumps_version(self):
+        reviewer, _, _ = _build_reviewer(col_vals={"score": 1})
+        before = reviewer.panel_version()
+        reviewer.set_value("score", 2)
+        assert reviewer.panel_version() != before
+
+    def test_other_record_unaffected_by_write(self):
+        reviewer, data, _ = _build_reviewer(col_vals={"score": 1})
+        data._precompute = data._postcompute = []
+        reviewer.set_index("row1")
+        other = reviewer.panel_version()
+        reviewer.set_index("row0")
+        reviewer.set_value("score", 2)
+        reviewer.set_index("row1")
+        assert reviewer.panel_version() == other
+
+    def test_index_change_with_hooks_bumps_version(self):
+        reviewer, data, _ = _build_reviewer(col_vals={"score": 1})
+        data._precompute = [{"function": "today", "field": "seen"}]
+        data._postcompute = []
+        reviewer.set_index("row1")
+        other = reviewer.panel_version()
+        reviewer.set_index("row0")
+        reviewer.set_index("row1")
+        assert reviewer.panel_version() != other
+
+    def test_reload_changes_generation(self):
+        reviewer, _, _ = _build_reviewer(col_vals={"score": 1})
+        before = reviewer.panel_version()
+        reviewer._directory = "."
+        new_data, _ = _make_data(col_vals={"score": 1})
+        with patch("referia.assess.data.CustomDataFrame.from_flow", return_value=new_data):
+            reviewer.load_flows()
+        assert reviewer.panel_version()[0] != before[0]
+
+
+class _FlowData:
+    """Stand-in for CustomDataFrame exposing flows the way lynguine stores them."""
+
+    def __init__(self, flows, index):
+        self._d = flows
+        self.types = {"input": ["data"], "output": ["writedata"],
+                      "parameters": ["constants"], "series": ["writeseries"],
+                      "cache": ["cache"]}
+        self._index = index
+        self._subindex = None
+        self._selector = None
+        self.index = flows["data"].index
+        cols: list = []
+        for frame in flows.values():
+            names = frame.columns if isinstance(frame, pd.DataFrame) else frame.index
+            cols += [c for c in names if c not in cols]
+        self.columns = cols
+        self.per_column_reads = []
+        self._column = None
+
+    def get_index(self):
+        return self._index
+
+    def set_column(self, column):
+        self._column = column
+
+    def get_value(self):
+        self.per_column_reads.append(self._column)
+        return "from get_value"
+
+
+class TestRowSnapshot:
+    def _reviewer(self):
+        from referia.assess.web_review import WebReviewer
+
+        data = pd.DataFrame({"name": ["Ann", "Bob"], "score": [1.0, float("nan")]},
+                            index=pd.Index(["a", "b"], name="id"))
+        writedata = pd.DataFrame({"score": [5.0], "comment": [None]}, index=["a"])
+        constants = pd.Series({"q1Question": "How many?"})
+        series = pd.DataFrame({"note": ["n1"]}, index=["a"])
+        flows = {"writedata": writedata, "data": data,
+                 "constants": constants, "writeseries": series}
+        reviewer = WebReviewer.__new__(WebReviewer)
+        reviewer._data = _FlowData(flows, "a")
+        return reviewer
+
+    def test_first_flow_holding_row_and_column_wins(self):
+        row = self._reviewer().get_row_data()
+        assert row["score"] == 5.0
+        assert row["name"] == "Ann"
+
+    def test_falls_through_when_row_missing_from_flow(self):
+        reviewer = self._reviewer()
+        reviewer._data._index = "b"
+        row = reviewer.get_row_data()
+        assert row["score"] is None  # NaN from data, writedata has no row "b"
+        assert row["name"] == "Bob"
+
+    def test_parameters_read_by_name(self):
+        row = self._reviewer().get_row_data()
+        assert row["q1Question"] == "How many?"
+
+    def test_only_series_columns_read_individually(self):
+        reviewer = self._reviewer()
+        row = reviewer.get_row_data()
+        assert reviewer._data.per_column_reads == ["note"]
+        assert row["note"] == "from get_value"
+        assert row["comment"] is None
+
+
+# ---------------------------------------------------------------------------
+# Tests: per-browser sessions
+# ---------------------------------------------------------------------------
+
+
+class _CursorData:
+    """Stand-in for CustomDataFrame that keeps the real cursor attributes."""
+
+    def __init__(self, index_vals):
+        self.index = list(index_vals)
+        self._index = self.index[0]
+        self._subindex = None
+        self._selector = None
+        self.hooks = []
+
+    def get_index(self):
+        return self._index
+
+    def set_index(self, value):
+        if value != self._index:
+            self.hooks.append(("post", self._index))
+            self._index = value
+            self.hooks.append(("pre", value))
+
+    def check_or_set_subseries(self):
+        pass
+
+
+def _session_reviewer(index_vals=("a", "b", "c")):
+    from referia.assess.web_review import WebReviewer
+
+    reviewer = WebReviewer.__new__(WebReviewer)
+    reviewer._data = _CursorData(index_vals)
+    return reviewer
+
+
+class TestSessions:
+    def test_sessions_keep_independent_cursors(self):
+        reviewer = _session_reviewer()
+        with reviewer.session("s1"):
+            reviewer.set_index("b")
+        with reviewer.session("s2"):
+            reviewer.set_index("c")
+        with reviewer.session("s1"):
+            assert reviewer.get_index() == "b"
+        with reviewer.session("s2"):
+            assert reviewer.get_index() == "c"
+
+    def test_shared_cursor_restored_after_session(self):
+        reviewer = _session_reviewer()
+        with reviewer.session("s1"):
+            reviewer.set_index("c")
+        assert reviewer.get_index() == "a"
+
+    def test_switching_sessions_runs_no_hooks(self):
+        reviewer = _session_reviewer()
+        with reviewer.session("s1"):
+            reviewer.set_index("b")
+        reviewer._data.hooks.clear()
+        with reviewer.session("s2"):
+            pass
+        with reviewer.session("s1"):
+            pass
+        assert reviewer._data.hooks == []
+
+    def test_hooks_run_for_session_record_only(self):
+        reviewer = _session_reviewer()
+        with reviewer.session("s1"):
+            reviewer.set_index("b")
+        with reviewer.session("s2"):
+            reviewer.set_index("c")
+        assert reviewer._data.hooks == [
+            ("post", "a"), ("pre", "b"), ("post", "a"), ("pre", "c"),
+        ]
+
+    def test_new_session_copies_parent(self):
+        reviewer = _session_reviewer()
+        with reviewer.session("browser"):
+            reviewer.set_index("c")
+        with reviewer.session("browser/tab", "browser"):
+            assert reviewer.get_index() == "c"
+            reviewer.set_index("b")
+        with reviewer.session("browser"):
+            assert reviewer.get_index() == "c"
+
+    def test_none_session_uses_shared_cursor(self):
+        reviewer = _session_reviewer()
+        with reviewer.session(None):
+            reviewer.set_index("b")
+        assert reviewer.get_index() == "b"
+
+    def test_session_table_is_bounded(self):
+        from referia.assess import web_review
+
+        reviewer = _session_reviewer()
+        with patch.object(web_review, "MAX_SESSIONS", 2):
+            for sid in ("s1", "s2", "s3"):
+                with reviewer.session(sid):
+                    pass
+        assert list(reviewer._sessions()) == ["s2", "s3"]
+
+    def test_cursor_on_removed_record_falls_back_after_reload(self):
+        reviewer = _session_reviewer()
+        with reviewer.session("s1"):
+            reviewer.set_index("c")
+        # Simulate load_flows() replacing the data without record "c".
+        reviewer._data = _CursorData(["a", "b"])
+        reviewer._data_generation = 1
+        with reviewer.session("s1"):
+            assert reviewer.get_index() == "a"
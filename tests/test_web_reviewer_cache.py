@@ -0,0 +1,149 @@
+"""Tests for referia.web.reviewer_cache — the bounded root-mode reviewer cache."""
+
+from __future__ import annotations
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from referia.web.app import create_app
+from referia.web.reviewer_cache import ReviewerCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _reviewer(size=0, dirty=False):
+    reviewer = MagicMock()
+    reviewer.memory_usage.return_value = size
+    reviewer.dirty = dirty
+    return reviewer
+
+
+class TestLimits:
+    def test_lookup_hit_and_stale_miss(self):
+        cache = ReviewerCache()
+        reviewer = _reviewer()
+        cache.store("a", 1.0, reviewer)
+        assert cache.lookup("a", 1.0) is reviewer
+        assert cache.lookup("a", 2.0) is None
+        assert cache.lookup("b", 1.0) is None
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"]) == (1, 2)
+
+    def test_maxsize_evicts_least_recently_used(self):
+        cache = ReviewerCache(maxsize=2, max_memory=0, ttl=0)
+        for key in "ab":
+            cache.store(key, 0, _reviewer())
+        cache.lookup("a", 0)
+        cache.store("c", 0, _reviewer())
+        assert sorted(cache) == ["a", "c"]
+        assert cache.stats()["evictions"] == 1
+
+    def test_memory_limit(self):
+        cache = ReviewerCache(maxsize=0, max_memory=250, ttl=0)
+        cache.store("a", 0, _reviewer(size=100))
+        cache.store("b", 0, _reviewer(size=100))
+        cache.store("c", 0, _reviewer(size=100))
+        assert sorted(cache) == ["b", "c"]
+        assert cache.memory() == 200
+
+    def test_oversized_reviewer_is_kept(self):
+        cache = ReviewerCache(maxsize=0, max_memory=50, ttl=0)
+        big = _reviewer(size=100)
+        cache.store("big", 0, big)
+        assert cache.lookup("big", 0) is big
+
+    def test_ttl_expires_idle_reviewers(self):
+        clock = _Clock()
+        cache = ReviewerCache(maxsize=0, max_memory=0, ttl=10, clock=clock)
+        cache.store("a", 0, _reviewer())
+        cache.store("b", 0, _reviewer())
+        clock.now = 8
+        cache.lookup("b", 0)
+        clock.now = 15
+        assert cache.lookup("a", 0) is None
+        assert "b" in cache
+
+    def test_negative_limit_rejected(self):
+        with pytest.raises(ValueError):
+            ReviewerCache(maxsize=-1)
+
+
+class TestFlushing:
+    def test_dirty_reviewer_saved_before_eviction(self):
+        cache = ReviewerCache(maxsize=1, max_memory=0, ttl=0)
+        dirty = _reviewer(dirty=True)
+        cache.store("a", 0, dirty)
+        cache.store("b", 0, _reviewer())
+        dirty.flush.assert_called_once()
+        assert list(cache) == ["b"]
+
+    def test_clean_reviewer_not_saved(self):
+        cache = ReviewerCache(maxsize=1, max_memory=0, ttl=0)
+        clean = _reviewer()
+        cache.store("a", 0, clean)
+        cache.store("b", 0, _reviewer())
+        clean.flush.assert_not_called()
+
+    def test_failed_save_keeps_reviewer(self):
+        cache = ReviewerCache(maxsize=1, max_memory=0, ttl=0)
+        dirty = _reviewer(dirty=True)
+        dirty.flush.side_effect = OSError("disk full")
+        cache.store("a", 0, dirty)
+        cache.store("b", 0, _reviewer())
+        assert sorted(cache) == ["a", "b"]
+        assert cache.stats()["flush_failures"] == 1
+
+    def test_replaced_reviewer_saved(self):
+        cache = ReviewerCache()
+        old = _reviewer(dirty=True)
+        cache.store("a", 1.0, old)
+        cache.store("a", 2.0, _reviewer())
+        old.flush.assert_called_once()
+
+    def test_dropped_reviewer_closed_under_its_lock(self):
+        lock = threading.Lock()
+        held = []
+        reviewer = _reviewer(dirty=True)
+        reviewer.close.side_effect = lambda: held.append(lock.locked())
+        cache = ReviewerCache(maxsize=1, max_memory=0, ttl=0, lock_for=lambda r: lock)
+        cache.store("a", 0, reviewer)
+        cache.store("b", 0, _reviewer())
+        reviewer.flush.assert_called_once()
+        assert held == [True]
+
+    def test_reviewer_that_failed_to_save_stays_open(self):
+        cache = ReviewerCache(maxsize=1, max_memory=0, ttl=0)
+        dirty = _reviewer(dirty=True)
+        dirty.flush.side_effect = OSError("disk full")
+        cache.store("a", 0, dirty)
+        cache.store("b", 0, _reviewer())
+        dirty.close.assert_not_called()
+
+    def test_save_holds_reviewer_lock(self):
+        lock = threading.Lock()
+        held = []
+        reviewer = _reviewer(dirty=True)
+        reviewer.flush.side_effect = lambda: held.append(lock.locked())
+        cache = ReviewerCache(lock_for=lambda r: lock)
+        cache.store("a", 0, reviewer)
+        cache.clear()
+        assert held == [True]
+        assert len(cache) == 0
+
+
+def test_health_reports_reviewer_cache(tmp_path):
+    app = create_app(root=str(tmp_path), max_reviewers=4, reviewer_ttl=60)
+    with TestClient(app) as client:
+        stats = client.get("/health").json()["reviewer_cache"]
+    assert stats["maxsize"] == 4
+    assert stats["ttl"] == 60
+    assert stats["size"] == 0
@@ -24,6 +24,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 from fastapi.testclient import TestClient
 
+from referia.assess.web_review import IndexCatalog
 from referia.web.app import create_app
 
 # ---------------------------------------------------------------------------
@@ -43,10 +44,24 @@ _REVIEW_SPECS = [
 _INDICES = ["alice", "bob", "carol"]
 
 
+def _index_specs(reviewer: MagicMock) -> None:
+    """Answer find_spec/find_populate_spec from the mock's get_widget_specs."""
+    from referia.assess.web_review import SpecRegistry
+
+    def registry():
+        return SpecRegistry([], list(reviewer.get_widget_specs()))
+
+    reviewer.find_spec.side_effect = lambda f: registry().by_field.get(f)
+    reviewer.find_populate_spec.side_effect = lambda t: registry().populate_by_target.get(t)
+
+
 def _build_mock_reviewer() -> MagicMock:
     """Return a fully-configured WebReviewer mock."""
     reviewer = MagicMock()
     reviewer.index_list.return_value = list(_INDICES)
+    reviewer.index_catalog.return_value = IndexCatalog(_INDICES)
+    reviewer.stale_dependencies.return_value = set()
+    reviewer.row_version.return_value = None
     reviewer.get_index.return_value = "alice"
 
     reviewer.get_viewer_specs.return_value = list(_VIEWER_SPECS)
@@ -58,6 +73,9 @@ def _build_mock_reviewer() -> MagicMock:
     reviewer.get_value.return_value = ""
     reviewer.get_row_data.return_value = {}
     reviewer.affected_widgets.return_value = {"Comment", "Score"}
+    _index_specs(reviewer)
+    # No panel caching: tests change the mock between requests.
+    reviewer.panel_version.return_value = None
     return reviewer
 
 
@@ -96,10 +114,14 @@ class TestGetRoot:
         response = client.get("/")
         assert 'id="index-select"' in response.text
 
-    def test_html_lists_all_indices_as_options(self, client):
+    def test_html_does_not_list_every_index(self, client):
         response = client.get("/")
-        for name in _INDICES:
-            assert name in response.text
+        assert "<option" not in response.text
+        assert "carol" not in response.text
+
+    def test_html_shows_position_from_catalog(self, client):
+        response = client.get("/")
+        assert "1 / 3" in response.text
 
     def test_html_contains_review_field_ids(self, client):
         response = client.get("/")
@@ -184,16 +206,62 @@ class TestGetIndices:
         response = client.get("/indices")
         assert response.status_code == 200
 
-    def test_returns_select_element(self, client):
+    def test_returns_result_buttons(self, client):
         response = client.get("/indices")
-        assert "<select" in response.text
-        assert 'id="index-select"' in response.text
+        assert "<select" not in response.text
+        assert 'hx-get="/record?index=bob"' in response.text
 
-    def test_all_indices_present_as_options(self, client):
+    def test_all_indices_present_without_query(self, client):
         response = client.get("/indices")
         for name in _INDICES:
             assert name in response.text
 
+    def test_query_filters_prefix_first(self, client, mock_reviewer):
+        mock_reviewer.index_catalog.return_value = IndexCatalog(["calvin", "alice", "al", "bob"])
+        response = client.get("/indices", params={"q": "al"})
+        text = response.text
+        assert "bob" not in text
+        assert text.index(">alice<") < text.index(">calvin<")
+
+    def test_pagination_offers_more(self, client, mock_reviewer):
+        mock_reviewer.index_catalog.return_value = IndexCatalog([f"r{i}" for i in range(5)])
+        response = client.get("/indices", params={"limit": 2, "offset": 2})
+        assert ">r2<" in response.text and ">r3<" in response.text
+        assert ">r1<" not in response.text and ">r4<" not in response.text
+        assert "offset=4" in response.text
+        assert "1 left" in response.text
+
+    def test_limit_is_clamped(self, client, mock_reviewer):
+        mock_reviewer.index_catalog.return_value = IndexCatalog([f"r{i}" for i in range(5)])
+        response = client.get("/indices", params={"limit": 0, "offset": -3})
+        assert ">r0<" in response.text
+        assert ">r1<" not in response.text
+
+    def test_no_matches(self, client):
+        response = client.get("/indices", params={"q": "zzz"})
+        assert "No matching records" in response.text
+
+
+# ---------------------------------------------------------------------------
+# GET /record/next, /record/prev
+# ---------------------------------------------------------------------------
+
+
+class TestStepRecord:
+    def test_next_moves_to_following_record(self, client, mock_reviewer):
+        client.get("/record/next")
+        mock_reviewer.set_index.assert_called_once_with("bob")
+
+    def test_prev_clamps_at_first_record(self, client, mock_reviewer):
+        client.get("/record/prev")
+        mock_reviewer.set_index.assert_called_once_with("alice")
+
+    def test_returns_panel_fragment(self, client):
+        response = client.get("/record/next")
+        assert response.status_code == 200
+        assert 'id="index-select"' in response.text
+        assert "<html" not in response.text
+
 
 # ---------------------------------------------------------------------------
 # POST /field/{column}
@@ -213,6 +281,11 @@ class TestPostField:
         response = client.post("/field/Comment", data={"Comment": "Well done"})
         assert "Updated" in response.text or "&#10003;" in response.text
 
+    def test_edit_queued_for_autosave(self, client, mock_reviewer):
+        client.post("/field/Comment", data={"Comment": "Great!"})
+        assert client.app.state.autosave.pending() == 1
+        mock_reviewer.flush.assert_not_called()
+
     def test_response_contains_oob_swaps_for_affected_widgets(self, client, mock_reviewer):
         mock_reviewer.affected_widgets.return_value = {"Comment", "Score"}
         response = client.post("/field/Comment", data={"Comment": "x"})
@@ -270,9 +343,9 @@ class TestPostSave:
         response = client.post("/save", data={"Comment": "ok", "Score": "5"})
         assert response.status_code == 200
 
-    def test_calls_save_flows(self, client, mock_reviewer):
+    def test_calls_flush(self, client, mock_reviewer):
         client.post("/save", data={"Comment": "ok", "Score": "5"})
-        mock_reviewer.save_flows.assert_called_once()
+        mock_reviewer.flush.assert_called_once()
 
     def test_response_contains_saved_confirmation(self, client):
         response = client.post("/save", data={"Comment": "ok", "Score": "5"})
@@ -283,20 +356,20 @@ class TestPostSave:
 
         Each field already posted its own value when the user edited it.
         Save's job is only to flush the in-memory reviewer state to disk
-        via save_flows().  Calling set_value here re-runs computes and
+        via flush().  Calling set_value here re-runs computes and
         can have unforeseen side-effects.
         """
         client.post("/save", data={"Comment": "looks good", "Score": "7"})
         mock_reviewer.set_value.assert_not_called()
 
-    def test_save_without_form_data_still_calls_save_flows(self, client, mock_reviewer):
-        """Even with no form data the save must not crash and must call save_flows."""
+    def test_save_without_form_data_still_flushes(self, client, mock_reviewer):
+        """Even with no form data the save must not crash and must flush."""
         response = client.post("/save", data={})
         assert response.status_code == 200
-        mock_reviewer.save_flows.assert_called_once()
+        mock_reviewer.flush.assert_called_once()
 
     def test_save_failure_returns_200_with_error_message(self, client, mock_reviewer):
-        mock_reviewer.save_flows.side_effect = OSError("disk full")
+        mock_reviewer.flush.side_effect = OSError("disk full")
         response = client.post("/save", data={})
         assert response.status_code == 200
         assert "failed" in response.text.lower()
@@ -378,7 +451,7 @@ class TestPostReload:
 
     def test_calls_load_flows(self, client, mock_reviewer):
         client.post("/reload")
-        mock_reviewer.load_flows.assert_called_once()
+        mock_reviewer.load_flows.assert_called_once_with(reload=True, changed_only=True)
 
     def test_response_contains_review_panel(self, client):
         response = client.post("/reload")
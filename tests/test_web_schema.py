@@ -0,0 +1,199 @@
+"""Tests for referia.assess.schema and the load-time column casts of WebReviewer."""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from referia.assess.schema import TIMESTAMP_DTYPE, ColumnSchema, widget_dtype
+
+INTERFACE = {
+    "modified_suffix": "modified",
+    "created_suffix": "created",
+    "review": [
+        {"type": "IntSlider", "field": "score"},
+        {"type": "Textarea", "field": "comment"},
+        {"type": "Checkbox", "field": "done"},
+        {"type": "PopulateButton", "field": "comment"},
+        {"type": "SaveButton"},
+    ],
+}
+
+
+class _At:
+    def __init__(self, frame):
+        self._frame = frame
+
+    def __getitem__(self, key):
+        return self._frame._d["output"].at[key]
+
+
+class _Frame:
+    """An output flow in a real DataFrame, written cell by cell."""
+
+    def __init__(self, rows, columns=("score", "comment", "done")):
+        index = [f"r{i}" for i in range(rows)]
+        # How a fresh output file reads: every column missing, as float64.
+        cols = list(columns) + [f"{c}_{s}" for c in columns for s in ("modified", "created")]
+        self._d = {"output": pd.DataFrame(np.nan, index=index, columns=cols)}
+        self.index = index
+        self._index = index[0]
+        self._column = None
+        self.at = _At(self)
+
+    @property
+    def columns(self):
+        return list(self._d["output"].columns)
+
+    def get_index(self):
+        return self._index
+
+    def set_column(self, column):
+        self._column = column
+
+    def get_value(self):
+        return self._d["output"].at[self._index, self._column]
+
+    def set_value(self, value):
+        self._d["output"].at[self._index, self._column] = value
+
+    def get_value_column(self, column):
+        return column
+
+    def set_dtype(self, column, dtype):
+        df = self._d["output"]
+        if df[column].dtype != dtype:
+            df[column] = df[column].astype(dtype)
+
+
+def _reviewer(frame):
+    from referia.assess.web_review import WebReviewer
+
+    reviewer = WebReviewer.__new__(WebReviewer)
+    reviewer._interface = INTERFACE
+    reviewer._data = frame
+    reviewer._apply_schema()
+    return reviewer
+
+
+class TestColumnSchema:
+    def test_widget_dtypes(self):
+        assert widget_dtype({"type": "Checkbox"}) == "object"
+        assert widget_dtype({"type": "Textarea"}) == "object"
+        assert widget_dtype({"type": "IntSlider"}) is None
+
+    def test_from_interface(self):
+        schema = ColumnSchema.from_interface(INTERFACE, INTERFACE["review"])
+        assert schema.dtype("comment") == "object"
+        assert schema.dtype("done") == "object"
+        assert schema.dtype("score") is None
+        assert schema.dtype("score_modified") == TIMESTAMP_DTYPE
+        assert schema.dtype("done_created") == TIMESTAMP_DTYPE
+        assert schema.dtype("unrelated") is None
+
+    def test_apply_casts_only_what_does_not_fit(self):
+        frame = _Frame(3)
+        frame._d["output"]["comment"] = frame._d["output"]["comment"].astype("object")
+        schema = ColumnSchema.from_interface(INTERFACE, INTERFACE["review"])
+        cast = schema.apply(frame)
+        assert "comment" not in cast
+        assert {"done", "score_modified", "comment_created"} <= set(cast)
+        dtypes = frame._d["output"].dtypes
+        assert dtypes["done"] == object
+        assert str(dtypes["score_modified"]) == TIMESTAMP_DTYPE
+        assert dtypes["score"] == np.float64
+        assert schema.apply(frame) == []
+
+    def test_unconvertible_column_is_left(self):
+        frame = _Frame(2)
+        df = frame._d["output"]
+        df["score_modified"] = pd.Series(["not a date", None], index=df.index, dtype="str")
+        ColumnSchema({"score_modified": TIMESTAMP_DTYPE}).apply(frame)
+        assert str(df["score_modified"].dtype) != TIMESTAMP_DTYPE
+
+
+class TestUpdateType:
+    """``CustomDataFrame._update_type`` runs on writes through lynguine."""
+
+    def test_cast_columns_keep_their_dtype(self):
+        from referia.assess.data import CustomDataFrame
+
+        frame = _Frame(3)
+        ColumnSchema({"score": "float64", "done": "object"}).apply(frame)
+        df = frame._d["output"]
+        before = df.dtypes.copy()
+        CustomDataFrame._update_type(frame, df, "score", "n/a")
+        CustomDataFrame._update_type(frame, df, "score", True)
+        CustomDataFrame._update_type(frame, df, "done", True)
+        assert (df.dtypes == before).all()
+
+    def test_columns_outside_the_schema_still_widen(self):
+        from referia.assess.data import CustomDataFrame
+
+        frame = _Frame(3)
+        ColumnSchema({"done": "object"}).apply(frame)
+        df = frame._d["output"]
+        CustomDataFrame._update_type(frame, df, "score", "n/a")
+        assert df["score"].dtype == object
+
+
+class TestEdits:
+    def test_edit_writes_cells_without_casting(self, monkeypatch):
+        frame = _Frame(5)
+        reviewer = _reviewer(frame)
+        casts = []
+        monkeypatch.setattr(frame, "set_dtype", lambda *args: casts.append(args))
+        reviewer.set_values({"score": 4, "comment": "Clear", "done": True})
+        df = frame._d["output"]
+        assert df.at["r0", "comment"] == "Clear"
+        assert bool(df.at["r0", "done"])
+        assert isinstance(df.at["r0", "comment_modified"], pd.Timestamp)
+        assert casts == []
+
+    def test_value_the_column_refuses_widens_it_once(self):
+        frame = _Frame(3)
+        reviewer = _reviewer(frame)
+        reviewer.set_value("score", "n/a")
+        assert frame._d["output"].at["r0", "score"] == "n/a"
+        assert frame._d["output"]["score"].dtype == object
+
+    def test_schema_rebuilt_on_load(self):
+        reviewer = _reviewer(_Frame(2))
+        schema = reviewer.column_schema()
+        assert reviewer.column_schema() is schema
+        reviewer._column_schema = None
+        assert reviewer.column_schema() is not schema
+
+
+@pytest.mark.slow
+def test_benchmark_edit_latency_by_sheet_size():
+    """Edit latency with load-time dtypes against a cast on every edit."""
+    edits = 50
+
+    def per_edit(rows, cast_each_edit):
+        frame = _Frame(rows)
+        reviewer = _reviewer(frame)
+        # The first lookup builds the index's hash table.
+        reviewer.set_value("score", 0)
+        start = time.perf_counter()
+        for i in range(edits):
+            frame._index = frame.index[i % rows]
+            if cast_each_edit:
+                # What each edit did before: recast both timestamp columns.
+                for column in ("comment_modified", "comment_created"):
+                    df = frame._d["output"]
+                    df[column] = df[column].astype(TIMESTAMP_DTYPE)
+            reviewer.set_value("comment", f"edit {i}")
+        return (time.perf_counter() - start) / edits
+
+    small = per_edit(100, False)
+    large = per_edit(100_000, False)
+    cast_large = per_edit(100_000, True)
+    print(
+        f"\nper edit: 100 rows {small * 1e3:.2f} ms, 100k rows {large * 1e3:.2f} ms; "
+        f"casting each edit at 100k rows {cast_large * 1e3:.2f} ms"
+    )
+    assert large < small * 5
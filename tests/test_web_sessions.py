@@ -0,0 +1,76 @@
+"""Tests for referia.web.sessions — per-browser and per-tab cursor keys."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from referia.assess.web_review import IndexCatalog
+from referia.web.app import create_app
+from referia.web.sessions import SESSION_COOKIE, TAB_HEADER
+
+
+def _mock_reviewer():
+    r = MagicMock()
+    r.index_list.return_value = ["alice", "bob"]
+    r.index_catalog.return_value = IndexCatalog(["alice", "bob"])
+    r.stale_dependencies.return_value = set()
+    r.row_version.return_value = None
+    r.get_index.return_value = "alice"
+    r.get_widget_specs.return_value = []
+    r.get_viewer_specs.return_value = []
+    r.get_review_specs.return_value = []
+    r.get_row_data.return_value = {}
+    return r
+
+
+@contextmanager
+def _client(reviewer):
+    with patch("referia.assess.web_review.WebReviewer", return_value=reviewer):
+        app = create_app(user_file="_referia.yml", directory="/tmp")
+        with TestClient(app) as client:
+            yield client
+
+
+class TestSessionCookie:
+    def test_cookie_issued_on_first_request(self):
+        with _client(_mock_reviewer()) as client:
+            resp = client.get("/record", params={"index": "bob"})
+        assert SESSION_COOKIE in resp.cookies
+
+    def test_cookie_not_reissued(self):
+        with _client(_mock_reviewer()) as client:
+            client.get("/record")
+            resp = client.get("/record")
+        assert SESSION_COOKIE not in resp.cookies
+
+    def test_invalid_cookie_replaced(self):
+        with _client(_mock_reviewer()) as client:
+            client.cookies.set(SESSION_COOKIE, "bad id!")
+            resp = client.get("/record")
+        assert resp.cookies.get(SESSION_COOKIE) not in (None, "bad id!")
+
+
+class TestSessionKey:
+    def test_reviewer_work_runs_in_browser_session(self):
+        reviewer = _mock_reviewer()
+        with _client(reviewer) as client:
+            client.cookies.set(SESSION_COOKIE, "browser1234")
+            client.get("/record", params={"index": "bob"})
+        reviewer.session.assert_called_with("browser1234", None)
+
+    def test_tab_header_keys_child_session(self):
+        reviewer = _mock_reviewer()
+        with _client(reviewer) as client:
+            client.cookies.set(SESSION_COOKIE, "browser1234")
+            client.get("/record", headers={TAB_HEADER: "tab56789"})
+        reviewer.session.assert_called_with("browser1234/tab56789", "browser1234")
+
+    def test_malformed_tab_header_ignored(self):
+        reviewer = _mock_reviewer()
+        with _client(reviewer) as client:
+            client.cookies.set(SESSION_COOKIE, "browser1234")
+            client.get("/record", headers={TAB_HEADER: "../x"})
+        reviewer.session.assert_called_with("browser1234", None)
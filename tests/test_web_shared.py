@@ -0,0 +1,270 @@
+"""Tests for referia.assess.shared (state shared by server processes).
+
+Two ``WebReviewer`` instances over one database stand in for two worker
+processes; their data is a minimal in-memory frame whose output flow is
+"written" to a dict both share, as a workbook on disk would be.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from referia.assess.shared import EditConflict, SharedState, shared_path
+from referia.assess.web_review import IndexCatalog
+
+_COLUMNS = ["score", "score_modified", "score_created", "note", "note_modified", "note_created"]
+
+
+def test_path_sits_beside_config(tmp_path):
+    assert shared_path("_referia.yml", tmp_path) == tmp_path / "._referia.shared.db"
+
+
+class TestSharedState:
+    def test_record_bumps_version_and_logs_cells(self, tmp_path):
+        state = SharedState(tmp_path / "s.db")
+        stamp = pd.Timestamp("2024-05-01 12:00:00")
+        assert state.version("a") == 0
+        seq = state.record("a", None, "score", [("score", 3), ("score_modified", stamp)])
+        assert state.version("a") == 1
+        entries, flushed = state.changes_since(0)
+        assert flushed == 0
+        assert [(e["index"], e["column"], e["value"]) for e in entries] == [
+            ("a", "score", 3), ("a", "score_modified", stamp),
+        ]
+        assert entries[-1]["seq"] == seq
+        assert state.changes_since(seq) == ([], 0)
+
+    def test_other_connection_sees_commits(self, tmp_path):
+        first, second = SharedState(tmp_path / "s.db"), SharedState(tmp_path / "s.db")
+        first.record(7, 2, "score", [("score", 1)])
+        entries, _ = second.changes_since(0)
+        assert (entries[0]["index"], entries[0]["subindex"]) == (7, 2)
+        assert second.version(7) == 1
+
+    def test_check_conflicts_on_same_field_only(self, tmp_path):
+        state = SharedState(tmp_path / "s.db")
+        state.record("a", None, "score", [("score", 1)])
+        state.check("a", "note", 0)
+        state.check("a", "score", 1)
+        with pytest.raises(EditConflict) as info:
+            state.check("a", "score", 0)
+        assert (info.value.expected, info.value.current) == (0, 1)
+
+    def test_flushed_edits_leave_log_but_keep_field_versions(self, tmp_path):
+        state = SharedState(tmp_path / "s.db")
+        seq = state.record("a", None, "score", [("score", 1)])
+        state.mark_flushed(seq)
+        assert state.changes_since(0) == ([], seq)
+        assert state.version("a") == 1
+        state.check("a", "note", 0)
+        with pytest.raises(EditConflict):
+            state.check("a", "score", 0)
+
+    def test_derived_cells_never_conflict(self, tmp_path):
+        state = SharedState(tmp_path / "s.db")
+        state.record_batch("a", None, [("score", "score", 1), (None, "total", 3)])
+        state.check("a", "total", 0)
+        with pytest.raises(EditConflict):
+            state.check("a", "score", 0)
+
+    def test_failed_transaction_rolls_back(self, tmp_path):
+        state = SharedState(tmp_path / "s.db")
+        with pytest.raises(RuntimeError):
+            with state.transaction():
+                state.record("a", None, "score", [("score", 1)])
+                raise RuntimeError
+        assert state.version("a") == 0
+        assert state.changes_since(0) == ([], 0)
+
+
+class _At:
+    def __init__(self, frame):
+        self._frame = frame
+
+    def __getitem__(self, key):
+        return self._frame.cells.get(key)
+
+
+class _Frame:
+    """Just enough of ``CustomDataFrame`` for set_value, sync and flush."""
+
+    def __init__(self, disk):
+        self.index = ["a", "b"]
+        self.columns = list(_COLUMNS)
+        self._index, self._subindex, self._selector = "a", None, None
+        self._column = None
+        self._d = {"output": None}
+        self._colspecs = {"output": list(_COLUMNS)}
+        self.disk = disk
+        self.cells = dict(disk)
+        self.at = _At(self)
+        self.reloads = 0
+
+    def get_index(self):
+        return self._index
+
+    def set_index(self, index):
+        self._index = index
+
+    def set_column(self, column):
+        self._column = column
+
+    def get_value(self):
+        return self.cells.get((self._index, self._column))
+
+    def set_value(self, value):
+        self.cells[(self._index, self._column)] = value
+
+    def set_dtype(self, column, dtype):
+        pass
+
+    def get_value_column(self, column):
+        return column
+
+    def save_flow(self, key, cells=None):
+        self.disk.clear()
+        self.disk.update(self.cells)
+
+    def reload_flows(self, flows):
+        self.reloads += 1
+        self.cells = dict(self.disk)
+
+
+def _worker(tmp_path, disk):
+    from referia.assess.web_review import WebReviewer
+
+    reviewer = WebReviewer.__new__(WebReviewer)
+    reviewer._interface = {"modified_suffix": "modified", "created_suffix": "created"}
+    reviewer._directory = str(tmp_path)
+    reviewer._data = _Frame(disk)
+    reviewer._fingerprint = MagicMock(signatures={"output": None})
+    reviewer._fingerprint.changed.return_value = set()
+    reviewer._shared = SharedState(tmp_path / "s.db")
+    return reviewer
+
+
+@pytest.fixture
+def workers(tmp_path):
+    disk: dict = {}
+    return _worker(tmp_path, disk), _worker(tmp_path, disk), disk
+
+
+class TestSharedReviewers:
+    def test_commit_reaches_other_worker(self, workers):
+        first, second, _ = workers
+        first.set_value("score", 4)
+        assert second.get_value("score") is None
+        with second.session("tab"):
+            assert second.get_value("score") == 4
+            assert second.row_version() == 1
+        assert second.dirty_cells() == {"output": {("a", "score"), ("a", "score_modified"),
+                                                   ("a", "score_created")}}
+
+    def test_sync_drops_cached_row(self, workers):
+        first, second, _ = workers
+        version = second.panel_version()
+        first.set_value("score", 4)
+        assert second.sync() == 3
+        assert second.panel_version() != version
+
+    def test_stale_edit_of_same_field_conflicts(self, workers):
+        first, second, _ = workers
+        first.set_value("score", 4)
+        with pytest.raises(EditConflict):
+            second.set_value("score", 5, expected_version=0)
+        assert second.get_value("score") == 4
+        assert second.row_version() == 1
+
+    def test_stale_edit_of_other_field_is_kept(self, workers):
+        first, second, _ = workers
+        first.set_value("score", 4)
+        second.set_value("note", "fine", expected_version=0)
+        first.sync()
+        assert (first.get_value("score"), first.get_value("note")) == (4, "fine")
+        assert first.row_version() == 2
+
+    def test_editors_of_different_fields_after_autosave(self, workers):
+        first, second, _ = workers
+        version = second.row_version()
+        first.set_value("score", 4)
+        # Autosave writes the edit out and drops it from the log.
+        first.flush()
+        second.set_value("note", "fine", expected_version=version)
+        first.sync()
+        assert (first.get_value("score"), first.get_value("note")) == (4, "fine")
+        with pytest.raises(EditConflict):
+            second.set_value("score", 5, expected_version=version)
+
+    def test_flush_writes_every_workers_edits(self, workers):
+        first, second, disk = workers
+        first.set_value("score", 4)
+        second.set_value("note", "fine")
+        assert first.flush() == ["output"]
+        assert (disk[("a", "score")], disk[("a", "note")]) == (4, "fine")
+        assert first._shared.changes_since(0)[0] == []
+        # The other worker held nothing newer, so it has nothing to write.
+        second.sync()
+        assert not second.dirty
+
+    def test_worker_behind_a_flush_rereads_outputs(self, workers):
+        first, second, disk = workers
+        first.set_value("score", 4)
+        first.flush()
+        second.sync()
+        assert second._data.reloads == 1
+        assert second.get_value("score") == 4
+
+
+class TestConflictRoute:
+    def test_conflict_returns_409_with_current_value(self):
+        from fastapi.testclient import TestClient
+        from referia.web.app import create_app
+
+        reviewer = MagicMock()
+        reviewer.index_catalog.return_value = IndexCatalog(["alice"])
+        reviewer.stale_dependencies.return_value = set()
+        reviewer.find_spec.return_value = {"type": "Textarea", "field": "Comment"}
+        reviewer.get_row_data.return_value = {}
+        reviewer.get_widget_specs.return_value = []
+        reviewer.set_value.side_effect = EditConflict("alice", "Comment", 1, 2)
+        reviewer.get_value.return_value = "their text"
+        reviewer.row_version.return_value = 2
+        with patch("referia.assess.web_review.WebReviewer", return_value=reviewer):
+            app = create_app(user_file="_referia.yml", directory="/tmp", shared=True)
+            with TestClient(app) as client:
+                response = client.post("/field/Comment", data={"Comment": "mine"},
+                                       headers={"X-Referia-Row-Version": "1"})
+        assert response.status_code == 409
+        reviewer.set_value.assert_called_once_with("Comment", "mine", expected_version=1)
+        assert "their text" in response.text
+        assert 'id="row-version" value="2" hx-swap-oob="true"' in response.text
+
+
+class TestProcessesOption:
+    def test_parsed(self):
+        from referia.cli import _build_parser
+        args = _build_parser().parse_args(["serve", "--processes", "3"])
+        assert args.processes == 3
+
+    def test_several_processes_start_shared_workers(self, tmp_path, monkeypatch):
+        from referia.cli import _serve
+        from referia.web.app import APP_OPTIONS_ENV
+
+        # Restored (removed) after the test.
+        monkeypatch.setenv(APP_OPTIONS_ENV, "{}")
+        args = argparse.Namespace(root=None, directory=str(tmp_path), config="_referia.yml",
+                                  host="127.0.0.1", port=8000, processes=3)
+        with patch("uvicorn.run") as run:
+            _serve(args)
+        target = run.call_args.args[0]
+        assert target == "referia.web.app:create_app_from_env"
+        assert run.call_args.kwargs["workers"] == 3
+        options = json.loads(os.environ[APP_OPTIONS_ENV])
+        assert options["shared"] is True
+        assert options["directory"] == str(tmp_path.resolve())
@@ -0,0 +1,264 @@
+"""Tests for referia.web.supervisor (root mode sharded over worker processes).
+
+Worker processes are stand-ins whose ``poll`` says whether they are alive;
+HTTP calls to them go through an ``httpx.MockTransport`` that answers as the
+worker on that port would.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from referia.web.supervisor import (
+    HashRing,
+    Supervisor,
+    create_supervisor_app,
+    route_key,
+    shard_key,
+)
+
+
+class TestHashRing:
+    def test_same_key_same_node(self):
+        ring = HashRing(["w0", "w1", "w2"])
+        assert {ring.node_for("theses/a") for _ in range(5)} == {ring.node_for("theses/a")}
+
+    def test_keys_spread_over_nodes(self):
+        ring = HashRing(["w0", "w1", "w2"])
+        owners = [ring.node_for(f"config/{i}") for i in range(600)]
+        assert all(owners.count(node) > 100 for node in ring.nodes)
+
+    def test_removing_a_node_moves_only_its_keys(self):
+        ring = HashRing(["w0", "w1", "w2"])
+        keys = [f"config/{i}" for i in range(300)]
+        before = {key: ring.node_for(key) for key in keys}
+        ring.remove("w1")
+        after = {key: ring.node_for(key) for key in keys}
+        assert "w1" not in after.values()
+        assert all(after[key] == owner for key, owner in before.items() if owner != "w1")
+        ring.add("w1")
+        assert {key: ring.node_for(key) for key in keys} == before
+
+    def test_empty_ring(self):
+        assert HashRing().node_for("x") is None
+
+
+@pytest.mark.parametrize("path, key", [
+    ("/theses/intro/", "theses/intro"),
+    ("/theses/intro/_referia.yml", "theses/intro"),
+    ("/theses/intro/record/next", "theses/intro"),
+    ("/theses/intro/field/score", "theses/intro"),
+    ("/theses/intro/_referia_v2.yml/save", "theses/intro/_referia_v2.yml"),
+    ("/_referia.yml/populate/summary", ""),
+    ("/", ""),
+])
+def test_route_key(path, key):
+    assert route_key(path) == key
+
+
+def test_shard_key_matches_directory_and_config_file():
+    assert shard_key("a/b") == shard_key("a/b/_referia.yml") == "a/b"
+
+
+class _Process:
+    pid = 1234
+
+    def __init__(self, command):
+        self.command = command
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+    def terminate(self):
+        self.returncode = 0
+
+    kill = terminate
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+
+def _supervisor(processes=3, on_release=None):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        port = request.url.port
+        if request.url.path == "/health":
+            return httpx.Response(200, json={"status": "ok", "port": port})
+        if request.url.path == "/_shard/release":
+            if on_release is not None:
+                on_release(json.loads(request.content))
+            return httpx.Response(200, json={"released": 0})
+        return httpx.Response(200, text=f"{port} {request.method} {request.url.path}",
+                              headers=[("set-cookie", "a=1"), ("set-cookie", "b=2")])
+
+    supervisor = Supervisor("/srv/reviews", processes, ["--workers", "2"],
+                            check_interval=3600, spawn=_Process,
+                            transport=httpx.MockTransport(handler))
+    return supervisor, calls
+
+
+class TestSupervisor:
+    def test_worker_command(self):
+        supervisor, _ = _supervisor()
+        supervisor.start()
+        try:
+            command = supervisor.workers[0].process.command
+            assert command[1:4] == ["-m", "referia.cli", "serve"]
+            assert ["--shard", "w0"] == command[command.index("--shard"):][:2]
+            assert command[-2:] == ["--workers", "2"]
+        finally:
+            supervisor.stop()
+
+    def test_config_always_goes_to_one_worker(self):
+        supervisor, _ = _supervisor()
+        app = create_supervisor_app(supervisor)
+        with TestClient(app) as client:
+            ports = {client.get(path).text.split()[0] for path in (
+                "/theses/intro/", "/theses/intro/record/next", "/theses/intro/_referia.yml",
+            )}
+            response = client.post("/theses/intro/field/score", data={"score": "3"})
+        assert len(ports) == 1
+        assert response.text.split()[:2] == [next(iter(ports)), "POST"]
+        assert response.headers.get_list("set-cookie") == ["a=1", "b=2"]
+
+    def test_dead_worker_is_replaced_and_configs_rebalanced(self):
+        supervisor, calls = _supervisor()
+        supervisor.start()
+        try:
+            victim = supervisor.workers[1]
+            key = next(k for k in (f"c{i}" for i in range(100))
+                       if supervisor.worker_for(k) is victim)
+            victim.process.returncode = -9
+            # Until replaced, its configs are served by a neighbour.
+            supervisor._leave(victim)
+            assert supervisor.worker_for(key) is not victim
+            assert supervisor.check() == ["w1"]
+            assert victim.restarts == 1 and victim.alive()
+            assert supervisor.worker_for(key) is victim
+            releases = [json.loads(c.content) for c in calls if c.url.path == "/_shard/release"]
+            assert sorted(r["owner"] for r in releases) == ["w0", "w2"]
+            assert releases[0]["nodes"] == ["w0", "w1", "w2"]
+        finally:
+            supervisor.stop()
+
+    def test_rejoining_worker_gets_configs_only_after_release(self):
+        seen = []
+        supervisor, _ = _supervisor(
+            on_release=lambda body: seen.append(
+                (body["owner"], supervisor.worker_for(key).name, supervisor.moving(key))
+            )
+        )
+        supervisor.start()
+        try:
+            victim = supervisor.workers[1]
+            key = next(k for k in (f"c{i}" for i in range(100))
+                       if supervisor.worker_for(k) is victim)
+            victim.process.returncode = -9
+            supervisor.check()
+        finally:
+            supervisor.stop()
+        # While the others release, the key stays with its interim owner and
+        # is held as moving; afterwards it routes to the rejoined worker.
+        assert [owner for owner, _, _ in seen] == ["w0", "w2"]
+        assert all(name != "w1" and moving for _, name, moving in seen)
+        assert supervisor.worker_for(key) is victim
+        assert not supervisor.moving(key)
+
+    def test_requests_for_moving_configs_wait_for_the_join(self):
+        supervisor, calls = _supervisor()
+        app = create_supervisor_app(supervisor)
+        with TestClient(app) as client:
+            joining = supervisor.workers[1]
+            path = next(p for p in (f"/c{i}/" for i in range(100))
+                        if supervisor.worker_for(route_key(p)) is joining)
+            supervisor._leave(joining)
+            # What _join sets while the others release.
+            supervisor._proposed = HashRing(["w0", "w1", "w2"], replicas=supervisor._ring.replicas)
+            supervisor._settled.clear()
+            responses = []
+            thread = threading.Thread(target=lambda: responses.append(client.get(path)))
+            thread.start()
+            time.sleep(0.2)
+            assert not responses and not any(c.url.path == path for c in calls)
+            with supervisor._guard:
+                supervisor._ring.add("w1")
+                supervisor._proposed = None
+                supervisor._settled.set()
+            thread.join(5)
+        assert responses[0].text.split()[0] == str(joining.port)
+
+    def test_health_reports_each_worker(self):
+        supervisor, _ = _supervisor(processes=2)
+        app = create_supervisor_app(supervisor)
+        with TestClient(app) as client:
+            client.get("/theses/intro/")
+            health = client.get("/health").json()
+        assert health["mode"] == "supervisor"
+        assert health["status"] == "ok"
+        assert [w["name"] for w in health["workers"]] == ["w0", "w1"]
+        assert sum(w["requests"] for w in health["workers"]) == 1
+        assert sum(w["configs_routed"] for w in health["workers"]) == 1
+        assert all(w["health"]["status"] == "ok" for w in health["workers"])
+
+
+class TestRelease:
+    def test_worker_drops_configs_it_no_longer_owns(self, tmp_path):
+        from referia.web.app import create_app
+
+        app = create_app(root=str(tmp_path), shard="w0", config_refresh_interval=0)
+        cache = app.state.reviewer_cache
+        ring = HashRing(["w0", "w1"])
+        keys = {}
+        for name in ("a", "b", "c", "d", "e", "f"):
+            reviewer = MagicMock(dirty=False)
+            reviewer.memory_usage.return_value = 0
+            key = str(tmp_path.resolve() / name / "_referia.yml")
+            cache.store(key, 0.0, reviewer)
+            keys[key] = ring.node_for(name)
+        with TestClient(app) as client:
+            response = client.post("/_shard/release",
+                                   json={"owner": "w0", "nodes": ["w0", "w1"], "replicas": 64})
+            kept = sorted(cache)
+        moved = [key for key, owner in keys.items() if owner != "w0"]
+        assert response.json() == {"released": len(moved)}
+        assert kept == sorted(key for key in keys if key not in moved)
+
+    def test_release_route_only_on_shard_workers(self, tmp_path):
+        from referia.web.app import create_app
+
+        app = create_app(root=str(tmp_path), config_refresh_interval=0)
+        assert "/_shard/release" not in {getattr(route, "path", None) for route in app.routes}
+
+
+class TestShardsOption:
+    def test_needs_root(self):
+        from referia.cli import _serve
+
+        args = argparse.Namespace(root=None, directory=None, config="_referia.yml",
+                                  host="127.0.0.1", port=8000, shards=2)
+        with pytest.raises(SystemExit) as info:
+            _serve(args)
+        assert info.value.code == 1
+
+    def test_starts_supervisor(self, tmp_path):
+        from referia.cli import _serve
+
+        args = argparse.Namespace(root=str(tmp_path), directory=None, config="_referia.yml",
+                                  host="127.0.0.1", port=8000, shards=3)
+        with patch("uvicorn.run") as run, \
+                patch("referia.web.supervisor.Supervisor") as supervisor:
+            _serve(args)
+        assert supervisor.call_args.args[:2] == (str(tmp_path.resolve()), 3)
+        assert "--max-reviewers" in supervisor.call_args.args[2]
+        run.assert_called_once()
@@ -0,0 +1,113 @@
+"""Tests for referia.web.workers — the bounded pool behind the async routes.
+
+Verifies that work for one reviewer is serialised, that work for different
+reviewers runs concurrently, and that the app factory wires the pool in.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from referia.web.app import create_app
+from referia.web.workers import DEFAULT_WORKERS, ReviewerExecutor
+
+
+class _Reviewer:
+    """Minimal weak-referenceable stand-in for a ``WebReviewer``."""
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+class TestReviewerExecutor:
+    def test_rejects_zero_workers(self):
+        with pytest.raises(ValueError):
+            ReviewerExecutor(max_workers=0)
+
+    def test_returns_result_and_runs_off_loop_thread(self):
+        executor = ReviewerExecutor(max_workers=2)
+
+        async def main():
+            return threading.get_ident(), await executor.run(None, threading.get_ident)
+
+        loop_thread, worker_thread = _run(main())
+        executor.shutdown()
+        assert loop_thread != worker_thread
+
+    def test_exception_propagates(self):
+        executor = ReviewerExecutor(max_workers=1)
+
+        def boom():
+            raise KeyError("x")
+
+        with pytest.raises(KeyError):
+            _run(executor.run(None, boom))
+        executor.shutdown()
+
+    def test_same_reviewer_is_serialised(self):
+        executor = ReviewerExecutor(max_workers=4)
+        reviewer = _Reviewer()
+        active = []
+        peak = []
+
+        def work():
+            active.append(1)
+            peak.append(len(active))
+            time.sleep(0.05)
+            active.pop()
+
+        async def main():
+            await asyncio.gather(*(executor.run(reviewer, work) for _ in range(4)))
+
+        _run(main())
+        executor.shutdown()
+        assert max(peak) == 1
+
+    def test_different_reviewers_run_concurrently(self):
+        executor = ReviewerExecutor(max_workers=2)
+        barrier = threading.Barrier(2, timeout=5)
+
+        async def main():
+            # Deadlocks (and the barrier times out) unless both run at once.
+            await asyncio.gather(
+                executor.run(_Reviewer(), barrier.wait),
+                executor.run(_Reviewer(), barrier.wait),
+            )
+
+        _run(main())
+        executor.shutdown()
+
+    def test_restarts_after_shutdown(self):
+        executor = ReviewerExecutor(max_workers=1)
+        assert _run(executor.run(None, lambda: 1)) == 1
+        executor.shutdown()
+        assert _run(executor.run(None, lambda: 2)) == 2
+        executor.shutdown()
+
+
+class TestAppWiring:
+    def _mock_reviewer(self):
+        r = MagicMock()
+        r.get_indices.return_value = ["a"]
+        r.get_index.return_value = "a"
+        return r
+
+    def test_default_workers_on_health(self):
+        with patch("referia.assess.web_review.WebReviewer", return_value=self._mock_reviewer()):
+            app = create_app(user_file="_referia.yml", directory="/tmp")
+            with TestClient(app) as client:
+                data = client.get("/health").json()
+        assert data["workers"] == DEFAULT_WORKERS
+
+    def test_custom_workers_on_health(self, tmp_path):
+        app = create_app(root=str(tmp_path), workers=7)
+        with TestClient(app) as client:
+            data = client.get("/health").json()
+        assert data["workers"] == 7